@@ -5,20 +5,27 @@ Control Chart Streamlit Web Application
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
+import logging
 import os
+import sqlite3
 from datetime import datetime, date
 
 # DB 모듈 임포트
 from modules import database as db
-import importlib
-importlib.reload(db) # Force reload to apply changes
+from modules import data_loader
 
 from modules.utils import (
     load_data, clean_data, normalize_check_items_column,
     add_date_columns, build_display_map, normalize_key,
-    calculate_stats, RESEARCH_MODELS, INDUSTRIAL_MODELS
+    calculate_stats
 )
+from modules import model_registry
+from modules import config_audit
+from modules import warmup
+from modules import metrics
+from modules import sql_trace
+from modules import rerun_profiler
+from modules.render_timing import begin_run, render_timer, render_timing_summary, timed_fragment
 from modules import charts  # 전체 모듈 임포트 (charts.plot_sunburst_chart 사용 위함)
 from modules.charts import create_control_chart, create_individual_chart
 from modules.monthly_shipment import (
@@ -38,6 +45,8 @@ from config import (
     get_ae_options
 )
 
+logger = logging.getLogger(__name__)
+
 # 페이지 설정
 st.set_page_config(
     page_title="Control Chart Viewer v1.0",
@@ -55,24 +64,24 @@ if 'db_initialized' not in st.session_state:
     data_file_path = os.path.join(os.path.dirname(__file__), 'data', 'data.xlsx')
     if os.path.exists(data_file_path):
         try:
-            # Read all 3 sheets
-            df_equip = pd.read_excel(data_file_path, sheet_name='Equipments')
-            df_meas = pd.read_excel(data_file_path, sheet_name='Measurements')
-            try:
-                df_specs = pd.read_excel(data_file_path, sheet_name='Specs')
-            except:
-                df_specs = None
-            
             # Check if DB is already populated to avoid overwriting pending data
+            # (채워진 DB면 워크북 파싱 자체를 생략)
             if db.get_equipment_count() == 0:
-                # Use sync_relational_data which sets status='approved' by default
-                result = db.sync_relational_data(df_equip, df_meas, df_specs)
+                # 3개 시트 병렬 파싱 + Parquet 캐시 → 일괄 저장 (status='approved')
+                result = data_loader.sync_local_workbook(data_file_path)
                 st.session_state.auto_load_msg = f"✅ 로컬 데이터 자동 로드 완료 (장비: {result['equipments']}대, 측정값: {result['measurements']}건)"
             else:
                 st.session_state.auto_load_msg = "✅ 기존 데이터베이스 유지됨 (초기화 건너뜀)"
         except Exception as e:
             st.session_state.auto_load_msg = f"⚠️ 자동 로드 실패: {str(e)}"
 
+# 규칙 파일(equipment_config_rules.json)에만 있는 모델 분류를 DB에 반영 (프로세스당 한 번, DB 오류는 경고만)
+model_registry.sync_rules_categories_once()
+# 캐시 예열 (프로세스당 한 번, 백그라운드 - 이후 실행에서는 바로 반환)
+warmup.start_warmup()
+# Prometheus /metrics endpoint (프로세스당 한 번 시도, METRICS_PORT=0이면 끔)
+metrics.start_http_server()
+
 # 세션 상태 초기화
 if 'filtered_data' not in st.session_state:
     st.session_state.filtered_data = None
@@ -90,20 +99,16 @@ def sync_data_from_local():
         return False
 
     try:
-        # Read all 3 sheets
-        df_equip = pd.read_excel(data_file_path, sheet_name='Equipments')
-        df_meas = pd.read_excel(data_file_path, sheet_name='Measurements')
-        try:
-            df_specs = pd.read_excel(data_file_path, sheet_name='Specs')
-        except:
-            df_specs = None
-        
-        # Use sync_relational_data (sets status='approved' by default)
-        result = db.sync_relational_data(df_equip, df_meas, df_specs)
-        
-        msg = f"✅ 로컬 데이터 동기화 완료! 장비 {result['equipments']}대, 측정값 {result['measurements']}건 저장됨."
-        if df_specs is not None:
-            msg += " + 규격(Specs) 동기화 완료"
+        # 변경분만 반영 (sets status='approved' by default, 동기화 중에도 DB가 비지 않음)
+        result = data_loader.sync_local_workbook(data_file_path, mode='delta')
+
+        def _fmt(summary):
+            return f"추가 {summary['inserted']} / 수정 {summary['updated']} / 삭제 {summary['deleted']}"
+
+        msg = (f"✅ 로컬 데이터 동기화 완료! 장비 [{_fmt(result['equipments'])}], "
+               f"측정값 [{_fmt(result['measurements'])}]")
+        if any(result['specs'][k] for k in ('inserted', 'updated', 'deleted')):
+            msg += f" + 규격(Specs) [{_fmt(result['specs'])}]"
         st.success(msg)
         return True
         
@@ -162,7 +167,7 @@ def extract_equipment_info_from_last_sheet(excel_file):
         
         # Auto-detect R/I based on model
         if 'model' in info:
-            info['ri'] = 'Industrial' if info['model'] in INDUSTRIAL_MODELS else 'Research'
+            info['ri'] = 'Industrial' if model_registry.category_of(info['model']) == model_registry.INDUSTRIAL else 'Research'
         
         return info
         
@@ -211,7 +216,10 @@ def analyze_current_data_context(df):
         'spec_margin': None,
         'mean': None,
         'std': None,
-        'n_out_of_spec': 0
+        'n_out_of_spec': 0,
+        
+        # 모델 × 항목별 공정 능력 (여러 모델/항목 선택 시)
+        'capability': None
     }
     
     # 기간 계산
@@ -276,6 +284,16 @@ def analyze_current_data_context(df):
             # 계산 중 오류 발생 시 무시 (지표는 None으로 유지)
             pass
     
+    # 여러 모델/항목이 섞인 경우 그룹별 Cpk 일괄 계산
+    if context['cpk'] is None and 'Value' in df.columns and 'Model' in df.columns and 'Check Items' in df.columns:
+        try:
+            from modules.spec_analysis import calculate_capability_matrix
+            context['capability'] = calculate_capability_matrix(df)
+        except (ValueError, TypeError, KeyError, sqlite3.Error) as e:
+            # 매트릭스 없이 계속 진행 (컨텍스트 카드는 기본 지표만 표시)
+            logger.warning("Capability matrix calculation failed", exc_info=True)
+            st.warning(f"⚠️ 그룹별 공정 능력 계산 실패: {e}")
+    
     return context
 
 
@@ -419,6 +437,26 @@ def render_data_context_card(df):
                         delta=margin_delta,
                         delta_color=margin_color
                     )
+            elif context['capability'] is not None and context['capability']['Cpk'].notna().any():
+                # 여러 모델/항목: 그룹별 Cpk 요약
+                st.markdown("#### 핵심 지표 (그룹별)")
+                matrix = context['capability']
+                worst = matrix.iloc[0]  # Cpk 오름차순 정렬
+                
+                st.metric(
+                    "최저 Cpk",
+                    f"{worst['Cpk']:.2f}",
+                    delta=f"{worst['Model']} / {worst['Check Items']}",
+                    delta_color="inverse" if worst['Cpk'] < 1.0 else "off"
+                )
+                n_low = int((matrix['Cpk'] < 1.33).sum())
+                st.metric(
+                    "Cpk < 1.33 그룹",
+                    f"{n_low} / {int(matrix['Cpk'].notna().sum())}",
+                    delta="✅ 모두 우수" if n_low == 0 else "⚠️ 점검 필요",
+                    delta_color="normal" if n_low == 0 else "inverse"
+                )
+                st.caption("📊 SPEC 분석 탭의 공정 능력 매트릭스에서 전체 목록을 확인하세요.")
             else:
                 # 지표가 없는 경우
                 st.markdown("#### 💡 안내")
@@ -698,6 +736,12 @@ def render_data_explorer():
                     else:
                         st.info("데이터가 없습니다.")
 
+def _apply_profile_settings():
+    """관리자 토글 -> 재실행 프로파일링 설정 (프로세스 전체)"""
+    rerun_profiler.set_profiling(st.session_state.rerun_profile_enabled,
+                                 st.session_state.get('rerun_profile_cprofile', False))
+
+
 def render_data_maintenance():
     """Tab 4-4: Data Maintenance and Migration Tools"""
     st.subheader("🔧 데이터 관리")
@@ -827,7 +871,59 @@ def render_data_maintenance():
     
     st.divider()
     
-    # === 6. DB 최적화 ===
+    # === 6. 구성 규칙 검증 ===
+    st.markdown("### 🧪 구성 규칙 검증")
+    
+    audit = config_audit.get_audit_summary()
+    last_run = audit['last_run']
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if audit['violations'] > 0:
+            st.metric("규칙 위반 장비", f"{audit['violations']:,}건", delta="확인 필요", delta_color="inverse")
+        else:
+            st.metric("규칙 위반 장비", "0건 ✓")
+    
+    with col2:
+        st.metric("검증 대기", f"{audit['pending']:,}건")
+    
+    with col3:
+        st.metric("마지막 검증", last_run['finished_at'].replace('T', ' ') if last_run else "-")
+    
+    if last_run:
+        mode_label = "전체" if last_run['mode'] == 'full' else "증분"
+        st.caption(
+            f"최근 실행: {mode_label} 검증 · 검사 {last_run['checked']:,}건 · "
+            f"규칙 없는 모델 {last_run['skipped']:,}건 · {last_run['seconds']}초 "
+            f"({last_run['rows_per_sec']:,}건/초)"
+        )
+    
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        st.info("변경된 장비만 검증합니다. 규칙 파일이 바뀐 경우 전체 장비를 다시 검증합니다.")
+    
+    with col2:
+        if st.button("🧪 검증 실행", key="run_config_audit"):
+            with st.spinner("구성 검증 중..."):
+                result = config_audit.run_config_audit()
+            st.success(f"✅ 검증 완료! {result['checked']:,}건 검사, 위반 {result['violations']:,}건")
+            st.rerun()
+    
+    if audit['violations'] > 0:
+        with st.expander("📊 모델별 위반 현황", expanded=False):
+            st.dataframe(
+                config_audit.get_violation_counts().rename(columns={'model': '모델', 'count': '위반 장비 수'}),
+                use_container_width=True, hide_index=True
+            )
+            violations = config_audit.get_violations()
+            violations['errors'] = violations['errors'].str.join('; ')
+            st.dataframe(violations, use_container_width=True, hide_index=True)
+    
+    st.divider()
+    
+    # === 7. DB 최적화 ===
     st.markdown("### ⚡ 데이터베이스 최적화")
     
     col1, col2 = st.columns([3, 1])
@@ -841,6 +937,164 @@ def render_data_maintenance():
                 result = db.vacuum_database()
             st.success(f"✅ 최적화 완료! {result['size_before_mb']} MB → {result['size_after_mb']} MB (절약: {result['space_saved_mb']} MB)")
             st.rerun()
+    
+    st.divider()
+    
+    # === 8. 재실행 프로파일링 ===
+    st.markdown("### ⏱ 재실행 프로파일링")
+    
+    col1, col2, col3 = st.columns([2, 2, 1])
+    
+    with col1:
+        enabled = st.toggle("재실행 프로파일링", value=rerun_profiler.is_enabled(), key="rerun_profile_enabled",
+                            on_change=_apply_profile_settings,
+                            help="프로세스 전체에 적용됩니다 (환경 변수 RERUN_PROFILE=1 / cprofile로도 켤 수 있음)")
+    
+    with col2:
+        st.toggle("cProfile 수집", value=rerun_profiler.is_cprofile_enabled(), key="rerun_profile_cprofile",
+                  on_change=_apply_profile_settings, disabled=not enabled,
+                  help="함수별 시간 + collapsed stack (실행이 2배 정도 느려짐)")
+    
+    with col3:
+        if st.button("🔄 기록 초기화", key="clear_rerun_profile"):
+            rerun_profiler.clear_profiles()
+            st.rerun()
+    
+    worst = rerun_profiler.get_worst_reruns()
+    if worst.empty:
+        st.info("기록된 재실행이 없습니다. 프로파일링을 켠 뒤 화면을 조작하면 기록됩니다.")
+    else:
+        st.markdown("**가장 느린 재실행**")
+        st.dataframe(
+            worst.rename(columns={'at': '시각', 'root': '실행', 'trigger': '트리거 위젯',
+                                  'ms': '시간(ms)', 'slowest': '가장 느린 구간'}),
+            use_container_width=True, hide_index=True
+        )
+        
+        with st.expander("📊 탭/패널별 누적 시간", expanded=False):
+            st.dataframe(
+                rerun_profiler.get_span_totals().rename(columns={
+                    'label': '구간', 'count': '횟수', 'total_ms': '총 시간(ms)', 'mean_ms': '평균(ms)', 'max_ms': '최대(ms)'
+                }),
+                use_container_width=True, hide_index=True
+            )
+    
+    functions = rerun_profiler.get_function_stats()
+    if not functions.empty:
+        with st.expander("🔬 함수별 시간 (cProfile)", expanded=False):
+            st.dataframe(
+                functions.rename(columns={'function': '함수', 'calls': '호출 수',
+                                          'tottime_ms': '자체 시간(ms)', 'cumtime_ms': '누적 시간(ms)'}),
+                use_container_width=True, hide_index=True
+            )
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button("📥 collapsed stack 다운로드", rerun_profiler.get_collapsed_stacks(),
+                                   file_name="reruns.folded", key="download_collapsed_stacks")
+            with col2:
+                if st.button("💾 파일로 저장", key="write_collapsed_stacks"):
+                    st.success(f"저장됨: {rerun_profiler.write_collapsed_stacks()} (flamegraph.pl / speedscope)")
+    
+    st.divider()
+    
+    # === 9. 메트릭 ===
+    st.markdown("### 📡 메트릭")
+    
+    endpoint = metrics.get_endpoint()
+    st.caption(
+        f"Prometheus 수집 주소: {endpoint}" if endpoint
+        else "HTTP endpoint가 꺼져 있습니다 (METRICS_PORT=0 또는 포트 사용 중). 이 프로세스의 값만 표시합니다."
+    )
+    
+    snapshot = pd.DataFrame(metrics.get_snapshot())
+    if snapshot.empty:
+        st.info("아직 기록된 메트릭이 없습니다.")
+    else:
+        lookups = snapshot[snapshot['metric'] == 'control_chart_cache_lookups_total']
+        if not lookups.empty:
+            lookups = lookups.assign(
+                cache=lookups['labels'].str.extract(r'cache=([^,]+)', expand=False),
+                result=lookups['labels'].str.extract(r'result=(\w+)', expand=False),
+            ).pivot_table(index='cache', columns='result', values='value', aggfunc='sum', fill_value=0)
+            cache_cols = st.columns(len(lookups))
+            for col, (cache, row) in zip(cache_cols, lookups.iterrows()):
+                hits, misses = row.get('hit', 0), row.get('miss', 0)
+                col.metric(f"캐시 적중률 ({cache})", f"{hits / (hits + misses):.0%}", f"{int(hits + misses):,}회 조회",
+                           delta_color="off")
+        
+        st.dataframe(
+            snapshot.round({'value': 3, 'mean': 4, 'p50': 4, 'p95': 4}).rename(columns={
+                'metric': '메트릭', 'labels': '라벨', 'type': '유형', 'value': '값(합계)',
+                'count': '건수', 'mean': '평균(초)', 'p50': 'p50(초)', 'p95': 'p95(초)'
+            }),
+            use_container_width=True, hide_index=True
+        )
+    
+    st.divider()
+    
+    # === 10. SQL 실행 통계 ===
+    st.markdown("### 🐢 SQL 실행 통계")
+    
+    if not sql_trace.TRACE_ENABLED:
+        st.info("SQL 기록이 꺼져 있습니다 (환경 변수 SQL_TRACE=0).")
+        return
+    
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        st.caption(
+            f"이 프로세스의 최근 {sql_trace.get_trace_count():,}개 문장 기준 (최대 {sql_trace.TRACE_BUFFER_SIZE:,}개) · "
+            f"느린 쿼리 기준 {sql_trace.SLOW_QUERY_MS:,.0f} ms · 시간은 execute + fetch"
+        )
+    
+    with col2:
+        if st.button("🔄 통계 초기화", key="clear_sql_trace"):
+            sql_trace.clear_trace()
+            st.rerun()
+    
+    stat_columns = {
+        'fingerprint': '문장', 'calls': '호출 수', 'total_ms': '총 시간(ms)', 'mean_ms': '평균(ms)',
+        'p95_ms': 'p95(ms)', 'max_ms': '최대(ms)', 'rows': '행 수', 'callers': '호출 함수'
+    }
+    
+    st.markdown("**총 시간 상위**")
+    st.dataframe(sql_trace.get_statement_stats('total_ms', limit=10).rename(columns=stat_columns),
+                 use_container_width=True, hide_index=True)
+    
+    st.markdown("**p95 상위**")
+    st.dataframe(sql_trace.get_statement_stats('p95_ms', limit=10).rename(columns=stat_columns),
+                 use_container_width=True, hide_index=True)
+    
+    slow = sql_trace.get_slow_queries()
+    with st.expander(f"🐢 느린 쿼리 로그 ({len(slow):,}건)", expanded=False):
+        if slow.empty:
+            st.success(f"✅ {sql_trace.SLOW_QUERY_MS:,.0f} ms 이상 걸린 문장이 없습니다.")
+        else:
+            st.dataframe(
+                slow.rename(columns={'at': '시각', 'ms': '시간(ms)', 'rows': '행 수', 'caller': '호출 함수', 'sql': 'SQL'}),
+                use_container_width=True, hide_index=True
+            )
+
+
+ADMIN_PANELS = ["📋 승인 대기", "📊 월별 출하 현황", "🗄️ 전체 데이터 조회", "🔧 데이터 관리"]
+
+
+@st.fragment
+def _render_admin_panel(panel):
+    """선택한 관리자 패널 렌더링 (fragment: 패널 안의 위젯 조작 시 이 패널만 다시 실행)"""
+    # Import modular tab renderers (선택한 패널 모듈만 import)
+    import tabs
+    
+    with render_timer(panel):
+        if panel == ADMIN_PANELS[0]:
+            tabs.render_approval_queue_tab()
+        elif panel == ADMIN_PANELS[1]:
+            tabs.render_monthly_dashboard_tab()
+        elif panel == ADMIN_PANELS[2]:
+            render_data_explorer()
+        else:
+            render_data_maintenance()
 
 
 def render_admin_tab():
@@ -850,101 +1104,120 @@ def render_admin_tab():
     if not render_admin_login():
         return
     
-    # Import modular tab renderers
-    from tabs.monthly_dashboard_tab import render_monthly_dashboard_tab
-    from tabs.approval_queue_tab import render_approval_queue_tab
+    # 4개 패널로 분리 (st.tabs는 보이지 않는 탭도 매번 실행하므로 선택한 패널만 렌더링)
+    panel = st.radio("관리자 메뉴", ADMIN_PANELS, horizontal=True,
+                     key='admin_panel', label_visibility="collapsed")
+    _render_admin_panel(panel)
+
+
+
+@timed_fragment("사이드바 필터")
+def render_sidebar_filters():
+    """
+    사이드바 Control Chart 필터 (fragment: 필터 조작 시 사이드바만 다시 실행)
+    
+    선택값은 session_state(sidebar_*)에 저장되며 '분석 시작'(run_analysis)에서 사용합니다.
+    """
+    st.header("🔍 Control Chart 필터")
     
-    # 4개 탭으로 분리
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "📋 승인 대기",
-        "📊 월별 출하 현황",
-        "🗄️ 전체 데이터 조회",
-        "🔧 데이터 관리"
-    ])
+    # 필터 옵션은 카탈로그(승인 데이터의 R/I·모델·항목별 건수)에서 조회하며,
+    # 앞에서 선택한 조건으로 좁혀 결과가 있는 옵션만 표시합니다.
+    # 1. R/I (Research/Industrial)
+    ri_counts = db.get_filter_options('ri')
+    sel_ris = st.multiselect("R/I", list(ri_counts), format_func=lambda v: f"{v} ({ri_counts[v]:,})",
+                             key='sidebar_ris')
     
-    with tab1:
-        render_approval_queue_tab()
+    # 2. Model (Filtered by R/I)
+    model_counts = db.get_filter_options('model', ris=sel_ris)
+    sel_models = st.multiselect("Model", list(model_counts), format_func=lambda v: f"{v} ({model_counts[v]:,})",
+                                key='sidebar_models')
     
-    with tab2:
-        render_monthly_dashboard_tab()
-        
-    with tab3:
-        render_data_explorer()
+    # 3. Check Items (Filtered by R/I, Model)
+    item_counts = db.get_filter_options('check_item', ris=sel_ris, models=sel_models)
+    st.multiselect("Check Items", list(item_counts), help="최대 2개 권장",
+                   format_func=lambda v: f"{v} ({item_counts[v]:,})", key='sidebar_items')
     
-    with tab4:
-        render_data_maintenance()
+    # 4. Date Range
+    if st.checkbox("날짜 범위 적용", key='sidebar_use_date'):
+        st.date_input("시작일", value=date(2024, 1, 1), key='sidebar_date_start')
+        st.date_input("종료일", value=date.today(), key='sidebar_date_end')
 
 
+def run_analysis():
+    """사이드바 필터 조건으로 데이터 조회 ('분석 시작')"""
+    state = st.session_state
+    state.analysis_triggered = True
+    filters = {}
+    # Order doesn't matter for dict, but logical flow is preserved
+    if state.get('sidebar_ris'): filters['ri'] = state.sidebar_ris
+    if state.get('sidebar_models'): filters['model'] = state.sidebar_models
+    if state.get('sidebar_items'): filters['check_item'] = state.sidebar_items
+    if state.get('sidebar_use_date'): filters['date_range'] = [state.sidebar_date_start, state.sidebar_date_end]
+    
+    with st.spinner("데이터 조회 및 분석 중..."):
+        df = db.fetch_filtered_data(filters)
+        if not df.empty:
+            df = add_date_columns(df)
+        state.filtered_data = df
+    
+    # 자주 쓰는 (모델, 항목) 조합은 다음 프로세스 시작 시 미리 조회
+    db.log_analysis_usage(filters)
 
-def main():
-    # Import modular tab renderers
-    from tabs import (
-        render_guide_tab, 
-        render_upload_tab, 
-        render_equipment_explorer_tab,
-        render_quality_analysis_tab
-    )
+
+def render_warmup_status():
+    """캐시 예열 상태 (준비 중이면 첫 조회가 느릴 수 있음)"""
+    status = warmup.get_warmup_status()
+    if status['status'] == 'running':
+        st.caption(f"⏳ 캐시 준비 중... ({len(status['steps'])}/{status['total_steps']})")
+    elif status['status'] == 'ready':
+        st.caption(f"✅ 캐시 준비 완료 ({status['seconds']:.1f}초)")
+    elif status['status'] == 'failed':
+        failed = ', '.join(name for name, _, error in status['steps'] if error)
+        st.caption(f"⚠️ 캐시 일부 준비 실패: {failed}")
+
+
+MAIN_TABS = ["📊 장비 현황", "📈 Control Chart", "📤 데이터 업로드", "🔒 관리자", "📖 사용 가이드"]
+
+
+@st.fragment
+def _render_main_tab(tab):
+    """선택한 메인 탭 렌더링 (fragment: 탭 안의 위젯 조작 시 이 탭만 다시 실행)"""
+    # Import modular tab renderers (tabs 패키지는 선택한 탭 모듈만 import)
+    import tabs
     
+    with render_timer(tab):
+        if tab == MAIN_TABS[0]:
+            tabs.render_equipment_explorer_tab()
+        elif tab == MAIN_TABS[1]:
+            tabs.render_quality_analysis_tab()
+        elif tab == MAIN_TABS[2]:
+            tabs.render_upload_tab(
+                extract_func=extract_equipment_info_from_last_sheet,
+                insert_func=db.insert_equipment_from_excel,
+                equipment_options=EQUIPMENT_OPTIONS,
+                industrial_models=model_registry.industrial_models(),
+                log_history_func=db.log_approval_history
+            )
+        elif tab == MAIN_TABS[3]:
+            render_admin_tab()
+        else:
+            tabs.render_guide_tab()
+
+
+@rerun_profiler.profiled("main")
+def main():
+    begin_run()
     st.title("Control Chart Viewer v1.0")
     
     # Sidebar (Analysis Filters)
     with st.sidebar:
-        st.header("🔍 Control Chart 필터")
-        
-        # 1. R/I (Research/Industrial)
-        ris = db.get_unique_values('ri')
-        sel_ris = st.multiselect("R/I", ris)
-        
-        # 2. Model (Filtered by R/I)
-        all_models = db.get_unique_values('model')
-        filtered_models = all_models
-        
-        if sel_ris:
-            filtered_models = []
-            # If 'Research' or 'R' is selected
-            if 'Research' in sel_ris or 'R' in sel_ris:
-                filtered_models.extend([m for m in all_models if m in RESEARCH_MODELS])
-            # If 'Industrial' or 'I' is selected
-            if 'Industrial' in sel_ris or 'I' in sel_ris:
-                filtered_models.extend([m for m in all_models if m in INDUSTRIAL_MODELS])
-            
-            # If user selected something else (e.g. empty string or unclassified), include them?
-            # For now, just stick to the known lists.
-            # Remove duplicates and sort
-            filtered_models = sorted(list(set(filtered_models)))
-            
-            # If filtered list is empty (e.g. only 'R' selected but no R models in DB), show empty or all?
-            # Better to show what matches.
-            
-        sel_models = st.multiselect("Model", filtered_models)
-        
-        # 3. Check Items
-        items = db.get_unique_values('check_item')
-        sel_items = st.multiselect("Check Items", items, help="최대 2개 권장")
+        render_sidebar_filters()
         
-        # 4. Date Range
-        use_date = st.checkbox("날짜 범위 적용")
-        date_range = []
-        if use_date:
-            d_start = st.date_input("시작일", value=date(2024, 1, 1))
-            d_end = st.date_input("종료일", value=date.today())
-            date_range = [d_start, d_end]
-            
+        # 버튼은 fragment 밖에 두어 누르면 앱 전체(분석 탭 포함)가 다시 실행됨
         st.markdown("---")
-        if st.button("분석 시작", type="primary", use_container_width=True):
-            st.session_state.analysis_triggered = True
-            filters = {}
-            # Order doesn't matter for dict, but logical flow is preserved
-            if sel_ris: filters['ri'] = sel_ris
-            if sel_models: filters['model'] = sel_models
-            if sel_items: filters['check_item'] = sel_items
-            if use_date: filters['date_range'] = date_range
-            
-            with st.spinner("데이터 조회 및 분석 중..."):
-                df = db.fetch_filtered_data(filters)
-                if not df.empty:
-                    df = add_date_columns(df)
-                st.session_state.filtered_data = df
+        if st.button("분석 시작", type="primary", use_container_width=True, key="start_analysis"):
+            run_analysis()
+        render_warmup_status()
 
         # Developer Info
         st.markdown("---")
@@ -956,31 +1229,12 @@ def main():
         - **Email**: [levi.beak@parksystems.com](mailto:levi.beak@parksystems.com)
         """)
 
-    # Main Tabs
-    tab_explorer, tab_analysis, tab_data, tab_admin, tab_guide = st.tabs([
-        "📊 장비 현황", "📈 Control Chart", "� 데이터 업로드", "🔒 관리자", "📖 사용 가이드"
-    ])
-    
-    with tab_explorer:
-        render_equipment_explorer_tab()
-        
-    with tab_analysis:
-        render_quality_analysis_tab()
-        
-    with tab_data:
-        render_upload_tab(
-            extract_func=extract_equipment_info_from_last_sheet,
-            insert_func=db.insert_equipment_from_excel,
-            equipment_options=EQUIPMENT_OPTIONS,
-            industrial_models=INDUSTRIAL_MODELS,
-            log_history_func=db.log_approval_history
-        )
+    # Main Tabs (st.tabs는 보이지 않는 탭도 매번 실행하므로 선택한 탭만 렌더링)
+    tab = st.radio("메뉴", MAIN_TABS, horizontal=True, key='main_tab', label_visibility="collapsed")
+    _render_main_tab(tab)
     
-    with tab_admin:
-        render_admin_tab()
-
-    with tab_guide:
-        render_guide_tab()
+    with st.sidebar:
+        render_timing_summary()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,126 @@
+"""
+Import Time Benchmark
+앱 시작(cold start) import 시간 측정 (python -X importtime 요약)
+
+시나리오마다 새 프로세스에서 -X importtime으로 import하고, 전체 import 시간과
+가장 무거운 최상위 import, 지연 로드 대상(scipy, plotly.express, 탭 모듈)의 로드 여부를 출력합니다.
+
+시나리오:
+    streamlit      streamlit만 (비교 기준)
+    startup        app.py 최상위 import (첫 화면 전)
+    explorer       startup + 기본 탭(장비 현황) 렌더링에 필요한 import
+    control_chart  startup + Control Chart 분석 탭 (SPEC 분석 포함)
+
+사용법:
+    python benchmarks/bench_import_time.py [--scenario startup] [--repeat 3] [--top 10]
+"""
+import argparse
+import ast
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 첫 화면 전에는 로드되지 않아야 하는 모듈
+WATCHED_MODULES = ['scipy.stats', 'plotly.express', 'openpyxl',
+                   'tabs.equipment_explorer_tab', 'tabs.quality_analysis_tab',
+                   'tabs.approval_queue_tab', 'tabs.monthly_dashboard_tab', 'tabs.data_upload_tab']
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def app_import_statements() -> str:
+    """app.py의 최상위 import 문 (app.py를 실행하지 않고 import만 재현)"""
+    with open(os.path.join(ROOT, 'app.py'), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return '\n'.join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def build_scenarios() -> Dict[str, str]:
+    # 지연 로드(importlib)는 -X importtime에 잡히지 않으므로 화면에서 실제로 로드되는 모듈을 import 문으로 재현
+    startup = app_import_statements()
+    return {
+        'streamlit': 'import streamlit',
+        'startup': startup,
+        'explorer': startup + '\n'
+                    'import tabs.equipment_explorer_tab\n'
+                    'import plotly.express',
+        'control_chart': startup + '\n'
+                         'import tabs.quality_analysis_tab\n'
+                         'import modules.spec_analysis, modules.equipment_tab_renderer\n'
+                         'import plotly.express, scipy.stats',
+    }
+
+
+# ============================================================
+# importtime 실행 / 파싱
+# ============================================================
+
+def run_importtime(code: str) -> Tuple[List[Tuple[int, int, int, str]], set]:
+    """새 프로세스에서 code 실행 -> ([(self_us, cumulative_us, depth, module)], 로드된 모듈 이름)"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    # 끝에 sys.modules를 출력해 실제로 로드된 모듈 확인
+    code += "\nimport sys\nprint('\\n'.join(sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            rows.append((int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2, m.group(4)))
+    return rows, set(proc.stdout.split())
+
+
+def summarize(rows: List[Tuple[int, int, int, str]], loaded: set, top: int) -> Dict:
+    """전체 import 시간, 최상위 import별 누적 시간 상위 N개, 감시 모듈 로드 여부"""
+    min_depth = min(depth for _, _, depth, _ in rows)
+    top_level = sorted(
+        ((cum, name) for _, cum, depth, name in rows if depth == min_depth),
+        reverse=True
+    )[:top]
+    return {
+        'total_ms': sum(own for own, _, _, _ in rows) / 1000,
+        'modules': len(rows),
+        'top': [(name, cum / 1000) for cum, name in top_level],
+        'watched': {name: name in loaded for name in WATCHED_MODULES},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenario', action='append', help='측정할 시나리오 (여러 번 지정 가능, 기본: 전체)')
+    parser.add_argument('--repeat', type=int, default=3, help='시나리오별 반복 횟수 (최소값 사용)')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    scenarios = build_scenarios()
+    names = args.scenario or list(scenarios)
+
+    results = {}
+    for name in names:
+        # 첫 실행은 .pyc 생성 시간이 섞일 수 있으므로 반복 중 최소값
+        runs = [summarize(*run_importtime(scenarios[name]), args.top) for _ in range(max(args.repeat, 1))]
+        results[name] = min(runs, key=lambda r: r['total_ms'])
+
+    print(f"{'scenario':<16}{'import (ms)':>13}{'modules':>9}")
+    for name, r in results.items():
+        print(f"{name:<16}{r['total_ms']:>13.1f}{r['modules']:>9,}")
+
+    for name, r in results.items():
+        print(f"\n[{name}] top-level imports (cumulative ms)")
+        for module, ms in r['top']:
+            print(f"  {ms:>9.1f}  {module}")
+        lazy = [module for module, is_loaded in r['watched'].items() if is_loaded]
+        print(f"  loaded heavy/tab modules: {', '.join(lazy) if lazy else '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Text Cleaning Benchmark
+clean_data / normalize_check_items_column / build_display_map 성능 측정
+
+기존(셀 단위 apply) 구현과 현재 벡터화 구현을 같은 데이터로 비교하고 결과 일치 여부를 확인합니다.
+
+사용법:
+    python benchmarks/bench_text_cleaning.py [--rows 1000000] [--items 300]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from unicodedata import normalize as unicode_normalize
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import utils  # noqa: E402
+
+
+# ============================================================
+# Legacy implementations (비교 기준)
+# ============================================================
+
+def legacy_normalize_key(text):
+    if not text or not isinstance(text, str):
+        return ""
+    s = unicode_normalize('NFKC', text.strip())
+    return re.sub(r'\s+', ' ', s).upper()
+
+
+def legacy_clean_data(df):
+    def clean(s):
+        return re.sub(r'[^\d\.\-]', '', s)
+
+    def is_valid_numeric(val):
+        if pd.isna(val) or val == '':
+            return False
+        try:
+            float(clean(str(val)))
+            return True
+        except ValueError:
+            return False
+
+    mask = df['Value'].apply(is_valid_numeric)
+    out = df[mask].copy()
+    out['Value'] = out['Value'].apply(lambda x: float(clean(str(x))))
+    return out
+
+
+def legacy_normalize_check_items(df):
+    def normalize_text(text):
+        if not isinstance(text, str) or not text:
+            return text
+        return re.sub(r'\s+', ' ', text.strip())
+
+    df['Check Items'] = df['Check Items'].apply(normalize_text)
+    return df
+
+
+def legacy_display_map(df, column):
+    key_to_display = {}
+    for val in df[column].dropna():
+        raw = str(val)
+        if raw.strip():
+            key_to_display.setdefault(legacy_normalize_key(raw), raw)
+    return sorted(key_to_display.values()), key_to_display
+
+
+# ============================================================
+# Data
+# ============================================================
+
+def make_checklist_rows(rows: int, items: int, seed: int = 0) -> pd.DataFrame:
+    """체크리스트 형태의 합성 데이터 (항목명 반복, 숫자/단위 포함 문자열/Pass/빈 값 혼합)"""
+    rng = np.random.default_rng(seed)
+
+    names = [f"Module {i % 12} Check  Item {i}" for i in range(items)]
+    # 같은 항목의 공백/전각 변형
+    names += [f" {n} " for n in names[: items // 4]]
+    names += [n.replace('Item', 'Ｉｔｅｍ') for n in names[: items // 10]]
+    check_items = np.array(names, dtype=object)[rng.integers(0, len(names), rows)]
+
+    numbers = rng.normal(10.0, 2.0, rows).round(4)
+    kind = rng.random(rows)
+    values = numbers.astype(object)
+    text = kind < 0.35
+    values[text] = [f"{v} nm" for v in numbers[text]]
+    values[(kind >= 0.35) & (kind < 0.40)] = 'Pass'
+    values[(kind >= 0.40) & (kind < 0.42)] = ''
+    values[(kind >= 0.42) & (kind < 0.44)] = None
+    values[(kind >= 0.44) & (kind < 0.45)] = True
+
+    return pd.DataFrame({'Check Items': check_items, 'Value': values})
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--items', type=int, default=300)
+    args = parser.parse_args()
+
+    df = make_checklist_rows(args.rows, args.items)
+    print(f"rows={len(df):,}  unique check items={df['Check Items'].nunique():,}")
+    print(f"{'step':<30}{'legacy (s)':>12}{'current (s)':>13}{'speedup':>10}  match")
+
+    cases = [
+        ('clean_data', legacy_clean_data, utils.clean_data,
+         lambda a, b: a.index.equals(b.index) and np.allclose(a['Value'].astype(float), b['Value'])),
+        ('normalize_check_items_column', legacy_normalize_check_items, utils.normalize_check_items_column,
+         lambda a, b: a['Check Items'].equals(b['Check Items'])),
+        ('build_display_map', lambda d: legacy_display_map(d, 'Check Items'),
+         lambda d: utils.build_display_map(d, 'Check Items'),
+         lambda a, b: a == b),
+    ]
+    for name, legacy, current, same in cases:
+        expected, t_legacy = _timed(legacy, df.copy())
+        utils._normalize_key_cached.cache_clear()
+        actual, t_current = _timed(current, df.copy())
+        print(f"{name:<30}{t_legacy:>12.3f}{t_current:>13.3f}{t_legacy / t_current:>9.1f}x  {same(expected, actual)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,404 @@
+"""
+Concurrent Session Load Test
+여러 사용자가 동시에 앱을 사용할 때의 재실행 지연 / SQLite 쓰기 대기 / 세션별 메모리 측정
+
+streamlit.testing.v1.AppTest로 app.py를 화면 없이 실행하고, 세션마다 실제 사용 순서대로 조작합니다.
+
+    open         첫 화면 (장비 현황)
+    filter_*     사이드바 R/I -> Model -> Check Items (-> 날짜 범위) 선택
+    chart_tab    Control Chart 탭으로 이동
+    analyze      '분석 시작' (기본: 모든 세션이 동시에 누름)
+    trend_group / spec_item / stat_group   Trend / SPEC 분석 / 통계 요약 하위 탭 조작
+    (--rounds만큼 필터 -> 분석 -> 하위 탭 반복)
+    admin_tab -> login -> approve          --admin-ratio 비율의 세션만, 승인 대기 장비 1건 승인
+
+세션은 각각 별도 프로세스에서 실행합니다 (AppTest는 실행 중 Runtime 인스턴스/설정 같은 프로세스
+전역 상태를 바꾸므로 한 프로세스에서 여러 세션을 동시에 돌릴 수 없음). 따라서 DB 연결/SQLite 잠금은
+실제 서버와 같이 경쟁하지만, 프로세스 캐시(필터 결과/규격 맵)는 세션끼리 공유되지 않습니다.
+
+보고:
+    재실행 지연   단계별 / 전체 p50, p95, p99 (AppTest 실행 = 스크립트 재실행 + 요소 트리 구성)
+    SQLite 쓰기   쓰기 문장(INSERT/UPDATE/DELETE/COMMIT) 시간 합계/최대, 'database is locked' 오류 수
+                  - 쓰기 잠금은 첫 쓰기 문장에서 기다리므로 동시 실행 시 잠금 대기가 포함됩니다.
+                    --sessions 1 결과와 비교하면 대기 시간을 알 수 있습니다.
+    메모리        세션(프로세스)별 첫 화면 후 RSS, 종료 RSS, 증가량, 최대 RSS, session_state 크기
+
+DB는 run_benchmarks.py와 같은 규모별 합성 DB(data/synthetic/bench/)의 복사본을 사용합니다 (--db로 지정 가능).
+
+사용법:
+    python benchmarks/load_test.py --sessions 10                         # small DB, 10명 동시
+    python benchmarks/load_test.py --scale medium --sessions 20 --rounds 3 --output load.json
+    python benchmarks/load_test.py --sessions 10 --no-sync --think 2     # 동시 클릭 대신 2초 이내 무작위 간격
+    python benchmarks/load_test.py --db data/control_chart_copy.db --sessions 5
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import database as db  # noqa: E402
+from modules import sql_trace  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_FILE = os.path.join(ROOT, 'app.py')
+MAIN_TABS = ["📊 장비 현황", "📈 Control Chart", "📤 데이터 업로드", "🔒 관리자", "📖 사용 가이드"]
+GROUP_OPTIONS = ['None', '연도', '분기', '월']
+STEP_ORDER = ['open', 'filter_ri', 'filter_model', 'filter_items', 'filter_date', 'chart_tab', 'analyze',
+              'trend_group', 'spec_item', 'stat_group', 'admin_tab', 'login', 'select_sid', 'approve']
+DEFAULT_ADMIN_PASSWORD = 'admin123'   # modules/auth.py 기본값 (ADMIN_PASSWORD 환경 변수 우선)
+
+
+# ============================================================
+# Memory
+# ============================================================
+
+def _rss_mb() -> Optional[float]:
+    """현재 RSS (Linux /proc, 없으면 None)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """최대 RSS (Unix resource, Windows는 None)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def _state_mb(at) -> float:
+    """session_state 크기 (DataFrame은 deep memory_usage, 나머지는 shallow getsizeof)"""
+    total = 0
+    for value in at.session_state.filtered_state.values():
+        if isinstance(value, pd.DataFrame):
+            total += int(value.memory_usage(deep=True).sum())
+        else:
+            total += sys.getsizeof(value)
+    return total / 1024 / 1024
+
+
+# ============================================================
+# Session (worker process)
+# ============================================================
+
+def _weighted_sample(rng: random.Random, counts: Dict[str, int], k: int) -> List[str]:
+    """건수 비중으로 k개 선택 (자주 쓰는 모델/항목이 더 자주 선택됨)"""
+    options = list(counts)
+    weights = [max(counts[option], 1) for option in options]
+    picked = []
+    while options and len(picked) < k:
+        choice = rng.choices(range(len(options)), weights=weights)[0]
+        picked.append(options.pop(choice))
+        weights.pop(choice)
+    return picked
+
+
+class Session:
+    """AppTest 세션 1개 + 단계별 재실행 시간 기록"""
+
+    def __init__(self, session_id: int, args, barrier):
+        from streamlit.testing.v1 import AppTest
+
+        self.session_id = session_id
+        self.args = args
+        self.barrier = barrier
+        self.rng = random.Random(args.seed * 1000 + session_id)
+        self.at = AppTest.from_file(APP_FILE, default_timeout=args.timeout)
+        self.steps = []     # (step, seconds, errors)
+        self.errors = []
+
+    def _sync(self):
+        """모든 세션이 이 지점에 올 때까지 대기 (동시 클릭), 다른 세션이 실패하면 동기화 없이 진행"""
+        if self.barrier is None:
+            return
+        try:
+            self.barrier.wait(timeout=self.args.timeout)
+        except threading.BrokenBarrierError:
+            self.barrier = None
+
+    def step(self, name: str, action, sync: bool = False):
+        if sync and not self.args.no_sync:
+            self._sync()
+        elif self.args.think:
+            time.sleep(self.rng.uniform(0, self.args.think))
+        start = time.perf_counter()
+        action()
+        seconds = time.perf_counter() - start
+        errors = [e.message for e in self.at.exception]
+        self.steps.append((name, seconds, len(errors)))
+        self.errors.extend(f"{name}: {message.splitlines()[0] if message else ''}" for message in errors)
+
+    def _widget(self, kind: str, key: str):
+        widgets = [w for w in getattr(self.at, kind) if w.key == key]
+        return widgets[0] if widgets else None
+
+    def analysis_round(self, use_date: bool):
+        at, rng = self.at, self.rng
+        ri_counts = db.get_filter_options('ri')
+        ris = _weighted_sample(rng, ri_counts, 1)
+        self.step('filter_ri', lambda: at.multiselect(key='sidebar_ris').set_value(ris).run())
+
+        model_counts = db.get_filter_options('model', ris=ris)
+        models = _weighted_sample(rng, model_counts, 1)
+        self.step('filter_model', lambda: at.multiselect(key='sidebar_models').set_value(models).run())
+
+        item_counts = db.get_filter_options('check_item', ris=ris, models=models)
+        items = _weighted_sample(rng, item_counts, rng.choice([1, 2]))
+        self.step('filter_items', lambda: at.multiselect(key='sidebar_items').set_value(items).run())
+
+        date_box = self._widget('checkbox', 'sidebar_use_date')
+        if date_box is not None and date_box.value != use_date:
+            self.step('filter_date', lambda: date_box.set_value(use_date).run())
+
+        if at.radio(key='main_tab').value != MAIN_TABS[1]:
+            self.step('chart_tab', lambda: at.radio(key='main_tab').set_value(MAIN_TABS[1]).run())
+
+        self.step('analyze', lambda: at.button(key='start_analysis').click().run(), sync=True)
+
+        # 하위 탭 조작 (분석 결과가 있을 때만 위젯이 있음)
+        group = self._widget('selectbox', 'combined_group')
+        if group is not None:
+            self.step('trend_group', lambda: group.set_value(rng.choice(GROUP_OPTIONS[1:])).run())
+        spec_item = self._widget('selectbox', 'spec_analysis_item')
+        if spec_item is not None and len(spec_item.options) > 1:
+            others = [o for o in spec_item.options if o != spec_item.value]
+            self.step('spec_item', lambda: spec_item.set_value(rng.choice(others)).run())
+        stat_group = self._widget('selectbox', 'stat_group')
+        if stat_group is not None:
+            self.step('stat_group', lambda: stat_group.set_value(rng.choice(GROUP_OPTIONS[1:])).run())
+
+    def approve(self):
+        at = self.at
+        password = os.environ.get('ADMIN_PASSWORD', DEFAULT_ADMIN_PASSWORD)
+        self.step('admin_tab', lambda: at.radio(key='main_tab').set_value(MAIN_TABS[3]).run())
+        self.step('login', lambda: at.text_input(key='password').input(password).run())
+
+        # 관리자끼리 같은 장비를 고르지 않도록 세션 번호로 선택
+        queue_box = self._widget('selectbox', 'selected_sid_label_queue')
+        if queue_box is None:
+            return
+        label = queue_box.options[self.session_id % len(queue_box.options)]
+        if label != queue_box.value:
+            self.step('select_sid', lambda: queue_box.set_value(label).run())
+        buttons = [b for b in at.button if b.key and b.key.startswith('approve_')]
+        if buttons:
+            self.step('approve', lambda: buttons[0].click().run())
+
+    def run(self) -> Dict[str, Any]:
+        self.step('open', lambda: self.at.run(), sync=True)
+        rss_open = _rss_mb()
+        for round_no in range(self.args.rounds):
+            self.analysis_round(use_date=self.rng.random() < self.args.date_ratio)
+        if self.session_id < round(self.args.sessions * self.args.admin_ratio):
+            self.approve()
+        rss_end = _rss_mb()
+        return {
+            'session': self.session_id, 'steps': self.steps, 'errors': self.errors,
+            'rss_open_mb': rss_open, 'rss_end_mb': rss_end,
+            'rss_growth_mb': rss_end - rss_open if rss_open is not None and rss_end is not None else None,
+            'peak_rss_mb': _peak_rss_mb(), 'state_mb': _state_mb(self.at),
+            'sqlite_writes': sql_trace.get_write_stats(),
+        }
+
+
+def _session_worker(session_id: int, args, barrier, results):
+    from streamlit import config, logger
+
+    # 화면 없이 실행할 때의 streamlit 경고(ScriptRunContext, 사용 중단 안내)와 느린 쿼리 경고는
+    # 결과 출력과 섞이지 않도록 숨김 (AppTest가 실행마다 logger.level 설정으로 로그 수준을 다시 맞춤)
+    config.set_option('logger.level', 'error')
+    logger.set_log_level('error')
+    logging.getLogger('modules.sql_trace').setLevel(logging.ERROR)
+    db.DB_FILE = args.db
+    sql_trace.clear_trace()
+    try:
+        result = Session(session_id, args, barrier).run()
+    except Exception:
+        if barrier is not None:
+            barrier.abort()
+        result = {'session': session_id, 'failed': traceback.format_exc()}
+    results.put(result)
+
+
+# ============================================================
+# Report
+# ============================================================
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return {'n': 0, 'p50': np.nan, 'p95': np.nan, 'p99': np.nan, 'max': np.nan}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'n': len(values), 'p50': p50, 'p95': p95, 'p99': p99, 'max': values.max()}
+
+
+def summarize(results: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    """
+    세션 결과 집계
+
+    Returns:
+        dict: latency (전체), steps (단계별 DataFrame), sqlite, memory (세션별 DataFrame), failed, errors
+    """
+    ok = [r for r in results if 'failed' not in r]
+    steps = pd.DataFrame([(name, seconds, errors) for r in ok for name, seconds, errors in r['steps']],
+                         columns=['step', 'seconds', 'errors'])
+    order = [name for name in STEP_ORDER if name in set(steps['step'])]
+    step_stats = pd.DataFrame([
+        {'step': name, **_percentiles(group['seconds']), 'errors': int(group['errors'].sum())}
+        for name, group in steps.groupby('step', sort=False)
+    ]).set_index('step').loc[order] if len(steps) else pd.DataFrame()
+
+    writes = pd.DataFrame([r['sqlite_writes'] for r in ok])
+    memory = pd.DataFrame([{key: r[key] for key in ('session', 'rss_open_mb', 'rss_end_mb', 'rss_growth_mb',
+                                                    'peak_rss_mb', 'state_mb')} for r in ok])
+    return {
+        'sessions': len(results), 'wall_seconds': wall_seconds,
+        'latency': _percentiles(steps['seconds']),
+        'steps': step_stats,
+        'sqlite': {
+            'write_statements': int(writes['statements'].sum()) if len(writes) else 0,
+            'write_seconds': float(writes['seconds'].sum()) if len(writes) else 0.0,
+            'write_seconds_per_session_max': float(writes['seconds'].max()) if len(writes) else 0.0,
+            'max_statement_seconds': float(writes['max_seconds'].max()) if len(writes) else 0.0,
+            'locked_errors': int(writes['locked_errors'].sum()) if len(writes) else 0,
+        },
+        'memory': memory,
+        'failed': [r for r in results if 'failed' in r],
+        'errors': [f"#{r['session']} {error}" for r in ok for error in r['errors']],
+    }
+
+
+def _ms(seconds) -> str:
+    return '-' if seconds is None or np.isnan(seconds) else f"{seconds * 1000:,.0f}"
+
+
+def print_report(summary: Dict[str, Any]):
+    latency = summary['latency']
+    print(f"\nsessions {summary['sessions']}, wall {summary['wall_seconds']:.1f}s, reruns {latency['n']}")
+    print(f"rerun latency (ms): p50 {_ms(latency['p50'])}  p95 {_ms(latency['p95'])}  "
+          f"p99 {_ms(latency['p99'])}  max {_ms(latency['max'])}")
+
+    print(f"\n{'step':<14}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>8}")
+    for name, row in summary['steps'].iterrows():
+        print(f"{name:<14}{int(row['n']):>5}{_ms(row['p50']):>10}{_ms(row['p95']):>10}"
+              f"{_ms(row['p99']):>10}{_ms(row['max']):>10}{int(row['errors']):>8}")
+
+    sqlite = summary['sqlite']
+    print(f"\nSQLite writes: {sqlite['write_statements']:,} statements, "
+          f"{sqlite['write_seconds'] * 1000:,.0f} ms total (lock waits included), "
+          f"max per session {sqlite['write_seconds_per_session_max'] * 1000:,.0f} ms, "
+          f"slowest statement {sqlite['max_statement_seconds'] * 1000:,.0f} ms, "
+          f"'database is locked' {sqlite['locked_errors']}")
+
+    memory = summary['memory']
+    if len(memory) and memory['rss_end_mb'].notna().any():
+        print("memory per session (MB): "
+              f"RSS after open {memory['rss_open_mb'].mean():,.0f}, end {memory['rss_end_mb'].mean():,.0f} "
+              f"(growth mean {memory['rss_growth_mb'].mean():,.1f} / max {memory['rss_growth_mb'].max():,.1f}), "
+              f"peak max {memory['peak_rss_mb'].max():,.0f}, session_state mean {memory['state_mb'].mean():,.2f}")
+    elif len(memory):
+        print(f"memory per session (MB): session_state mean {memory['state_mb'].mean():,.2f} (RSS unavailable)")
+
+    for failed in summary['failed']:
+        print(f"\nsession #{failed['session']} failed:\n{failed['failed']}")
+    if summary['errors']:
+        print(f"\napp exceptions ({len(summary['errors'])}):")
+        for error in summary['errors'][:20]:
+            print(f"  {error}")
+
+
+def _to_json(summary: Dict[str, Any]) -> Dict[str, Any]:
+    out = dict(summary)
+    out['steps'] = summary['steps'].reset_index().to_dict(orient='records')
+    out['memory'] = summary['memory'].to_dict(orient='records')
+    return out
+
+
+# ============================================================
+# Main
+# ============================================================
+
+def run_load(args) -> List[Dict[str, Any]]:
+    ctx = multiprocessing.get_context()
+    barrier = None if args.no_sync or args.sessions < 2 else ctx.Barrier(args.sessions)
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_session_worker, args=(i, args, barrier, results), daemon=True)
+               for i in range(args.sessions)]
+    for worker in workers:
+        worker.start()
+
+    collected = []
+    while len(collected) < len(workers):
+        try:
+            collected.append(results.get(timeout=5))
+        except queue.Empty:
+            if not any(worker.is_alive() for worker in workers):
+                break
+    for worker in workers:
+        worker.join(timeout=5)
+    done = {r['session'] for r in collected}
+    collected += [{'session': i, 'failed': f'process exited (code {w.exitcode}) without result'}
+                  for i, w in enumerate(workers) if i not in done]
+    return sorted(collected, key=lambda r: r['session'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=10, help='동시 세션 수 (세션마다 프로세스 1개)')
+    parser.add_argument('--rounds', type=int, default=2, help='세션별 필터 -> 분석 -> 하위 탭 반복 횟수')
+    parser.add_argument('--admin-ratio', type=float, default=0.2, help='마지막에 승인까지 하는 세션 비율')
+    parser.add_argument('--date-ratio', type=float, default=0.3, help='날짜 범위를 적용하는 분석 비율')
+    parser.add_argument('--no-sync', action='store_true', help="'분석 시작'을 동시에 누르지 않음")
+    parser.add_argument('--think', type=float, default=0.0, help='단계 사이 무작위 대기 최대 초 (동기화 단계 제외)')
+    parser.add_argument('--scale', default='small', help='합성 DB 규모 (small / medium / large)')
+    parser.add_argument('--db', help='사용할 DB 파일 (지정 시 합성 DB 대신 사용, 승인 단계가 DB를 변경함)')
+    parser.add_argument('--timeout', type=float, default=300, help='AppTest 실행 1회 제한 시간 (초)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    if args.db is None:
+        from run_benchmarks import prepare_scale
+        args.db = prepare_scale(args.scale, run_name='load')['db_file']
+    args.db = os.path.abspath(args.db)
+    # 세션 프로세스마다 /metrics 포트를 열지 않음
+    os.environ['METRICS_PORT'] = '0'
+
+    print(f"db: {args.db}")
+    print(f"{args.sessions} sessions x {args.rounds} rounds "
+          f"({'staggered' if args.no_sync else 'synchronized'} '분석 시작') ...", flush=True)
+    start = time.perf_counter()
+    results = run_load(args)
+    summary = summarize(results, time.perf_counter() - start)
+    print_report(summary)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(_to_json(summary), f, indent=2, ensure_ascii=False, default=float)
+    if summary['failed'] or summary['errors']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
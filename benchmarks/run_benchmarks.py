@@ -0,0 +1,487 @@
+"""
+Benchmark Suite
+수집 / 조회 / SPC / 차트 / 승인 / 체크리스트 파싱 hot path 성능 측정 + 기준값(baseline) 비교
+
+synthetic_data.py로 만든 규모별 DB(small / medium / large)에서 각 항목을 측정하고
+같은 기계에서 잰 기준값과 비교합니다. 허용 범위(--tolerance)보다 느려진 항목이 있으면
+종료 코드 1로 끝납니다.
+
+기준값:
+    --baseline-ref REF   REF(예: main, HEAD~1) 코드를 임시 git worktree에 꺼내 같은 조건으로 먼저 측정하고
+                         그 결과와 비교합니다 (회귀 판정은 이 방식을 사용하세요).
+    --baseline FILE      --save-baseline으로 이 기계에서 저장해 둔 결과와 비교
+                         (기본: data/synthetic/bench/baselines.json, 저장소에 커밋하지 않음)
+절대 시간은 기계/부하에 따라 달라지므로 다른 기계에서 잰 기준값과는 비교하지 않습니다.
+
+항목:
+    ingest.sync_relational_data          Specs/Equipments/Measurements 일괄 저장 (별도 DB 파일)
+    ingest.insert_pending_measurements   체크리스트 1개 분량 승인 대기 측정값 저장
+    query.fetch_filtered_data[...]       대표 필터 조합 (결과 캐시는 매번 비움)
+    spc.detect_rule_of_seven             항목 1개의 전체 장비 시계열
+    spc.detect_trend_violations          〃
+    spc.calculate_process_capability     prepare_spec_data + Cp/Cpk 계산 (SPEC 분석 탭과 같은 순서)
+    chart.create_control_chart           Figure 생성 시간 + json_bytes (Figure JSON 크기)
+    approval.approve_equipment           승인 대기 장비 승인 + 이력 기록
+    excel.parse_checklist                업로드 탭과 같은 방식으로 Last 시트 정보 + 모델 시트 측정값 읽기
+
+측정값 = 항목마다 최대 --repeat회 (--budget초를 넘으면 중단, 최소 1회) 실행한 중앙값.
+생성한 DB/체크리스트는 data/synthetic/bench/에 두고 다음 실행에서 재사용합니다 (--regenerate로 다시 생성).
+승인/업로드 항목은 DB를 바꾸므로 매 실행마다 복사본에서 측정합니다.
+
+--min-delta-ms보다 작은 차이는 측정 잡음으로 보고 회귀로 판정하지 않으며,
+기준값이 100 ms 미만인 항목은 허용 범위를 --small-tolerance 이상으로 넓혀 판정합니다.
+
+사용법:
+    python benchmarks/run_benchmarks.py --baseline-ref main               # main 대비 회귀 확인
+    python benchmarks/run_benchmarks.py --scale small medium large --save-baseline
+    python benchmarks/run_benchmarks.py                                   # 저장한 기준값과 비교
+    python benchmarks/run_benchmarks.py --scale large --repeat 3 --output results.json
+    python benchmarks/run_benchmarks.py --only query. spc. --tolerance 0.5
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import synthetic_data  # noqa: E402
+from modules import database as db  # noqa: E402
+from modules.charts import create_control_chart  # noqa: E402
+from modules.spec_analysis import calculate_process_capability, prepare_spec_data  # noqa: E402
+from modules.utils import add_date_columns, detect_rule_of_seven, detect_trend_violations  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(synthetic_data.OUTPUT_DIR, 'bench')
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baselines.json')   # 기계별 기준값 (git-ignored)
+SEED = 42
+DEFAULT_SCALES = ['small', 'medium']
+DEFAULT_REPEAT = 11
+DEFAULT_TOLERANCE = 0.25      # 기준값 대비 25% 넘게 느려지면 회귀
+DEFAULT_MIN_DELTA_MS = 20.0
+# 기준값이 이보다 짧은 항목은 스케줄링/GC 잡음 비중이 크므로 허용 범위를 넓힘
+SMALL_CASE_SECONDS = 0.1
+DEFAULT_SMALL_TOLERANCE = 0.5
+CHECKLIST_SID = 'BENCH-PENDING-0001'
+
+
+# ============================================================
+# Data (규모별 DB / 체크리스트, 재사용)
+# ============================================================
+
+def _remove_db(db_file: str):
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_file + suffix):
+            os.remove(db_file + suffix)
+
+
+def _reset_caches():
+    """DB 파일을 바꾼 뒤 프로세스 캐시 폐기 (다른 DB의 결과가 남지 않도록)"""
+    global_caches = [(db._filtered_cache_lock, db._filtered_cache), (db._full_cache_lock, db._full_cache)]
+    for lock, cache in global_caches:
+        with lock:
+            cache.clear()
+    db._filtered_cache_version = None
+    db._full_cache_version = None
+    db.invalidate_spec_cache()
+
+
+@contextmanager
+def using_db(db_file: str):
+    previous = db.DB_FILE
+    db.DB_FILE = db_file
+    _reset_caches()
+    try:
+        yield
+    finally:
+        db.DB_FILE = previous
+        _reset_caches()
+
+
+def prepare_scale(scale: str, regenerate: bool = False, run_name: str = 'run') -> Dict[str, Any]:
+    """
+    규모별 측정 데이터 준비
+
+    Args:
+        run_name: 측정용 복사본 이름 ({scale}.{run_name}.db, 다른 도구와 동시에 실행할 때 구분)
+
+    Returns:
+        dict: plan, db_file (측정용 복사본), sync_db_file, checklist (xlsx 경로), counts
+    """
+    n_equipments, n_items = synthetic_data.SCALES[scale]
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    plan = synthetic_data.build_plan(n_equipments, n_items, seed=SEED)
+
+    master = os.path.join(BENCH_DIR, f'{scale}.db')
+    meta_file = master + '.json'
+    params = {'equipments': n_equipments, 'items': n_items, 'seed': SEED}
+    meta = None
+    if os.path.exists(meta_file) and os.path.exists(master):
+        with open(meta_file, encoding='utf-8') as f:
+            meta = json.load(f)
+    if regenerate or meta is None or meta.get('params') != params:
+        print(f"[{scale}] generating {n_equipments:,} x {n_items} DB ...", flush=True)
+        previous = db.DB_FILE
+        counts = synthetic_data.populate_db(plan, master)
+        db.DB_FILE = previous
+        meta = {'params': params, 'counts': counts}
+        with open(meta_file, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+    work = os.path.join(BENCH_DIR, f'{scale}.{run_name}.db')
+    _remove_db(work)
+    for suffix in ('', '-wal'):
+        if os.path.exists(master + suffix):
+            shutil.copyfile(master + suffix, work + suffix)
+
+    checklist_dir = os.path.join(BENCH_DIR, f'{scale}_checklists')
+    checklists = sorted(os.path.join(checklist_dir, name) for name in os.listdir(checklist_dir)
+                        if name.endswith('.xlsx')) if os.path.isdir(checklist_dir) else []
+    if regenerate or not checklists:
+        checklists = synthetic_data.write_checklists(plan, checklist_dir, 1)
+
+    return {'plan': plan, 'db_file': work, 'sync_db_file': os.path.join(BENCH_DIR, f'{scale}.sync.db'),
+            'checklist': checklists[0], 'counts': meta['counts']}
+
+
+# ============================================================
+# Cases
+# ============================================================
+
+def parse_checklist(path: str):
+    """
+    업로드 탭과 같은 순서로 체크리스트 읽기
+
+    Last 시트(장비 정보) -> 모델 이름 시트 -> Trend/Measurement가 모두 있는 행
+    """
+    last = pd.read_excel(path, sheet_name='Last', header=None)
+    column = synthetic_data.LAST_SHEET_COLUMN - 1
+    info = {field: last.iloc[row - 1, column] for field, row in synthetic_data.LAST_SHEET_CELLS.items()}
+    df = pd.read_excel(path, sheet_name=str(info['model']).strip())
+    filtered = df[df['Trend'].notna() & df['Measurement'].notna()]
+    return info, filtered
+
+
+def _filter_sets(plan: Dict[str, Any]) -> Dict[str, Dict[str, List[str]]]:
+    """사이드바에서 자주 쓰는 필터 조합 (가장 많은 모델 / 규격이 있는 항목 기준)"""
+    models = plan['models']
+    top_model = models[int(np.argmax(plan['weights']))]
+    catalog = plan['catalog']
+    items = catalog.loc[catalog['lsl'].notna() | catalog['usl'].notna(), 'name'].tolist()
+    end = plan['end'].date()
+    return {
+        'model+item': {'model': [top_model], 'check_item': items[:1]},
+        'model+5items': {'model': [top_model], 'check_item': items[:5]},
+        'ri+item': {'ri': [plan['categories'][top_model]], 'check_item': items[:1]},
+        'model+90days': {'model': [top_model], 'date_range': [str(end - timedelta(days=90)), str(end)]},
+        'item': {'check_item': items[:1]},
+    }
+
+
+def build_cases(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    측정 항목 목록
+
+    Returns:
+        list of dict: name, run (측정 대상), setup (측정 전 준비, 반환값을 run 인자로 전달),
+                      sizes (마지막 결과 -> 크기 지표 dict, 선택)
+    """
+    plan = data['plan']
+    filter_sets = _filter_sets(plan)
+    cases = []
+
+    # --- ingest ---
+    equipments = plan['equipments']
+    values = synthetic_data.generate_values(plan, equipments, np.random.default_rng([SEED, 0]))
+    df_equip = equipments[list(db.EQUIP_COL_MAP)]
+    df_meas = synthetic_data.measurement_frame(plan, equipments, values)
+    df_specs = synthetic_data.spec_frame(plan)
+
+    def sync():
+        with using_db(data['sync_db_file']):
+            return db.sync_relational_data(df_equip, df_meas, df_specs)
+
+    cases.append({'name': 'ingest.sync_relational_data', 'run': sync})
+
+    df_checklist = synthetic_data.checklist_frame(plan, values[0])
+    cases.append({'name': 'ingest.insert_pending_measurements',
+                  'run': lambda: db.insert_pending_measurements(df_checklist, CHECKLIST_SID, 'Bench Customer')})
+
+    # --- query ---
+    def cold(filters):
+        def setup():
+            _reset_caches()
+            return (filters,)
+        return setup
+
+    for label, filters in filter_sets.items():
+        cases.append({'name': f'query.fetch_filtered_data[{label}]', 'run': db.fetch_filtered_data,
+                      'setup': cold(filters), 'sizes': lambda df: {'rows': len(df)}})
+
+    # --- SPC / chart (항목 1개, 전체 모델: SPEC 분석/Trend 탭과 같은 입력) ---
+    item_df = add_date_columns(db.fetch_filtered_data(filter_sets['item']))
+    item_df = item_df.sort_values('종료일', kind='stable').reset_index(drop=True)
+    series = item_df['Value'].to_numpy(dtype=float)
+    series_mean = float(np.nanmean(series)) if len(series) else 0.0
+
+    cases.append({'name': 'spc.detect_rule_of_seven', 'run': lambda: detect_rule_of_seven(series, series_mean)})
+    cases.append({'name': 'spc.detect_trend_violations', 'run': lambda: detect_trend_violations(series)})
+
+    def capability():
+        spec_data = prepare_spec_data(item_df)
+        return calculate_process_capability(spec_data, spec_data['lsl'], spec_data['usl'])
+
+    cases.append({'name': 'spc.calculate_process_capability', 'run': capability})
+
+    item_name = item_df['Check Items'].iloc[0] if len(item_df) else ''
+    chart_df = item_df.copy()
+    chart_df[item_name] = item_name   # 그룹화 'None' + 단일 항목일 때 Trend 탭과 같은 그룹 컬럼
+
+    cases.append({'name': 'chart.create_control_chart',
+                  'run': lambda: create_control_chart(chart_df, group_col=item_name, equipment_col='장비명'),
+                  'sizes': lambda fig: {'json_bytes': len(fig.to_json())}})
+
+    # --- approval (승인 대기 장비를 하나씩 승인) ---
+    conn = db.get_connection()
+    pending = conn.execute(
+        "SELECT id, sid, equipment_name FROM equipments WHERE status = 'pending' ORDER BY id").fetchall()
+    conn.close()
+
+    def approve(equip_id, sid, equipment_name):
+        db.approve_equipment(equip_id)
+        db.log_approval_history(sid=sid, equipment_id=equip_id, action='approved', admin_name='bench',
+                                reason='승인 완료', previous_status='pending', new_status='approved',
+                                equipment_name=equipment_name)
+
+    if pending:
+        cases.append({'name': 'approval.approve_equipment', 'run': approve,
+                      'setup': lambda: pending.pop(0), 'limit': len(pending)})
+
+    # --- excel ---
+    cases.append({'name': 'excel.parse_checklist', 'run': lambda: parse_checklist(data['checklist']),
+                  'sizes': lambda parsed: {'rows': len(parsed[1])}})
+    return cases
+
+
+def measure(case: Dict[str, Any], repeat: int, budget: float) -> Dict[str, Any]:
+    """중앙값 측정 (budget초를 넘으면 남은 반복 생략, 최소 1회)"""
+    setup: Optional[Callable] = case.get('setup')
+    runs = min(repeat, case.get('limit', repeat))
+    times = []
+    started = time.perf_counter()
+    result = None
+    while len(times) < runs and (not times or time.perf_counter() - started < budget):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        result = case['run'](*args)
+        times.append(time.perf_counter() - start)
+
+    out = {'seconds': statistics.median(times), 'min_seconds': min(times), 'runs': len(times)}
+    if case.get('sizes'):
+        out.update(case['sizes'](result))
+    return out
+
+
+# ============================================================
+# Baseline / Report
+# ============================================================
+
+# 회귀 판정 지표 (rows는 데이터 확인용으로만 기록)
+COMPARED_METRICS = ('seconds', 'json_bytes')
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {'scales': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, baseline: Dict[str, Any], results: Dict[str, Dict[str, Any]]):
+    """측정한 항목만 덮어쓰고 나머지 규모/항목의 기준값은 유지"""
+    machine = {
+        'platform': platform.platform(), 'python': platform.python_version(),
+        'cpus': os.cpu_count(), 'saved_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    scales = dict(baseline.get('scales', {}))
+    for scale, cases in results.items():
+        saved = dict(scales.get(scale, {}))
+        for name, result in cases.items():
+            saved[name] = {metric: round(value, 6) if isinstance(value, float) else value
+                           for metric, value in result.items() if metric != 'min_seconds'}
+        scales[scale] = saved
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'machine': machine, 'scales': scales}, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def measure_ref(ref: str, args) -> Dict[str, Any]:
+    """
+    git ref의 코드로 같은 항목을 이 기계에서 측정 (임시 worktree, 합성 데이터는 공유)
+
+    Returns:
+        dict: 기준값 ({'scales': {scale: {case: metrics}}})
+    """
+    workdir = tempfile.mkdtemp(prefix='bench-ref-')
+    tree = os.path.join(workdir, 'tree')
+    output = os.path.join(workdir, 'results.json')
+    subprocess.run(['git', '-C', ROOT, 'worktree', 'add', '--detach', '--quiet', tree, ref], check=True)
+    try:
+        # 같은 seed의 합성 DB/체크리스트를 다시 만들지 않도록 현재 트리의 데이터를 연결
+        os.makedirs(os.path.join(tree, 'data'), exist_ok=True)
+        try:
+            os.symlink(synthetic_data.OUTPUT_DIR, os.path.join(tree, 'data', 'synthetic'), target_is_directory=True)
+        except OSError as e:
+            print(f"[{ref}] synthetic data link failed, regenerating in worktree: {e}", flush=True)
+
+        command = [sys.executable, os.path.join(tree, 'benchmarks', 'run_benchmarks.py'),
+                   '--scale', *args.scale, '--repeat', str(args.repeat), '--budget', str(args.budget),
+                   '--baseline', os.path.join(workdir, 'none.json'), '--output', output]
+        if args.only:
+            command += ['--only', *args.only]
+        print(f"[{ref}] measuring baseline ...", flush=True)
+        subprocess.run(command, cwd=tree, check=True)
+        with open(output, encoding='utf-8') as f:
+            return {'scales': json.load(f)}
+    finally:
+        subprocess.run(['git', '-C', ROOT, 'worktree', 'remove', '--force', tree], check=False)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+            tolerance: float, min_delta: float, small_tolerance: float = DEFAULT_SMALL_TOLERANCE) -> pd.DataFrame:
+    """
+    기준값 비교 (기준값이 SMALL_CASE_SECONDS 미만인 시간 항목은 small_tolerance 이상 적용)
+
+    Returns:
+        DataFrame: scale, case, metric, baseline, current, change (%), status
+                   status = ok / REGRESSION / improved / new
+    """
+    rows = []
+    for scale, cases in results.items():
+        base_cases = baseline.get('scales', {}).get(scale, {})
+        for name, result in cases.items():
+            for metric in COMPARED_METRICS:
+                if metric not in result:
+                    continue
+                current = result[metric]
+                base = base_cases.get(name, {}).get(metric)
+                status, change = 'new', None
+                if base:
+                    change = (current / base - 1) * 100
+                    # 시간은 아주 작은 차이(잡음)는 무시, 크기는 허용 범위만 적용
+                    noise = min_delta if metric == 'seconds' else 0
+                    allowed = tolerance
+                    if metric == 'seconds' and base < SMALL_CASE_SECONDS:
+                        allowed = max(tolerance, small_tolerance)
+                    if current > base * (1 + allowed) and current - base > noise:
+                        status = 'REGRESSION'
+                    elif current < base * (1 - allowed) and base - current > noise:
+                        status = 'improved'
+                    else:
+                        status = 'ok'
+                rows.append({'scale': scale, 'case': name, 'metric': metric,
+                             'baseline': base, 'current': current, 'change': change, 'status': status})
+    return pd.DataFrame(rows, columns=['scale', 'case', 'metric', 'baseline', 'current', 'change', 'status'])
+
+
+def _format_value(metric: str, value) -> str:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return '-'
+    if metric == 'seconds':
+        return f"{value * 1000:,.1f} ms" if value < 1 else f"{value:,.2f} s"
+    return f"{int(value):,}"
+
+
+def print_report(report: pd.DataFrame, tolerance: float, small_tolerance: float = DEFAULT_SMALL_TOLERANCE):
+    print()
+    print(f"{'scale':<8}{'case':<46}{'baseline':>12}{'current':>12}{'change':>9}  status")
+    for row in report.itertuples(index=False):
+        name = row.case if row.metric == 'seconds' else f"{row.case} ({row.metric})"
+        change = '' if row.change is None or pd.isna(row.change) else f"{row.change:+.0f}%"
+        print(f"{row.scale:<8}{name:<46}{_format_value(row.metric, row.baseline):>12}"
+              f"{_format_value(row.metric, row.current):>12}{change:>9}  {row.status}")
+    counts = report['status'].value_counts()
+    print(f"\ntolerance {tolerance:.0%} (< {SMALL_CASE_SECONDS * 1000:.0f} ms: {max(tolerance, small_tolerance):.0%}): "
+          + ', '.join(f"{status} {n}" for status, n in counts.items()))
+
+
+# ============================================================
+# Main
+# ============================================================
+
+def run_scale(scale: str, args) -> Dict[str, Any]:
+    data = prepare_scale(scale, regenerate=args.regenerate)
+    counts = data['counts']
+    print(f"[{scale}] {counts['equipments']:,} equipments, {counts['measurements']:,} measurements", flush=True)
+
+    results = {}
+    with using_db(data['db_file']):
+        for case in build_cases(data):
+            if args.only and not any(case['name'].startswith(prefix) for prefix in args.only):
+                continue
+            result = measure(case, args.repeat, args.budget)
+            results[case['name']] = result
+            print(f"  {case['name']:<46}{_format_value('seconds', result['seconds']):>12}  (x{result['runs']})",
+                  flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', nargs='+', choices=list(synthetic_data.SCALES), default=DEFAULT_SCALES)
+    parser.add_argument('--only', nargs='+', help='이 접두어로 시작하는 항목만 (예: query. spc.)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='항목별 최대 반복 횟수 (중앙값)')
+    parser.add_argument('--budget', type=float, default=10.0, help='항목별 반복 시간 한도 (초)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='허용 범위 (0.25 = 25%%)')
+    parser.add_argument('--small-tolerance', type=float, default=DEFAULT_SMALL_TOLERANCE,
+                        help='기준값 100 ms 미만 항목의 허용 범위')
+    parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help='이보다 작은 시간 차이는 회귀로 보지 않음')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='--save-baseline으로 저장한 기준값 파일')
+    parser.add_argument('--baseline-ref', help='이 git ref의 코드를 먼저 측정해 기준값으로 사용 (예: main)')
+    parser.add_argument('--save-baseline', action='store_true', help='이번 결과를 기준값으로 저장 (비교 생략)')
+    parser.add_argument('--output', help='이번 결과를 JSON으로 저장')
+    parser.add_argument('--regenerate', action='store_true', help='DB/체크리스트를 다시 생성')
+    args = parser.parse_args()
+
+    # 대규모 조회의 느린 쿼리 경고는 결과 표와 섞이지 않도록 숨김
+    logging.getLogger('modules.sql_trace').setLevel(logging.ERROR)
+
+    # 기준 코드를 먼저 측정 (합성 데이터 생성/캐시 예열 비용이 현재 코드 측정에 섞이지 않도록)
+    baseline = measure_ref(args.baseline_ref, args) if args.baseline_ref else None
+
+    results = {scale: run_scale(scale, args) for scale in args.scale}
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, load_baseline(args.baseline), results)
+        print(f"\nbaseline saved: {args.baseline}")
+        return
+
+    if baseline is None:
+        baseline = load_baseline(args.baseline)
+    report = compare(results, baseline, args.tolerance, args.min_delta_ms / 1000, args.small_tolerance)
+    print_report(report, args.tolerance, args.small_tolerance)
+    if (report['status'] == 'REGRESSION').any():
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
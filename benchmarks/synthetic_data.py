@@ -0,0 +1,720 @@
+"""
+Synthetic Data Generator
+운영 규모 합성 데이터 생성 (성능 측정용 DB + Industrial Check List 업로드 파일)
+
+생성 대상:
+    specs / equipments / measurements   database.sync_relational_stream (bulk, 측정값은 장비 청크 단위)
+    승인 대기/반려 장비                  equipments + measurements + pending_measurements (executemany)
+    approval_history                    승인 / 반려 -> 재제출 -> 승인 이력 (executemany)
+    Industrial Check List xlsx          data/samples 체크리스트를 템플릿으로 Last 시트 + 모델 시트 작성
+
+분포:
+    항목        템플릿의 Trend 항목 (Min/Max -> LSL/USL), 부족하면 '<항목> #2'처럼 복제
+    기준값/산포  양측 규격: 중앙, (USL-LSL)/8 / 단측 규격: 템플릿 측정값 기준
+    모델        모델별 비중(편중), 적용 항목(약 90%), 항목별 offset/산포 배율
+    구성        모델별 허용 구성(equipment_config_rules.json, EQUIPMENT_OPTIONS) + 일부 규칙 위반,
+                구성 값에 따라 관련 모듈 항목의 offset 변화 (XY Scanner -> XY 항목 등)
+    drift       일부 (모델, 항목)에 출하일에 따른 선형 drift / 단계 이동(shift)
+    규칙 위반   연속 7점 한쪽(rule of seven), 7점 연속 증가(trend), 규격 이탈 outlier
+    날짜        기간 후반으로 갈수록 출하 증가, 형식 혼합 (YYYY-MM-DD, 시각 포함, /, ., YYYYMMDD, 일부 파싱 불가)
+
+같은 --seed면 같은 데이터를 생성합니다.
+
+사용법:
+    python benchmarks/synthetic_data.py --scale large                      # 20,000대 x 400항목
+    python benchmarks/synthetic_data.py --equipments 5000 --items 200 --db data/synthetic/mid.db
+    python benchmarks/synthetic_data.py --scale small --xlsx 20            # 업로드용 체크리스트 20개 추가 생성
+    python benchmarks/synthetic_data.py --no-db --xlsx 5 --items 150
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import EQUIPMENT_OPTIONS  # noqa: E402
+from modules import database as db  # noqa: E402
+from modules import sql_trace  # noqa: E402
+from modules.utils import RESEARCH_MODELS, INDUSTRIAL_MODELS  # noqa: E402
+
+# (장비 수, 항목 수)
+SCALES = {
+    'small': (500, 60),
+    'medium': (5000, 200),
+    'large': (20000, 400),
+}
+
+TEMPLATE_FILE = os.path.join(ROOT, 'data', 'samples', 'Industrial Check List v3.21.1.xlsx')
+TEMPLATE_SHEET = 'NX-Wafer'
+RULES_FILE = os.path.join(ROOT, 'equipment_config_rules.json')
+OUTPUT_DIR = os.path.join(ROOT, 'data', 'synthetic')
+
+# Last 시트 입력 셀 (Excel 행, L열) - app.extract_equipment_info_from_last_sheet와 같은 위치
+LAST_SHEET_CELLS = {'model': 22, 'sid': 25, 'reference_doc': 28, 'date': 31,
+                    'end_user': 34, 'mfg_engineer': 37, 'qc_engineer': 40}
+LAST_SHEET_COLUMN = 12
+
+CONFIG_FIELDS = {
+    'xy_scanner': 'XY Scanner', 'head_type': 'Head Type', 'mod_vit': 'MOD/VIT',
+    'sliding_stage': 'Sliding Stage', 'sample_chuck': 'Sample Chuck', 'ae': 'AE',
+}
+# 구성 값에 영향을 받는 항목 (Module/Check Items에 포함된 단어, 소문자)
+CONFIG_AFFECTS = {
+    'xy_scanner': ['xy', 'x detector', 'y detector', 'ringing'],
+    'head_type': ['head', 'z '],
+    'mod_vit': ['noise', 'vibration'],
+    'sliding_stage': ['sliding', 'opm'],
+    'sample_chuck': ['chuck', 'wafer', 'flatness'],
+    'ae': ['enclosure', 'noise'],
+}
+
+# (형식, 비율) - None은 파싱할 수 없는 값
+DATE_FORMATS = [('%Y-%m-%d', 0.70), ('%Y-%m-%d %H:%M:%S', 0.10), ('%Y/%m/%d', 0.08),
+                ('%Y.%m.%d', 0.07), ('%Y%m%d', 0.04), (None, 0.01)]
+INVALID_DATES = ['미정', 'TBD', '']
+
+CUSTOMERS = {
+    'Samsung': ['S1', 'S3', 'S4', 'Giheung', 'Pyeongtaek'], 'SK hynix': ['M14', 'M15', 'M16'],
+    'TSMC': ['Fab12', 'Fab15', 'Fab18'], 'Micron': ['Boise', 'Hiroshima'], 'Intel': ['D1X', 'Fab28'],
+    'Kioxia': ['Yokkaichi'], 'LG Display': ['Paju'], 'KAIST': ['Lab'], 'SNU': ['Lab'], 'NIST': ['Lab'],
+}
+ENGINEERS = ['Minjun Kim', 'Seoyeon Lee', 'Jihoon Park', 'Hayoon Choi', 'Dohyun Jung', 'Yuna Kang',
+             'Junseo Cho', 'Eunji Yoon', 'Hyunwoo Jang', 'Sumin Lim', 'Taeyang Han', 'Jiwoo Oh']
+ADMINS = ['Levi Baek', 'QC Admin', 'Sora Shin']
+REJECT_REASONS = ['측정값 누락', 'SPEC 초과 항목 재측정 필요', '구성 정보 오류 (Head Type)',
+                  '체크리스트 버전 불일치', '종료일 오기입']
+CHECKLIST_VERSIONS = {
+    'Industrial': ['Industrial Check List v3.18.0', 'Industrial Check List v3.20.2', 'Industrial Check List v3.21.1'],
+    'Research': ['Research Check List v2.4', 'Research Check List v2.6'],
+}
+
+
+# ============================================================
+# Plan (항목 / 모델 / 장비 목록과 분포 파라미터)
+# ============================================================
+
+def load_template(path: str = TEMPLATE_FILE) -> pd.DataFrame:
+    """템플릿 체크리스트의 측정 시트 (업로드 미리보기와 같은 형태)"""
+    return pd.read_excel(path, sheet_name=TEMPLATE_SHEET)
+
+
+def build_item_catalog(template: pd.DataFrame, n_items: int) -> pd.DataFrame:
+    """
+    측정 항목 목록과 항목별 분포
+
+    Returns:
+        DataFrame: name, module, category, unit, criteria, remark, lsl, usl, target, mu, sigma, decimals
+    """
+    num = lambda s: pd.to_numeric(s, errors='coerce')  # noqa: E731
+    trend = template[template['Trend'].notna() & template['Check Items'].notna()].copy()
+    trend['name'] = trend['Check Items'].astype(str).str.strip()
+    trend = trend[(num(trend['Min']).notna() | num(trend['Max']).notna() | num(trend['Measurement']).notna())]
+    base = trend.drop_duplicates('name')
+
+    lsl, usl, ref = num(base['Min']).to_numpy(), num(base['Max']).to_numpy(), num(base['Measurement']).to_numpy()
+    mu = np.where(np.isnan(ref), 1.0, ref)
+    sigma = np.abs(mu) * 0.03 + 1e-3
+    both = ~np.isnan(lsl) & ~np.isnan(usl)
+    upper = np.isnan(lsl) & ~np.isnan(usl)
+    lower = ~np.isnan(lsl) & np.isnan(usl)
+
+    mu = np.where(both, (lsl + usl) / 2, mu)
+    sigma = np.where(both, (usl - lsl) / 8, sigma)
+    upper_mu = np.where((ref > 0) & (ref < usl), ref, usl * 0.45)
+    mu = np.where(upper, upper_mu, mu)
+    # 0 근처 값이 많지 않도록 (noise/error 항목은 0 미만이 없음)
+    sigma = np.where(upper, np.minimum((usl - upper_mu) / 4, np.abs(upper_mu) / 3), sigma)
+    lower_mu = np.where(ref > lsl, ref, lsl + np.abs(lsl) * 0.3 + 1e-3)
+    mu = np.where(lower, lower_mu, mu)
+    sigma = np.where(lower, (lower_mu - lsl) / 4, sigma)
+    sigma = np.maximum(np.abs(sigma), 1e-6)
+
+    catalog = pd.DataFrame({
+        'name': base['name'].to_numpy(), 'module': base['Module'].to_numpy(),
+        'category': base['Category'].to_numpy(), 'unit': base['Unit'].to_numpy(),
+        'criteria': base['Criteria'].to_numpy(), 'remark': base['Remark'].to_numpy(),
+        'lsl': lsl, 'usl': usl, 'target': np.where(both, (lsl + usl) / 2, np.nan),
+        'mu': mu, 'sigma': sigma,
+    })
+
+    # 항목 수가 템플릿보다 많으면 '<항목> #2', '#3'... 으로 복제
+    repeat = np.arange(n_items)
+    catalog = catalog.iloc[repeat % len(catalog)].reset_index(drop=True)
+    copy_no = repeat // len(base)
+    catalog['name'] = np.where(copy_no > 0, catalog['name'] + ' #' + (copy_no + 1).astype(str), catalog['name'])
+    catalog['decimals'] = np.clip(3 - np.floor(np.log10(catalog['sigma'])), 0, 6).astype(int)
+    return catalog
+
+
+def _load_config_rules() -> Dict[str, Any]:
+    try:
+        with open(RULES_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get('model_specific_rules', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _config_profiles(rng, models: List[str], categories: Dict[str, str]) -> Dict[str, Dict[str, List[str]]]:
+    """모델별 구성 값 후보 (규칙 파일의 허용 값, 없으면 EQUIPMENT_OPTIONS에서 한 분류를 골라 최대 3개)"""
+    rules = _load_config_rules()
+    profiles = {}
+    for model in models:
+        profile = {}
+        for field in CONFIG_FIELDS:
+            allowed = rules.get(model, {}).get(field, {}).get('allowed')
+            if not allowed:
+                options = EQUIPMENT_OPTIONS[field]
+                if field == 'ae':
+                    values = options[categories[model]]
+                else:
+                    values = options[list(options)[rng.integers(len(options))]]
+                allowed = list(rng.choice(values, size=min(3, len(values)), replace=False))
+            profile[field] = [str(v) for v in allowed]
+        profiles[model] = profile
+    return profiles
+
+
+def _config_values(profiles: Dict[str, Dict[str, List[str]]]) -> Dict[str, List[str]]:
+    """필드별 전체 구성 값 (규칙 위반 시 여기서 선택)"""
+    values = {}
+    for field in CONFIG_FIELDS:
+        options = [v for group in EQUIPMENT_OPTIONS[field].values() for v in group]
+        options += [v for profile in profiles.values() for v in profile[field]]
+        values[field] = list(dict.fromkeys(options))
+    return values
+
+
+def build_plan(n_equipments: int, n_items: int, seed: int = 42,
+               start: str = '2020-01-01', end: str = '2026-09-30',
+               template: pd.DataFrame = None, config_violation_rate: float = 0.01) -> Dict[str, Any]:
+    """
+    생성 계획: 항목 목록, 모델별 분포 파라미터, 장비 목록 (출하일 순)
+
+    Returns:
+        dict: catalog, models, categories, params, config_values, config_effects, equipments, template, ...
+    """
+    rng = np.random.default_rng(seed)
+    template = load_template() if template is None else template
+    catalog = build_item_catalog(template, n_items)
+    n_items = len(catalog)
+
+    categories = {m: 'Research' for m in RESEARCH_MODELS}
+    categories.update({m: 'Industrial' for m in INDUSTRIAL_MODELS})
+    models = list(categories)
+    # 모델 비중: 소수 모델에 출하가 몰리는 분포
+    weights = 1 / (rng.permutation(len(models)) + 1) ** 0.9
+    weights /= weights.sum()
+
+    n_models = len(models)
+    shape = (n_models, n_items)
+    pick = lambda rate: rng.random(shape) < rate  # noqa: E731
+
+    # 모델별 기대 장비 수 기준으로 연속 ~12대가 들어가는 구간 폭 (u = 출하 순번 / 전체)
+    width = np.minimum(0.5, 12 / np.maximum(n_equipments * weights, 1))
+    window_start = lambda rate: np.where(  # noqa: E731
+        pick(rate), rng.random(shape) * (1 - width)[:, None], 2.0)
+    params = {
+        'offset': rng.normal(0, 0.3, shape),                # sigma 단위
+        'scale': rng.lognormal(0, 0.15, shape),
+        'applicable': rng.random(shape) < 0.9,
+        'drift': np.where(pick(0.05), rng.choice([-1, 1], shape) * rng.uniform(1, 3, shape), 0.0),
+        'shift': np.where(pick(0.03), rng.choice([-1, 1], shape) * rng.uniform(1, 2, shape), 0.0),
+        'shift_at': rng.uniform(0.3, 0.9, shape),
+        'rule7_start': window_start(0.05),
+        'trend_start': window_start(0.03),
+        'width': width,
+    }
+    # 측정 항목은 모든 모델에서 최소 1개 이상 (모델별 분석이 비지 않도록)
+    params['applicable'][:, 0] = True
+
+    profiles = _config_profiles(rng, models, categories)
+    config_values = _config_values(profiles)
+    text = (catalog['module'].fillna('').astype(str) + ' ' + catalog['name']).str.lower()
+    config_effects = {}
+    for field, words in CONFIG_AFFECTS.items():
+        affected = text.str.contains('|'.join(words), regex=True).to_numpy()
+        config_effects[field] = rng.normal(0, 0.4, (len(config_values[field]), n_items)) * affected
+
+    plan = {
+        'seed': seed, 'catalog': catalog, 'models': models, 'weights': weights,
+        'categories': categories, 'profiles': profiles, 'params': params,
+        'config_values': config_values, 'config_effects': config_effects,
+        'config_violation_rate': config_violation_rate, 'template': template,
+        'start': pd.Timestamp(start), 'end': pd.Timestamp(end),
+    }
+    # 템플릿 행 -> 항목 번호 (체크리스트 작성용, 항목 목록에 없으면 -1)
+    item_index = {name: i for i, name in enumerate(catalog['name'])}
+    names = template['Check Items'].astype(str).str.strip()
+    plan['template_items'] = np.where(
+        template['Trend'].notna(), names.map(item_index).fillna(-1), -1).astype(int)
+
+    plan['equipments'] = generate_equipments(plan, n_equipments, rng)
+    return plan
+
+
+def _format_dates(rng, dates: pd.Series) -> np.ndarray:
+    formats = [fmt for fmt, _ in DATE_FORMATS]
+    chosen = rng.choice(len(formats), size=len(dates), p=[p for _, p in DATE_FORMATS])
+    out = np.empty(len(dates), dtype=object)
+    for k, fmt in enumerate(formats):
+        mask = chosen == k
+        if fmt is None:
+            out[mask] = rng.choice(INVALID_DATES, size=mask.sum())
+        else:
+            out[mask] = dates[mask].dt.strftime(fmt).to_numpy()
+    return out
+
+
+def generate_equipments(plan: Dict[str, Any], n: int, rng, sid_prefix: str = 'D',
+                        u_start: float = 0.0, u_end: float = 1.0,
+                        start: pd.Timestamp = None, end: pd.Timestamp = None) -> pd.DataFrame:
+    """
+    장비 목록 (출하일 순)
+
+    Returns:
+        DataFrame: 시트 컬럼(SID, 장비명, 종료일, R/I, Model, ...) + 내부 컬럼
+                   _date(출하 시각), _u(순번 위치 0~1), _model(모델 번호), _<field>(구성 값 번호)
+    """
+    start = plan['start'] if start is None else start
+    end = plan['end'] if end is None else end
+    models = plan['models']
+
+    # 기간 후반으로 갈수록 출하 증가
+    span = (end - start).total_seconds()
+    offsets = np.sort(np.sqrt(rng.random(n)) * span)
+    dates = pd.Series(start + pd.to_timedelta(offsets, unit='s')).dt.floor('D')
+    model_idx = rng.choice(len(models), size=n, p=plan['weights'])
+    model_names = np.array(models, dtype=object)[model_idx]
+    ri = np.array([plan['categories'][m] for m in model_names], dtype=object)
+
+    df = pd.DataFrame({
+        'SID': [f"{sid_prefix}{i:06d}-{d:%y%m%d}" for i, d in enumerate(dates, start=100001)],
+        '종료일': _format_dates(rng, dates),
+        'R/I': ri,
+        'Model': model_names,
+    })
+
+    for field, column in CONFIG_FIELDS.items():
+        values = plan['config_values'][field]
+        value_index = {v: i for i, v in enumerate(values)}
+        idx = np.empty(n, dtype=int)
+        for m, model in enumerate(models):
+            mask = model_idx == m
+            allowed = [value_index[v] for v in plan['profiles'][model][field]]
+            idx[mask] = rng.choice(allowed, size=mask.sum())
+        violate = rng.random(n) < plan['config_violation_rate']
+        idx[violate] = rng.integers(len(values), size=violate.sum())
+        df[column] = np.array(values, dtype=object)[idx]
+        df[f'_{field}'] = idx
+
+    customers = list(CUSTOMERS)
+    customer = np.array(customers, dtype=object)[rng.integers(len(customers), size=n)]
+    site = np.array([CUSTOMERS[c][rng.integers(len(CUSTOMERS[c]))] for c in customer], dtype=object)
+    end_user = pd.Series(customer + ' ' + site)
+    df['End User'] = end_user
+    df['장비명'] = end_user + '-' + (end_user.groupby(end_user).cumcount() + 1).map('{:03d}'.format)
+    df['Mfg Engineer'] = rng.choice(ENGINEERS, size=n)
+    df['QC Engineer'] = rng.choice(ENGINEERS, size=n)
+
+    # 체크리스트 버전: 출하 시기에 따라 올라감
+    position = np.arange(n) / max(n, 1)
+    df['Reference Doc'] = [
+        CHECKLIST_VERSIONS[r][min(int(p * len(CHECKLIST_VERSIONS[r])), len(CHECKLIST_VERSIONS[r]) - 1)]
+        for r, p in zip(ri, position)
+    ]
+
+    df['_date'] = dates
+    df['_u'] = u_start + position * (u_end - u_start)
+    df['_model'] = model_idx
+    return df
+
+
+# ============================================================
+# Measurement Values
+# ============================================================
+
+def generate_values(plan: Dict[str, Any], equipments: pd.DataFrame, rng,
+                    outlier_rate: float = 0.002, missing_rate: float = 0.01) -> np.ndarray:
+    """
+    장비 x 항목 측정값
+
+    Returns:
+        ndarray: (장비 수, 항목 수), 측정하지 않은 항목은 NaN
+    """
+    catalog, p = plan['catalog'], plan['params']
+    m = equipments['_model'].to_numpy()
+    u = equipments['_u'].to_numpy()[:, None]
+    n, n_items = len(equipments), len(catalog)
+    mu, sigma = catalog['mu'].to_numpy(), catalog['sigma'].to_numpy()
+
+    # sigma 단위 offset: 모델 + 구성 + drift + shift
+    base = p['offset'][m] + p['drift'][m] * u + p['shift'][m] * (u >= p['shift_at'][m])
+    offset = base.copy()
+    for field in CONFIG_FIELDS:
+        offset += plan['config_effects'][field][equipments[f'_{field}'].to_numpy()]
+    noise = rng.standard_normal((n, n_items))
+    z = offset + noise * p['scale'][m]
+
+    # 연속 7점 이상 평균 위쪽 (구성 offset 없이 +1 sigma 이상)
+    width = p['width'][m][:, None]
+    rule7 = (u >= p['rule7_start'][m]) & (u < p['rule7_start'][m] + width)
+    z = np.where(rule7, base + 1 + 0.5 * np.abs(noise), z)
+
+    # 연속 증가 (구성/산포 영향 없이 순번에 따라 단조 증가)
+    in_trend = (u >= p['trend_start'][m]) & (u < p['trend_start'][m] + width)
+    ramp = p['offset'][m] - 2 + 4 * (u - p['trend_start'][m]) / width
+    z = np.where(in_trend, ramp, z)
+
+    outlier = rng.random((n, n_items)) < outlier_rate
+    z = np.where(outlier, rng.choice([-1, 1], (n, n_items)) * rng.uniform(5, 8, (n, n_items)), z)
+
+    values = mu + sigma * z
+    # 상한만 있는 양수 항목 (noise, error 등)은 0 미만이 나오지 않음
+    non_negative = np.isnan(catalog['lsl'].to_numpy()) & (catalog['usl'].to_numpy() > 0)
+    values = np.where(non_negative & (values < 0), 0.0, values)
+
+    for decimals in np.unique(catalog['decimals']):
+        cols = (catalog['decimals'] == decimals).to_numpy()
+        values[:, cols] = np.round(values[:, cols], int(decimals))
+
+    missing = ~p['applicable'][m] | (rng.random((n, n_items)) < missing_rate)
+    values[missing] = np.nan
+    return values
+
+
+def measurement_frame(plan: Dict[str, Any], equipments: pd.DataFrame, values: np.ndarray) -> pd.DataFrame:
+    """측정값 배열 -> Measurements 시트 형태 (SID, Check Items, Value)"""
+    rows, cols = np.nonzero(~np.isnan(values))
+    return pd.DataFrame({
+        'SID': equipments['SID'].to_numpy()[rows],
+        'Check Items': plan['catalog']['name'].to_numpy()[cols],
+        'Value': values[rows, cols],
+    })
+
+
+def spec_frame(plan: Dict[str, Any]) -> pd.DataFrame:
+    """Specs 시트 (모델 x 규격이 있는 항목)"""
+    catalog = plan['catalog']
+    limited = catalog[catalog['lsl'].notna() | catalog['usl'].notna()]
+    return pd.DataFrame([
+        {'Model': model, 'Check Item': row.name, 'LSL': row.lsl, 'USL': row.usl, 'Target': row.target}
+        for model in plan['models'] for row in limited.itertuples(index=False)
+    ])
+
+
+def checklist_frame(plan: Dict[str, Any], values: np.ndarray) -> pd.DataFrame:
+    """
+    장비 1대의 체크리스트 측정 시트 (템플릿 행 + 템플릿에 없는 항목 추가 행)
+
+    템플릿의 Trend 행은 생성한 측정값으로 바꾸고, 항목 목록에 없는 Trend 행은 비웁니다.
+    """
+    catalog, template = plan['catalog'], plan['template']
+    df = template.copy()
+    items = plan['template_items']
+    trend = template['Trend'].notna().to_numpy()
+    df.loc[trend, 'Measurement'] = np.where(items[trend] >= 0, values[items[trend]], np.nan)
+
+    extra = np.setdiff1d(np.arange(len(catalog)), items[items >= 0])
+    if len(extra):
+        added = catalog.iloc[extra]
+        df = pd.concat([df, pd.DataFrame({
+            'Module': added['module'].to_numpy(), 'Check Items': added['name'].to_numpy(),
+            'Min': added['lsl'].to_numpy(), 'Criteria': added['criteria'].to_numpy(),
+            'Max': added['usl'].to_numpy(), 'Measurement': values[extra],
+            'Unit': added['unit'].to_numpy(), 'Category': added['category'].to_numpy(),
+            'Trend': 'Check item', 'Remark': added['remark'].to_numpy(),
+        })], ignore_index=True)
+
+    # 템플릿의 '#', PASS/FAIL은 수식이므로 값으로 채움
+    df['#'] = np.arange(1, len(df) + 1)
+    value = pd.to_numeric(df['Measurement'], errors='coerce')
+    low, high = pd.to_numeric(df['Min'], errors='coerce'), pd.to_numeric(df['Max'], errors='coerce')
+    fail = (value < low) | (value > high)
+    is_trend = df['Trend'].notna()
+    df.loc[is_trend, 'PASS/FAIL'] = np.where(value[is_trend].isna(), None,
+                                             np.where(fail[is_trend], 'Fail', 'Pass'))
+    return df
+
+
+# ============================================================
+# Database
+# ============================================================
+
+def _measurement_sheets(plan: Dict[str, Any], equipments: pd.DataFrame,
+                        chunk_size: int) -> Iterator[Tuple[str, pd.DataFrame]]:
+    for chunk_no, begin in enumerate(range(0, len(equipments), chunk_size)):
+        chunk = equipments.iloc[begin:begin + chunk_size]
+        rng = np.random.default_rng([plan['seed'], chunk_no])
+        yield 'Measurements', measurement_frame(plan, chunk, generate_values(plan, chunk, rng))
+
+
+def _upload_times(rng, equipments: pd.DataFrame) -> pd.Series:
+    """출하 후 체크리스트 업로드 시각 (대부분 1~3일 뒤)"""
+    lag = pd.to_timedelta(rng.lognormal(np.log(36), 0.8, len(equipments)), unit='h')
+    return (equipments['_date'] + lag).dt.floor('s')
+
+
+def _timestamps(times: pd.Series) -> pd.Series:
+    """CURRENT_TIMESTAMP와 같은 형식 ('YYYY-MM-DD HH:MM:SS')"""
+    return times.dt.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _write_staged(c, plan: Dict[str, Any], staged: pd.DataFrame, rng) -> Dict[str, int]:
+    """승인 대기/반려 장비: equipments + measurements + pending_measurements (업로드 경로와 같은 상태)"""
+    cols = list(db.EQUIP_COL_MAP) + ['_status', '_uploaded_at']
+    equip_rows = db._to_records(staged.assign(_uploaded_at=_timestamps(staged['_uploaded_at'])), cols)
+    c.executemany(f"""
+        INSERT INTO equipments ({', '.join(db.EQUIP_COL_MAP.values())}, status, uploaded_at)
+        VALUES ({', '.join(['?'] * len(cols))})
+    """, equip_rows)
+    ids = dict(c.execute("SELECT sid, id FROM equipments WHERE status IN ('pending', 'rejected')").fetchall())
+
+    values = generate_values(plan, staged, rng)
+    meas = measurement_frame(plan, staged, values)
+    names = dict(zip(staged['SID'], staged['장비명']))
+    statuses = dict(zip(staged['SID'], staged['_status']))
+    c.executemany("""
+        INSERT INTO measurements (equipment_id, check_item, check_items, value, sid, equipment_name, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, [(ids[sid], item, item, value, sid, names[sid], statuses[sid])
+          for sid, item, value in meas.itertuples(index=False, name=None)])
+
+    # 업로드 원본 (insert_pending_measurements와 같은 컬럼 매핑, 원문 TEXT 보존)
+    sheets = [
+        checklist_frame(plan, values[row_no]).assign(_sid=sid, _status=status)
+        for row_no, (sid, status) in enumerate(zip(staged['SID'], staged['_status']))
+    ]
+    sheet = pd.concat(sheets, ignore_index=True)
+    text = lambda col: sheet[col].astype(object).where(sheet[col].notna(), '').astype(str)  # noqa: E731
+    staging = pd.DataFrame({
+        'sid': sheet['_sid'], 'equipment_name': sheet['_sid'].map(names), 'module': sheet['Module'],
+        'category': sheet['Category'], 'check_items': sheet['Check Items'],
+        'min_value': pd.to_numeric(sheet['Min'], errors='coerce'), 'criteria': sheet['Criteria'],
+        'max_value': pd.to_numeric(sheet['Max'], errors='coerce'),
+        'value': pd.to_numeric(sheet['Measurement'], errors='coerce'),
+        'min_text': text('Min'), 'criteria_text': text('Criteria'), 'max_text': text('Max'),
+        'value_text': text('Measurement'),
+        'unit': sheet['Unit'], 'pass_fail': sheet['PASS/FAIL'], 'trend': sheet['Trend'], 'remark': sheet['Remark'],
+        'status': sheet['_status'],
+    })
+    pending_rows = db._to_records(staging, list(staging.columns))
+    c.executemany("""
+        INSERT INTO pending_measurements
+        (sid, equipment_name, module, category, check_items,
+         min_value, criteria, max_value, value,
+         min_text, criteria_text, max_text, value_text,
+         unit, pass_fail, trend, remark, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, pending_rows)
+    return {'measurements': len(meas), 'pending_measurements': len(pending_rows)}
+
+
+def _approval_history_rows(rng, equipments: pd.DataFrame, ids: Dict[str, int],
+                           resubmit_ratio: float) -> List[tuple]:
+    """승인 / 반려 -> 재제출 -> 승인 이력 (action_at은 업로드 이후)"""
+    hours = lambda: timedelta(hours=float(rng.lognormal(np.log(20), 1.0)))  # noqa: E731
+    fmt = lambda t: t.strftime('%Y-%m-%d %H:%M:%S')  # noqa: E731
+    rows = []
+    for sid, name, status, uploaded in zip(equipments['SID'], equipments['장비명'],
+                                           equipments['_status'], equipments['_uploaded_at']):
+        equip_id, admin = ids.get(sid), ADMINS[rng.integers(len(ADMINS))]
+        at = uploaded.to_pydatetime()
+        if status == 'pending':
+            continue
+        if status == 'rejected' or rng.random() < resubmit_ratio:
+            at += hours()
+            rows.append((sid, equip_id, name, 'reject', admin, REJECT_REASONS[rng.integers(len(REJECT_REASONS))],
+                         'pending', 'rejected', 0, fmt(at)))
+            if status == 'rejected':
+                continue
+            at += hours()
+            rows.append((sid, equip_id, name, 'resubmit', None, None, 'rejected', 'pending',
+                         int(rng.integers(1, 6)), fmt(at)))
+        at += hours()
+        rows.append((sid, equip_id, name, 'approve', admin, None, 'pending', 'approved', 0, fmt(at)))
+    return rows
+
+
+def populate_db(plan: Dict[str, Any], db_file: str, pending_ratio: float = 0.01,
+                rejected_ratio: float = 0.005, resubmit_ratio: float = 0.05,
+                chunk_size: int = 500) -> Dict[str, Any]:
+    """
+    계획한 장비/측정값으로 DB 생성 (기존 파일은 덮어씀)
+
+    최근 출하분 중 pending_ratio는 승인 대기, rejected_ratio는 반려 상태로 두고
+    나머지는 bulk 경로(sync_relational_stream)로 승인 상태 적재합니다.
+
+    Returns:
+        dict: 테이블별 행 수 + seconds
+    """
+    start = time.perf_counter()
+    rng = np.random.default_rng([plan['seed'], 1_000_000])
+    os.makedirs(os.path.dirname(os.path.abspath(db_file)), exist_ok=True)
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_file + suffix):
+            os.remove(db_file + suffix)
+    db.DB_FILE = db_file
+    db.invalidate_spec_cache()
+
+    equipments = plan['equipments'].copy()
+    n = len(equipments)
+    status = np.full(n, 'approved', dtype=object)
+    n_pending = int(round(n * pending_ratio))
+    if n_pending:
+        status[n - n_pending:] = 'pending'
+    # 반려는 최근 10% 출하분 중에서
+    recent = np.arange(max(n - n_pending - max(n // 10, 1), 0), n - n_pending)
+    n_rejected = min(int(round(n * rejected_ratio)), len(recent))
+    status[rng.choice(recent, size=n_rejected, replace=False)] = 'rejected'
+    equipments['_status'] = status
+    equipments['_uploaded_at'] = _upload_times(rng, equipments)
+
+    approved = equipments[equipments['_status'] == 'approved']
+    staged = equipments[equipments['_status'] != 'approved']
+
+    def sheets():
+        yield 'Specs', spec_frame(plan)
+        yield 'Equipments', approved[list(db.EQUIP_COL_MAP)]
+        yield from _measurement_sheets(plan, approved, chunk_size)
+
+    # 대량 적재 문장은 SQL 기록/느린 쿼리 로그에 남기지 않음
+    tracing = sql_trace.TRACE_ENABLED
+    sql_trace.set_tracing(False)
+    try:
+        result = db.sync_relational_stream(sheets())
+        bulk_seconds = time.perf_counter() - start
+
+        conn = db.get_connection()
+        c = conn.cursor()
+        staged_result = _write_staged(c, plan, staged, rng) if len(staged) else {}
+        c.executemany("UPDATE equipments SET uploaded_at = ? WHERE sid = ?",
+                      zip(_timestamps(approved['_uploaded_at']), approved['SID']))
+        ids = dict(c.execute("SELECT sid, id FROM equipments").fetchall())
+        history = _approval_history_rows(rng, equipments, ids, resubmit_ratio)
+        c.executemany("""
+            INSERT INTO approval_history
+            (sid, equipment_id, equipment_name, action, admin_name, reason, previous_status, new_status,
+             modification_count, action_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, history)
+        conn.commit()
+        conn.close()
+        db.backfill_check_item_ids()
+        db.backfill_ship_dates()
+    finally:
+        sql_trace.set_tracing(tracing)
+
+    return {
+        'equipments': n, 'approved': len(approved),
+        'pending': int((status == 'pending').sum()), 'rejected': int((status == 'rejected').sum()),
+        'measurements': result['measurements'] + staged_result.get('measurements', 0),
+        'pending_measurements': staged_result.get('pending_measurements', 0),
+        'specs': result['specs'], 'approval_history': len(history),
+        'bulk_seconds': bulk_seconds, 'seconds': time.perf_counter() - start,
+    }
+
+
+# ============================================================
+# Industrial Check List xlsx
+# ============================================================
+
+def write_checklists(plan: Dict[str, Any], out_dir: str, count: int,
+                     template_file: str = TEMPLATE_FILE, sid_prefix: str = 'U') -> List[str]:
+    """
+    업로드용 Industrial Check List 파일 생성 (DB에 없는 새 SID, 계획 기간 이후 출하)
+
+    Returns:
+        list: 생성한 파일 경로
+    """
+    import openpyxl  # xlsx를 만들 때만 필요
+    from openpyxl.cell.cell import MergedCell
+
+    rng = np.random.default_rng([plan['seed'], 2_000_000])
+    end = plan['end']
+    equipments = generate_equipments(plan, count, rng, sid_prefix=sid_prefix, u_start=1.0, u_end=1.02,
+                                     start=end, end=end + pd.Timedelta(days=30))
+    values = generate_values(plan, equipments, rng)
+    os.makedirs(out_dir, exist_ok=True)
+
+    paths = []
+    for row_no, equip in enumerate(equipments.itertuples(index=False)):
+        equip = dict(zip(equipments.columns, equip))
+        sheet = checklist_frame(plan, values[row_no])
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')  # 템플릿의 wmf 이미지 미지원 경고
+            wb = openpyxl.load_workbook(template_file)
+        ws = wb[TEMPLATE_SHEET]
+        # 측정 시트: 헤더 순서대로 값 기록 (수식 열도 값으로 덮어씀)
+        header = [cell.value for cell in ws[1]]
+        for col_no, column in enumerate(header, start=1):
+            if column not in sheet.columns:
+                continue
+            for offset, value in enumerate(sheet[column].tolist()):
+                cell = ws.cell(row=offset + 2, column=col_no)
+                # 병합 셀은 왼쪽 위 셀만 값을 가짐 / ws.cell(value=None)은 기존 값을 지우지 않으므로 직접 대입
+                if not isinstance(cell, MergedCell):
+                    cell.value = None if pd.isna(value) else value
+        ws.title = equip['Model'][:31]
+
+        last = wb['Last']
+        info = {'model': equip['Model'], 'sid': equip['SID'], 'reference_doc': equip['Reference Doc'],
+                'date': equip['_date'].to_pydatetime(), 'end_user': equip['End User'],
+                'mfg_engineer': equip['Mfg Engineer'], 'qc_engineer': equip['QC Engineer']}
+        for key, row in LAST_SHEET_CELLS.items():
+            last.cell(row=row, column=LAST_SHEET_COLUMN, value=info[key])
+
+        path = os.path.join(out_dir, f"Industrial Check List_{equip['SID']}.xlsx")
+        wb.save(path)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=list(SCALES), help='장비 수 x 항목 수 프리셋')
+    parser.add_argument('--equipments', type=int, help='장비 수 (기본: --scale 또는 small)')
+    parser.add_argument('--items', type=int, help='측정 항목 수')
+    parser.add_argument('--db', default=os.path.join(OUTPUT_DIR, 'control_chart.db'), help='생성할 DB 파일 (덮어씀)')
+    parser.add_argument('--no-db', action='store_true', help='DB는 만들지 않음 (xlsx만)')
+    parser.add_argument('--xlsx', type=int, default=0, help='생성할 체크리스트 xlsx 수')
+    parser.add_argument('--xlsx-dir', default=os.path.join(OUTPUT_DIR, 'uploads'))
+    parser.add_argument('--pending-ratio', type=float, default=0.01)
+    parser.add_argument('--rejected-ratio', type=float, default=0.005)
+    parser.add_argument('--start', default='2020-01-01')
+    parser.add_argument('--end', default='2026-09-30')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    n_equipments, n_items = SCALES[args.scale or 'small']
+    n_equipments = args.equipments or n_equipments
+    n_items = args.items or n_items
+
+    t0 = time.perf_counter()
+    plan = build_plan(n_equipments, n_items, seed=args.seed, start=args.start, end=args.end)
+    print(f"plan: {n_equipments:,} equipments x {len(plan['catalog']):,} items, "
+          f"{len(plan['models'])} models ({time.perf_counter() - t0:.1f}s)")
+
+    if not args.no_db:
+        result = populate_db(plan, args.db, pending_ratio=args.pending_ratio, rejected_ratio=args.rejected_ratio)
+        print(f"db: {args.db}")
+        for key, value in result.items():
+            print(f"  {key:<22}{value:>14,.1f}" if isinstance(value, float) else f"  {key:<22}{value:>14,}")
+
+    if args.xlsx:
+        t0 = time.perf_counter()
+        paths = write_checklists(plan, args.xlsx_dir, args.xlsx)
+        print(f"xlsx: {len(paths)} files -> {args.xlsx_dir} ({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
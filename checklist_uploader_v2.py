@@ -7,6 +7,22 @@ import requests
 from datetime import datetime
 from typing import Dict
 
+from modules import metrics
+
+# NocoDB API 응답 시간 (Prometheus, METRICS_PORT 기본 9109)
+NOCODB_REQUEST_SECONDS = metrics.histogram(
+    'nocodb_request_seconds', 'NocoDB API response time', ['method', 'status'])
+
+
+def _observe_response(response, *args, **kwargs):
+    NOCODB_REQUEST_SECONDS.labels(response.request.method, str(response.status_code)).observe(
+        response.elapsed.total_seconds())
+
+
+# 모든 NocoDB 호출은 이 세션 사용 (연결 재사용 + 응답 시간 기록)
+http = requests.Session()
+http.hooks['response'].append(_observe_response)
+
 class ChecklistUploaderGUI:
     def __init__(self, root):
         self.root = root
@@ -255,7 +271,7 @@ class ChecklistUploaderGUI:
             
             # Equipments 테이블
             equip_url = f"{self.BASE_URL}/meta/tables/{self.TABLE_IDS['Equipments']}"
-            response = requests.get(equip_url, headers=headers)
+            response = http.get(equip_url, headers=headers)
             
             if response.status_code == 200:
                 columns = response.json().get('columns', [])
@@ -277,7 +293,7 @@ class ChecklistUploaderGUI:
             
             # ChecklistRawData 테이블
             data_url = f"{self.BASE_URL}/meta/tables/{self.TABLE_IDS['ChecklistRawData']}"
-            response = requests.get(data_url, headers=headers)
+            response = http.get(data_url, headers=headers)
             
             if response.status_code == 200:
                 columns = response.json().get('columns', [])
@@ -843,7 +859,7 @@ class ChecklistUploaderGUI:
             self.log(f"→ 업로드 필드: {list(equip_payload.keys())}")
             
             url_equip = f"{self.BASE_URL}/tables/{self.TABLE_IDS['Equipments']}/records"
-            response = requests.post(url_equip, headers=headers, json=equip_payload)
+            response = http.post(url_equip, headers=headers, json=equip_payload)
             
             if response.status_code in [200, 201]:
                 self.log(f"✅ 장비 정보 업로드 완료: {self.equipment_info.get('sid')}")
@@ -891,7 +907,7 @@ class ChecklistUploaderGUI:
                             elif pd.notna(value):
                                 data_payload[nocodb_field] = value
                 
-                response = requests.post(url_data, headers=headers, json=data_payload)
+                response = http.post(url_data, headers=headers, json=data_payload)
                 
                 if response.status_code in [200, 201]:
                     success_count += 1
@@ -938,7 +954,7 @@ class ChecklistUploaderGUI:
                 "limit": 10000
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = http.get(url, headers=headers, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -1015,7 +1031,7 @@ class ChecklistUploaderGUI:
                 "sort": "Id"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = http.get(url, headers=headers, params=params)
             
             if response.status_code != 200:
                 self.log(f"❌ API 오류: {response.status_code}")
@@ -1064,7 +1080,7 @@ class ChecklistUploaderGUI:
                 url = f"{self.BASE_URL}/tables/{self.TABLE_IDS[table_name]}/records"
                 
                 params = {"limit": 1000, "sort": "Id"}
-                response = requests.get(url, headers=headers, params=params)
+                response = http.get(url, headers=headers, params=params)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -1142,6 +1158,7 @@ class ChecklistUploaderGUI:
                   command=viewer.destroy, width=15).pack(side=tk.RIGHT, padx=5)
 
 if __name__ == "__main__":
+    metrics.start_http_server(port=int(os.environ.get('METRICS_PORT', 9109)))
     root = tk.Tk()
     app = ChecklistUploaderGUI(root)
     root.mainloop()
@@ -3,13 +3,75 @@ Equipment Configuration Validator
 장비 구성 검증 엔진 - JSON 규칙 기반
 """
 
+import hashlib
 import json
 import os
-from typing import Dict, List, Optional, Tuple
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from modules import model_registry
+except ImportError:
+    # 앱 밖에서 단독 실행 시 규칙 파일의 model_categories만 사용
+    model_registry = None
+
+
+# 조건 연산자: (설정값, 규칙값) -> bool. 설정값이 비어 있으면 조건은 항상 거짓입니다.
+CONDITION_OPERATORS = {
+    'contains': lambda config_value, value: value in config_value,
+    'equals': lambda config_value, value: config_value == value,
+    'not_equals': lambda config_value, value: config_value != value,
+}
+
+# (모델, 필드, 조건 필드값) -> 허용 옵션 캐시 크기
+OPTIONS_CACHE_SIZE = 4096
+
+# 컴파일된 조건부 규칙
+#   condition: config -> bool
+#   condition_fields: 조건이 참조하는 필드 (옵션 캐시 키)
+#   target: 강제 대상 필드
+#   option_filter: 옵션 -> bool (None이면 필터링하지 않음, 검증은 항상 실패)
+CompiledRule = namedtuple('CompiledRule', 'condition condition_fields target option_filter message')
+
+
+def _compile_condition(condition: Dict) -> Callable[[Dict[str, str]], bool]:
+    """조건 딕셔너리 -> config 판정 함수"""
+    field = condition.get('field')
+    value = condition.get('value')
+    operator = CONDITION_OPERATORS.get(condition.get('operator'))
+    
+    if operator is None:
+        return lambda config: False
+    
+    def check(config: Dict[str, str]) -> bool:
+        config_value = config.get(field, '')
+        return bool(config_value) and operator(config_value, value)
+    
+    return check
+
+
+def _compile_enforce(enforce: Dict) -> Optional[Callable[[str], bool]]:
+    """강제 조건 딕셔너리 -> 옵션 판정 함수"""
+    operator = enforce.get('operator')
+    
+    if operator == 'must_contain':
+        value = enforce.get('value')
+        return lambda option: value in option
+    
+    if operator == 'must_be_one_of':
+        values = frozenset(enforce.get('values', []))
+        return lambda option: option in values
+    
+    return None
 
 
 class EquipmentConfigValidator:
-    """장비 구성 검증 클래스"""
+    """
+    장비 구성 검증 클래스
+    
+    규칙 파일은 로드 시 한 번 컴파일됩니다 (모델/필드별 허용 옵션 집합, 조건 판정 함수).
+    이후 조회/검증은 JSON을 다시 해석하지 않습니다.
+    """
     
     def __init__(self, rules_file='equipment_config_rules.json'):
         """
@@ -30,6 +92,56 @@ class EquipmentConfigValidator:
             raise FileNotFoundError(f"규칙 파일을 찾을 수 없습니다: {rules_file}")
         except json.JSONDecodeError as e:
             raise ValueError(f"규칙 파일 JSON 파싱 오류: {e}")
+        
+        # 규칙 내용 해시 (이력 검증 시 규칙 변경 감지용)
+        self.rules_version = hashlib.sha256(
+            json.dumps(self.rules, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        ).hexdigest()
+        
+        self._compile()
+    
+    def _compile(self):
+        """규칙 JSON -> 조회 테이블 / 판정 함수"""
+        self._display_names = dict(self.rules.get('field_display_names', {}))
+        self.config_fields = list(self._display_names)
+        
+        # 모델 -> 필드 -> 허용 옵션 (순서 유지 tuple / 검증용 frozenset)
+        self._allowed = {}
+        self._allowed_sets = {}
+        self._required = {}
+        for model, info in self.rules.get('model_specific_rules', {}).items():
+            fields = {field: spec for field, spec in info.items() if isinstance(spec, dict)}
+            self._allowed[model] = {field: tuple(spec.get('allowed', [])) for field, spec in fields.items()}
+            self._allowed_sets[model] = {field: frozenset(options) for field, options in self._allowed[model].items()}
+            self._required[model] = tuple(field for field, spec in fields.items() if spec.get('required', False))
+        # 규칙이 정의된 모델 (이력 검증에서 규칙 없는 모델은 건너뜀)
+        self.models = frozenset(self._allowed)
+        
+        # 조건부 규칙 (파일 순서 유지) + 대상 필드별 색인
+        self._compiled_rules = []
+        self._rules_by_target = {}
+        for rule in self.rules.get('conditional_rules', []):
+            condition = rule.get('condition', {})
+            enforce = rule.get('enforce', {})
+            compiled = CompiledRule(
+                condition=_compile_condition(condition),
+                condition_fields=(condition.get('field'),),
+                target=enforce.get('field'),
+                option_filter=_compile_enforce(enforce),
+                message=rule.get('error_message', rule.get('description', ''))
+            )
+            self._compiled_rules.append(compiled)
+            self._rules_by_target.setdefault(compiled.target, []).append(compiled)
+        
+        # 대상 필드별로 허용 옵션에 영향을 주는 필드 (캐시 키)
+        self._condition_fields = {
+            target: tuple(dict.fromkeys(f for rule in rules for f in rule.condition_fields))
+            for target, rules in self._rules_by_target.items()
+        }
+        self._options_cache = {}
+    
+    def _field_display(self, field: str) -> str:
+        return self._display_names.get(field, field)
     
     def get_model_info(self, model: str) -> Optional[Dict]:
         """
@@ -57,6 +169,11 @@ class EquipmentConfigValidator:
         if model_info:
             return model_info.get('category', 'unknown')
         
+        # 앱 공통 모델 레지스트리 (이 파일의 model_categories도 병합되어 있음)
+        if model_registry is not None:
+            category = model_registry.category_of(model)
+            return {model_registry.INDUSTRIAL: 'industrial', model_registry.RESEARCH: 'research'}.get(category, 'unknown')
+        
         # 카테고리 목록에서 찾기
         for category, models in self.rules.get('model_categories', {}).items():
             if model in models:
@@ -91,6 +208,8 @@ class EquipmentConfigValidator:
         """
         허용된 옵션 목록 반환 (조건부 규칙 적용)
         
+        결과는 (모델, 필드, 조건에 쓰이는 필드값)별로 캐시됩니다.
+        
         Args:
             model: 모델명
             field: 필드명
@@ -99,20 +218,22 @@ class EquipmentConfigValidator:
         Returns:
             허용된 옵션 리스트
         """
-        model_info = self.get_model_info(model)
-        if not model_info:
+        model_allowed = self._allowed.get(model)
+        if model_allowed is None:
             return []
         
-        field_info = model_info.get(field, {})
-        allowed = field_info.get('allowed', [])
-        
-        # 조건부 규칙 적용
-        if current_config:
-            allowed = self._apply_conditional_rules(
-                field, allowed, current_config
-            )
-        
-        return allowed
+        options = model_allowed.get(field, ())
+        if not current_config or field not in self._rules_by_target:
+            return list(options)
+        
+        key = (model, field, tuple(current_config.get(f, '') for f in self._condition_fields[field]))
+        cached = self._options_cache.get(key)
+        if cached is None:
+            cached = tuple(self._apply_conditional_rules(field, options, current_config))
+            if len(self._options_cache) >= OPTIONS_CACHE_SIZE:
+                self._options_cache.clear()
+            self._options_cache[key] = cached
+        return list(cached)
     
     def is_field_required(self, model: str, field: str) -> bool:
         """
@@ -125,12 +246,7 @@ class EquipmentConfigValidator:
         Returns:
             필수 여부
         """
-        model_info = self.get_model_info(model)
-        if not model_info:
-            return False
-        
-        field_info = model_info.get(field, {})
-        return field_info.get('required', False)
+        return field in self._required.get(model, ())
     
     def get_required_fields(self, model: str) -> List[str]:
         """
@@ -142,16 +258,7 @@ class EquipmentConfigValidator:
         Returns:
             필수 필드명 리스트
         """
-        model_info = self.get_model_info(model)
-        if not model_info:
-            return []
-        
-        required = []
-        for field, info in model_info.items():
-            if isinstance(info, dict) and info.get('required', False):
-                required.append(field)
-        
-        return required
+        return list(self._required.get(model, ()))
     
     def get_default_config(self, model: str) -> Dict[str, str]:
         """
@@ -178,28 +285,24 @@ class EquipmentConfigValidator:
             (검증 성공 여부, 오류 메시지 리스트)
         """
         errors = []
-        model_info = self.get_model_info(model)
+        allowed_sets = self._allowed_sets.get(model)
         
-        if not model_info:
+        if allowed_sets is None:
             errors.append(f"알 수 없는 모델: {model}")
             return False, errors
         
         # 1. 필수 필드 확인
-        for field in self.get_required_fields(model):
+        for field in self._required[model]:
             if not config.get(field):
-                field_display = self.rules.get('field_display_names', {}).get(field, field)
-                errors.append(f"필수 필드 누락: {field_display}")
+                errors.append(f"필수 필드 누락: {self._field_display(field)}")
         
         # 2. 허용 옵션 확인
         for field, value in config.items():
             if value:
-                field_info = model_info.get(field, {})
-                allowed = field_info.get('allowed', [])
-                
+                allowed = allowed_sets.get(field)
                 if allowed and value not in allowed:
-                    field_display = self.rules.get('field_display_names', {}).get(field, field)
                     errors.append(
-                        f"{field_display}: '{value}'는 {model}에서 사용할 수 없습니다"
+                        f"{self._field_display(field)}: '{value}'는 {model}에서 사용할 수 없습니다"
                     )
         
         # 3. 조건부 규칙 검증
@@ -208,6 +311,56 @@ class EquipmentConfigValidator:
         
         return len(errors) == 0, errors
     
+    def validate_many(self, items: Iterable[Tuple[str, Dict[str, str]]]) -> List[Tuple[bool, List[str]]]:
+        """
+        여러 구성 일괄 검증
+        
+        같은 (모델, 구성) 조합은 한 번만 검증합니다 (이력 데이터는 구성이 대부분 반복됨).
+        
+        Args:
+            items: (모델명, 구성 딕셔너리) 목록
+            
+        Returns:
+            입력 순서대로 (검증 성공 여부, 오류 메시지 리스트).
+            같은 조합의 결과는 같은 객체를 공유하므로 수정하지 마세요.
+        """
+        seen = {}
+        results = []
+        for model, config in items:
+            key = (model, tuple(config.items()))
+            result = seen.get(key)
+            if result is None:
+                result = seen[key] = self.validate_config(model, config)
+            results.append(result)
+        return results
+    
+    def validate_frame(self, df, model_col: str = 'model', fields: Optional[List[str]] = None):
+        """
+        장비 DataFrame(equipments 컬럼명) 일괄 검증
+        
+        Args:
+            df: model_col과 구성 필드 컬럼을 가진 DataFrame
+            fields: 검증할 구성 필드 (None이면 규칙 파일의 field_display_names)
+            
+        Returns:
+            DataFrame: is_valid, errors (df와 같은 index)
+        """
+        import pandas as pd
+        
+        fields = [f for f in (fields or self.config_fields) if f in df.columns]
+        values = df[fields].astype(object).where(df[fields].notna(), '')
+        
+        items = []
+        for model, row in zip(df[model_col], values.itertuples(index=False, name=None)):
+            config = {field: str(value).strip() for field, value in zip(fields, row) if str(value).strip()}
+            items.append((model, config))
+        
+        results = self.validate_many(items)
+        return pd.DataFrame(
+            {'is_valid': [r[0] for r in results], 'errors': [r[1] for r in results]},
+            index=df.index
+        )
+    
     def _apply_conditional_rules(self, target_field: str, 
                                  allowed_options: List[str],
                                  current_config: Dict[str, str]) -> List[str]:
@@ -222,33 +375,17 @@ class EquipmentConfigValidator:
         Returns:
             필터링된 옵션 리스트
         """
-        filtered = allowed_options.copy()
+        filtered = list(allowed_options)
         
-        for rule in self.rules.get('conditional_rules', []):
-            enforce = rule.get('enforce', {})
-            
-            # 이 규칙이 target_field에 적용되는가?
-            if enforce.get('field') != target_field:
-                continue
-            
-            # 조건 확인
-            if self._check_condition(rule.get('condition', {}), current_config):
-                # 조건부 강제 적용
-                operator = enforce.get('operator')
-                
-                if operator == 'must_contain':
-                    value = enforce.get('value')
-                    filtered = [opt for opt in filtered if value in opt]
-                
-                elif operator == 'must_be_one_of':
-                    values = enforce.get('values', [])
-                    filtered = [opt for opt in filtered if opt in values]
+        for rule in self._rules_by_target.get(target_field, ()):
+            if rule.option_filter is not None and rule.condition(current_config):
+                filtered = [opt for opt in filtered if rule.option_filter(opt)]
         
         return filtered
     
     def _check_condition(self, condition: Dict, config: Dict[str, str]) -> bool:
         """
-        조건 확인
+        조건 확인 (컴파일되지 않은 조건 딕셔너리용)
         
         Args:
             condition: 조건 딕셔너리
@@ -257,23 +394,7 @@ class EquipmentConfigValidator:
         Returns:
             조건 만족 여부
         """
-        field = condition.get('field')
-        operator = condition.get('operator')
-        value = condition.get('value')
-        
-        config_value = config.get(field, '')
-        
-        if not config_value:
-            return False
-        
-        if operator == 'contains':
-            return value in config_value
-        elif operator == 'equals':
-            return config_value == value
-        elif operator == 'not_equals':
-            return config_value != value
-        
-        return False
+        return _compile_condition(condition)(config)
     
     def _validate_conditional_rules(self, config: Dict[str, str]) -> List[str]:
         """
@@ -287,28 +408,12 @@ class EquipmentConfigValidator:
         """
         errors = []
         
-        for rule in self.rules.get('conditional_rules', []):
-            # 조건 확인
-            if self._check_condition(rule.get('condition', {}), config):
-                # 강제 조건 검증
-                enforce = rule.get('enforce', {})
-                field = enforce.get('field')
-                operator = enforce.get('operator')
-                config_value = config.get(field, '')
-                
-                is_valid = False
-                
-                if operator == 'must_contain':
-                    value = enforce.get('value')
-                    is_valid = value in config_value if config_value else False
-                
-                elif operator == 'must_be_one_of':
-                    values = enforce.get('values', [])
-                    is_valid = config_value in values if config_value else False
-                
+        for rule in self._compiled_rules:
+            if rule.condition(config):
+                config_value = config.get(rule.target, '')
+                is_valid = bool(config_value) and rule.option_filter is not None and rule.option_filter(config_value)
                 if not is_valid:
-                    error_msg = rule.get('error_message', rule.get('description', ''))
-                    errors.append(error_msg)
+                    errors.append(rule.message)
         
         return errors
 
@@ -7,6 +7,22 @@ import threading
 import requests
 from datetime import datetime
 
+from modules import metrics
+
+# NocoDB API 응답 시간 (Prometheus, METRICS_PORT 기본 9110)
+NOCODB_REQUEST_SECONDS = metrics.histogram(
+    'nocodb_request_seconds', 'NocoDB API response time', ['method', 'status'])
+
+
+def _observe_response(response, *args, **kwargs):
+    NOCODB_REQUEST_SECONDS.labels(response.request.method, str(response.status_code)).observe(
+        response.elapsed.total_seconds())
+
+
+# 모든 NocoDB 호출은 이 세션 사용 (연결 재사용 + 응답 시간 기록)
+http = requests.Session()
+http.hooks['response'].append(_observe_response)
+
 class MigrationToolGUI:
     def __init__(self, root):
         self.root = root
@@ -253,7 +269,7 @@ class MigrationToolGUI:
                 try:
                     headers = {"xc-token": self.API_TOKEN}
                     table_meta_url = f"{self.BASE_URL}/meta/tables/{self.TABLE_IDS['Equipments']}"
-                    response = requests.get(table_meta_url, headers=headers)
+                    response = http.get(table_meta_url, headers=headers)
                     
                     if response.status_code == 200:
                         table_meta = response.json()
@@ -488,7 +504,7 @@ class MigrationToolGUI:
                     headers = {"xc-token": self.API_TOKEN}
                     # 2번 방식: /meta/tables/{tableId}
                     table_meta_url = f"{self.BASE_URL}/meta/tables/{self.TABLE_IDS['Equipments']}"
-                    response = requests.get(table_meta_url, headers=headers)
+                    response = http.get(table_meta_url, headers=headers)
                     
                     if response.status_code == 200:
                         table_meta = response.json()
@@ -849,7 +865,7 @@ class MigrationToolGUI:
                                 else:
                                     payload[col] = val
                 
-                response = requests.post(url_equip, headers=headers, json=payload)
+                response = http.post(url_equip, headers=headers, json=payload)
                 
                 if response.status_code in [200, 201]:
                     self.migration_state['uploaded_count'] += 1
@@ -942,7 +958,7 @@ class MigrationToolGUI:
                                 else:
                                     payload[col] = val
                 
-                response = requests.post(url_equip, headers=headers, json=payload)
+                response = http.post(url_equip, headers=headers, json=payload)
                 
                 if response.status_code in [200, 201]:
                     uploaded_count += 1
@@ -1004,7 +1020,7 @@ class MigrationToolGUI:
                 "sort": "Id"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = http.get(url, headers=headers, params=params)
             
             if response.status_code != 200:
                 self.log(f"❌ NocoDB API 오류: {response.status_code}")
@@ -1042,7 +1058,7 @@ class MigrationToolGUI:
                 "limit": 10000
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = http.get(url, headers=headers, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -1334,7 +1350,7 @@ class MigrationToolGUI:
                         "sort": "Id"
                     }
                     
-                    response = requests.get(url, headers=headers, params=params)
+                    response = http.get(url, headers=headers, params=params)
                     
                     if response.status_code == 200:
                         data = response.json()
@@ -1451,6 +1467,7 @@ class MigrationToolGUI:
 
 
 if __name__ == "__main__":
+    metrics.start_http_server(port=int(os.environ.get('METRICS_PORT', 9110)))
     root = tk.Tk()
     app = MigrationToolGUI(root)
     root.mainloop()
@@ -1,14 +1,22 @@
 """
 Control Chart Plotly 시각화 함수
 """
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Tuple
-from .utils import calculate_stats, detect_rule_of_seven, detect_trend_violations, RESEARCH_MODELS, INDUSTRIAL_MODELS
+from .utils import calculate_stats, detect_rule_of_seven, detect_trend_violations
+from . import metrics
+from . import model_registry
+from .lazy_imports import lazy_module
 
+px = lazy_module('plotly.express')  # 막대 차트를 그릴 때 import
+
+CHART_SECONDS = metrics.histogram(
+    'control_chart_chart_build_seconds', 'Plotly figure build time', ['chart'])
+
+@metrics.timed(CHART_SECONDS, 'control')
 def create_control_chart(
     df: pd.DataFrame,
     group_col: str,
@@ -99,15 +107,7 @@ def create_control_chart(
         models = group_data['Model'].values if 'Model' in group_data.columns else [''] * len(dates)
         
         # Marker Colors based on Model Type (Research vs Industrial)
-        marker_symbols = []
-        
-        for m in models:
-            if m in RESEARCH_MODELS:
-                marker_symbols.append('diamond')
-            elif m in INDUSTRIAL_MODELS:
-                marker_symbols.append('circle')
-            else:
-                marker_symbols.append('circle')
+        marker_symbols = model_registry.marker_symbols(models)
         
         # 통계 계산
         stats = calculate_stats(values)
@@ -256,6 +256,7 @@ def create_control_chart(
     return fig
 
 
+@metrics.timed(CHART_SECONDS, 'individual')
 def create_individual_chart(
     group_data: pd.DataFrame,
     group_name: str,
@@ -278,14 +279,7 @@ def create_individual_chart(
     models = group_data['Model'].values if 'Model' in group_data.columns else [''] * len(dates)
     
     # Marker Symbols
-    marker_symbols = []
-    for m in models:
-        if m in RESEARCH_MODELS:
-            marker_symbols.append('diamond')
-        elif m in INDUSTRIAL_MODELS:
-            marker_symbols.append('circle')
-        else:
-            marker_symbols.append('circle')
+    marker_symbols = model_registry.marker_symbols(models)
             
     # 통계 계산
     stats = calculate_stats(values)
@@ -410,51 +404,114 @@ def create_individual_chart(
     
     return fig
 
-def plot_sunburst_chart(df: pd.DataFrame, path: List[str] = None) -> go.Figure:
+# 시간 단위 경로 (date 컬럼에서 파생)
+SUNBURST_TIME_UNITS = ['Year', 'YearQuarter', 'YearMonth']
+
+# 노드 id 구분자 (라벨에 '/'가 들어갈 수 있으므로 제어 문자 사용)
+_SUNBURST_ID_SEP = '\x1f'
+
+
+def _sunburst_level(df: pd.DataFrame, col: str) -> pd.Series:
+    """Sunburst 경로 한 단계의 라벨 (결측/빈 값은 '미지정')"""
+    if col in SUNBURST_TIME_UNITS:
+        dates = pd.to_datetime(df['date'], errors='coerce') if 'date' in df.columns else pd.Series(pd.NaT, index=df.index)
+        if col == 'Year':
+            labels = dates.dt.year.astype('Int64').astype(str)
+        elif col == 'YearQuarter':
+            labels = dates.dt.year.astype('Int64').astype(str) + '-Q' + dates.dt.quarter.astype('Int64').astype(str)
+        else:
+            labels = dates.dt.strftime('%Y-%m')
+        return labels.where(dates.notna(), '미지정')
+    
+    if col not in df.columns:
+        return pd.Series('미지정', index=df.index)
+    
+    labels = df[col].astype(object).where(df[col].notna(), '미지정').astype(str)
+    return labels.replace({'': '미지정', 'nan': '미지정', 'None': '미지정'})
+
+
+def build_sunburst_hierarchy(df: pd.DataFrame, path: List[str]) -> Dict[str, list]:
     """
-    계층형 Sunburst 차트 생성
+    Sunburst 계층 데이터 생성 (ids / labels / parents / values)
+    
+    장비 행 전체를 px.sunburst에 넘기지 않고, 경로 컬럼으로 groupby().size()를
+    한 번 수행한 뒤 상위 단계는 집계 결과만 다시 합산합니다.
+    결과 크기는 장비 수가 아니라 노드 수에 비례합니다.
+    
+    Returns:
+        dict: go.Sunburst에 바로 넘길 수 있는 ids, labels, parents, values
     """
-    # 데이터가 없으면 빈 차트 반환
-    if df.empty:
-        return go.Figure()
+    hierarchy = {'ids': [], 'labels': [], 'parents': [], 'values': []}
+    if df.empty or not path:
+        return hierarchy
+    
+    levels = pd.DataFrame({col: _sunburst_level(df, col) for col in path})
+    leaf_counts = levels.groupby(list(path), sort=True).size()
+    
+    for depth in range(1, len(path) + 1):
+        if depth == len(path):
+            counts = leaf_counts
+        else:
+            counts = leaf_counts.groupby(level=list(range(depth)), sort=True).sum()
         
+        keys = counts.index.to_list() if depth > 1 else [(k,) for k in counts.index.to_list()]
+        for key, value in zip(keys, counts.to_list()):
+            hierarchy['ids'].append(_SUNBURST_ID_SEP.join(key))
+            hierarchy['labels'].append(key[-1])
+            hierarchy['parents'].append(_SUNBURST_ID_SEP.join(key[:-1]))
+            hierarchy['values'].append(int(value))
+    
+    return hierarchy
+
+
+@metrics.timed(CHART_SECONDS, 'sunburst')
+def plot_sunburst_chart(df: pd.DataFrame, path: List[str] = None, hierarchy: Dict[str, list] = None) -> go.Figure:
+    """
+    계층형 Sunburst 차트 생성
+    
+    Args:
+        df: 장비 DataFrame (hierarchy가 주어지면 사용하지 않음)
+        path: 계층 구조 (예: ['Year', 'ri', 'model'])
+        hierarchy: build_sunburst_hierarchy 결과 (캐시된 값 재사용 시)
+    """
     if path is None:
         path = ['ri', 'model']
-        
-    # Sunburst 차트 생성
-    # path: 계층 구조 (예: ['Year', 'ri', 'model'])
-    # values: 크기 (count) - 이미 집계된 데이터가 아니라면 count가 1인 컬럼을 추가해서 써야 함
-    
-    # 데이터프레임에 'count' 컬럼이 없다면 1로 채움 (개별 row가 1개 장비)
-    df = df.copy()
-    if 'count' not in df.columns:
-        df['count'] = 1
-        
-    # 데이터 전처리: Path 컬럼의 결측치/빈 문자열 처리
-    # Sunburst는 빈 문자열이나 NaN이 섞여 있으면 계층 구조 해석에 실패할 수 있음
-    for col in path:
-        if col in df.columns:
-            df[col] = df[col].fillna('미지정').astype(str)
-            df[col] = df[col].replace('', '미지정')
-            df[col] = df[col].replace('nan', '미지정') # str 변환 후 'nan' 문자열 처리
-        
-    fig = px.sunburst(
-        df,
-        path=path,
-        values='count',
-        title=f'장비 분포 ({", ".join(path)})'
-    )
     
-    fig.update_traces(textinfo="label+value+percent parent")
-    fig.update_layout(margin=dict(t=40, l=0, r=0, b=0))
+    if hierarchy is None:
+        # 데이터가 없으면 빈 차트 반환
+        if df is None or df.empty:
+            return go.Figure()
+        hierarchy = build_sunburst_hierarchy(df, path)
+    
+    fig = go.Figure(go.Sunburst(
+        ids=hierarchy['ids'],
+        labels=hierarchy['labels'],
+        parents=hierarchy['parents'],
+        values=hierarchy['values'],
+        branchvalues='total',
+        textinfo="label+value+percent parent"
+    ))
+    fig.update_layout(
+        title=f'장비 분포 ({", ".join(path)})',
+        margin=dict(t=40, l=0, r=0, b=0)
+    )
     
     return fig
 
-def create_model_bar_chart(df: pd.DataFrame, color_seq: list = None) -> go.Figure:
-    """Create a horizontal bar chart for model counts."""
+@metrics.timed(CHART_SECONDS, 'model_bar')
+def create_model_bar_chart(df: pd.DataFrame, color_seq: list = None,
+                           model_counts: pd.DataFrame = None) -> go.Figure:
+    """
+    Create a horizontal bar chart for model counts.
+    
+    model_counts(model, count)가 주어지면 df 대신 사용합니다 (SQL 집계 결과).
+    """
     # Count by model
-    model_counts = df['model'].value_counts().reset_index()
-    model_counts.columns = ['model', 'count']
+    if model_counts is None:
+        model_counts = df['model'].value_counts().reset_index()
+        model_counts.columns = ['model', 'count']
+    else:
+        model_counts = model_counts.dropna(subset=['model'])
     model_counts = model_counts.sort_values('count', ascending=True) # Sort for bar chart
     
     fig = px.bar(
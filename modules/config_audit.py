@@ -0,0 +1,197 @@
+"""
+Configuration Audit Job
+장비 구성 이력 일괄 검증 모듈
+
+- equipments를 id 순서로 chunk 단위 조회(keyset)하여 EquipmentConfigValidator로 검증
+- 위반 결과는 config_violations 테이블에 저장 (chunk 단위 트랜잭션)
+- 증분 실행: equipments 트리거가 채우는 config_audit_queue의 장비만 검사
+- 규칙 파일이 바뀌면(rules_version 변경) 전체 장비를 다시 검사
+"""
+import json
+import time
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+import pandas as pd
+
+from . import database as db
+
+AUDIT_CHUNK_SIZE = 5000
+
+_AUDIT_SELECT = ', '.join(['id'] + db.CONFIG_AUDIT_COLUMNS)
+
+
+def _load_validator():
+    # 루트 모듈 (modules 패키지 밖)
+    from equipment_config_validator import EquipmentConfigValidator
+    return EquipmentConfigValidator()
+
+
+def _get_state(conn) -> Dict[str, str]:
+    return dict(conn.execute("SELECT key, value FROM config_audit_state").fetchall())
+
+
+def _set_state(conn, **values):
+    conn.executemany(
+        "INSERT OR REPLACE INTO config_audit_state (key, value) VALUES (?, ?)",
+        list(values.items())
+    )
+
+
+def _iter_chunks(conn, full: bool, high_water: int, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """검사 대상 장비를 id 순서로 chunk_size씩 조회"""
+    if full:
+        query = f"SELECT {_AUDIT_SELECT} FROM equipments WHERE id > ? ORDER BY id LIMIT ?"
+        extra = []
+    else:
+        cols = ', '.join(f"e.{col}" for col in _AUDIT_SELECT.split(', '))
+        query = f"""
+            SELECT {cols}
+            FROM config_audit_queue q
+            JOIN equipments e ON e.id = q.equipment_id
+            WHERE q.seq <= ? AND e.id > ?
+            ORDER BY e.id
+            LIMIT ?
+        """
+        extra = [high_water]
+
+    last_id = 0
+    while True:
+        chunk = pd.read_sql_query(query, conn, params=extra + [last_id, chunk_size])
+        if chunk.empty:
+            return
+        yield chunk
+        last_id = int(chunk['id'].iloc[-1])
+
+
+def _audit_chunk(conn, validator, chunk: pd.DataFrame, checked_at: str) -> Dict[str, int]:
+    """chunk 검증 후 해당 장비들의 위반 기록을 교체"""
+    has_rules = chunk['model'].isin(validator.models)
+    targets = chunk[has_rules]
+
+    rows = []
+    if not targets.empty:
+        results = validator.validate_frame(targets)
+        invalid = targets[~results['is_valid']]
+        for row, errors in zip(invalid.itertuples(index=False), results.loc[invalid.index, 'errors']):
+            rows.append((
+                row.id, row.sid, row.equipment_name, row.model, row.status,
+                json.dumps(errors, ensure_ascii=False), validator.rules_version, checked_at
+            ))
+
+    ids = [(int(i),) for i in chunk['id']]
+    conn.executemany("DELETE FROM config_violations WHERE equipment_id = ?", ids)
+    conn.executemany("""
+        INSERT INTO config_violations
+            (equipment_id, sid, equipment_name, model, status, errors, rules_version, checked_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    conn.commit()
+    return {'checked': len(targets), 'skipped': len(chunk) - len(targets), 'violations': len(rows)}
+
+
+def run_config_audit(full: bool = False, chunk_size: int = AUDIT_CHUNK_SIZE, validator=None) -> Dict:
+    """
+    장비 구성 일괄 검증 실행
+
+    Args:
+        full: True면 대기열과 관계없이 전체 장비 검사
+        chunk_size: 한 번에 조회/검증할 장비 수
+        validator: EquipmentConfigValidator (None이면 규칙 파일에서 생성)
+
+    Returns:
+        dict: mode('full'/'incremental'), checked, skipped(규칙 없는 모델),
+              violations(이번 실행에서 발견), seconds, rows_per_sec, rules_version, finished_at
+    """
+    validator = validator or _load_validator()
+    conn = db.get_connection()
+    state = _get_state(conn)
+    full = full or state.get('rules_version') != validator.rules_version
+
+    # 실행 중 새로 등록되는 장비(seq > high_water)는 다음 실행으로 넘김
+    high_water = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM config_audit_queue").fetchone()[0]
+    checked_at = datetime.now().isoformat(timespec='seconds')
+
+    start = time.perf_counter()
+    totals = {'checked': 0, 'skipped': 0, 'violations': 0}
+    for chunk in _iter_chunks(conn, full, high_water, chunk_size):
+        for key, value in _audit_chunk(conn, validator, chunk, checked_at).items():
+            totals[key] += value
+    seconds = time.perf_counter() - start
+
+    summary = {
+        'mode': 'full' if full else 'incremental',
+        **totals,
+        'seconds': round(seconds, 3),
+        'rows_per_sec': round((totals['checked'] + totals['skipped']) / seconds) if seconds > 0 else 0,
+        'rules_version': validator.rules_version,
+        'finished_at': datetime.now().isoformat(timespec='seconds'),
+    }
+
+    conn.execute("DELETE FROM config_audit_queue WHERE seq <= ?", (high_water,))
+    _set_state(conn, rules_version=validator.rules_version, last_run=json.dumps(summary))
+    conn.commit()
+    conn.close()
+    return summary
+
+
+def get_audit_summary() -> Dict:
+    """
+    검증 현황 (관리자 탭 표시용)
+
+    Returns:
+        dict: violations(위반 장비 수), pending(검증 대기 장비 수),
+              rules_version(마지막 검증 규칙), last_run(마지막 실행 요약 또는 None)
+    """
+    conn = db.get_connection()
+    violations = conn.execute("SELECT COUNT(*) FROM config_violations").fetchone()[0]
+    pending = conn.execute("SELECT COUNT(*) FROM config_audit_queue").fetchone()[0]
+    state = _get_state(conn)
+    conn.close()
+
+    return {
+        'violations': violations,
+        'pending': pending,
+        'rules_version': state.get('rules_version'),
+        'last_run': json.loads(state['last_run']) if 'last_run' in state else None,
+    }
+
+
+def get_violation_counts() -> pd.DataFrame:
+    """
+    모델별 위반 장비 수
+
+    Returns:
+        DataFrame: model, count (count 내림차순)
+    """
+    conn = db.get_connection()
+    df = pd.read_sql_query("""
+        SELECT model, COUNT(*) AS count
+        FROM config_violations
+        GROUP BY model
+        ORDER BY count DESC, model
+    """, conn)
+    conn.close()
+    return df
+
+
+def get_violations(model: Optional[str] = None) -> pd.DataFrame:
+    """
+    위반 장비 목록
+
+    Returns:
+        DataFrame: sid, equipment_name, model, status, errors(list), checked_at
+    """
+    query = "SELECT sid, equipment_name, model, status, errors, checked_at FROM config_violations"
+    params = []
+    if model is not None:
+        query += " WHERE model = ?"
+        params.append(model)
+    query += " ORDER BY model, equipment_name"
+
+    conn = db.get_connection()
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+
+    df['errors'] = df['errors'].map(json.loads)
+    return df
@@ -0,0 +1,256 @@
+"""
+Local Workbook Loader
+로컬 data.xlsx 자동 로드 모듈
+
+- 워크북을 한 번만 읽고(bytes) 시트별 파싱을 프로세스 풀에서 병렬 수행
+- 파싱이 끝난 시트부터 DB 일괄 저장(sync_relational_stream)으로 바로 전달
+- 파일 내용 해시(SHA-256) 기반 Parquet 캐시: data.xlsx가 바뀌지 않았다면 Excel 파싱 생략
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from . import database as db
+
+SHEET_NAMES = ['Equipments', 'Measurements', 'Specs']
+OPTIONAL_SHEETS = {'Specs'}
+
+# 이보다 작은 파일은 프로세스 기동 비용이 더 크므로 순차 파싱
+PARALLEL_MIN_BYTES = 512 * 1024
+
+CACHE_DIR_NAME = '.cache'
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401  (Parquet 엔진)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+def _parse_sheet(content: bytes, sheet_name: str) -> Optional[pd.DataFrame]:
+    """
+    워크북 bytes에서 시트 하나를 파싱 (프로세스 풀 worker)
+
+    Returns:
+        DataFrame, 선택 시트(Specs)가 없으면 None
+    """
+    try:
+        return pd.read_excel(io.BytesIO(content), sheet_name=sheet_name)
+    except ValueError:
+        # Worksheet not found
+        if sheet_name in OPTIONAL_SHEETS:
+            return None
+        raise
+
+
+def content_hash(content: bytes) -> str:
+    """워크북 내용 해시 (캐시 키)"""
+    return hashlib.sha256(content).hexdigest()
+
+
+# ============================================================
+# Parquet Cache
+# ============================================================
+
+def _cache_dir(path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+
+
+def _manifest_path(cache_dir: str, digest: str) -> str:
+    return os.path.join(cache_dir, f"{digest}.json")
+
+
+def _sheet_cache_path(cache_dir: str, digest: str, sheet_name: str) -> str:
+    return os.path.join(cache_dir, f"{digest}_{sheet_name}.parquet")
+
+
+def _normalize_for_parquet(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    타입이 섞인 object 컬럼을 문자열로 통일 (Parquet 저장용)
+
+    예: 종료일 컬럼에 datetime과 문자열이 함께 있는 경우.
+    DB 저장 시에도 문자열로 변환되므로 결과는 동일합니다.
+    """
+    out = df.copy()
+    out.columns = [str(col) for col in out.columns]
+    for col in out.columns:
+        if out[col].dtype != object:
+            continue
+        non_null = out[col].dropna()
+        if non_null.map(type).nunique() > 1:
+            out[col] = out[col].where(out[col].isna(), out[col].astype(str))
+    return out
+
+
+def read_cache(path: str, digest: str) -> Optional[Dict[str, Optional[pd.DataFrame]]]:
+    """
+    캐시된 시트 읽기
+
+    Returns:
+        dict: 시트명 -> DataFrame (캐시 없음/손상 시 None)
+    """
+    if not PARQUET_AVAILABLE:
+        return None
+
+    cache_dir = _cache_dir(path)
+    manifest = _manifest_path(cache_dir, digest)
+    if not os.path.exists(manifest):
+        return None
+
+    try:
+        with open(manifest, 'r', encoding='utf-8') as f:
+            present = json.load(f)['sheets']
+        return {
+            sheet: pd.read_parquet(_sheet_cache_path(cache_dir, digest, sheet)) if sheet in present else None
+            for sheet in SHEET_NAMES
+        }
+    except Exception as e:
+        logger.warning("Parquet cache read failed (%s): %s", digest[:12], e)
+        return None
+
+
+def write_cache(path: str, digest: str, sheets: Dict[str, Optional[pd.DataFrame]]):
+    """
+    시트를 Parquet로 캐시하고 이전 버전 캐시는 삭제
+
+    manifest(json)는 모든 시트 저장 후 마지막에 기록하므로
+    중간에 실패한 캐시는 읽히지 않습니다.
+    """
+    if not PARQUET_AVAILABLE:
+        return
+
+    cache_dir = _cache_dir(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # 이전 내용 해시의 캐시 정리
+        for name in os.listdir(cache_dir):
+            if not name.startswith(digest):
+                os.remove(os.path.join(cache_dir, name))
+
+        present = []
+        for sheet, df in sheets.items():
+            if df is None:
+                continue
+            _normalize_for_parquet(df).to_parquet(_sheet_cache_path(cache_dir, digest, sheet), index=False)
+            present.append(sheet)
+
+        with open(_manifest_path(cache_dir, digest), 'w', encoding='utf-8') as f:
+            json.dump({'sheets': present, 'source': os.path.basename(path)}, f)
+    except Exception as e:
+        # 캐시는 선택 사항이므로 실패해도 로드는 계속
+        logger.warning("Parquet cache write failed (%s): %s", digest[:12], e)
+
+
+# ============================================================
+# Parsing
+# ============================================================
+
+def iter_parsed_sheets(content: bytes, parallel: Optional[bool] = None) -> Iterator[Tuple[str, Optional[pd.DataFrame]]]:
+    """
+    시트를 파싱이 끝나는 순서대로 반환
+
+    Args:
+        content: 워크북 bytes
+        parallel: None이면 파일 크기로 자동 결정
+
+    Yields:
+        (시트명, DataFrame 또는 None)
+    """
+    if parallel is None:
+        parallel = len(content) >= PARALLEL_MIN_BYTES
+
+    if parallel:
+        try:
+            executor = ProcessPoolExecutor(max_workers=len(SHEET_NAMES))
+        except (OSError, NotImplementedError) as e:
+            # 프로세스 생성이 불가한 환경 (일부 컨테이너 등) → 순차 처리
+            logger.warning("Process pool unavailable, parsing sequentially: %s", e)
+            parallel = False
+
+    if not parallel:
+        for sheet in SHEET_NAMES:
+            yield sheet, _parse_sheet(content, sheet)
+        return
+
+    with executor:
+        futures = {executor.submit(_parse_sheet, content, sheet): sheet for sheet in SHEET_NAMES}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def load_workbook_sheets(path: str, use_cache: bool = True,
+                         parallel: Optional[bool] = None) -> Dict[str, Optional[pd.DataFrame]]:
+    """
+    data.xlsx의 Equipments / Measurements / Specs 시트 로드
+
+    Returns:
+        dict: 시트명 -> DataFrame (Specs 시트가 없으면 None)
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    digest = content_hash(content)
+
+    if use_cache:
+        cached = read_cache(path, digest)
+        if cached is not None:
+            return cached
+
+    sheets = dict(iter_parsed_sheets(content, parallel))
+    if use_cache:
+        write_cache(path, digest, sheets)
+    return sheets
+
+
+def sync_local_workbook(path: str, use_cache: bool = True,
+                        parallel: Optional[bool] = None, mode: str = 'full') -> Dict[str, object]:
+    """
+    로컬 워크북을 읽어 DB에 동기화 (승인 상태)
+
+    - mode='full': 전체 재적재. 캐시가 있으면 Parquet에서 바로 적재하고,
+      없으면 시트 파싱과 DB 기록을 파이프라인으로 겹쳐 실행한 뒤 캐시를 남깁니다.
+    - mode='delta': 변경분만 반영 (db.sync_relational_delta)
+
+    Returns:
+        full: {'equipments', 'measurements', 'specs', 'cache_hit'} (저장 건수)
+        delta: {'equipments', 'measurements', 'specs', 'cache_hit'} (항목별 변경 요약)
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    digest = content_hash(content)
+
+    cached = read_cache(path, digest) if use_cache else None
+
+    if mode == 'delta':
+        sheets = cached if cached is not None else dict(iter_parsed_sheets(content, parallel))
+        if cached is None and use_cache:
+            write_cache(path, digest, sheets)
+        result = db.sync_relational_delta(sheets['Equipments'], sheets['Measurements'], sheets['Specs'])
+        result['cache_hit'] = cached is not None
+        return result
+
+    if cached is not None:
+        result = db.sync_relational_stream(cached.items())
+        result['cache_hit'] = True
+        return result
+
+    parsed = {}
+
+    def _collect():
+        for sheet, df in iter_parsed_sheets(content, parallel):
+            parsed[sheet] = df
+            yield sheet, df
+
+    result = db.sync_relational_stream(_collect())
+    if use_cache:
+        write_cache(path, digest, parsed)
+    result['cache_hit'] = False
+    return result
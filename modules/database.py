@@ -2,19 +2,154 @@
 SQLite Database Management for Control Chart App
 Normalized Schema: Equipments (Master) + Measurements (Transaction)
 """
+import atexit
+import logging
 import sqlite3
 import pandas as pd
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterable, Optional, Mapping, Tuple
+
+from . import metrics
+from . import sql_trace
+from .utils import normalize_key
 
 DB_FILE = "data/control_chart.db"
 
+logger = logging.getLogger(__name__)
+
+# ============================================================
+# Metrics (Prometheus, modules/metrics.py)
+# ============================================================
+
+DB_QUERY_SECONDS = metrics.histogram(
+    'control_chart_db_query_seconds',
+    'SQL time per database function (sum of statements on one connection, recorded on close)', ['function'])
+CACHE_LOOKUPS = metrics.counter(
+    'control_chart_cache_lookups_total', 'Process cache lookups', ['cache', 'result'])
+INGEST_ROWS = metrics.counter(
+    'control_chart_ingest_rows_total', 'Rows written by ingest path (delta: inserted + updated + deleted)', ['path', 'table'])
+INGEST_SECONDS = metrics.histogram(
+    'control_chart_ingest_seconds', 'Ingest duration', ['path'],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600))
+APPROVAL_WAIT_SECONDS = metrics.histogram(
+    'control_chart_approval_wait_seconds', 'Time from upload to approve/reject decision', ['action'],
+    buckets=(60, 600, 3600, 4 * 3600, 86400, 3 * 86400, 7 * 86400, 30 * 86400))
+
+
+@sql_trace.on_connection_closed
+def _observe_db_query(function: str, seconds: float):
+    DB_QUERY_SECONDS.labels(function).observe(seconds)
+
+
+def _observe_cache(cache: str, hits: int, misses: int):
+    if hits:
+        CACHE_LOOKUPS.labels(cache, 'hit').inc(hits)
+    if misses:
+        CACHE_LOOKUPS.labels(cache, 'miss').inc(misses)
+
+
+def _observe_ingest(path: str, result: Dict[str, Any], seconds: float):
+    """적재 경로별 행 수/시간 (rows/sec = rate(ingest_rows_total))"""
+    INGEST_SECONDS.labels(path).observe(seconds)
+    for table, rows in result.items():
+        if isinstance(rows, dict):
+            rows = rows.get('inserted', 0) + rows.get('updated', 0) + rows.get('deleted', 0)
+        INGEST_ROWS.labels(path, table).inc(rows)
+
+
+def _observe_approval_wait(c, equip_id: int, action: str):
+    # uploaded_at은 CURRENT_TIMESTAMP(UTC)이므로 julianday('now')와 비교
+    row = c.execute(
+        "SELECT (julianday('now') - julianday(uploaded_at)) * 86400 FROM equipments WHERE id = ?", (equip_id,)
+    ).fetchone()
+    if row and row[0] is not None:
+        APPROVAL_WAIT_SECONDS.labels(action).observe(max(row[0], 0.0))
+
+
+# ============================================================
+# Schema Migrations (PRAGMA user_version)
+# ============================================================
+
+# PRAGMA user_version이 적용된 마지막 단계 번호입니다. 단계는 추가만 하고 수정하지 않습니다
+# (이미 적용된 DB에서는 다시 실행되지 않으므로 스키마 변경은 항상 새 단계로).
+# 모든 단계는 기존 DB(user_version = 0이지만 테이블이 이미 있는 경우)에서도 안전하게 다시 실행됩니다.
+MIGRATION_LOCK_TIMEOUT = 60  # 다른 프로세스가 마이그레이션 중일 때 기다리는 시간 (초)
+
+_migration_lock = threading.Lock()
+
+
 def init_db():
-    """Initialize the database with normalized tables."""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
+    """
+    Initialize the database (스키마 마이그레이션 적용)
+    
+    최신 버전이면 PRAGMA user_version 한 번만 읽고 끝나므로 세션마다 호출해도 됩니다.
+    아니면 프로세스 잠금 + BEGIN IMMEDIATE(다른 프로세스) 안에서 남은 단계만 순서대로 적용합니다.
+    """
+    if get_schema_version() >= SCHEMA_VERSION:
+        return
+    
+    with _migration_lock:
+        conn = sql_trace.connect(DB_FILE, timeout=MIGRATION_LOCK_TIMEOUT)
+        try:
+            _apply_migrations(conn)
+        finally:
+            conn.close()
+
+
+def get_schema_version() -> int:
+    """DB에 적용된 마이그레이션 단계 (PRAGMA user_version)"""
+    conn = get_connection()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    return version
+
+
+def _apply_migrations(conn):
+    """남은 마이그레이션을 단계별 트랜잭션으로 적용 (다른 스레드/프로세스가 먼저 적용했으면 건너뜀)"""
+    # WAL 모드: 쓰기(동기화/재적재) 중에도 읽기는 일관된 스냅샷을 봅니다 (DB 파일에 영구 설정, 트랜잭션 밖에서만 가능)
+    conn.execute("PRAGMA journal_mode=WAL")
     
+    c = conn.cursor()
+    applied = False
+    for version, _, step in MIGRATIONS:
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            if c.execute("PRAGMA user_version").fetchone()[0] >= version:
+                conn.rollback()
+                continue
+            step(c)
+            c.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+            applied = True
+        except Exception:
+            conn.rollback()
+            raise
+    
+    if applied:
+        _refresh_query_stats(c)
+        conn.commit()
+
+
+def _table_columns(c, table: str) -> set:
+    c.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in c.fetchall()}
+
+
+def _add_columns(c, table: str, columns: List[Tuple[str, str]]):
+    """없는 컬럼만 추가 (ALTER TABLE 실패를 무시하는 대신 스키마를 확인)"""
+    existing = _table_columns(c, table)
+    for name, decl in columns:
+        if name not in existing:
+            c.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+
+def _migration_base_tables(c):
     # 1. Equipments Table (Master Data)
     # 장비의 고유 스펙을 관리합니다.
     # SID Number를 Primary Key(또는 Unique Key)로 사용합니다.
@@ -56,7 +191,7 @@ def init_db():
             FOREIGN KEY (equipment_id) REFERENCES equipments (id)
         )
     ''')
-
+    
     # 3. Specs Table (Standards)
     # 모델별/항목별 관리 기준 (LSL, USL, Target)
     c.execute('''
@@ -69,7 +204,7 @@ def init_db():
             PRIMARY KEY (model, check_item)
         )
     ''')
-
+    
     # 4. Approve History Table (Approval/Rejection tracking)
     # 모든 승인/반려 이력을 기록합니다
     c.execute('''
@@ -89,18 +224,6 @@ def init_db():
         )
     ''')
     
-    # Add equipment_name column if not exists (migration for existing DBs)
-    try:
-        c.execute("ALTER TABLE approval_history ADD COLUMN equipment_name TEXT")
-    except:
-        pass  # Column already exists
-    
-    # Rename timestamp to action_at if exists (migration)
-    try:
-        c.execute("ALTER TABLE approval_history RENAME COLUMN timestamp TO action_at")
-    except:
-        pass  # Already renamed or doesn't exist
-
     # 5. Pending Measurements Table (Staging Area)
     # 업로드된 원본 데이터를 검증 전까지 그대로 보관하는 테이블
     c.execute('''
@@ -122,101 +245,93 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+
+
+def _migration_legacy_columns(c):
+    # approval_history: equipment_name 추가, timestamp -> action_at
+    _add_columns(c, 'approval_history', [('equipment_name', 'TEXT')])
+    columns = _table_columns(c, 'approval_history')
+    if 'timestamp' in columns and 'action_at' not in columns:
+        c.execute("ALTER TABLE approval_history RENAME COLUMN timestamp TO action_at")
     
-    # Migration: Add new columns if they don't exist (for backward compatibility)
-    
-    # Equipments table migrations
-    try:
-        c.execute("ALTER TABLE equipments ADD COLUMN end_user TEXT")
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-    
-    try:
-        c.execute("ALTER TABLE equipments ADD COLUMN mfg_engineer TEXT")
-    except sqlite3.OperationalError:
-        pass
-    
-    try:
-        c.execute("ALTER TABLE equipments ADD COLUMN qc_engineer TEXT")
-    except sqlite3.OperationalError:
-        pass
-    
-    try:
-        c.execute("ALTER TABLE equipments ADD COLUMN reference_doc TEXT")
-    except sqlite3.OperationalError:
-        pass
-    
-    # Measurements table migrations
-    try:
-        c.execute("ALTER TABLE measurements ADD COLUMN sid TEXT")
-    except sqlite3.OperationalError:
-        pass
-    
-    try:
-        c.execute("ALTER TABLE measurements ADD COLUMN equipment_name TEXT")
-    except sqlite3.OperationalError:
-        pass
-    
-    try:
-        c.execute("ALTER TABLE measurements ADD COLUMN status TEXT DEFAULT 'pending'")
-    except sqlite3.OperationalError:
-        pass
-    
-    try:
-        c.execute("ALTER TABLE measurements ADD COLUMN check_items TEXT")
-    except sqlite3.OperationalError:
-        pass
+    # Equipments (Additional Info)
+    _add_columns(c, 'equipments', [
+        ('end_user', 'TEXT'), ('mfg_engineer', 'TEXT'), ('qc_engineer', 'TEXT'), ('reference_doc', 'TEXT'),
+    ])
     
+    # Measurements (denormalized columns + check_items)
+    _add_columns(c, 'measurements', [
+        ('sid', 'TEXT'), ('equipment_name', 'TEXT'), ('status', "TEXT DEFAULT 'pending'"), ('check_items', 'TEXT'),
+    ])
     # Data migration: Copy check_item to check_items if needed
-    try:
-        c.execute("""
-            UPDATE measurements 
-            SET check_items = check_item 
-            WHERE check_items IS NULL AND check_item IS NOT NULL
-        """)
-    except sqlite3.OperationalError:
-        pass
-    # pending_measurements table migrations
-    try:
-        c.execute("ALTER TABLE pending_measurements ADD COLUMN module TEXT")
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-    
-    # Add TEXT columns to preserve original data format (e.g. "0x6e31041e" stays as text)
-    try:
-        c.execute("ALTER TABLE pending_measurements ADD COLUMN min_text TEXT")
-    except sqlite3.OperationalError:
-        pass
-    
-    try:
-        c.execute("ALTER TABLE pending_measurements ADD COLUMN criteria_text TEXT")
-    except sqlite3.OperationalError:
-        pass
-    
-    try:
-        c.execute("ALTER TABLE pending_measurements ADD COLUMN max_text TEXT")
-    except sqlite3.OperationalError:
-        pass
+    c.execute("""
+        UPDATE measurements
+        SET check_items = check_item
+        WHERE check_items IS NULL AND check_item IS NOT NULL
+    """)
     
-    try:
-        c.execute("ALTER TABLE pending_measurements ADD COLUMN value_text TEXT")
-    except sqlite3.OperationalError:
-        pass
-    try:
-        c.execute("ALTER TABLE pending_measurements ADD COLUMN value_text TEXT")
-    except sqlite3.OperationalError:
-        pass
-        
-    # Equipment Table Migrations (Additional Info)
-    new_cols = ['end_user', 'mfg_engineer', 'qc_engineer', 'reference_doc']
-    for col in new_cols:
-        try:
-            c.execute(f"ALTER TABLE equipments ADD COLUMN {col} TEXT")
-        except sqlite3.OperationalError:
-            pass
+    # pending_measurements: module + 원문 보존용 TEXT 컬럼 (e.g. "0x6e31041e" stays as text)
+    _add_columns(c, 'pending_measurements', [
+        ('module', 'TEXT'), ('min_text', 'TEXT'), ('criteria_text', 'TEXT'),
+        ('max_text', 'TEXT'), ('value_text', 'TEXT'),
+    ])
+
+
+def _migration_ship_date(c):
+    # 정규화된 출하일 (YYYY-MM-DD, 파싱 불가 시 ''). date 원문은 형식이 섞여 있어
+    # SQL 범위 조건에 쓸 수 없으므로 backfill_ship_dates()가 채웁니다.
+    _add_columns(c, 'equipments', [('ship_date', 'TEXT')])
+
+
+def _migration_check_items(c):
+    # Check item dictionary (측정 항목명 -> 정수 ID)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS check_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_key TEXT NOT NULL UNIQUE,   -- normalize_key(항목명)
+            name TEXT NOT NULL               -- 표시명 (최초 등록된 원문)
+        )
+    ''')
+    for table in ITEM_ID_TABLES:
+        _add_columns(c, table, [('item_id', 'INTEGER')])
     
-    conn.commit()
-    conn.close()
+    # 기존 측정 행 item_id backfill
+    _backfill_check_item_ids(c)
+
+
+def _migration_derived_objects(c):
+    # Indexes / 월별 집계 / 검증 대기열 / 필터 카탈로그 / 트리거
+    # (shadow swap 시 이름이 번갈아 바뀌므로 두 이름 모두 확인)
+    _ensure_indexes(c)
+    _ensure_monthly_rollup(c)
+    _ensure_config_audit(c)
+    _ensure_filter_catalog(c)
+    _ensure_triggers(c)
+
+
+def _migration_analysis_usage(c):
+    # 분석 조회 이력 (모델, 항목)별 횟수 - 시작 시 자주 쓰는 데이터셋 예열(warm-up)에 사용
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS analysis_usage (
+            model TEXT NOT NULL,             -- '' = 모델 미선택
+            check_item TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            last_used TIMESTAMP,
+            PRIMARY KEY (model, check_item)
+        )
+    ''')
+
+
+# (버전, 설명, 단계) - 버전 순서대로 적용
+MIGRATIONS = [
+    (1, 'base tables', _migration_base_tables),
+    (2, 'legacy column additions / approval_history rename', _migration_legacy_columns),
+    (3, 'equipments.ship_date', _migration_ship_date),
+    (4, 'check item dictionary + item_id', _migration_check_items),
+    (5, 'indexes, rollup, audit queue, filter catalog, triggers', _migration_derived_objects),
+    (6, 'analysis usage log', _migration_analysis_usage),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
 
 def recreate_tables():
     """Drop and recreate tables (Force schema update)."""
@@ -225,13 +340,23 @@ def recreate_tables():
     c.execute("DROP TABLE IF EXISTS measurements")
     c.execute("DROP TABLE IF EXISTS equipments")
     c.execute("DROP TABLE IF EXISTS specs")
+    c.execute("PRAGMA user_version = 0")  # 모든 마이그레이션 다시 적용
     conn.commit()
     conn.close()
     init_db()
+    
+    conn = get_connection()
+    _rebuild_monthly_rollup(conn.cursor())
+    _reset_config_audit(conn.cursor())
+    _rebuild_filter_catalog(conn.cursor())
+    _bump_table_versions(conn.cursor(), ['equipments', 'measurements', 'specs'])
+    conn.commit()
+    conn.close()
+    invalidate_spec_cache()
 
 def get_connection():
-    """Get database connection."""
-    return sqlite3.connect(DB_FILE)
+    """Get database connection (문장별 실행 시간은 sql_trace에 기록)."""
+    return sql_trace.connect(DB_FILE)
 
 def sync_specs_from_dataframe(df: pd.DataFrame):
     """
@@ -244,170 +369,1197 @@ def sync_specs_from_dataframe(df: pd.DataFrame):
     conn = get_connection()
     c = conn.cursor()
     
-    # Clear existing specs (Full Replace strategy for specs too)
-    c.execute("DELETE FROM specs")
+    # Full Replace와 같은 결과지만 변경된 규격만 반영 (테이블을 비우지 않음)
+    summary = _delta_write_specs(c, df)
+        
+    conn.commit()
+    conn.close()
+    invalidate_spec_cache()
+    return summary
+
+# ============================================================
+# Spec Cache (규격 조회 캐시)
+# ============================================================
+
+# specs 테이블 전체를 프로세스 메모리에 보관 (읽기 전용 매핑)
+# 규격이 동기화되면 invalidate_spec_cache()로 폐기 후 다음 조회 시 다시 로드합니다.
+_spec_map = None
+_spec_frame = None
+_spec_lock = threading.Lock()
+
+
+def _load_spec_cache():
+    global _spec_map, _spec_frame
+    with _spec_lock:
+        if _spec_map is None:
+            conn = get_connection()
+            rows = conn.execute("SELECT model, check_item, lsl, usl, target FROM specs").fetchall()
+            conn.close()
+            
+            _spec_frame = pd.DataFrame(rows, columns=['model', 'check_item', 'LSL', 'USL', 'Target'])
+            _spec_map = MappingProxyType({(m, item): (lsl, usl, target) for m, item, lsl, usl, target in rows})
+        return _spec_map, _spec_frame
+
+
+def invalidate_spec_cache():
+    """규격 캐시 폐기 (specs 테이블 변경 후 호출)"""
+    global _spec_map, _spec_frame
+    with _spec_lock:
+        _spec_map = None
+        _spec_frame = None
+
+
+def get_spec_map() -> Mapping[Tuple[str, str], Tuple[Optional[float], Optional[float], Optional[float]]]:
+    """
+    (model, check_item) -> (lsl, usl, target) 읽기 전용 매핑
+    """
+    spec_map = _spec_map
+    _observe_cache('spec', spec_map is not None, spec_map is None)
+    if spec_map is None:
+        spec_map, _ = _load_spec_cache()
+    return spec_map
+
+
+def get_spec_for_item(model: str, check_item: str) -> Dict[str, Optional[float]]:
+    """Get spec limits for a specific model and check item."""
+    res = get_spec_map().get((model, check_item))
+    
+    if res:
+        return {'lsl': res[0], 'usl': res[1], 'target': res[2]}
+    return {'lsl': None, 'usl': None, 'target': None}
+
+
+def attach_specs(df: pd.DataFrame, model_col: str = 'Model', item_col: str = 'Check Items') -> pd.DataFrame:
+    """
+    분석용 DataFrame에 LSL / USL / Target 컬럼을 한 번의 join으로 추가
+    
+    모델이 여러 개 섞인 데이터도 행마다 해당 모델의 규격이 붙으므로
+    (df['Value'] < df['LSL']) | (df['Value'] > df['USL']) 로 바로 스펙 이탈을 판정할 수 있습니다.
+    
+    Returns:
+        DataFrame: 원본 index 유지, 규격이 없는 행은 NaN
+    """
+    out = df.drop(columns=['LSL', 'USL', 'Target'], errors='ignore')
+    if model_col not in out.columns or item_col not in out.columns:
+        return out.assign(LSL=float('nan'), USL=float('nan'), Target=float('nan'))
+    
+    spec_frame = _spec_frame
+    if spec_frame is None:
+        _, spec_frame = _load_spec_cache()
+    
+    specs = spec_frame.rename(columns={'model': model_col, 'check_item': item_col}).set_index([model_col, item_col])
+    return out.join(specs[['LSL', 'USL', 'Target']].astype(float), on=[model_col, item_col])
+
+
+# ============================================================
+# Bulk Sync (로컬 data.xlsx 일괄 적재)
+# ============================================================
+
+SPEC_COL_MAP = {'Model': 'model', 'Check Item': 'check_item', 'LSL': 'lsl', 'USL': 'usl', 'Target': 'target'}
+
+# Expected columns: SID, 장비명, 종료일, R/I, Model, ...
+EQUIP_COL_MAP = {
+    'SID': 'sid', '장비명': 'equipment_name', '종료일': 'date', 'R/I': 'ri', 'Model': 'model',
+    'XY Scanner': 'xy_scanner', 'Head Type': 'head_type', 'MOD/VIT': 'mod_vit',
+    'Sliding Stage': 'sliding_stage', 'Sample Chuck': 'sample_chuck', 'AE': 'ae',
+    'End User': 'end_user', 'Mfg Engineer': 'mfg_engineer', 'QC Engineer': 'qc_engineer', 'Reference Doc': 'reference_doc'
+}
+
+# Expected columns: SID, Check Items, Value. (Optional: 장비명 for fallback)
+MEAS_COL_MAP = {'SID': 'sid', '장비명': 'equipment_name', 'Check Items': 'check_item', 'Value': 'value'}
+
+EQUIP_COLS = ['sid', 'equipment_name', 'date', 'ri', 'model', 'xy_scanner',
+              'head_type', 'mod_vit', 'sliding_stage', 'sample_chuck', 'ae',
+              'end_user', 'mfg_engineer', 'qc_engineer', 'reference_doc']
+
+
+def _to_records(df: pd.DataFrame, cols: List[str]) -> List[tuple]:
+    """DataFrame -> executemany용 튜플 리스트 (NaN -> None, numpy 타입 -> Python 타입)"""
+    out = df.reindex(columns=cols).astype(object)
+    out = out.where(pd.notna(out), None)
+    return list(out.itertuples(index=False, name=None))
+
+
+def _identifier_series(df: pd.DataFrame) -> pd.Series:
+    """
+    행별 장비 식별자 (SID, 없으면 장비명으로 대체)
+    
+    Returns:
+        Series: 식별자 문자열 (식별 불가 행은 NaN)
+    """
+    sid = df['sid'] if 'sid' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    name = df['equipment_name'] if 'equipment_name' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    
+    has_sid = sid.notna() & (sid.astype(str).str.strip() != '')
+    key = sid.where(has_sid, name)
+    return key.where(key.isna(), key.astype(str))
+
+
+def _bulk_write_specs(c, df_specs: pd.DataFrame, table: str = 'specs') -> int:
+    """Specs 시트 일괄 저장 (executemany)"""
+    df_s = df_specs.rename(columns=SPEC_COL_MAP)
+    if 'model' not in df_s.columns or 'check_item' not in df_s.columns:
+        return 0
+    df_s = df_s[df_s['model'].notna() & df_s['check_item'].notna()]
+    
+    rows = _to_records(df_s, ['model', 'check_item', 'lsl', 'usl', 'target'])
+    c.executemany(f'''
+        INSERT OR REPLACE INTO {table} (model, check_item, lsl, usl, target)
+        VALUES (?, ?, ?, ?, ?)
+    ''', rows)
+    return len(rows)
+
+
+def _bulk_write_equipments(c, df_equip: pd.DataFrame, table: str = 'equipments') -> Dict[str, tuple]:
+    """
+    Equipments 시트 일괄 저장 (status='approved')
+    
+    Returns:
+        dict: 식별자 -> (equipment_id, sid, equipment_name) (Measurements 연결용)
+    """
+    df_e = df_equip.rename(columns=EQUIP_COL_MAP)
+    
+    # Ensure date is string
+    if 'date' in df_e.columns:
+        df_e['date'] = df_e['date'].astype(str)
+    
+    # 식별자가 없는 행은 건너뜀
+    df_e = df_e[_identifier_series(df_e).notna()]
+    
+    # ship_date는 적재 시 함께 계산 (swap 직후 월별 집계가 바로 맞도록)
+    df_e = df_e.assign(ship_date=_parse_ship_dates(df_e['date']) if 'date' in df_e.columns else '')
+    cols = EQUIP_COLS + ['ship_date', 'status']
+    rows = [r + ('approved',) for r in _to_records(df_e, EQUIP_COLS + ['ship_date'])]
+    
+    # 중복 SID는 건너뜀 (UNIQUE 제약)
+    c.executemany(
+        f"INSERT OR IGNORE INTO {table} ({', '.join(cols)}) VALUES ({', '.join(['?'] * len(cols))})",
+        rows
+    )
+    
+    return _equipment_id_map(c, table=table)
+
+
+def _equipment_id_map(c, status: str = None, table: str = 'equipments') -> Dict[str, tuple]:
+    """식별자 -> (equipment_id, sid, equipment_name) 매핑 (SID가 없는 장비는 장비명으로 연결)"""
+    query = f"SELECT id, sid, equipment_name FROM {table}"
+    params = []
+    if status:
+        query += " WHERE status = ?"
+        params.append(status)
+    c.execute(query + " ORDER BY id", params)
+    
+    sid_to_id = {}
+    for equip_id, sid, name in c.fetchall():
+        if sid is not None and str(sid).strip() != '':
+            sid_to_id[str(sid)] = (equip_id, sid, name)
+        elif name is not None:
+            sid_to_id[str(name)] = (equip_id, sid, name)
+    return sid_to_id
+
+
+def _prepare_measurements(df_meas: pd.DataFrame, sid_to_id: Dict[str, tuple]) -> pd.DataFrame:
+    """
+    Measurements 시트를 장비에 연결 (연결 불가/값 없는 행 제외)
+    
+    Returns:
+        DataFrame: _key, _equip_id, _equip_sid, _equip_name, check_item, value
+    """
+    df_m = df_meas.rename(columns=MEAS_COL_MAP)
+    if 'check_item' not in df_m.columns or 'value' not in df_m.columns:
+        return pd.DataFrame(columns=['_key', '_equip_id', '_equip_sid', '_equip_name', 'check_item', 'value'])
+    
+    key = _identifier_series(df_m)
+    linked = key.map(sid_to_id)
+    df_m = df_m.assign(
+        _key=key,
+        _equip_id=linked.map(lambda v: v[0] if isinstance(v, tuple) else None),
+        _equip_sid=linked.map(lambda v: v[1] if isinstance(v, tuple) else None),
+        _equip_name=linked.map(lambda v: v[2] if isinstance(v, tuple) else None)
+    )
+    return df_m[df_m['_equip_id'].notna() & df_m['check_item'].notna() & df_m['value'].notna()]
+
+
+def _insert_measurements(c, df_m: pd.DataFrame, table: str = 'measurements') -> int:
+    """_prepare_measurements 결과를 measurements 테이블에 일괄 저장"""
+    records = _to_records(df_m, ['_equip_id', 'check_item', 'value', '_equip_sid', '_equip_name'])
+    item_ids = _intern_check_items(c, [r[1] for r in records])
+    rows = [
+        (equip_id, item, value, item, item_ids[item], sid, name, 'approved')
+        for equip_id, item, value, sid, name in records
+    ]
+    c.executemany(f'''
+        INSERT INTO {table} (equipment_id, check_item, value, check_items, item_id, sid, equipment_name, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    return len(rows)
+
+
+def _bulk_write_measurements(c, df_meas: pd.DataFrame, sid_to_id: Dict[str, tuple],
+                             table: str = 'measurements') -> int:
+    """Measurements 시트 일괄 저장 (장비 식별자로 equipment_id 연결)"""
+    return _insert_measurements(c, _prepare_measurements(df_meas, sid_to_id), table)
+
+
+# ============================================================
+# Shadow Table Swap (전체 재적재)
+# ============================================================
+
+SWAP_TABLES = ['equipments', 'measurements', 'specs']
+
+# (인덱스 이름, 테이블, 컬럼)
+TABLE_INDEXES = [
+    ('idx_equipments_status', 'equipments', 'status'),
+    ('idx_equipments_ship_date', 'equipments', 'ship_date'),
+    ('idx_equipments_ri_ship_date', 'equipments', 'ri, ship_date'),
+    ('idx_measurements_equipment_id', 'measurements', 'equipment_id'),
+    ('idx_measurements_sid', 'measurements', 'sid'),
+    ('idx_measurements_item_id', 'measurements', 'item_id'),
+    ('idx_pending_measurements_item_id', 'pending_measurements', 'item_id'),
+]
+
+
+def _schema_names_in_use(c) -> set:
+    c.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")
+    return {row[0] for row in c.fetchall()}
+
+
+def _free_schema_name(base: str, in_use: set) -> str:
+    """
+    SQLite는 인덱스/트리거 이름을 바꿀 수 없으므로 (RENAME 시 테이블만 바뀜)
+    live 테이블과 shadow 테이블이 두 이름을 번갈아 사용합니다.
+    """
+    return base if base not in in_use else f"{base}_alt"
+
+
+def _ensure_indexes(c):
+    """기본 인덱스 생성 (두 이름 중 하나라도 있으면 건너뜀)"""
+    in_use = _schema_names_in_use(c)
+    for name, table, col in TABLE_INDEXES:
+        if name not in in_use and f"{name}_alt" not in in_use:
+            c.execute(f"CREATE INDEX {name} ON {table} ({col})")
+
+
+def _refresh_query_stats(c):
+    """
+    쿼리 플래너 통계 갱신 (표본 ANALYZE, 수 ms)
+    
+    통계가 없으면 SQLite는 status처럼 값 종류가 적은 인덱스를 먼저 고르므로,
+    item_id IN (...) 필터가 item_id 인덱스를 쓰도록 적재/마이그레이션 후 갱신합니다.
+    """
+    c.execute("PRAGMA analysis_limit = 1000")
+    c.execute("ANALYZE")
+
+
+# ============================================================
+# Check Item Dictionary (측정 항목 사전)
+# ============================================================
+
+# 같은 항목명이 측정 행마다 반복되므로 정수 ID(check_items.id)로도 저장합니다.
+# 테이블 -> 항목명 원문 식 (항목명이 비어 있는 행은 item_id = 0, 다시 시도하지 않음)
+ITEM_ID_TABLES = {
+    'measurements': 'COALESCE(check_items, check_item)',
+    'pending_measurements': 'check_items',
+}
+
+
+def _check_item_key(name) -> str:
+    return normalize_key(name if isinstance(name, str) else str(name)) if name is not None else ''
+
+
+def _intern_check_items(c, names: Iterable) -> Dict[Any, int]:
+    """
+    항목명 원문 -> check_items.id (사전에 없는 키는 등록)
+    
+    대소문자/공백/전각 차이만 있는 항목명은 같은 ID를 받습니다.
+    
+    Returns:
+        dict: 원문 -> id (키가 비어 있는 이름은 0)
+    """
+    keys = {name: _check_item_key(name) for name in dict.fromkeys(names)}
+    new_keys = {}
+    for name, key in keys.items():
+        if key:
+            new_keys.setdefault(key, str(name).strip())
+    
+    c.executemany(
+        "INSERT OR IGNORE INTO check_items (item_key, name) VALUES (?, ?)",
+        list(new_keys.items())
+    )
+    c.execute("SELECT item_key, id FROM check_items")
+    ids = dict(c.fetchall())
+    return {name: ids.get(key, 0) for name, key in keys.items()}
+
+
+def _backfill_check_item_ids(c) -> int:
+    """item_id가 없는 측정 행을 항목명 원문으로 채움 (행 단위 INSERT 경로 / 기존 DB 마이그레이션)"""
+    updated = 0
+    for table, name_expr in ITEM_ID_TABLES.items():
+        c.execute(f"SELECT DISTINCT {name_expr} FROM {table} WHERE item_id IS NULL")
+        names = [row[0] for row in c.fetchall()]
+        if not names:
+            continue
+        
+        item_ids = _intern_check_items(c, names)
+        c.execute("CREATE TEMP TABLE IF NOT EXISTS item_id_map (name PRIMARY KEY, item_id INTEGER)")
+        c.execute("DELETE FROM temp.item_id_map")
+        c.executemany("INSERT INTO temp.item_id_map (name, item_id) VALUES (?, ?)",
+                      [(name, item_id) for name, item_id in item_ids.items() if name is not None])
+        c.execute(f'''
+            UPDATE {table}
+            SET item_id = COALESCE((SELECT item_id FROM temp.item_id_map WHERE name = {name_expr}), 0)
+            WHERE item_id IS NULL
+        ''')
+        updated += c.rowcount
+    return updated
+
+
+def backfill_check_item_ids() -> int:
+    """
+    measurements / pending_measurements의 item_id가 비어 있는 행을 채움
+    
+    Returns:
+        int: 갱신한 행 수
+    """
+    conn = get_connection()
+    updated = _backfill_check_item_ids(conn.cursor())
+    conn.commit()
+    conn.close()
+    return updated
+
+
+def get_check_item_ids(names: Iterable[str]) -> List[int]:
+    """항목명 -> check_items.id 목록 (표기 차이 무시, 사전에 없는 이름은 제외)"""
+    keys = list({_check_item_key(name) for name in names} - {''})
+    if not keys:
+        return []
+    conn = get_connection()
+    rows = conn.execute(
+        f"SELECT id FROM check_items WHERE item_key IN ({', '.join(['?'] * len(keys))})", keys
+    ).fetchall()
+    conn.close()
+    return [row[0] for row in rows]
+
+
+# ============================================================
+# Table Versions (캐시 무효화용)
+# ============================================================
+
+# 행이 바뀔 때마다 트리거로 버전이 증가합니다.
+# 화면 캐시는 (버전, 조회 조건)을 키로 사용하므로, DB를 직접 수정하는 코드
+# (승인 탭의 UPDATE, 마이그레이션 도구 등)가 있어도 캐시가 낡지 않습니다.
+VERSIONED_TABLES = ['equipments', 'measurements', 'specs', 'pending_measurements']
+
+
+def _create_version_trigger(c, name: str, op: str, table: str, target: str):
+    c.execute(f'''
+        CREATE TRIGGER {name} AFTER {op} ON {target}
+        BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+        END
+    ''')
+
+
+def _create_ship_date_trigger(c, name: str, target: str):
+    """date가 바뀌면 ship_date를 비워 backfill_ship_dates()가 다시 계산하도록 함"""
+    c.execute(f'''
+        CREATE TRIGGER {name} AFTER UPDATE OF date ON {target}
+        BEGIN
+            UPDATE {target} SET ship_date = NULL WHERE id = NEW.id;
+        END
+    ''')
+
+
+def _ensure_triggers(c):
+    """table_versions 테이블과 버전/equipments 트리거 생성 (두 이름 중 하나라도 있으면 건너뜀)"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    c.executemany(
+        "INSERT OR IGNORE INTO table_versions (table_name, version) VALUES (?, 0)",
+        [(table,) for table in VERSIONED_TABLES]
+    )
+    
+    in_use = _schema_names_in_use(c)
+    for table in VERSIONED_TABLES:
+        for op in ('INSERT', 'UPDATE', 'DELETE'):
+            name = f"trg_{table}_{op.lower()}_version"
+            if name not in in_use and f"{name}_alt" not in in_use:
+                _create_version_trigger(c, name, op, table, table)
+    
+    for base, create in EQUIPMENT_TRIGGERS.items():
+        if base not in in_use and f"{base}_alt" not in in_use:
+            create(c, base, 'equipments')
+
+
+# ============================================================
+# Monthly Shipment Rollup (월별 출하 집계)
+# ============================================================
+
+# (year_month, model, status) -> count. equipments 트리거가 행 단위로 증감하므로
+# 업로드/승인/동기화/직접 UPDATE 어느 경로든 항상 equipments와 일치합니다.
+# 연구용/산업용 분류는 저장하지 않고 조회 시 model_categories와 join 합니다.
+# (분류표가 바뀌어도 집계를 다시 만들 필요가 없음)
+
+def _rollup_add(prefix: str) -> str:
+    return f'''
+        INSERT OR IGNORE INTO monthly_shipments (year_month, model, status, count)
+        SELECT substr({prefix}.ship_date, 1, 7), COALESCE({prefix}.model, ''), COALESCE({prefix}.status, ''), 0
+        WHERE {prefix}.ship_date > '';
+        UPDATE monthly_shipments SET count = count + 1
+        WHERE {prefix}.ship_date > '' AND year_month = substr({prefix}.ship_date, 1, 7)
+          AND model = COALESCE({prefix}.model, '') AND status = COALESCE({prefix}.status, '');
+    '''
+
+
+def _rollup_remove(prefix: str) -> str:
+    return f'''
+        UPDATE monthly_shipments SET count = count - 1
+        WHERE {prefix}.ship_date > '' AND year_month = substr({prefix}.ship_date, 1, 7)
+          AND model = COALESCE({prefix}.model, '') AND status = COALESCE({prefix}.status, '');
+        DELETE FROM monthly_shipments
+        WHERE count <= 0 AND year_month = substr({prefix}.ship_date, 1, 7)
+          AND model = COALESCE({prefix}.model, '') AND status = COALESCE({prefix}.status, '');
+    '''
+
+
+def _create_rollup_trigger(c, name: str, op: str, target: str):
+    """equipments 변경분을 monthly_shipments에 반영하는 트리거"""
+    body = {
+        'INSERT': _rollup_add('NEW'),
+        'DELETE': _rollup_remove('OLD'),
+        'UPDATE OF ship_date, model, status': _rollup_remove('OLD') + _rollup_add('NEW'),
+    }[op]
+    c.execute(f"CREATE TRIGGER {name} AFTER {op} ON {target} BEGIN {body} END")
+
+
+# ============================================================
+# Config Audit Queue (장비 구성 규칙 검증 대기열)
+# ============================================================
+
+# 구성 검증에 쓰이는 컬럼 (sid/장비명/상태는 위반 목록 표시용)
+CONFIG_AUDIT_COLUMNS = ['sid', 'equipment_name', 'status', 'model', 'ri', 'xy_scanner',
+                        'head_type', 'mod_vit', 'sliding_stage', 'sample_chuck', 'ae']
+
+
+def _create_audit_trigger(c, name: str, op: str, target: str):
+    """
+    변경된 장비를 config_audit_queue에 등록하는 트리거
+    
+    INSERT OR REPLACE로 seq가 새로 발급되므로, 검증 도중 다시 바뀐 장비는
+    검증 시작 시점의 seq보다 커져 다음 검증에서 다시 검사됩니다.
+    """
+    if op == 'DELETE':
+        body = '''
+            DELETE FROM config_audit_queue WHERE equipment_id = OLD.id;
+            DELETE FROM config_violations WHERE equipment_id = OLD.id;
+        '''
+    else:
+        body = "INSERT OR REPLACE INTO config_audit_queue (equipment_id) VALUES (NEW.id);"
+    c.execute(f"CREATE TRIGGER {name} AFTER {op} ON {target} BEGIN {body} END")
+
+
+def _ensure_config_audit(c):
+    """구성 검증 테이블 생성 (처음 생성 시 전체 장비를 대기열에 등록)"""
+    c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'config_audit_queue'")
+    created = c.fetchone() is None
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS config_audit_queue (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            equipment_id INTEGER NOT NULL UNIQUE
+        )
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS config_violations (
+            equipment_id INTEGER PRIMARY KEY,
+            sid TEXT,
+            equipment_name TEXT,
+            model TEXT,
+            status TEXT,
+            errors TEXT,
+            rules_version TEXT,
+            checked_at TEXT
+        )
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS config_audit_state (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    ''')
+    if created:
+        _reset_config_audit(c)
+
+
+def _reset_config_audit(c):
+    """equipments가 통째로 바뀐 뒤 (swap/재생성): 위반 목록을 비우고 전체 장비를 대기열에 등록"""
+    c.execute("DELETE FROM config_violations")
+    c.execute("DELETE FROM config_audit_queue")
+    c.execute("INSERT INTO config_audit_queue (equipment_id) SELECT id FROM equipments ORDER BY id")
+
+
+# equipments(live/shadow) 공통 트리거: 기본 이름 -> 생성 함수(c, name, target)
+EQUIPMENT_TRIGGERS = {
+    'trg_equipments_ship_date_reset': _create_ship_date_trigger,
+    'trg_equipments_rollup_insert': lambda c, name, target: _create_rollup_trigger(c, name, 'INSERT', target),
+    'trg_equipments_rollup_delete': lambda c, name, target: _create_rollup_trigger(c, name, 'DELETE', target),
+    'trg_equipments_rollup_update': lambda c, name, target: _create_rollup_trigger(
+        c, name, 'UPDATE OF ship_date, model, status', target),
+    'trg_equipments_audit_insert': lambda c, name, target: _create_audit_trigger(c, name, 'INSERT', target),
+    'trg_equipments_audit_update': lambda c, name, target: _create_audit_trigger(
+        c, name, f"UPDATE OF {', '.join(CONFIG_AUDIT_COLUMNS)}", target),
+    'trg_equipments_audit_delete': lambda c, name, target: _create_audit_trigger(c, name, 'DELETE', target),
+}
+
+
+def _ensure_monthly_rollup(c):
+    """monthly_shipments / model_categories 테이블과 롤업 트리거 생성"""
+    c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'monthly_shipments'")
+    created = c.fetchone() is None
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_shipments (
+            year_month TEXT NOT NULL,
+            model TEXT NOT NULL,
+            status TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (year_month, model, status)
+        )
+    ''')
+    
+    # 모델 분류 조회 테이블 (monthly_shipments와 join)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS model_categories (
+            model TEXT PRIMARY KEY,
+            category TEXT NOT NULL
+        )
+    ''')
+    from .utils import RESEARCH_MODELS, INDUSTRIAL_MODELS
+    c.executemany(
+        "INSERT OR IGNORE INTO model_categories (model, category) VALUES (?, ?)",
+        [(m, 'Research') for m in RESEARCH_MODELS] + [(m, 'Industrial') for m in INDUSTRIAL_MODELS]
+    )
+    
+    if created:
+        _rebuild_monthly_rollup(c)
+
+
+def _rebuild_monthly_rollup(c):
+    """equipments 전체에서 monthly_shipments 재계산 (테이블 교체/재생성 후)"""
+    c.execute("DELETE FROM monthly_shipments")
+    c.execute('''
+        INSERT INTO monthly_shipments (year_month, model, status, count)
+        SELECT substr(ship_date, 1, 7), COALESCE(model, ''), COALESCE(status, ''), COUNT(*)
+        FROM equipments
+        WHERE ship_date > ''
+        GROUP BY 1, 2, 3
+    ''')
+
+
+def get_monthly_rollup(statuses: List[str] = None) -> pd.DataFrame:
+    """
+    월별 출하 집계 (model_categories join으로 분류 포함)
+    
+    Args:
+        statuses: 포함할 상태 (None이면 전체, 기존 대시보드와 동일)
+    
+    Returns:
+        DataFrame: year_month, category('Research'/'Industrial'/'Other'), model, count
+    """
+    backfill_ship_dates()  # 아직 ship_date가 없는 행 반영 (트리거가 집계 갱신)
+    
+    query = '''
+        SELECT r.year_month, COALESCE(mc.category, 'Other') AS category, r.model, SUM(r.count) AS count
+        FROM monthly_shipments r
+        LEFT JOIN model_categories mc ON mc.model = r.model
+    '''
+    params = []
+    if statuses:
+        query += f" WHERE r.status IN ({','.join(['?'] * len(statuses))})"
+        params.extend(statuses)
+    query += " GROUP BY r.year_month, category, r.model ORDER BY r.year_month"
+    
+    conn = get_connection()
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+    return df
+
+
+def get_shipment_count_since(start_date: str) -> int:
+    """start_date('YYYY-MM-DD') 이후 출하 대수 (ship_date 인덱스 사용)"""
+    conn = get_connection()
+    count = conn.execute("SELECT COUNT(*) FROM equipments WHERE ship_date >= ?", (start_date,)).fetchone()[0]
+    conn.close()
+    return count
+
+
+def get_month_equipments(year_month: str) -> pd.DataFrame:
+    """
+    해당 월 출하 장비 목록
+    
+    Returns:
+        DataFrame: sid, equipment_name, model, date, category (출하일 최신순)
+    """
+    backfill_ship_dates()
+    conn = get_connection()
+    df = pd.read_sql_query('''
+        SELECT e.sid, e.equipment_name, e.model, e.ship_date AS date,
+               COALESCE(mc.category, 'Other') AS category
+        FROM equipments e
+        LEFT JOIN model_categories mc ON mc.model = e.model
+        WHERE e.ship_date BETWEEN ? AND ?
+        ORDER BY e.ship_date DESC, e.id DESC
+    ''', conn, params=(f"{year_month}-01", f"{year_month}-31"))
+    conn.close()
+    df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d')
+    return df
+
+
+# ============================================================
+# Filter Catalog (사이드바 필터 목록)
+# ============================================================
+
+# 승인된 측정 데이터의 (R/I, 모델, 항목)별 행 수 (수천 행 이하).
+# 사이드바 옵션/건수와 종속 필터링(선택한 모델에 있는 항목만)을 이 표에서 조회합니다.
+# 적재/승인/삭제는 live 테이블 트리거로 바로 반영됩니다. 장비 단위 변경(승인, 모델/R/I 수정)은
+# equipment_id 인덱스로 해당 장비의 측정 행만 집계합니다. 건수가 0이 된 행은 조회 시 제외합니다.
+FILTER_DIMENSIONS = ('ri', 'model', 'check_item')
+
+
+def _catalog_equipment_sql(ref: str, sign: int) -> str:
+    """장비(OLD/NEW) 한 대의 승인 측정 건수를 카탈로그에 더하거나 빼는 SQL"""
+    return f'''
+        INSERT INTO filter_catalog (ri, model, item_id, count)
+        SELECT COALESCE({ref}.ri, ''), COALESCE({ref}.model, ''), item_id, {sign} * COUNT(*)
+        FROM measurements
+        WHERE equipment_id = {ref}.id AND item_id > 0 AND {ref}.status = 'approved'
+        GROUP BY item_id
+        ON CONFLICT (ri, model, item_id) DO UPDATE SET count = count + excluded.count;
+    '''
+
+
+def _catalog_measurement_sql(ref: str, sign: int) -> str:
+    """측정 행(OLD/NEW) 하나를 카탈로그에 더하거나 빼는 SQL (승인된 장비만)"""
+    return f'''
+        INSERT INTO filter_catalog (ri, model, item_id, count)
+        SELECT COALESCE(ri, ''), COALESCE(model, ''), {ref}.item_id, {sign}
+        FROM equipments
+        WHERE id = {ref}.equipment_id AND status = 'approved' AND {ref}.item_id > 0
+        ON CONFLICT (ri, model, item_id) DO UPDATE SET count = count + excluded.count;
+    '''
+
+
+# 이름 -> (이벤트, 테이블, WHEN 조건, 본문)
+# 다른 테이블을 참조하므로 live 테이블에만 만들고 shadow swap 뒤 다시 연결합니다
+# (shadow 테이블에 두면 swap 중 RENAME 스키마 검사에서 참조 테이블을 찾지 못함).
+CATALOG_TRIGGERS = {
+    'trg_measurements_catalog_insert': ('INSERT', 'measurements', None, _catalog_measurement_sql('NEW', 1)),
+    'trg_measurements_catalog_delete': ('DELETE', 'measurements', None, _catalog_measurement_sql('OLD', -1)),
+    'trg_measurements_catalog_update': (
+        'UPDATE OF item_id, equipment_id', 'measurements',
+        'OLD.item_id IS NOT NEW.item_id OR OLD.equipment_id IS NOT NEW.equipment_id',
+        _catalog_measurement_sql('OLD', -1) + _catalog_measurement_sql('NEW', 1)
+    ),
+    'trg_equipments_catalog_update': (
+        'UPDATE OF status, ri, model', 'equipments',
+        'OLD.status IS NOT NEW.status OR OLD.ri IS NOT NEW.ri OR OLD.model IS NOT NEW.model',
+        _catalog_equipment_sql('OLD', -1) + _catalog_equipment_sql('NEW', 1)
+    ),
+    'trg_equipments_catalog_delete': ('DELETE', 'equipments', None, _catalog_equipment_sql('OLD', -1)),
+}
+
+
+def _create_catalog_triggers(c):
+    for name, (event, table, when, body) in CATALOG_TRIGGERS.items():
+        when_clause = f"WHEN {when}" if when else ""
+        c.execute(f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} {when_clause} BEGIN {body} END")
+
+
+def _ensure_filter_catalog(c):
+    """필터 카탈로그 테이블/트리거 생성 (처음 생성 시 기존 데이터로 채움)"""
+    c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'filter_catalog'")
+    created = c.fetchone() is None
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS filter_catalog (
+            ri TEXT NOT NULL,
+            model TEXT NOT NULL,
+            item_id INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (ri, model, item_id)
+        )
+    ''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_filter_catalog_model ON filter_catalog (model, item_id)")
+    _create_catalog_triggers(c)
+    if created:
+        _rebuild_filter_catalog(c)
+
+
+def _rebuild_filter_catalog(c):
+    """필터 카탈로그 전체 재집계 (shadow swap / 재생성 후)"""
+    c.execute("DELETE FROM filter_catalog")
+    c.execute('''
+        INSERT INTO filter_catalog (ri, model, item_id, count)
+        SELECT COALESCE(e.ri, ''), COALESCE(e.model, ''), m.item_id, COUNT(*)
+        FROM measurements m
+        JOIN equipments e ON m.equipment_id = e.id
+        WHERE e.status = 'approved' AND m.item_id > 0
+        GROUP BY 1, 2, 3
+    ''')
+
+
+def get_filter_options(dimension: str, ris: List[str] = None, models: List[str] = None) -> Dict[str, int]:
+    """
+    사이드바 필터 옵션과 승인된 측정값 건수
+    
+    선택한 R/I·모델 조건으로 좁힌 값만 반환하므로, 반환된 옵션은 항상 조회 결과가 있습니다.
+    
+    Args:
+        dimension: 'ri', 'model', 'check_item'
+        ris: 선택한 R/I (model, check_item 옵션을 좁힘)
+        models: 선택한 모델 (check_item 옵션을 좁힘)
+    
+    Returns:
+        dict: 값 -> 측정값 건수 (값 이름순)
+    """
+    if dimension not in FILTER_DIMENSIONS:
+        raise ValueError(f"Unknown filter dimension: {dimension}")
+    
+    where, params = ["fc.count > 0"], []
+    if ris and dimension != 'ri':
+        where.append(f"fc.ri IN ({', '.join(['?'] * len(ris))})")
+        params.extend(ris)
+    if models and dimension == 'check_item':
+        where.append(f"fc.model IN ({', '.join(['?'] * len(models))})")
+        params.extend(models)
+    
+    if dimension == 'check_item':
+        source = "ci.name AS value, SUM(fc.count) AS count FROM filter_catalog fc JOIN check_items ci ON ci.id = fc.item_id"
+        group = "fc.item_id"
+    else:
+        source = f"fc.{dimension} AS value, SUM(fc.count) AS count FROM filter_catalog fc"
+        group = f"fc.{dimension}"
+        where.append(f"fc.{dimension} != ''")
+    
+    query = f"SELECT {source} WHERE {' AND '.join(where)} GROUP BY {group} ORDER BY value"
+    
+    conn = get_connection()
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+    return dict(rows)
+
+
+def _bump_table_versions(c, tables: List[str]):
+    """트리거를 거치지 않는 변경(DROP/RENAME 등) 후 버전 수동 증가"""
+    c.executemany(
+        "UPDATE table_versions SET version = version + 1 WHERE table_name = ?",
+        [(table,) for table in tables if table in VERSIONED_TABLES]
+    )
+
+
+def get_table_versions() -> Dict[str, int]:
+    """
+    테이블별 데이터 버전
+    
+    Returns:
+        dict: {'equipments': n, 'measurements': n, 'specs': n}
+    """
+    conn = get_connection()
+    try:
+        rows = conn.execute("SELECT table_name, version FROM table_versions").fetchall()
+    except sqlite3.OperationalError:
+        rows = []  # init_db 이전
+    conn.close()
+    return dict(rows)
+
+
+def _create_shadow_tables(c, tables: List[str]):
+    """
+    live 테이블과 같은 스키마로 <table>_new 생성
+    
+    스키마는 sqlite_master에서 복사하므로 마이그레이션으로 추가된 컬럼도 그대로 유지됩니다.
+    measurements_new의 FK는 equipments_new를 가리키며, swap 시 RENAME으로 자동 갱신됩니다.
+    """
+    for table in tables:
+        c.execute(f"DROP TABLE IF EXISTS {table}_new")
+    
+    for table in tables:
+        c.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        sql = c.fetchone()[0]
+        sql = re.sub(rf'^CREATE TABLE\s+"?{table}"?', f'CREATE TABLE {table}_new', sql)
+        if 'equipments' in tables:
+            sql = re.sub(r'REFERENCES\s+"?equipments"?\s*\(', 'REFERENCES equipments_new (', sql)
+        c.execute(sql)
+
+
+def _index_shadow_tables(c, tables: List[str]):
+    """적재가 끝난 shadow 테이블에 인덱스 생성 (적재 후 생성이 더 빠름)"""
+    in_use = _schema_names_in_use(c)
+    for name, table, col in TABLE_INDEXES:
+        if table in tables:
+            c.execute(f"CREATE INDEX {_free_schema_name(name, in_use)} ON {table}_new ({col})")
+    
+    # 버전 트리거는 적재가 끝난 뒤에 연결 (행 단위 트리거 비용 회피, swap 시 버전 일괄 증가)
+    for table in tables:
+        if table in VERSIONED_TABLES:
+            for op in ('INSERT', 'UPDATE', 'DELETE'):
+                name = _free_schema_name(f"trg_{table}_{op.lower()}_version", in_use)
+                _create_version_trigger(c, name, op, table, f"{table}_new")
+    if 'equipments' in tables:
+        for base, create in EQUIPMENT_TRIGGERS.items():
+            create(c, _free_schema_name(base, in_use), 'equipments_new')
+
+
+def _drop_shadow_tables(conn, tables: List[str]):
+    for table in tables:
+        conn.execute(f"DROP TABLE IF EXISTS {table}_new")
+    conn.commit()
+
+
+def _swap_shadow_tables(conn, tables: List[str]):
+    """
+    <table>_new를 live 테이블로 교체 (DROP + RENAME을 하나의 트랜잭션으로)
+    
+    읽는 쪽은 교체 전/후 중 하나의 완전한 데이터만 보게 되며,
+    잠금은 DDL 몇 개를 실행하는 동안(수 ms)만 유지됩니다.
+    """
+    c = conn.cursor()
+    c.execute("BEGIN IMMEDIATE")
+    try:
+        for table in tables:
+            c.execute(f"DROP TABLE IF EXISTS {table}")
+        for table in tables:
+            c.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+        if 'equipments' in tables:
+            _rebuild_monthly_rollup(c)
+            _reset_config_audit(c)
+        if 'equipments' in tables or 'measurements' in tables:
+            # 카탈로그 트리거는 live 테이블과 함께 삭제되었으므로 다시 연결
+            _create_catalog_triggers(c)
+            _rebuild_filter_catalog(c)
+        _bump_table_versions(c, tables)
+        _refresh_query_stats(c)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def sync_relational_stream(sheets) -> Dict[str, int]:
+    """
+    시트 단위 스트리밍 일괄 동기화 (전체 재적재)
     
-    # Column mapping
-    col_map = {
-        'Model': 'model',
-        'Check Item': 'check_item',
-        'LSL': 'lsl',
-        'USL': 'usl',
-        'Target': 'target'
-    }
+    파싱이 끝난 시트부터 순서에 상관없이 받아 shadow 테이블(<table>_new)에 기록하고,
+    적재와 인덱스 생성이 끝나면 live 테이블과 한 번에 교체합니다.
+    적재 중에도 다른 사용자는 기존 데이터를 그대로 조회할 수 있습니다.
+    Measurements는 Equipments가 먼저 기록되어야 연결할 수 있으므로
+    Equipments 이전에 도착하면 보관해 두었다가 이어서 기록합니다.
+    Measurements는 여러 조각(청크)으로 나눠 보낼 수 있습니다 (대용량 생성/적재 시 메모리 절약).
     
-    df_db = df.rename(columns=col_map)
+    Args:
+        sheets: (시트명, DataFrame) 이터러블. 시트명은 'Equipments', 'Measurements', 'Specs'
     
-    for _, row in df_db.iterrows():
-        if pd.isna(row.get('model')) or pd.isna(row.get('check_item')):
-            continue
-            
-        c.execute('''
-            INSERT OR REPLACE INTO specs (model, check_item, lsl, usl, target)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (
-            row.get('model'), 
-            row.get('check_item'), 
-            row.get('lsl') if pd.notna(row.get('lsl')) else None,
-            row.get('usl') if pd.notna(row.get('usl')) else None,
-            row.get('target') if pd.notna(row.get('target')) else None
-        ))
-        
-    conn.commit()
-    conn.close()
-
-def get_spec_for_item(model: str, check_item: str) -> Dict[str, Optional[float]]:
-    """Get spec limits for a specific model and check item."""
+    Returns:
+        dict: {'equipments': n, 'measurements': n, 'specs': n}
+    """
+    start = time.perf_counter()
+    init_db()
     conn = get_connection()
     c = conn.cursor()
+
+    result = {'equipments': 0, 'measurements': 0, 'specs': 0}
+    sid_to_id = None
+    pending_meas = []
+
+    try:
+        _create_shadow_tables(c, SWAP_TABLES)
+
+        for sheet_name, df in sheets:
+            if df is None or df.empty:
+                continue
+            
+            if sheet_name == 'Specs':
+                result['specs'] = _bulk_write_specs(c, df, table='specs_new')
+            elif sheet_name == 'Equipments':
+                before = conn.total_changes
+                sid_to_id = _bulk_write_equipments(c, df, table='equipments_new')
+                result['equipments'] = conn.total_changes - before
+                for df_meas in pending_meas:
+                    result['measurements'] += _bulk_write_measurements(c, df_meas, sid_to_id, table='measurements_new')
+                pending_meas = []
+            elif sheet_name == 'Measurements':
+                if sid_to_id is None:
+                    pending_meas.append(df)
+                else:
+                    result['measurements'] += _bulk_write_measurements(c, df, sid_to_id, table='measurements_new')
+        
+        _index_shadow_tables(c, SWAP_TABLES)
+        conn.commit()
+        _swap_shadow_tables(conn, SWAP_TABLES)
+        invalidate_spec_cache()
+    except Exception:
+        # 실패 시 live 테이블은 그대로, shadow만 정리
+        conn.rollback()
+        _drop_shadow_tables(conn, SWAP_TABLES)
+        raise
+    finally:
+        conn.close()
     
-    c.execute("SELECT lsl, usl, target FROM specs WHERE model = ? AND check_item = ?", (model, check_item))
-    res = c.fetchone()
-    conn.close()
-    
-    if res:
-        return {'lsl': res[0], 'usl': res[1], 'target': res[2]}
-    return {'lsl': None, 'usl': None, 'target': None}
+    _observe_ingest('bulk', result, time.perf_counter() - start)
+    return result
 
 
 def sync_relational_data(df_equip: pd.DataFrame, df_meas: pd.DataFrame, df_specs: pd.DataFrame = None) -> Dict[str, int]:
     """
     Sync data from 3 relational sheets (Equipments, Measurements, Specs).
+    Bulk sync는 승인(approved) 상태로 저장합니다.
     """
-    recreate_tables()
-    conn = get_connection()
-    c = conn.cursor()
+    return sync_relational_stream([
+        ('Specs', df_specs),
+        ('Equipments', df_equip),
+        ('Measurements', df_meas),
+    ])
+
+
+# ============================================================
+# Delta Sync (변경분만 반영)
+# ============================================================
+
+def _canonical_text(series: pd.Series) -> pd.Series:
+    """비교용 문자열 정규화 (NaN/None -> None)"""
+    return series.astype(object).map(lambda v: None if v is None or (not isinstance(v, str) and pd.isna(v)) else str(v))
+
+
+def _canonical_number(series: pd.Series) -> pd.Series:
+    """비교용 숫자 정규화 (1, 1.0, '1.0' 모두 같은 값으로 취급)"""
+    num = pd.to_numeric(series, errors='coerce').astype(float)
+    return num.map(lambda v: repr(float(v))).where(num.notna(), _canonical_text(series))
+
+
+def _row_hashes(df: pd.DataFrame, text_cols: List[str], number_cols: List[str] = ()) -> pd.Series:
+    """행 단위 해시 (변경 여부 판단용)"""
+    canon = pd.DataFrame(index=df.index)
+    for col in text_cols:
+        canon[col] = _canonical_text(df[col]) if col in df.columns else None
+    for col in number_cols:
+        canon[col] = _canonical_number(df[col]) if col in df.columns else None
+    return pd.util.hash_pandas_object(canon, index=False)
+
+
+def _delta_write_specs(c, df_specs: Optional[pd.DataFrame]) -> Dict[str, int]:
+    """
+    Specs 변경분 반영 (키: model, check_item)
     
-    added_equipments = 0
-    added_measurements = 0
+    시트에 없는 규격은 삭제합니다 (전체 교체와 같은 결과).
+    """
+    summary = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+    
+    cols = ['model', 'check_item', 'lsl', 'usl', 'target']
+    df_s = (df_specs if df_specs is not None else pd.DataFrame()).rename(columns=SPEC_COL_MAP).reindex(columns=cols)
+    df_s = df_s[df_s['model'].notna() & df_s['check_item'].notna()]
+    df_s.index = pd.MultiIndex.from_arrays([_canonical_text(df_s['model']), _canonical_text(df_s['check_item'])])
+    # INSERT OR REPLACE와 동일하게 같은 키는 마지막 행 사용
+    df_s = df_s[~df_s.index.duplicated(keep='last')]
+    
+    ex = pd.read_sql_query("SELECT model, check_item, lsl, usl, target FROM specs", c.connection)
+    ex.index = pd.MultiIndex.from_arrays([_canonical_text(ex['model']), _canonical_text(ex['check_item'])])
+    
+    inc_hash = _row_hashes(df_s, [], ['lsl', 'usl', 'target'])
+    ex_hash = _row_hashes(ex, [], ['lsl', 'usl', 'target'])
+    
+    is_new = ~df_s.index.isin(ex.index)
+    common = df_s.index[~is_new]
+    changed = common[inc_hash[common].values != ex_hash[common].values]
+    removed = ex[~ex.index.isin(df_s.index)]
+    
+    upserts = pd.concat([df_s[is_new], df_s.loc[changed]])
+    c.executemany('''
+        INSERT OR REPLACE INTO specs (model, check_item, lsl, usl, target)
+        VALUES (?, ?, ?, ?, ?)
+    ''', _to_records(upserts, cols))
+    c.executemany("DELETE FROM specs WHERE model = ? AND check_item = ?",
+                  _to_records(removed, ['model', 'check_item']))
+    
+    summary['inserted'] = int(is_new.sum())
+    summary['updated'] = len(changed)
+    summary['deleted'] = len(removed)
+    summary['unchanged'] = len(common) - len(changed)
+    return summary
+
+
+def _delta_write_equipments(c, df_equip: pd.DataFrame) -> Dict[str, int]:
+    """
+    Equipments 변경분 반영 (키: SID, 없으면 장비명)
     
-    # 1. Sync Specs
-    if df_specs is not None and not df_specs.empty:
-        # Inline Specs Sync
-        col_map_specs = {'Model': 'model', 'Check Item': 'check_item', 'LSL': 'lsl', 'USL': 'usl', 'Target': 'target'}
-        df_s = df_specs.rename(columns=col_map_specs)
-        for _, row in df_s.iterrows():
-            if pd.isna(row.get('model')) or pd.isna(row.get('check_item')): continue
-            c.execute('''
-                INSERT OR REPLACE INTO specs (model, check_item, lsl, usl, target)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                row.get('model'), row.get('check_item'), 
-                row.get('lsl') if pd.notna(row.get('lsl')) else None,
-                row.get('usl') if pd.notna(row.get('usl')) else None,
-                row.get('target') if pd.notna(row.get('target')) else None
-            ))
-
-    # 2. Sync Equipments
-    # Expected columns: SID, 장비명, 종료일, R/I, Model, ...
-    col_map_equip = {
-        'SID': 'sid', '장비명': 'equipment_name', '종료일': 'date', 'R/I': 'ri', 'Model': 'model',
-        'XY Scanner': 'xy_scanner', 'Head Type': 'head_type', 'MOD/VIT': 'mod_vit',
-        'Sliding Stage': 'sliding_stage', 'Sample Chuck': 'sample_chuck', 'AE': 'ae',
-        'End User': 'end_user', 'Mfg Engineer': 'mfg_engineer', 'QC Engineer': 'qc_engineer', 'Reference Doc': 'reference_doc'
-    }
-    df_e = df_equip.rename(columns=col_map_equip)
+    승인(approved) 장비만 수정/삭제 대상이며, 대기/반려 중인 장비와
+    SID가 겹치는 행은 건너뜁니다 (skipped).
+    """
+    summary = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0, 'skipped': 0}
     
-    # Ensure date is string
+    df_e = df_equip.rename(columns=EQUIP_COL_MAP)
     if 'date' in df_e.columns:
         df_e['date'] = df_e['date'].astype(str)
-        
-    # Map SID -> ID for measurements linking
-    sid_to_id = {}
+    df_e = df_e.reindex(columns=EQUIP_COLS)
+    df_e.index = _identifier_series(df_e)
+    df_e = df_e[df_e.index.notna()]
+    df_e = df_e[~df_e.index.duplicated(keep='first')]
     
-    for _, row in df_e.iterrows():
-        # If SID is missing, use Equipment Name as fallback? Or skip?
-        sid = row.get('sid')
-        if pd.isna(sid) or str(sid).strip() == '':
-            # Fallback: Use equipment_name if available
-            if pd.notna(row.get('equipment_name')):
-                sid = row.get('equipment_name')
-            else:
-                continue # Skip if no identifier
-        
-        # Insert Equipment (Default status='pending' for new uploads via this function, 
-        # but if this function is used for bulk import, maybe we want 'approved'?)
-        # Let's assume bulk import via this function is 'approved' for now or 'pending'.
-        # For now, let's default to 'approved' if it's a migration, but 'pending' if it's user upload.
-        # Actually, this function 'sync_relational_data' seems to be legacy or bulk import.
-        # Let's set default to 'approved' for bulk sync to maintain backward compatibility if used.
-        
-        cols = ['sid', 'equipment_name', 'date', 'ri', 'model', 'xy_scanner', 
-                'head_type', 'mod_vit', 'sliding_stage', 'sample_chuck', 'ae', 
-                'end_user', 'mfg_engineer', 'qc_engineer', 'reference_doc', 'status']
-        
-        # Prepare values
-        vals = [row.get(col) for col in cols[:-1]] # All except status
-        vals.append('approved') # Default status for bulk sync
-        
-        placeholders = ', '.join(['?'] * len(cols))
-        cols_str = ', '.join(cols)
-        
-        try:
-            c.execute(f"INSERT INTO equipments ({cols_str}) VALUES ({placeholders})", vals)
-            equip_id = c.lastrowid
-            sid_to_id[str(sid)] = equip_id
-            added_equipments += 1
-        except sqlite3.IntegrityError:
-            # Duplicate SID? Skip or Update?
-            # For now, skip
-            pass
+    ex = pd.read_sql_query(
+        f"SELECT id, status, {', '.join(EQUIP_COLS)} FROM equipments ORDER BY id", c.connection
+    )
+    ex.index = _identifier_series(ex)
+    ex = ex[ex.index.notna()]
+    
+    # 같은 식별자가 여러 번 저장된 경우 첫 행만 비교 대상, 나머지(승인분)는 삭제
+    dup_mask = ex.index.duplicated(keep='first')
+    ex_dups = ex[dup_mask & (ex['status'] == 'approved')]
+    ex = ex[~dup_mask]
+    
+    inc_hash = _row_hashes(df_e, EQUIP_COLS)
+    ex_hash = _row_hashes(ex, EQUIP_COLS)
+    
+    is_new = ~df_e.index.isin(ex.index)
+    common = df_e.index[~is_new]
+    approved = ex.loc[common, 'status'] == 'approved'
+    summary['skipped'] = int((~approved).sum())
+    common = common[approved.values]
+    changed = common[inc_hash[common].values != ex_hash[common].values]
+    removed = pd.concat([ex[~ex.index.isin(df_e.index) & (ex['status'] == 'approved')], ex_dups])
+    
+    # 1. 삭제 (측정값 포함)
+    removed_ids = [(int(i),) for i in removed['id']]
+    c.executemany("DELETE FROM measurements WHERE equipment_id = ?", removed_ids)
+    c.executemany("DELETE FROM equipments WHERE id = ?", removed_ids)
+    
+    # 2. 수정 (측정값의 비정규화 컬럼도 함께 갱신)
+    updates = df_e.loc[changed]
+    update_ids = [int(i) for i in ex.loc[changed, 'id']]
+    set_clause = ', '.join(f"{col} = ?" for col in EQUIP_COLS)
+    c.executemany(
+        f"UPDATE equipments SET {set_clause} WHERE id = ?",
+        [r + (equip_id,) for r, equip_id in zip(_to_records(updates, EQUIP_COLS), update_ids)]
+    )
+    c.executemany(
+        "UPDATE measurements SET sid = ?, equipment_name = ? WHERE equipment_id = ?",
+        [r + (equip_id,) for r, equip_id in zip(_to_records(updates, ['sid', 'equipment_name']), update_ids)]
+    )
+    # 출하일도 같은 트랜잭션에서 계산 (date 수정 시 트리거가 ship_date를 비우므로 수정 뒤에 기록)
+    c.executemany(
+        "UPDATE equipments SET ship_date = ? WHERE id = ?",
+        zip(_parse_ship_dates(updates['date']).tolist(), update_ids)
+    )
+    
+    # 3. 추가 (ship_date는 일괄 저장과 같이 적재 시 함께 계산)
+    inserts = df_e[is_new].assign(ship_date=_parse_ship_dates(df_e.loc[is_new, 'date']))
+    cols = EQUIP_COLS + ['ship_date', 'status']
+    c.executemany(
+        f"INSERT INTO equipments ({', '.join(cols)}) VALUES ({', '.join(['?'] * len(cols))})",
+        [r + ('approved',) for r in _to_records(inserts, EQUIP_COLS + ['ship_date'])]
+    )
+    
+    summary['inserted'] = int(is_new.sum())
+    summary['updated'] = len(changed)
+    summary['deleted'] = len(removed)
+    summary['unchanged'] = len(common) - len(changed)
+    return summary
 
-    # 3. Sync Measurements
-    # Expected columns: SID, Check Items, Value. (Optional: 장비명 for fallback)
-    col_map_meas = {'SID': 'sid', '장비명': 'equipment_name', 'Check Items': 'check_item', 'Value': 'value'}
-    df_m = df_meas.rename(columns=col_map_meas)
+
+def _delta_write_measurements(c, df_meas: pd.DataFrame) -> Dict[str, int]:
+    """
+    Measurements 변경분 반영 (키: 장비 식별자 + Check Item)
     
-    for _, row in df_m.iterrows():
-        sid = row.get('sid')
-        
-        # Fallback: If SID is empty, try using equipment_name
-        if pd.isna(sid) or str(sid).strip() == '':
-            if pd.notna(row.get('equipment_name')):
-                sid = row.get('equipment_name')
-            else:
-                continue # Skip if no identifier
-        
-        equip_id = sid_to_id.get(str(sid))
-        
-        if equip_id:
-            if pd.notna(row.get('check_item')) and pd.notna(row.get('value')):
-                c.execute('''
-                    INSERT INTO measurements (equipment_id, check_item, value)
-                    VALUES (?, ?, ?)
-                ''', (equip_id, row['check_item'], row['value']))
-                added_measurements += 1
-                
-    conn.commit()
-    conn.close()
+    같은 장비에 같은 항목이 여러 번 있으면 등장 순서로 구분합니다.
+    """
+    summary = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
     
-    return {'equipments': added_equipments, 'measurements': added_measurements}
+    df_m = _prepare_measurements(df_meas, _equipment_id_map(c, status='approved')).copy()
+    df_m['_item'] = _canonical_text(df_m['check_item'])
+    df_m['_seq'] = df_m.groupby(['_key', '_item']).cumcount()
+    df_m.index = pd.MultiIndex.from_frame(df_m[['_key', '_item', '_seq']])
+    
+    ex = pd.read_sql_query('''
+        SELECT m.id, COALESCE(m.check_items, m.check_item) AS check_item, m.value,
+               e.sid, e.equipment_name
+        FROM measurements m
+        JOIN equipments e ON m.equipment_id = e.id
+        WHERE e.status = 'approved'
+        ORDER BY m.id
+    ''', c.connection)
+    ex['_key'] = _identifier_series(ex)
+    ex['_item'] = _canonical_text(ex['check_item'])
+    ex['_seq'] = ex.groupby(['_key', '_item']).cumcount()
+    ex.index = pd.MultiIndex.from_frame(ex[['_key', '_item', '_seq']])
+    
+    inc_hash = _row_hashes(df_m, [], ['value'])
+    ex_hash = _row_hashes(ex, [], ['value'])
+    
+    is_new = ~df_m.index.isin(ex.index)
+    common = df_m.index[~is_new]
+    changed = common[inc_hash[common].values != ex_hash[common].values]
+    removed = ex[~ex.index.isin(df_m.index)]
+    
+    c.executemany("DELETE FROM measurements WHERE id = ?", [(int(i),) for i in removed['id']])
+    c.executemany(
+        "UPDATE measurements SET value = ? WHERE id = ?",
+        [(value, int(meas_id)) for (value,), meas_id in zip(_to_records(df_m.loc[changed], ['value']), ex.loc[changed, 'id'])]
+    )
+    _insert_measurements(c, df_m[is_new])
+    
+    summary['inserted'] = int(is_new.sum())
+    summary['updated'] = len(changed)
+    summary['deleted'] = len(removed)
+    summary['unchanged'] = len(common) - len(changed)
+    return summary
+
+
+def sync_relational_delta(df_equip: pd.DataFrame, df_meas: pd.DataFrame,
+                          df_specs: pd.DataFrame = None) -> Dict[str, Dict[str, int]]:
+    """
+    변경분 동기화 (Delta Sync)
+    
+    SID 및 (SID, Check Item) 단위로 행 해시를 비교해 추가/수정/삭제만
+    하나의 트랜잭션으로 반영합니다. 테이블을 비우지 않으므로 동기화 중에도
+    다른 사용자는 항상 이전 또는 새 데이터 전체를 보게 됩니다.
+    추가/수정된 장비의 출하일(ship_date)도 같은 트랜잭션에서 계산하므로 월별 집계가 바로 맞습니다.
+    대기(pending)/반려 데이터는 건드리지 않습니다.
+    
+    Args:
+        df_specs: None이면 규격은 그대로 유지
+    
+    Returns:
+        dict: {'equipments': {...}, 'measurements': {...}, 'specs': {...}}
+              각 항목은 inserted / updated / deleted / unchanged 건수
+    """
+    start = time.perf_counter()
+    init_db()
+    conn = get_connection()
+    c = conn.cursor()
+    
+    try:
+        result = {'equipments': _delta_write_equipments(c, df_equip)}
+        result['measurements'] = _delta_write_measurements(c, df_meas)
+        if df_specs is not None:
+            result['specs'] = _delta_write_specs(c, df_specs)
+        else:
+            result['specs'] = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+        conn.commit()
+        invalidate_spec_cache()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    
+    _observe_ingest('delta', result, time.perf_counter() - start)
+    return result
 
 
 def insert_equipment_from_excel(df_equip: pd.DataFrame, df_meas: pd.DataFrame) -> Dict[str, int]:
     """
     Insert data from uploaded Excel file with status='pending'.
     """
+    start = time.perf_counter()
     conn = get_connection()
     c = conn.cursor()
     
@@ -486,6 +1638,7 @@ def insert_equipment_from_excel(df_equip: pd.DataFrame, df_meas: pd.DataFrame) -
                       str(sid), equipment_name, 'pending'))
                 added_measurements += 1
                 
+    _backfill_check_item_ids(c)
     conn.commit()
     conn.close()
     
@@ -499,7 +1652,12 @@ def insert_equipment_from_excel(df_equip: pd.DataFrame, df_meas: pd.DataFrame) -
             equipment_name = sid_to_name.get(str(sid), '')
             insert_pending_measurements(equip_meas, str(sid), equipment_name)
     
-    return {'equipments': added_equipments, 'measurements': added_measurements}
+    # 출하일 정규화 → 월별 집계 반영 (트리거)
+    backfill_ship_dates()
+    
+    result = {'equipments': added_equipments, 'measurements': added_measurements}
+    _observe_ingest('upload', result, time.perf_counter() - start)
+    return result
 
 
 def insert_pending_measurements(df_meas: pd.DataFrame, sid: str, equipment_name: str):
@@ -507,6 +1665,7 @@ def insert_pending_measurements(df_meas: pd.DataFrame, sid: str, equipment_name:
     Insert raw measurement data into pending_measurements table.
     df_meas should contain columns from the upload preview.
     """
+    start = time.perf_counter()
     conn = get_connection()
     c = conn.cursor()
     
@@ -552,8 +1711,10 @@ def insert_pending_measurements(df_meas: pd.DataFrame, sid: str, equipment_name:
             row.get('Remark')
         ))
     
+    _backfill_check_item_ids(c)
     conn.commit()
     conn.close()
+    _observe_ingest('pending', {'pending_measurements': len(df_meas)}, time.perf_counter() - start)
 
 def get_pending_measurements(sid: str) -> pd.DataFrame:
     """
@@ -585,36 +1746,100 @@ def get_full_measurements(sid: str) -> pd.DataFrame:
     Used for the Dashboard 'Full Data View'.
     Returns columns in Excel original order (matching upload preview).
     """
-    conn = get_connection()
-    query = """
-        SELECT 
-            module as Module,
-            check_items as "Check Items", 
-            min_text as Min, 
-            criteria_text as Criteria, 
-            max_text as Max, 
-            value_text as Measurement, 
-            unit as Unit, 
-            pass_fail as "PASS/FAIL",
-            category as Category, 
-            trend as Trend, 
-            remark as Remark
-        FROM pending_measurements
-        WHERE sid = ?
-        ORDER BY id ASC
-    """
-    df = pd.read_sql_query(query, conn, params=(sid,))
-    conn.close()
-    
+    return get_full_measurements_many([sid])[str(sid)]
+
+
+# ============================================================
+# Full Data View Cache (SID별 LRU)
+# ============================================================
+
+FULL_MEASUREMENT_COLUMNS = [
+    'Module', 'Check Items', 'Min', 'Criteria', 'Max', 'Measurement',
+    'Unit', 'PASS/FAIL', 'Category', 'Trend', 'Remark'
+]
+FULL_MEASUREMENT_CACHE_SIZE = 32
+
+# sid -> DataFrame (최근 사용 순). pending_measurements 버전이 바뀌면 전체 폐기합니다.
+_full_cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+_full_cache_version = None
+_full_cache_lock = threading.Lock()
+
+
+def _format_full_measurements(df: pd.DataFrame) -> pd.DataFrame:
     # Replace None with empty string for better display
-    df = df.fillna('')
+    df = df[FULL_MEASUREMENT_COLUMNS].fillna('').reset_index(drop=True)
     
     # Add row number column at the beginning
     df.insert(0, '#', range(1, len(df) + 1))
-    
     return df
 
 
+def get_full_measurements_many(sids: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    여러 SID의 Full Data View를 한 번의 쿼리로 조회
+    
+    캐시에 없는 SID만 IN 조건으로 함께 조회한 뒤 SID별로 나눕니다.
+    결과는 SID별 LRU 캐시(FULL_MEASUREMENT_CACHE_SIZE)에 보관됩니다.
+    
+    Returns:
+        dict: sid -> DataFrame (get_full_measurements와 같은 형식, 데이터가 없으면 빈 DataFrame)
+    """
+    global _full_cache_version
+    sids = list(dict.fromkeys(str(sid) for sid in sids))
+    version = get_table_versions().get('pending_measurements')
+    
+    with _full_cache_lock:
+        if version != _full_cache_version:
+            _full_cache.clear()
+            _full_cache_version = version
+        result = {sid: _full_cache[sid] for sid in sids if sid in _full_cache}
+        for sid in result:
+            _full_cache.move_to_end(sid)
+    
+    missing = [sid for sid in sids if sid not in result]
+    _observe_cache('full_view', len(result), len(missing))
+    if missing:
+        placeholders = ','.join(['?'] * len(missing))
+        conn = get_connection()
+        df = pd.read_sql_query(f"""
+            SELECT 
+                sid,
+                module as Module,
+                check_items as "Check Items", 
+                min_text as Min, 
+                criteria_text as Criteria, 
+                max_text as Max, 
+                value_text as Measurement, 
+                unit as Unit, 
+                pass_fail as "PASS/FAIL",
+                category as Category, 
+                trend as Trend, 
+                remark as Remark
+            FROM pending_measurements
+            WHERE sid IN ({placeholders})
+            ORDER BY id ASC
+        """, conn, params=missing)
+        conn.close()
+        
+        groups = dict(tuple(df.groupby('sid', sort=False)))
+        fetched = {
+            sid: _format_full_measurements(groups[sid] if sid in groups else df.iloc[0:0])
+            for sid in missing
+        }
+        
+        with _full_cache_lock:
+            if version == _full_cache_version:
+                for sid, frame in fetched.items():
+                    _full_cache[sid] = frame
+                    _full_cache.move_to_end(sid)
+                while len(_full_cache) > FULL_MEASUREMENT_CACHE_SIZE:
+                    _full_cache.popitem(last=False)
+        result.update(fetched)
+    
+    # 캐시된 DataFrame이 화면 코드에서 수정되지 않도록 복사본 반환
+    return {sid: result[sid].copy() for sid in sids}
+
+
 def get_equipment_status(sid: str) -> str:
     """
     Check the current status of an equipment by SID.
@@ -682,6 +1907,42 @@ def get_all_equipments(filters: dict = None) -> pd.DataFrame:
     return df
 
 
+def _parse_ship_dates(dates: pd.Series) -> pd.Series:
+    """date 원문 -> 'YYYY-MM-DD' (파싱 불가 시 '')"""
+    try:
+        parsed = pd.to_datetime(dates, format='mixed', errors='coerce')
+    except Exception:
+        parsed = pd.to_datetime(dates, errors='coerce')
+    return parsed.dt.strftime('%Y-%m-%d').fillna('')
+
+
+def backfill_ship_dates() -> int:
+    """
+    equipments.ship_date가 비어 있는 행을 date 원문에서 채움
+    
+    get_all_equipments()와 같은 규칙(format='mixed')으로 파싱하며,
+    파싱할 수 없는 날짜는 ''로 저장해 다시 시도하지 않습니다.
+    
+    Returns:
+        int: 갱신한 행 수
+    """
+    conn = get_connection()
+    df = pd.read_sql_query("SELECT id, date FROM equipments WHERE ship_date IS NULL", conn)
+    if df.empty:
+        conn.close()
+        return 0
+    
+    ship_dates = _parse_ship_dates(df['date'])
+    
+    conn.executemany(
+        "UPDATE equipments SET ship_date = ? WHERE id = ?",
+        zip(ship_dates.tolist(), df['id'].tolist())
+    )
+    conn.commit()
+    conn.close()
+    return len(df)
+
+
 def get_pending_equipments() -> pd.DataFrame:
     """Get all equipments with status='pending'."""
     conn = get_connection()
@@ -702,6 +1963,7 @@ def approve_equipment(equip_id: int):
     c.execute("SELECT sid, equipment_name FROM equipments WHERE id = ?", (equip_id,))
     equip = c.fetchone()
     sid, equip_name = equip if equip else (None, None)
+    _observe_approval_wait(c, equip_id, 'approve')
     
     # 2. Update equipment status
     c.execute("UPDATE equipments SET status = 'approved' WHERE id = ?", (equip_id,))
@@ -730,6 +1992,8 @@ def reject_equipment(equip_id: int, reason: str = None, admin_name: str = None):
     conn = get_connection()
     c = conn.cursor()
     
+    _observe_approval_wait(c, equip_id, 'reject')
+    
     # Get SID first to update pending_measurements
     c.execute("SELECT sid FROM equipments WHERE id = ?", (equip_id,))
     row = c.fetchone()
@@ -800,11 +2064,11 @@ def check_previous_rejections(sid: str) -> pd.DataFrame:
             action,
             admin_name,
             reason,
-            timestamp,
+            action_at AS timestamp,
             modification_count
         FROM approval_history
-        WHERE sid = ? AND action = 'rejected'
-        ORDER BY timestamp DESC
+        WHERE sid = ? AND action IN ('reject', 'rejected')
+        ORDER BY action_at DESC
         LIMIT 5
     """
     df = pd.read_sql_query(query, conn, params=(sid,))
@@ -816,10 +2080,10 @@ def is_resubmitted(sid: str) -> bool:
     """Check if the latest action for this SID was 'resubmitted'."""
     conn = get_connection()
     c = conn.cursor()
-    c.execute("SELECT action FROM approval_history WHERE sid = ? ORDER BY timestamp DESC LIMIT 1", (sid,))
+    c.execute("SELECT action FROM approval_history WHERE sid = ? ORDER BY action_at DESC, id DESC LIMIT 1", (sid,))
     row = c.fetchone()
     conn.close()
-    return row and row[0] == 'resubmitted'
+    return bool(row) and row[0] in ('resubmit', 'resubmitted')
 
 
 def import_data_from_df(df: pd.DataFrame, replace: bool = False) -> Dict[str, int]:
@@ -902,6 +2166,7 @@ def import_data_from_df(df: pd.DataFrame, replace: bool = False) -> Dict[str, in
             ''', (equip_id, row['check_item'], row['value']))
             added_measurements += 1
             
+    _backfill_check_item_ids(c)
     conn.commit()
     conn.close()
     
@@ -940,6 +2205,7 @@ def insert_single_record(data: Dict[str, Any]):
         VALUES (?, ?, ?)
     ''', (equip_id, data['check_item'], data['value']))
     
+    _backfill_check_item_ids(c)
     conn.commit()
     conn.close()
 
@@ -955,7 +2221,15 @@ def get_unique_values(column: str) -> List[str]:
     table = 'equipments' if column in equip_cols else 'measurements'
     
     try:
-        c.execute(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL AND {column} != '' ORDER BY {column}")
+        if column in ('check_item', 'check_items'):
+            # 항목 사전(수백 행)만 순회하며 측정 행이 있는 항목인지 item_id 인덱스로 확인
+            c.execute('''
+                SELECT ci.name FROM check_items ci
+                WHERE EXISTS (SELECT 1 FROM measurements m WHERE m.item_id = ci.id)
+                ORDER BY ci.name
+            ''')
+        else:
+            c.execute(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL AND {column} != '' ORDER BY {column}")
         results = [row[0] for row in c.fetchall()]
     except sqlite3.OperationalError:
         results = []
@@ -963,10 +2237,70 @@ def get_unique_values(column: str) -> List[str]:
     conn.close()
     return results
 
+# ============================================================
+# Filtered Data Cache (분석 데이터 LRU)
+# ============================================================
+
+FILTERED_DATA_CACHE_SIZE = 8
+# 캐시 전체 행 수 상한 (행 수 기준으로 오래된 항목부터 폐기)
+FILTERED_DATA_CACHE_MAX_ROWS = 2_000_000
+# 이보다 큰 조회 결과(예: 조건 없는 전체 조회)는 캐시하지 않음 - 복사 비용/메모리가 재조회보다 큼
+FILTERED_DATA_CACHE_ENTRY_MAX_ROWS = 500_000
+
+# 조회 조건 -> DataFrame (최근 사용 순). equipments/measurements 버전이 바뀌면 전체 폐기합니다.
+_filtered_cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_filtered_cache_version = None
+_filtered_cache_lock = threading.Lock()
+
+
+def _filter_cache_key(filters: Dict[str, List[str]]) -> tuple:
+    # 조건 순서/값 타입(date, str)과 관계없이 같은 조회는 같은 키
+    return tuple(sorted(
+        (col, tuple(str(v) for v in values)) for col, values in filters.items() if values
+    ))
+
+
 def fetch_filtered_data(filters: Dict[str, List[str]]) -> pd.DataFrame:
     """
     Fetch data by JOINing equipments and measurements tables.
+    
+    같은 조건의 최근 조회 결과는 프로세스 LRU 캐시에서 반환합니다.
+    캐시는 항목 수(FILTERED_DATA_CACHE_SIZE)와 전체 행 수(FILTERED_DATA_CACHE_MAX_ROWS)로 제한되며,
+    FILTERED_DATA_CACHE_ENTRY_MAX_ROWS보다 큰 결과는 캐시하지 않습니다.
     """
+    global _filtered_cache_version
+    key = _filter_cache_key(filters)
+    versions = get_table_versions()
+    version = (versions.get('equipments'), versions.get('measurements'))
+    
+    with _filtered_cache_lock:
+        if version != _filtered_cache_version:
+            _filtered_cache.clear()
+            _filtered_cache_version = version
+        df = _filtered_cache.get(key)
+        if df is not None:
+            _filtered_cache.move_to_end(key)
+    _observe_cache('filtered_data', df is not None, df is None)
+
+    if df is None:
+        df = _query_filtered_data(filters)
+        if len(df) > FILTERED_DATA_CACHE_ENTRY_MAX_ROWS:
+            return df  # 캐시하지 않으므로 복사 불필요
+        
+        with _filtered_cache_lock:
+            if version == _filtered_cache_version and key not in _filtered_cache:
+                _filtered_cache[key] = df
+                total_rows = sum(len(cached) for cached in _filtered_cache.values())
+                while (len(_filtered_cache) > FILTERED_DATA_CACHE_SIZE
+                       or total_rows > FILTERED_DATA_CACHE_MAX_ROWS):
+                    _, evicted = _filtered_cache.popitem(last=False)
+                    total_rows -= len(evicted)
+    
+    # 캐시된 DataFrame이 화면 코드에서 수정되지 않도록 복사본 반환
+    return df.copy()
+
+
+def _query_filtered_data(filters: Dict[str, List[str]]) -> pd.DataFrame:
     conn = get_connection()
     
     # Base Query: JOIN equipments and measurements
@@ -975,7 +2309,7 @@ def fetch_filtered_data(filters: Dict[str, List[str]]) -> pd.DataFrame:
         SELECT 
             e.date, e.equipment_name, e.ri, e.model, e.xy_scanner, 
             e.head_type, e.mod_vit, e.sliding_stage, e.sample_chuck, e.ae,
-            m.check_item, m.value
+            COALESCE(m.check_item, m.check_items) AS check_item, m.value
         FROM measurements m
         JOIN equipments e ON m.equipment_id = e.id
         WHERE e.status = 'approved'
@@ -994,10 +2328,13 @@ def fetch_filtered_data(filters: Dict[str, List[str]]) -> pd.DataFrame:
             query += " AND e.date >= ? AND e.date <= ?"
             params.extend([str(start), str(end)])
         elif col == 'check_item':
-            # check_item is in measurements table
-            placeholders = ', '.join(['?'] * len(values))
-            query += f" AND m.check_item IN ({placeholders})"
-            params.extend(values)
+            # 항목명 -> check_items.id (표기 차이 무시), 정수 item_id 인덱스로 필터
+            # item_id는 필터에만 사용하고, 반환하는 항목명은 행에 저장된 원래 표기를 유지합니다.
+            # (규격 조회는 specs.check_item과 정확히 일치하는 이름으로 이뤄지기 때문)
+            item_ids = get_check_item_ids(values)
+            placeholders = ', '.join(['?'] * len(item_ids))
+            query += f" AND m.item_id IN ({placeholders})"
+            params.extend(item_ids)
         else:
             # All other filters are likely in equipments table
             # e.g. model -> e.model
@@ -1037,13 +2374,125 @@ def fetch_filtered_data(filters: Dict[str, List[str]]) -> pd.DataFrame:
         
     return df
 
+
+# ============================================================
+# Analysis Usage Log (분석 조회 이력)
+# ============================================================
+
+# 분석 버튼마다 DB에 쓰지 않도록 횟수를 메모리에 모았다가 한 번에 기록합니다.
+# 누적 클릭 수(USAGE_FLUSH_EVERY) 또는 마지막 기록 후 경과 시간(USAGE_FLUSH_INTERVAL_SEC)을
+# 넘으면 기록하고, 프로세스 종료 시(atexit)와 조회(get_top_analysis_usage) 전에도 기록합니다.
+USAGE_FLUSH_EVERY = 50
+USAGE_FLUSH_INTERVAL_SEC = 300
+
+# (model, check_item) -> [count, last_used]
+_usage_buffer: Dict[Tuple[str, str], list] = {}
+_usage_pending = 0
+_usage_flushed_at = time.monotonic()
+_usage_lock = threading.Lock()
+
+
+def log_analysis_usage(filters: Dict[str, List[str]]):
+    """
+    분석 조회 조건의 (모델, 항목) 조합별 사용 횟수 기록 (메모리 버퍼, 일정 주기로 DB 반영)
+    
+    항목을 선택하지 않은 조회는 기록하지 않습니다 (예열 대상이 아님).
+    모델을 선택하지 않았으면 model = ''로 기록합니다.
+    여러 모델/항목 조회는 쌍별로 나누어 기록하고 R/I·기간 필터는 기록하지 않으므로,
+    예열(warmup._warm_datasets)이 적중하는 것은 단일 모델/단일 항목 조회뿐입니다.
+    """
+    global _usage_pending
+    items = filters.get('check_item') or []
+    models = filters.get('model') or ['']
+    if not items:
+        return
+    
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    with _usage_lock:
+        for model in models:
+            for item in items:
+                entry = _usage_buffer.setdefault((str(model), str(item)), [0, now])
+                entry[0] += 1
+                entry[1] = now
+        _usage_pending += 1
+        due = (_usage_pending >= USAGE_FLUSH_EVERY
+               or time.monotonic() - _usage_flushed_at >= USAGE_FLUSH_INTERVAL_SEC)
+    
+    if due:
+        flush_analysis_usage()
+
+
+@atexit.register
+def flush_analysis_usage():
+    """버퍼에 모인 사용 횟수를 analysis_usage 테이블에 한 번에 반영"""
+    global _usage_pending, _usage_flushed_at
+    with _usage_lock:
+        if not _usage_buffer:
+            return
+        rows = [(model, item, count, last_used) for (model, item), (count, last_used) in _usage_buffer.items()]
+        _usage_buffer.clear()
+        _usage_pending = 0
+        _usage_flushed_at = time.monotonic()
+    
+    try:
+        conn = get_connection()
+        try:
+            conn.executemany('''
+                INSERT INTO analysis_usage (model, check_item, count, last_used) VALUES (?, ?, ?, ?)
+                ON CONFLICT(model, check_item) DO UPDATE SET
+                    count = count + excluded.count, last_used = excluded.last_used
+            ''', rows)
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        # 기록 실패 시 버퍼로 되돌려 다음 기록 때 다시 시도
+        logger.warning("Analysis usage flush failed (%d rows): %s", len(rows), e)
+        with _usage_lock:
+            for model, item, count, last_used in rows:
+                entry = _usage_buffer.setdefault((model, item), [0, last_used])
+                entry[0] += count
+
+
+def get_top_analysis_usage(limit: int = 5) -> List[Tuple[str, str, int]]:
+    """
+    가장 많이 조회된 (모델, 항목) 조합
+    
+    Returns:
+        list: [(model, check_item, count)] (count 내림차순, model ''은 모델 미선택)
+    """
+    flush_analysis_usage()
+    conn = get_connection()
+    try:
+        rows = conn.execute('''
+            SELECT model, check_item, count FROM analysis_usage
+            ORDER BY count DESC, last_used DESC
+            LIMIT ?
+        ''', (limit,)).fetchall()
+    except sqlite3.OperationalError:
+        rows = []  # init_db 이전
+    conn.close()
+    return rows
+
 def clear_all_data():
-    """Clear all data."""
+    """
+    Clear all data (장비 + 측정값).
+    빈 shadow 테이블과 교체하므로 삭제 중간 상태가 보이지 않으며, 규격(specs)은 유지됩니다.
+    """
+    tables = ['equipments', 'measurements']
     conn = get_connection()
     c = conn.cursor()
-    c.execute("DELETE FROM equipments")
-    conn.commit()
-    conn.close()
+    try:
+        _create_shadow_tables(c, tables)
+        _index_shadow_tables(c, tables)
+        conn.commit()
+        _swap_shadow_tables(conn, tables)
+    except Exception:
+        conn.rollback()
+        _drop_shadow_tables(conn, tables)
+        raise
+    finally:
+        conn.close()
 
 def sync_denormalized_columns():
     """
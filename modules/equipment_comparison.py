@@ -5,10 +5,13 @@ Equipment Comparison Analysis Module
 """
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+from .lazy_imports import lazy_module
+
+px = lazy_module('plotly.express')
+
 
 def create_equipment_comparison_table(df, lsl=None, usl=None, target=None):
     """
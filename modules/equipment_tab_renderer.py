@@ -3,6 +3,7 @@ Equipment Comparison Tab Renderer
 장비 비교 탭 렌더링 함수
 """
 import streamlit as st
+from . import database as db
 from .spec_analysis import prepare_spec_data
 from .equipment_comparison import (
     create_equipment_comparison_table,
@@ -25,7 +26,8 @@ def render_equipment_comparison_content(display_df, selected_equip_item):
         st.warning("⚠️ 선택한 항목에 장비 데이터가 없습니다.")
         return
     
-    # 스펙 정보 추출
+    # 스펙 정보 추출 (캐시된 specs를 행 단위로 join)
+    item_equip_df = db.attach_specs(item_equip_df)
     spec_data = prepare_spec_data(item_equip_df)
     lsl = spec_data['lsl'] if spec_data else None
     usl = spec_data['usl'] if spec_data else None
@@ -0,0 +1,177 @@
+"""
+Equipment Explorer Data Service
+장비 현황 탭 조회 모듈
+
+- 기간 / R/I / 모델 조건을 SQL(ship_date 인덱스)로 내려 필요한 행만 조회
+- 탐색 탭이 표시하는 컬럼만 SELECT
+- 출고 기간 최소/최대값은 equipments 데이터 버전별로 캐시
+"""
+import threading
+from datetime import date
+from typing import Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from . import database as db
+
+# 탐색 탭(목록, 상세, 비교, Sunburst)이 사용하는 컬럼
+EXPLORER_COLUMNS = [
+    'id', 'sid', 'equipment_name', 'ri', 'model', 'date',
+    'head_type', 'xy_scanner', 'mod_vit', 'sliding_stage', 'sample_chuck', 'ae',
+    'end_user', 'mfg_engineer', 'qc_engineer', 'reference_doc',
+]
+
+_lock = threading.Lock()
+_backfilled_version: Optional[int] = None
+_bounds_cache: Dict[int, Tuple[Optional[date], Optional[date]]] = {}
+
+
+def _equipments_version() -> Optional[int]:
+    return db.get_table_versions().get('equipments')
+
+
+def _ensure_ship_dates() -> Optional[int]:
+    """
+    ship_date backfill (equipments 버전이 바뀐 경우에만 실행)
+
+    Returns:
+        backfill 이후의 equipments 버전
+    """
+    global _backfilled_version
+    version = _equipments_version()
+    if version is not None and version == _backfilled_version:
+        return version
+
+    with _lock:
+        if db.backfill_ship_dates():
+            version = _equipments_version()  # backfill UPDATE로 버전 증가
+        _backfilled_version = version
+    return version
+
+
+def _window_clause(start_date: date, end_date: date,
+                   ri: Optional[str] = None, model: Optional[str] = None) -> Tuple[str, list]:
+    where = "ship_date BETWEEN ? AND ?"
+    params = [start_date.isoformat(), end_date.isoformat()]
+    if ri is not None:
+        where += " AND ri = ?"
+        params.append(ri)
+    if model is not None:
+        where += " AND model = ?"
+        params.append(model)
+    return where, params
+
+
+def get_data_version() -> Optional[int]:
+    """ship_date가 최신인 상태의 equipments 데이터 버전 (화면 캐시 키)"""
+    return _ensure_ship_dates()
+
+
+def get_date_bounds() -> Tuple[Optional[date], Optional[date]]:
+    """
+    출고 기간 최소/최대값
+
+    Returns:
+        (min_date, max_date), 날짜가 있는 장비가 없으면 (None, None)
+    """
+    version = _ensure_ship_dates()
+    if version in _bounds_cache:
+        return _bounds_cache[version]
+
+    conn = db.get_connection()
+    row = conn.execute(
+        "SELECT MIN(ship_date), MAX(ship_date) FROM equipments WHERE ship_date > ''"
+    ).fetchone()
+    conn.close()
+
+    bounds = (None, None)
+    if row and row[0]:
+        bounds = (date.fromisoformat(row[0]), date.fromisoformat(row[1]))
+
+    with _lock:
+        _bounds_cache.clear()  # 최신 버전 하나만 유지
+        _bounds_cache[version] = bounds
+    return bounds
+
+
+def get_model_counts(start_date: date, end_date: date, ri: Optional[str] = None) -> pd.DataFrame:
+    """
+    기간 내 R/I·모델별 장비 수
+
+    Returns:
+        DataFrame: ri, model, count (count 내림차순, 값이 없는 항목은 None)
+    """
+    _ensure_ship_dates()
+    where, params = _window_clause(start_date, end_date, ri)
+
+    conn = db.get_connection()
+    df = pd.read_sql_query(f"""
+        SELECT ri, model, COUNT(*) AS count
+        FROM equipments
+        WHERE {where}
+        GROUP BY ri, model
+        ORDER BY count DESC, model
+    """, conn, params=params)
+    conn.close()
+    return df
+
+
+def get_explorer_equipments(start_date: date, end_date: date,
+                            ri: Optional[str] = None, model: Optional[str] = None,
+                            columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    기간 / R/I / 모델 조건에 맞는 장비 조회
+
+    Args:
+        start_date, end_date: 출고 기간 (양 끝 포함)
+        ri: 'Research' / 'Industrial' (None이면 전체)
+        model: 모델명 (None이면 전체)
+        columns: 조회 컬럼 (None이면 EXPLORER_COLUMNS)
+
+    Returns:
+        DataFrame: 출고일 최신순, date는 datetime (ship_date 기준)
+    """
+    _ensure_ship_dates()
+    columns = list(columns or EXPLORER_COLUMNS)
+    select = ', '.join('ship_date AS date' if col == 'date' else col for col in columns)
+    where, params = _window_clause(start_date, end_date, ri, model)
+
+    conn = db.get_connection()
+    df = pd.read_sql_query(f"""
+        SELECT {select}
+        FROM equipments
+        WHERE {where}
+        ORDER BY ship_date DESC, id DESC
+    """, conn, params=params)
+    conn.close()
+
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d')
+    return df
+
+
+def compare_full_measurements(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    장비별 Full Data View 측정값을 나란히 배치
+
+    (Module, Check Items) 기준으로 맞추며, 같은 항목이 여러 번 나오면 나온 순서대로 짝을 짓습니다.
+
+    Args:
+        frames: 장비명 -> db.get_full_measurements_many() 결과
+
+    Returns:
+        DataFrame: Module, Check Items, Unit, <장비명>... (Measurement 원문)
+    """
+    keys = ['Module', 'Check Items', 'seq']
+    parts = []
+    for name, df in frames.items():
+        part = df[['Module', 'Check Items', 'Unit', 'Measurement']].copy()
+        part['seq'] = part.groupby(['Module', 'Check Items']).cumcount()
+        part['equipment'] = name
+        parts.append(part)
+    long = pd.concat(parts, ignore_index=True)
+
+    wide = long.pivot(index=keys, columns='equipment', values='Measurement').reset_index()
+    rows = long.drop_duplicates(keys)[keys + ['Unit']]
+    out = rows.merge(wide, on=keys, how='left')
+    return out[['Module', 'Check Items', 'Unit'] + list(frames)].fillna('').reset_index(drop=True)
@@ -0,0 +1,64 @@
+"""
+Lazy Imports
+무거운 모듈을 처음 사용할 때 import (컨테이너 재시작 후 첫 화면 시간 단축)
+
+    from modules.lazy_imports import lazy_module
+    px = lazy_module('plotly.express')   # px.bar(...)처럼 속성에 처음 접근할 때 import
+
+- scipy.stats(~0.4초), plotly.express(~0.07초)는 사용하는 화면을 열 때까지 로드하지 않음
+- preload(): 등록된 모듈을 미리 import (백그라운드 warm-up용)
+- 측정: python benchmarks/bench_import_time.py
+"""
+import importlib
+import sys
+import types
+from typing import Dict, List
+
+# 이름 -> 지연 모듈 (같은 이름은 하나의 객체를 공유)
+_LAZY_MODULES: Dict[str, 'LazyModule'] = {}
+
+
+class LazyModule(types.ModuleType):
+    """속성에 처음 접근할 때 실제 모듈을 import하는 대리 모듈"""
+
+    def __getattr__(self, attr):
+        # 실제 모듈의 속성을 복사해 두므로 이후 접근은 __getattr__을 거치지 않음
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+    def __repr__(self):
+        state = 'loaded' if self.__name__ in sys.modules else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_module(name: str) -> types.ModuleType:
+    """
+    모듈 지연 import
+
+    이미 import된 모듈이면 그대로 반환합니다.
+    import 오류(설치되지 않은 모듈)는 처음 사용할 때 발생합니다.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if name not in _LAZY_MODULES:
+        _LAZY_MODULES[name] = LazyModule(name)
+    return _LAZY_MODULES[name]
+
+
+def preload(names: List[str] = None) -> List[str]:
+    """
+    지연 모듈을 미리 import
+
+    Args:
+        names: None이면 lazy_module()로 등록된 전체
+
+    Returns:
+        list: 이번에 새로 import한 모듈 이름
+    """
+    loaded = []
+    for name in names if names is not None else list(_LAZY_MODULES):
+        if name not in sys.modules:
+            importlib.import_module(name)
+            loaded.append(name)
+    return loaded
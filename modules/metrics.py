@@ -0,0 +1,371 @@
+"""
+Metrics
+Prometheus 형식 메트릭 (counter / gauge / histogram) + 로컬 HTTP endpoint
+
+    REQUESTS = metrics.counter('app_cache_lookups_total', '캐시 조회', ['cache', 'result'])
+    REQUESTS.labels('spec', 'hit').inc()
+
+    LATENCY = metrics.histogram('app_db_query_seconds', 'DB 조회 시간', ['function'])
+    LATENCY.labels('fetch_filtered_data').observe(0.012)
+
+    metrics.start_http_server()      # http://127.0.0.1:9108/metrics (text exposition format)
+    metrics.get_snapshot()           # 관리자 화면용 [{'metric', 'labels', 'type', 'value', ...}]
+
+- 표준 라이브러리만 사용 (Tkinter 도구에서도 import 가능)
+- 같은 이름으로 다시 만들면 기존 메트릭을 반환 (Streamlit 재실행마다 app.py가 다시 실행되므로)
+- 기록 비용: 라벨 dict 조회 + lock 1회 (수백 ns)
+- 환경 변수: METRICS_PORT (기본 9108, 0이면 끄기), METRICS_ADDR (기본 127.0.0.1, 컨테이너에서는 0.0.0.0 + 호스트 127.0.0.1에만 publish)
+"""
+import bisect
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_PORT = 9108
+# 초 단위 (DB 조회 / 렌더링 / 외부 요청)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger(__name__)
+
+_registry: Dict[str, '_Metric'] = {}
+_registry_lock = threading.Lock()
+_server = None
+_server_attempted = False
+
+
+# ============================================================
+# Metric Types
+# ============================================================
+
+class _Metric:
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values, **kwargs):
+        """라벨 값 -> 하위 메트릭 (위치 인자는 labelnames 순서)"""
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: labels {self.labelnames} expected, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _default(self):
+        # 라벨이 없는 메트릭은 자기 자신처럼 사용 (COUNTER.inc())
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """[(sample 이름, 라벨, 값)]"""
+        raise NotImplementedError
+
+    def _label_dict(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self, lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """증가만 하는 값 (요청 수, 적재 행 수)"""
+    type_name = 'counter'
+
+    def _new_child(self):
+        return _CounterChild(self._lock)
+
+    def inc(self, amount: float = 1):
+        self._default().inc(amount)
+
+    def samples(self):
+        return [(self.name, self._label_dict(values), child.value) for values, child in list(self._children.items())]
+
+
+class _GaugeChild:
+    __slots__ = ('value', 'function', '_lock')
+
+    def __init__(self, lock):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+        self._lock = lock
+
+    def set(self, value: float):
+        self.value = float(value)
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]):
+        """수집 시점에 값을 계산 (활성 세션 수 등)"""
+        self.function = function
+
+    def get(self) -> float:
+        return float(self.function()) if self.function is not None else self.value
+
+
+class Gauge(_Metric):
+    """올라가고 내려가는 현재 값 (활성 세션 수)"""
+    type_name = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild(self._lock)
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def inc(self, amount: float = 1):
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1):
+        self._default().dec(amount)
+
+    def set_function(self, function: Callable[[], float]):
+        self._default().set_function(function)
+
+    def samples(self):
+        return [(self.name, self._label_dict(values), child.get()) for values, child in list(self._children.items())]
+
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets, lock):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # 마지막 = +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = lock
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """버킷 경계로 추정한 분위수 (버킷 안에서는 선형 보간)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if i == len(self.buckets):
+                    return lower  # +Inf 버킷: 마지막 경계
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+class Histogram(_Metric):
+    """분포 (지연 시간) - 버킷별 누적 개수 + 합계 + 개수"""
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets, self._lock)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+    def samples(self):
+        result = []
+        for values, child in list(self._children.items()):
+            labels = self._label_dict(values)
+            cumulative = 0
+            for bound, count in zip(list(self.buckets) + [float('inf')], child.counts):
+                cumulative += count
+                result.append((f"{self.name}_bucket", {**labels, 'le': _format_value(bound)}, cumulative))
+            result.append((f"{self.name}_sum", labels, child.sum))
+            result.append((f"{self.name}_count", labels, child.count))
+        return result
+
+
+def _get_or_create(cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, documentation, labelnames, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"metric {name} already registered as {metric.type_name}")
+        return metric
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _get_or_create(Counter, name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return _get_or_create(Gauge, name, documentation, labelnames)
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return _get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+
+def timed(metric: Histogram, *label_values):
+    """함수 실행 시간을 histogram에 기록하는 데코레이터"""
+    def decorator(func):
+        child = metric.labels(*label_values)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+# ============================================================
+# Exposition / Snapshot
+# ============================================================
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_text() -> str:
+    """Prometheus text exposition format (0.0.4)"""
+    lines = []
+    for metric in sorted(list(_registry.values()), key=lambda m: m.name):
+        lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+        for name, labels, value in metric.samples():
+            label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            lines.append(f"{name}{{{label_text}}} {_format_value(value)}" if label_text
+                         else f"{name} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+def get_snapshot() -> List[Dict[str, Any]]:
+    """
+    현재 값 목록 (관리자 화면용)
+
+    Returns:
+        list: {'metric', 'labels', 'type', 'value', 'count', 'mean', 'p50', 'p95'}
+              counter/gauge는 value, histogram은 count/mean/p50/p95 (초)
+    """
+    rows = []
+    for metric in sorted(list(_registry.values()), key=lambda m: m.name):
+        for values, child in sorted(list(metric._children.items())):
+            labels = ', '.join(f"{k}={v}" for k, v in zip(metric.labelnames, values))
+            row = {'metric': metric.name, 'labels': labels, 'type': metric.type_name,
+                   'value': None, 'count': None, 'mean': None, 'p50': None, 'p95': None}
+            if isinstance(child, _HistogramChild):
+                row.update(value=child.sum, count=child.count,
+                           mean=child.sum / child.count if child.count else None,
+                           p50=child.quantile(0.5), p95=child.quantile(0.95))
+            elif isinstance(child, _GaugeChild):
+                row['value'] = child.get()
+            else:
+                row['value'] = child.value
+            rows.append(row)
+    return rows
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = render_text().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 수집 요청마다 stderr에 남기지 않음
+
+
+def start_http_server(port: int = None, addr: str = None) -> Optional[str]:
+    """
+    /metrics endpoint 시작 (프로세스당 한 번 시도, daemon 스레드)
+
+    Returns:
+        str: endpoint URL (포트 0 / 이미 사용 중이면 None)
+    """
+    global _server, _server_attempted
+    with _registry_lock:
+        if _server_attempted:
+            return get_endpoint()
+        _server_attempted = True
+        port = int(os.environ.get('METRICS_PORT', DEFAULT_PORT)) if port is None else port
+        addr = os.environ.get('METRICS_ADDR', '127.0.0.1') if addr is None else addr
+        if not port:
+            return None
+        try:
+            _server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+        except OSError as e:
+            logger.warning("metrics endpoint %s:%s unavailable: %s", addr, port, e)
+            return None
+        _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name='metrics-http', daemon=True).start()
+    return get_endpoint()
+
+
+def get_endpoint() -> Optional[str]:
+    if _server is None:
+        return None
+    addr, port = _server.server_address[:2]
+    return f"http://{addr}:{port}/metrics"
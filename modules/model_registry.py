@@ -0,0 +1,263 @@
+"""
+Model Classification Registry
+모델 분류(연구용/산업용) 레지스트리
+
+- 분류의 단일 출처: DB model_categories 테이블 (월별 집계 SQL join과 같은 데이터)
+- 프로세스 메모리에는 읽기 전용 dict / frozenset으로 보관 (O(1) 조회)
+- classify(series), marker_symbols(array): 행/포인트 단위 루프 없이 벡터 연산으로 분류
+
+초기값은 utils.RESEARCH_MODELS / INDUSTRIAL_MODELS 이며,
+equipment_config_rules.json의 분류는 레지스트리에 없는 모델만 추가됩니다
+(충돌 시 레지스트리 우선, 경고 로그 출력).
+
+레지스트리 로드는 DB를 읽기 전용으로만 열며 DB 파일이 없으면 만들지 않습니다
+(equipment_config_validator 등 앱 밖에서 import 해도 data/control_chart.db가 생기지 않음).
+규칙 파일 분류의 DB 반영은 앱 시작 시 sync_rules_categories_once()가 담당합니다 (프로세스당 한 번).
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+from urllib.request import pathname2url
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import database as db
+from . import sql_trace
+from .utils import RESEARCH_MODELS, INDUSTRIAL_MODELS
+
+RESEARCH = 'Research'
+INDUSTRIAL = 'Industrial'
+OTHER = 'Other'
+
+# 차트 마커: 연구용은 diamond, 그 외(산업용/미분류)는 circle
+MARKER_SYMBOLS = {RESEARCH: 'diamond', INDUSTRIAL: 'circle'}
+DEFAULT_MARKER = 'circle'
+
+RULES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'equipment_config_rules.json')
+
+# equipment_config_rules.json 카테고리 표기 -> 레지스트리 표기
+_RULES_CATEGORY_MAP = {'research': RESEARCH, 'industrial': INDUSTRIAL}
+
+_registry: Optional[Mapping[str, str]] = None
+_research: frozenset = frozenset()
+_industrial: frozenset = frozenset()
+_lock = threading.Lock()
+_rules_synced = False
+_rules_sync_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def builtin_categories() -> dict:
+    """코드에 정의된 기본 분류 (utils 모델 목록)"""
+    categories = {m: RESEARCH for m in RESEARCH_MODELS}
+    categories.update({m: INDUSTRIAL for m in INDUSTRIAL_MODELS})
+    return categories
+
+
+def rules_categories(rules_file: str = RULES_FILE) -> dict:
+    """
+    equipment_config_rules.json의 모델 분류 (model_categories + model_specific_rules.category)
+
+    Returns:
+        dict: model -> 'Research' / 'Industrial' (파일이 없으면 빈 dict)
+    """
+    try:
+        with open(rules_file, 'r', encoding='utf-8') as f:
+            rules = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    categories = {}
+    for category, models in rules.get('model_categories', {}).items():
+        for model in models:
+            if category in _RULES_CATEGORY_MAP:
+                categories[model] = _RULES_CATEGORY_MAP[category]
+    for model, info in rules.get('model_specific_rules', {}).items():
+        if info.get('category') in _RULES_CATEGORY_MAP:
+            categories[model] = _RULES_CATEGORY_MAP[info['category']]
+    return categories
+
+
+def reconcile(base: dict, extra: dict) -> dict:
+    """
+    두 분류를 합침 (base 우선, 충돌은 경고 후 base 유지)
+
+    Returns:
+        dict: extra에서 새로 추가할 model -> category
+    """
+    added = {}
+    for model, category in extra.items():
+        if model not in base:
+            added[model] = category
+        elif base[model] != category:
+            logger.warning("Model category conflict for %s: registry=%s, rules=%s (registry kept)",
+                           model, base[model], category)
+    return added
+
+
+def _read_db_categories() -> dict:
+    """
+    DB model_categories 읽기 (읽기 전용 연결, DB 파일이 없으면 빈 dict)
+
+    Raises:
+        sqlite3.Error: 테이블이 없는 경우(init_db 이전) 등
+    """
+    if not os.path.exists(db.DB_FILE):
+        return {}
+    uri = f"file:{pathname2url(os.path.abspath(db.DB_FILE))}?mode=ro"
+    conn = sql_trace.connect(uri, uri=True)
+    try:
+        return dict(conn.execute("SELECT model, category FROM model_categories").fetchall())
+    finally:
+        conn.close()
+
+
+def _load_registry() -> Mapping[str, str]:
+    global _registry, _research, _industrial
+    with _lock:
+        if _registry is not None:
+            return _registry
+
+        categories = builtin_categories()
+        try:
+            categories = _read_db_categories() or categories
+        except sqlite3.Error as e:
+            # init_db 이전(테이블 없음) 등: 코드 기본값 + 규칙 파일로 동작
+            logger.warning("Model registry DB load failed, using built-in lists: %s", e)
+        categories.update(reconcile(categories, rules_categories()))
+
+        _registry = MappingProxyType(categories)
+        _research = frozenset(m for m, c in categories.items() if c == RESEARCH)
+        _industrial = frozenset(m for m, c in categories.items() if c == INDUSTRIAL)
+        return _registry
+
+
+def invalidate():
+    """레지스트리 캐시 폐기 (model_categories 변경 후 호출)"""
+    global _registry
+    with _lock:
+        _registry = None
+
+
+def get_registry() -> Mapping[str, str]:
+    """model -> 'Research' / 'Industrial' 읽기 전용 매핑"""
+    registry = _registry
+    if registry is None:
+        registry = _load_registry()
+    return registry
+
+
+def research_models() -> frozenset:
+    get_registry()
+    return _research
+
+
+def industrial_models() -> frozenset:
+    get_registry()
+    return _industrial
+
+
+def category_of(model) -> str:
+    """단일 모델 분류 ('Research' / 'Industrial' / 'Other')"""
+    return get_registry().get(model, OTHER)
+
+
+def classify(models: Iterable) -> pd.Series:
+    """
+    모델 배열/Series를 한 번에 분류
+
+    Returns:
+        Series: 'Research' / 'Industrial' / 'Other' (입력이 Series면 index 유지)
+    """
+    models = models if isinstance(models, pd.Series) else pd.Series(np.asarray(models, dtype=object))
+    return models.map(get_registry()).fillna(OTHER)
+
+
+def marker_symbols(models: Iterable) -> np.ndarray:
+    """모델 배열 -> plotly 마커 심볼 배열 (연구용 diamond, 그 외 circle)"""
+    categories = classify(models).to_numpy()
+    return np.select(
+        [categories == category for category in MARKER_SYMBOLS],
+        list(MARKER_SYMBOLS.values()),
+        default=DEFAULT_MARKER
+    )
+
+
+def filter_models(models: Iterable[str], categories: Iterable[str]) -> list:
+    """models 중 categories('Research'/'Industrial')에 속하는 모델 (입력 순서 유지)"""
+    wanted = set(categories)
+    registry = get_registry()
+    return [m for m in models if registry.get(m, OTHER) in wanted]
+
+
+def sync_rules_categories() -> int:
+    """
+    규칙 파일에만 있는 모델 분류를 DB model_categories에 추가 (앱 시작 시, init_db 이후)
+
+    월별 집계 SQL join이 레지스트리와 같은 분류를 쓰도록 합니다. 기존 분류는 바꾸지 않습니다.
+
+    Returns:
+        int: 추가한 모델 수
+    """
+    conn = db.get_connection()
+    try:
+        existing = dict(conn.execute("SELECT model, category FROM model_categories").fetchall())
+        added = reconcile(existing or builtin_categories(), rules_categories())
+        if added:
+            conn.executemany(
+                "INSERT OR IGNORE INTO model_categories (model, category) VALUES (?, ?)",
+                list(added.items())
+            )
+            conn.commit()
+    finally:
+        conn.close()
+    if added:
+        invalidate()
+    return len(added)
+
+
+def sync_rules_categories_once() -> int:
+    """
+    sync_rules_categories()를 프로세스당 한 번만 실행 (app.py는 세션/rerun마다 호출)
+
+    DB 잠금 등 sqlite3.Error는 경고 로그만 남기고 앱 시작을 막지 않으며, 다음 호출에서 다시 시도합니다.
+
+    Returns:
+        int: 추가한 모델 수 (이미 실행했거나 실패하면 0)
+    """
+    global _rules_synced
+    with _rules_sync_lock:
+        if _rules_synced:
+            return 0
+        try:
+            added = sync_rules_categories()
+        except sqlite3.Error as e:
+            logger.warning("Rules category sync failed, will retry on next start: %s", e)
+            return 0
+        _rules_synced = True
+    return added
+
+
+def register_model(model: str, category: str):
+    """
+    모델 분류 추가/변경 (DB 저장 후 캐시 폐기)
+
+    월별 집계는 조회 시 model_categories와 join 하므로 다시 만들 필요가 없습니다.
+    """
+    if category not in (RESEARCH, INDUSTRIAL):
+        raise ValueError(f"Unknown category: {category}")
+    conn = db.get_connection()
+    conn.execute(
+        "INSERT INTO model_categories (model, category) VALUES (?, ?) "
+        "ON CONFLICT(model) DO UPDATE SET category = excluded.category",
+        (model, category)
+    )
+    conn.commit()
+    conn.close()
+    invalidate()
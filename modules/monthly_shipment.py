@@ -5,64 +5,89 @@ Monthly Shipment Analysis Module
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
-from .utils import RESEARCH_MODELS, INDUSTRIAL_MODELS
+from . import database as db
+from . import model_registry
 
 
-def aggregate_monthly_shipments(df_equipments):
+# model_categories.category -> 화면 표시명
+CATEGORY_LABELS = {model_registry.RESEARCH: '연구용', model_registry.INDUSTRIAL: '산업용'}
+
+
+def _category_lookup() -> pd.DataFrame:
+    """model -> category 조회 테이블 (DataFrame join용)"""
+    return pd.DataFrame(list(model_registry.get_registry().items()), columns=['model', 'category'])
+
+
+def monthly_stats_from_rollup(df_rollup, years=None):
     """
-    월별 출하 대수 집계
+    월별 집계(db.get_monthly_rollup) -> 차트용 월별 통계
     
     Args:
-        df_equipments: Equipment DataFrame with 'date' and 'model' columns
+        df_rollup: DataFrame with year_month, category, model, count
+        years: 포함할 년도 목록 (None/빈 목록이면 전체)
     
     Returns:
         DataFrame: year_month, 연구용, 산업용, 합계
     """
-    if df_equipments.empty or 'date' not in df_equipments.columns:
+    if df_rollup.empty:
         return pd.DataFrame()
     
-    # DataFrame 복사
-    df = df_equipments.copy()
-    
-    # 날짜를 연-월로 변환
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    df = df.dropna(subset=['date'])
-    
-    if df.empty:
-        return pd.DataFrame()
+    df = df_rollup
+    if years:
+        df = df[df['year_month'].str[:4].astype(int).isin(years)]
+        if df.empty:
+            return pd.DataFrame()
     
-    df['year_month'] = df['date'].dt.strftime('%Y-%m')  # 년-월 형식 강제 (YYYY-MM)
-    
-    # 연구용/산업용 분류
-    def classify_type(model):
-        if pd.isna(model):
-            return '기타'
-        if model in RESEARCH_MODELS:
-            return '연구용'
-        elif model in INDUSTRIAL_MODELS:
-            return '산업용'
-        else:
-            return '기타'
-    
-    df['category'] = df['model'].apply(classify_type)
-    
-    # 월별 + 카테고리별 집계
-    monthly_stats = df.groupby(['year_month', 'category']).size().unstack(fill_value=0)
+    monthly_stats = df.pivot_table(
+        index='year_month', columns='category', values='count', aggfunc='sum', fill_value=0
+    ).rename(columns=CATEGORY_LABELS)
     
     # 컬럼 정리
-    if '연구용' not in monthly_stats.columns:
-        monthly_stats['연구용'] = 0
-    if '산업용' not in monthly_stats.columns:
-        monthly_stats['산업용'] = 0
+    for label in CATEGORY_LABELS.values():
+        if label not in monthly_stats.columns:
+            monthly_stats[label] = 0
     
     monthly_stats = monthly_stats.reset_index()
     monthly_stats = monthly_stats[['year_month', '연구용', '산업용']]
+    monthly_stats.columns.name = None
     monthly_stats['합계'] = monthly_stats['연구용'] + monthly_stats['산업용']
     
     # 날짜순 정렬
-    monthly_stats = monthly_stats.sort_values('year_month')
+    return monthly_stats.sort_values('year_month')
+
+
+def aggregate_monthly_shipments(df_equipments):
+    """
+    월별 출하 대수 집계 (장비 DataFrame 기준)
     
-    return monthly_stats
+    대시보드는 DB의 월별 집계(db.get_monthly_rollup)를 사용합니다.
+    이 함수는 이미 메모리에 있는 장비 목록을 같은 방식(분류표 join)으로 집계할 때 사용합니다.
+    
+    Args:
+        df_equipments: Equipment DataFrame with 'date' and 'model' columns
+    
+    Returns:
+        DataFrame: year_month, 연구용, 산업용, 합계
+    """
+    if df_equipments.empty or 'date' not in df_equipments.columns:
+        return pd.DataFrame()
+    
+    dates = pd.to_datetime(df_equipments['date'], errors='coerce')
+    df = pd.DataFrame({
+        'year_month': dates.dt.strftime('%Y-%m'),  # 년-월 형식 강제 (YYYY-MM)
+        'model': df_equipments['model'] if 'model' in df_equipments.columns else None,
+    }).dropna(subset=['year_month'])
+    
+    if df.empty:
+        return pd.DataFrame()
+    
+    # 연구용/산업용 분류 (조회 테이블 join)
+    df_rollup = (
+        df.groupby(['year_month', 'model'], dropna=False).size().rename('count').reset_index()
+        .merge(_category_lookup(), on='model', how='left')
+        .fillna({'category': 'Other'})
+    )
+    return monthly_stats_from_rollup(df_rollup)
 
 
 def create_monthly_shipment_chart(monthly_stats):
@@ -201,56 +226,33 @@ def create_summary_pie_chart(research_count, industrial_count):
     return fig
 
 
-def show_shipment_stats(df_equipments):
+def show_shipment_stats(df_rollup):
     """
     출하 현황 통계 카드 + 파이 차트 표시 (트렌드 중심)
     
     Args:
-        df_equipments: Equipment DataFrame
+        df_rollup: 월별 집계 DataFrame (db.get_monthly_rollup)
     """
-    if df_equipments.empty:
-        st.info("데이터가 없습니다.")
-        return
-    
-    # 날짜 처리
-    df = df_equipments.copy()
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    df = df.dropna(subset=['date'])
-    
-    if df.empty:
+    if df_rollup.empty:
         st.info("유효한 날짜 데이터가 없습니다.")
         return
     
-    # 연구용/산업용 분류
-    def classify_type(model):
-        if pd.isna(model):
-            return '기타'
-        if model in RESEARCH_MODELS:
-            return '연구용'
-        elif model in INDUSTRIAL_MODELS:
-            return '산업용'
-        else:
-            return '기타'
-    
-    df['category'] = df['model'].apply(classify_type)
-    
     # === 트렌드 중심 메트릭 계산 ===
     from datetime import datetime, timedelta
     
     # 1. 총 출하
-    total_count = len(df)
+    total_count = int(df_rollup['count'].sum())
     
-    # 2. 최근 30일
+    # 2. 최근 30일 (일 단위이므로 ship_date 인덱스로 조회)
     now = datetime.now()
-    recent_30d = df[df['date'] >= now - timedelta(days=30)]
-    recent_count = len(recent_30d)
+    recent_count = db.get_shipment_count_since((now - timedelta(days=30)).strftime('%Y-%m-%d'))
     
     # 3. 전월 대비
-    current_month = now.replace(day=1)
-    last_month_start = (current_month - timedelta(days=1)).replace(day=1)
+    current_month = now.strftime('%Y-%m')
+    last_month = (now.replace(day=1) - timedelta(days=1)).strftime('%Y-%m')
     
-    current_month_count = len(df[df['date'] >= current_month])
-    last_month_count = len(df[(df['date'] >= last_month_start) & (df['date'] < current_month)])
+    current_month_count = int(df_rollup.loc[df_rollup['year_month'] >= current_month, 'count'].sum())
+    last_month_count = int(df_rollup.loc[df_rollup['year_month'] == last_month, 'count'].sum())
     
     if last_month_count > 0:
         mom_change_pct = ((current_month_count - last_month_count) / last_month_count) * 100
@@ -258,12 +260,13 @@ def show_shipment_stats(df_equipments):
         mom_change_pct = 0
     
     # 4. 평균 월 출하
-    months = df['date'].dt.to_period('M').nunique()
+    months = df_rollup['year_month'].nunique()
     avg_per_month = total_count / months if months > 0 else 0
     
     # 5. 연구용/산업용 개수
-    research_count = len(df[df['category'] == '연구용'])
-    industrial_count = len(df[df['category'] == '산업용'])
+    by_category = df_rollup.groupby('category')['count'].sum()
+    research_count = int(by_category.get('Research', 0))
+    industrial_count = int(by_category.get('Industrial', 0))
     
     # === 2구역 레이아웃 ===
     col_stats, col_chart = st.columns([11, 9])
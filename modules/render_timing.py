@@ -0,0 +1,121 @@
+"""
+Render Timing
+탭/패널 fragment 렌더링 시간 측정
+
+- timed_fragment: st.fragment + 렌더링 시간 기록 (해당 패널의 위젯 조작 시 그 패널만 다시 실행)
+- 전체 실행(앱 스크립트 전체)과 부분 실행(fragment만)을 구분해 기록
+- 사이드바의 '렌더링 시간 표시'를 켜면 패널 하단 캡션과 사이드바 요약으로 표시
+- 재실행 프로파일링(rerun_profiler)이 켜져 있으면 같은 구간을 재실행 기록에도 남김
+- 패널/전체 실행 시간, 활성 세션 수는 항상 Prometheus 메트릭으로도 기록 (modules/metrics.py)
+"""
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from . import metrics
+from .rerun_profiler import span
+
+SHOW_TIMING_KEY = 'show_render_timing'
+_RUN_ID_KEY = '_render_run_id'
+_RUN_START_KEY = '_render_run_start'
+_TIMINGS_KEY = '_render_timings'   # label -> {'ms', 'run', 'at'}
+_SEEN_KEY = '_render_seen'         # label -> 마지막으로 렌더링된 전체 실행 번호
+
+RENDER_SECONDS = metrics.histogram(
+    'control_chart_render_seconds', 'Panel render time (full and fragment reruns)', ['panel'])
+RERUN_SECONDS = metrics.histogram(
+    'control_chart_rerun_seconds', 'Full script rerun time')
+
+# 활성 세션: 최근 ACTIVE_SESSION_TTL초 안에 전체 실행이 있었던 세션
+ACTIVE_SESSION_TTL = 300
+_session_seen = {}   # session_id -> 마지막 전체 실행 시각
+_session_lock = threading.Lock()
+
+
+def _count_active_sessions() -> int:
+    cutoff = time.time() - ACTIVE_SESSION_TTL
+    with _session_lock:
+        for session_id in [sid for sid, seen in _session_seen.items() if seen < cutoff]:
+            del _session_seen[session_id]
+        return len(_session_seen)
+
+
+ACTIVE_SESSIONS = metrics.gauge(
+    'control_chart_active_sessions', f'Sessions with a full rerun in the last {ACTIVE_SESSION_TTL}s')
+ACTIVE_SESSIONS.set_function(_count_active_sessions)
+
+
+def begin_run():
+    """앱 스크립트 전체 실행 시작 (main 첫 줄에서 호출)"""
+    st.session_state[_RUN_ID_KEY] = st.session_state.get(_RUN_ID_KEY, 0) + 1
+    st.session_state[_RUN_START_KEY] = time.perf_counter()
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        with _session_lock:
+            _session_seen[ctx.session_id] = time.time()
+
+
+def _record(label: str, seconds: float):
+    run_id = st.session_state.get(_RUN_ID_KEY, 0)
+    seen = st.session_state.setdefault(_SEEN_KEY, {})
+    run = '부분 실행' if seen.get(label) == run_id else '전체 실행'
+    seen[label] = run_id
+    st.session_state.setdefault(_TIMINGS_KEY, {})[label] = {
+        'ms': seconds * 1000, 'run': run, 'at': datetime.now().strftime('%H:%M:%S')
+    }
+    return run
+
+
+@contextmanager
+def render_timer(label: str):
+    """블록 렌더링 시간 기록 (표시 설정 시 블록 아래에 캡션 표시)"""
+    start = time.perf_counter()
+    with span(label):
+        yield
+    seconds = time.perf_counter() - start
+    RENDER_SECONDS.labels(label).observe(seconds)
+    run = _record(label, seconds)
+    if st.session_state.get(SHOW_TIMING_KEY):
+        st.caption(f"⏱ {label}: {seconds * 1000:,.0f} ms ({run})")
+
+
+def timed_fragment(label: str):
+    """
+    렌더링 함수를 fragment로 감싸고 실행 시간을 기록하는 데코레이터
+
+    fragment 안의 위젯을 조작하면 앱 전체가 아니라 이 함수만 다시 실행됩니다.
+    st.rerun()은 기본적으로 앱 전체를 다시 실행합니다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            with render_timer(label):
+                return func(*args, **kwargs)
+        return st.fragment(timed)
+    return decorator
+
+
+def render_timing_summary():
+    """사이드바 요약: 이번 전체 실행 시간 + 패널별 마지막 렌더링 시간 (main 마지막에서 호출)"""
+    total_ms = (time.perf_counter() - st.session_state.get(_RUN_START_KEY, time.perf_counter())) * 1000
+    RERUN_SECONDS.observe(total_ms / 1000)
+
+    st.toggle("⏱ 렌더링 시간 표시", key=SHOW_TIMING_KEY)
+    if not st.session_state.get(SHOW_TIMING_KEY):
+        return
+
+    st.caption(f"전체 실행 #{st.session_state.get(_RUN_ID_KEY, 0)}: {total_ms:,.0f} ms")
+
+    timings = st.session_state.get(_TIMINGS_KEY, {})
+    if timings:
+        df = pd.DataFrame([
+            {'패널': label, 'ms': round(t['ms']), '실행': t['run'], '시각': t['at']}
+            for label, t in timings.items()
+        ])
+        st.dataframe(df, hide_index=True, use_container_width=True)
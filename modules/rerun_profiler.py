@@ -0,0 +1,342 @@
+"""
+Rerun Profiler
+Streamlit 재실행(rerun)별 프로파일링 (opt-in, 기본 꺼짐)
+
+켜기: 환경 변수 RERUN_PROFILE=1 (구간 타이머), RERUN_PROFILE=cprofile (구간 타이머 + cProfile)
+      또는 관리자 > 데이터 관리 > '재실행 프로파일링' 토글 (프로세스 전체에 적용)
+
+    @profiled("main")                 # app.main - 전체 실행 1회 = 재실행 기록 1건
+    with span("📊 장비 현황"): ...     # render_timing.render_timer가 탭/패널/fragment마다 호출
+
+- 진행 중인 재실행이 없을 때 시작된 구간(fragment만 다시 실행된 경우)은 그 자체로 재실행 1건
+- 재실행마다 트리거 위젯(직전 실행 대비 값이 바뀐 key)과 구간별 시간 기록 -> 가장 느린 재실행 표
+- cProfile: 재실행별 pstats를 합산 (함수별 시간) + flamegraph용 collapsed stack 파일
+  (flamegraph.pl / speedscope 입력, 값 = 마이크로초. pstats 호출 그래프에서 만든 근사값)
+"""
+import atexit
+import cProfile
+import functools
+import io
+import os
+import pstats
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+PROFILE_ENV = 'RERUN_PROFILE'
+RERUN_HISTORY_SIZE = 200
+COLLAPSED_MIN_US = 1000    # 이보다 짧은 하위 호출은 호출한 함수의 자체 시간으로 합침
+COLLAPSED_MAX_DEPTH = 64
+COLLAPSED_FILE = os.path.join('data', 'profiles', 'reruns.folded')
+
+_SNAPSHOT_KEY = '_profile_widget_snapshot'
+_SIMPLE_TYPES = (str, int, float, bool, type(None), date, datetime)
+
+_env = os.environ.get(PROFILE_ENV, '').lower()
+_settings = {
+    'enabled': _env not in ('', '0', 'false'),
+    'cprofile': _env == 'cprofile',
+}
+
+_local = threading.local()   # 스크립트 스레드(세션)별 진행 중인 재실행
+_lock = threading.Lock()
+_reruns: deque = deque(maxlen=RERUN_HISTORY_SIZE)
+_span_totals: Dict[str, List[float]] = {}   # label -> [횟수, 총 ms, 최대 ms]
+_function_stats: Optional[pstats.Stats] = None
+_collapsed: Counter = Counter()
+
+
+# ============================================================
+# Settings
+# ============================================================
+
+def set_profiling(enabled: bool, use_cprofile: bool = False):
+    """프로파일링 켜기/끄기 (프로세스 전체, 다음 재실행부터 적용)"""
+    _settings['enabled'] = enabled
+    _settings['cprofile'] = enabled and use_cprofile
+
+
+def is_enabled() -> bool:
+    return _settings['enabled']
+
+
+def is_cprofile_enabled() -> bool:
+    return _settings['cprofile']
+
+
+def clear_profiles():
+    """누적 기록 초기화"""
+    global _function_stats
+    with _lock:
+        _reruns.clear()
+        _span_totals.clear()
+        _collapsed.clear()
+        _function_stats = None
+
+
+# ============================================================
+# Trigger Widget
+# ============================================================
+
+def _widget_snapshot() -> Dict[str, Any]:
+    # key가 있는 위젯/상태 중 비교 가능한 단순 값만 (DataFrame 등은 제외)
+    snapshot = {}
+    for key, value in st.session_state.items():
+        if key.startswith('_'):
+            continue
+        if isinstance(value, (list, tuple)) and all(isinstance(v, _SIMPLE_TYPES) for v in value):
+            snapshot[key] = tuple(value)
+        elif isinstance(value, _SIMPLE_TYPES):
+            snapshot[key] = value
+    return snapshot
+
+
+def _trigger_widget(snapshot: Dict[str, Any]) -> str:
+    previous = st.session_state.get(_SNAPSHOT_KEY)
+    if previous is None:
+        return '(첫 실행)'
+    changed = [key for key, value in snapshot.items() if previous.get(key, value) != value]
+    # 버튼은 눌린 실행에서만 True -> 다음 실행에서 True -> False로 바뀐 것처럼 보이므로,
+    # True -> False는 다른 변경이 없을 때만 트리거로 봄 (체크박스 해제)
+    pressed = [key for key in changed if not (previous[key] is True and snapshot[key] is False)]
+    changed = pressed or changed
+    # key 없는 위젯, st.rerun(), 페이지 새로고침 등은 바뀐 값이 없음
+    return ', '.join(changed) if changed else '-'
+
+
+# ============================================================
+# Spans / Reruns
+# ============================================================
+
+@contextmanager
+def span(label: str):
+    """
+    구간 시간 기록
+
+    진행 중인 재실행이 있으면 그 안의 구간, 없으면 새 재실행(root)으로 기록합니다.
+    프로파일링이 꺼져 있으면 아무것도 하지 않습니다.
+    """
+    if not _settings['enabled']:
+        yield
+        return
+
+    rerun = getattr(_local, 'rerun', None)
+    if rerun is not None:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            rerun['spans'][label] = rerun['spans'].get(label, 0.0) + (time.perf_counter() - start) * 1000
+        return
+
+    snapshot = _widget_snapshot()
+    rerun = {
+        'at': datetime.now(), 'root': label, 'trigger': _trigger_widget(snapshot),
+        'spans': {}, 'ms': None,
+    }
+    profiler = cProfile.Profile() if _settings['cprofile'] else None
+    _local.rerun = rerun
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        rerun['ms'] = (time.perf_counter() - start) * 1000
+        _local.rerun = None
+        # 다음 재실행의 트리거 비교 기준 (이번 실행에서 바뀐 값 포함)
+        st.session_state[_SNAPSHOT_KEY] = _widget_snapshot()
+        _finish_rerun(rerun, profiler)
+
+
+def profiled(label: str):
+    """함수 전체를 span(label)으로 감싸는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _finish_rerun(rerun: Dict[str, Any], profiler: Optional[cProfile.Profile]):
+    global _function_stats
+    stats = None
+    if profiler is not None:
+        profiler.create_stats()
+        stats = pstats.Stats(profiler)
+
+    with _lock:
+        _reruns.append(rerun)
+        for label, ms in [(rerun['root'], rerun['ms'])] + list(rerun['spans'].items()):
+            total = _span_totals.setdefault(label, [0, 0.0, 0.0])
+            total[0] += 1
+            total[1] += ms
+            total[2] = max(total[2], ms)
+        if stats is not None:
+            if _function_stats is None:
+                _function_stats = stats
+            else:
+                _function_stats.add(stats)
+            _collapsed.update(_collapse_stats(stats))
+
+
+# ============================================================
+# Collapsed Stacks (pstats 호출 그래프 -> flamegraph 입력)
+# ============================================================
+
+_ADDRESS_RE = re.compile(r' at 0x[0-9a-f]+')
+
+
+def _frame_label(func) -> str:
+    filename, line, name = func
+    if filename == '~':
+        return _ADDRESS_RE.sub('', name)  # built-in
+    return f"{os.path.splitext(os.path.basename(filename))[0]}:{name}"
+
+
+def _collapse_stats(stats: pstats.Stats) -> Counter:
+    """
+    pstats -> {'a;b;c': 자체 시간(us)}
+
+    cProfile은 호출자-피호출자 쌍별 시간만 저장하므로, 여러 곳에서 호출된 함수의 하위 시간은
+    호출 경로별 비율로 나눈 근사값입니다.
+    """
+    callees: Dict[Any, Dict[Any, float]] = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, edge_ct) in callers.items():
+            callees.setdefault(caller, {})[func] = edge_ct
+
+    def walk(folded: Counter, func, path: List[str], on_path: set, inclusive: float):
+        _, _, tt, ct, _ = stats.stats[func]
+        share = inclusive / ct if ct else 0.0
+        path = path + [_frame_label(func)]
+        self_us = tt * share * 1e6
+        for callee, edge_ct in callees.get(func, {}).items():
+            child = edge_ct * share
+            if callee in on_path:
+                continue  # 재귀 호출은 이미 경로의 누적 시간에 포함
+            if child * 1e6 < COLLAPSED_MIN_US or len(path) >= COLLAPSED_MAX_DEPTH:
+                self_us += child * 1e6
+            else:
+                walk(folded, callee, path, on_path | {callee}, child)
+        if self_us >= 1:
+            folded[';'.join(path)] += int(self_us)
+
+    # 호출자가 없는 함수 = 프로파일 시작 지점
+    result: Counter = Counter()
+    for func, (_, _, _, ct, callers) in stats.stats.items():
+        if not callers:
+            folded: Counter = Counter()
+            walk(folded, func, [], {func}, ct)
+            # 간접 재귀(A -> B -> A)는 호출 쌍별 누적 시간에 중복 포함되므로 시작 지점의 누적 시간에 맞춤
+            total = sum(folded.values())
+            scale = min(1.0, ct * 1e6 / total) if total else 1.0
+            result.update({stack: int(value * scale) for stack, value in folded.items() if value * scale >= 1})
+    return result
+
+
+def get_collapsed_stacks() -> str:
+    """누적 collapsed stack ('a;b;c 123' 줄 단위, 값 = 마이크로초)"""
+    with _lock:
+        return ''.join(f"{stack} {value}\n" for stack, value in _collapsed.most_common())
+
+
+def write_collapsed_stacks(path: str = COLLAPSED_FILE) -> str:
+    """collapsed stack 파일 저장 (flamegraph.pl reruns.folded > reruns.svg)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(get_collapsed_stacks())
+    return path
+
+
+@atexit.register
+def _write_on_exit():
+    # 환경 변수로만 켠 경우(관리자 화면 없이)에도 종료 시 파일을 남김
+    if _collapsed:
+        write_collapsed_stacks()
+
+
+# ============================================================
+# Reports
+# ============================================================
+
+def get_worst_reruns(limit: int = 20) -> pd.DataFrame:
+    """
+    가장 느린 재실행
+
+    Returns:
+        DataFrame: at, root, trigger, ms, slowest (가장 오래 걸린 구간)
+    """
+    with _lock:
+        reruns = sorted(_reruns, key=lambda r: r['ms'], reverse=True)[:limit]
+    rows = []
+    for r in reruns:
+        slowest = max(r['spans'].items(), key=lambda item: item[1]) if r['spans'] else None
+        rows.append({
+            'at': r['at'].strftime('%H:%M:%S'),
+            'root': r['root'],
+            'trigger': r['trigger'],
+            'ms': round(r['ms'], 1),
+            'slowest': f"{slowest[0]} ({slowest[1]:,.0f} ms)" if slowest else '-',
+        })
+    return pd.DataFrame(rows, columns=['at', 'root', 'trigger', 'ms', 'slowest'])
+
+
+def get_span_totals() -> pd.DataFrame:
+    """
+    구간(탭/패널)별 누적 시간
+
+    Returns:
+        DataFrame: label, count, total_ms, mean_ms, max_ms (total_ms 내림차순)
+    """
+    with _lock:
+        rows = [
+            {'label': label, 'count': int(count), 'total_ms': round(total, 1),
+             'mean_ms': round(total / count, 1), 'max_ms': round(max_ms, 1)}
+            for label, (count, total, max_ms) in _span_totals.items()
+        ]
+    df = pd.DataFrame(rows, columns=['label', 'count', 'total_ms', 'mean_ms', 'max_ms'])
+    return df.sort_values('total_ms', ascending=False).reset_index(drop=True)
+
+
+def get_function_stats(limit: int = 30) -> pd.DataFrame:
+    """
+    cProfile 함수별 누적 시간 (cumtime 내림차순)
+
+    Returns:
+        DataFrame: function, calls, tottime_ms, cumtime_ms
+    """
+    columns = ['function', 'calls', 'tottime_ms', 'cumtime_ms']
+    with _lock:
+        if _function_stats is None:
+            return pd.DataFrame(columns=columns)
+        items = list(_function_stats.stats.items())
+    rows = [
+        {'function': f"{_frame_label(func)} ({os.path.basename(func[0])}:{func[1]})" if func[0] != '~' else func[2],
+         'calls': nc, 'tottime_ms': round(tt * 1000, 2), 'cumtime_ms': round(ct * 1000, 2)}
+        for func, (_, nc, tt, ct, _) in items
+    ]
+    df = pd.DataFrame(rows, columns=columns)
+    return df.sort_values('cumtime_ms', ascending=False).head(limit).reset_index(drop=True)
+
+
+def get_pstats_text(limit: int = 40, sort: str = 'cumulative') -> str:
+    """pstats 텍스트 리포트"""
+    with _lock:
+        if _function_stats is None:
+            return ''
+        out = io.StringIO()
+        _function_stats.stream = out
+        _function_stats.sort_stats(sort).print_stats(limit)
+    return out.getvalue()
@@ -5,9 +5,12 @@
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from scipy import stats as scipy_stats
 import streamlit as st
 
+from .lazy_imports import lazy_module
+
+scipy_stats = lazy_module('scipy.stats')  # 정규분포 계산 시 import (~0.4초)
+
 
 def prepare_spec_data(df):
     """
@@ -33,11 +36,14 @@ def prepare_spec_data(df):
     
     item = df['Check Items'].iloc[0] if 'Check Items' in df.columns else 'Unknown'
     
-    # Min/Criteria/Max 추출 (measurements 테이블에서는 specs에서 조회해야 함)
-    # 여기서는 데이터에 이미 포함되어 있다고 가정
-    min_vals = df['Min'].dropna().unique() if 'Min' in df.columns else np.array([])
-    crit_vals = df['Criteria'].dropna().unique() if 'Criteria' in df.columns else np.array([])
-    max_vals = df['Max'].dropna().unique() if 'Max' in df.columns else np.array([])
+    # Min/Criteria/Max 추출 (pending 데이터)
+    # measurements 데이터는 db.attach_specs()로 붙인 LSL/Target/USL 컬럼 사용
+    min_col = 'Min' if 'Min' in df.columns else 'LSL'
+    crit_col = 'Criteria' if 'Criteria' in df.columns else 'Target'
+    max_col = 'Max' if 'Max' in df.columns else 'USL'
+    min_vals = df[min_col].dropna().unique() if min_col in df.columns else np.array([])
+    crit_vals = df[crit_col].dropna().unique() if crit_col in df.columns else np.array([])
+    max_vals = df[max_col].dropna().unique() if max_col in df.columns else np.array([])
     
     # 스펙 일관성 확인
     inconsistent = False
@@ -46,7 +52,8 @@ def prepare_spec_data(df):
         st.warning(f"⚠️ '{item}' 항목의 스펙이 데이터 간 불일치합니다!")
         
         # 불일치 데이터 표시
-        spec_comparison = df[['장비명', 'Min', 'Criteria', 'Max']].drop_duplicates() if '장비명' in df.columns else df[['Min', 'Criteria', 'Max']].drop_duplicates()
+        spec_cols = [col for col in ['Model', min_col, crit_col, max_col] if col in df.columns]
+        spec_comparison = df[['장비명'] + spec_cols].drop_duplicates() if '장비명' in df.columns else df[spec_cols].drop_duplicates()
         with st.expander("스펙 불일치 상세"):
             st.dataframe(spec_comparison)
     
@@ -152,6 +159,153 @@ def calculate_process_capability(data, lsl, usl):
     return result
 
 
+CAPABILITY_COLUMNS = [
+    'Model', 'Check Items', '등급', 'Cpk', 'Cp', 'CPU', 'CPL',
+    'PPM (실측)', 'PPM (예상)', '스펙 여유도(%)', '스펙 외부 개수',
+    '데이터 수', '평균', '표준편차', 'LSL', 'USL', 'Target'
+]
+
+
+def grade_cpk(cpk):
+    """Cpk 등급 (카드/탭과 동일한 기준)"""
+    if cpk is None or pd.isna(cpk):
+        return '규격 없음'
+    if cpk >= 1.67:
+        return '🟢 매우우수'
+    if cpk >= 1.33:
+        return '🟢 우수'
+    if cpk >= 1.0:
+        return '🟡 양호'
+    return '🔴 부적합'
+
+
+def calculate_capability_matrix(df, group_cols=('Model', 'Check Items'), value_col='Value'):
+    """
+    (Model, Check Item) 그룹별 공정 능력 일괄 계산
+    
+    행마다 해당 모델의 규격(LSL/USL)을 join한 뒤 groupby 한 번으로
+    모든 그룹의 Cp, Cpk, PPM, 스펙 여유도를 계산합니다.
+    계산 방식은 calculate_process_capability와 동일합니다 (모표준편차, LSL/USL 모두 있을 때만).
+    
+    Args:
+        df: 측정 데이터 (Model, Check Items, Value). LSL/USL/Target 컬럼이 없으면 specs 테이블에서 붙임
+        group_cols: 그룹 기준 컬럼
+        value_col: 측정값 컬럼
+    
+    Returns:
+        DataFrame: CAPABILITY_COLUMNS (Cpk 오름차순, 규격 없는 그룹은 마지막)
+    """
+    group_cols = list(group_cols)
+    if df is None or df.empty or value_col not in df.columns or not set(group_cols) <= set(df.columns):
+        return pd.DataFrame(columns=CAPABILITY_COLUMNS)
+    
+    if not {'LSL', 'USL', 'Target'} <= set(df.columns):
+        from . import database as db
+        df = db.attach_specs(df)
+    
+    values = pd.to_numeric(df[value_col], errors='coerce')
+    lsl_row = pd.to_numeric(df['LSL'], errors='coerce')
+    usl_row = pd.to_numeric(df['USL'], errors='coerce')
+    out_of_spec = (values < lsl_row) | (values > usl_row)
+    
+    work = df[group_cols].assign(
+        _v=values,
+        _out=out_of_spec & lsl_row.notna() & usl_row.notna(),
+        LSL=lsl_row,
+        USL=usl_row,
+        Target=pd.to_numeric(df['Target'], errors='coerce')
+    )
+    work = work[work['_v'].notna()]
+    if work.empty:
+        return pd.DataFrame(columns=CAPABILITY_COLUMNS)
+    
+    grouped = work.groupby(group_cols, sort=False, dropna=False)
+    res = grouped.agg(
+        n=('_v', 'count'),
+        mean=('_v', 'mean'),
+        n_out=('_out', 'sum'),
+        LSL=('LSL', 'first'),
+        USL=('USL', 'first'),
+        Target=('Target', 'first')
+    )
+    res['std'] = grouped['_v'].std(ddof=0)
+    
+    lsl = res['LSL'].to_numpy(dtype=float)
+    usl = res['USL'].to_numpy(dtype=float)
+    mean = res['mean'].to_numpy(dtype=float)
+    std = res['std'].to_numpy(dtype=float)
+    n = res['n'].to_numpy(dtype=float)
+    
+    has_spec = ~np.isnan(lsl) & ~np.isnan(usl)
+    valid = has_spec & (std > 0)
+    safe_std = np.where(valid, std, np.nan)
+    
+    cp = (usl - lsl) / (6 * safe_std)
+    cpu = (usl - mean) / (3 * safe_std)
+    cpl = (mean - lsl) / (3 * safe_std)
+    cpk = np.fmin(cpu, cpl)
+    margin = ((usl - lsl) - 6 * safe_std) / (usl - lsl) * 100
+    
+    # 실측 PPM: 스펙 이탈 건수 기준 / 예상 PPM: 정규분포 가정
+    ppm_observed = np.where(has_spec, res['n_out'].to_numpy(dtype=float) / n * 1e6, np.nan)
+    ppm_expected = (scipy_stats.norm.cdf(-3 * cpl) + scipy_stats.norm.sf(3 * cpu)) * 1e6
+    
+    matrix = pd.DataFrame({
+        '등급': [grade_cpk(v) for v in cpk],
+        'Cpk': cpk,
+        'Cp': cp,
+        'CPU': cpu,
+        'CPL': cpl,
+        'PPM (실측)': ppm_observed,
+        'PPM (예상)': ppm_expected,
+        '스펙 여유도(%)': margin,
+        '스펙 외부 개수': res['n_out'].to_numpy(dtype=int),
+        '데이터 수': res['n'].to_numpy(dtype=int),
+        '평균': mean,
+        '표준편차': std,
+        'LSL': lsl,
+        'USL': usl,
+        'Target': res['Target'].to_numpy(dtype=float)
+    }, index=res.index).reset_index()
+    
+    return matrix.sort_values('Cpk', na_position='last', kind='stable').reset_index(drop=True)
+
+
+def render_capability_matrix(matrix, key='capability_matrix'):
+    """
+    공정 능력 매트릭스 표시 (컬럼 헤더 클릭으로 정렬)
+    """
+    if matrix is None or matrix.empty:
+        st.info("ℹ️ 공정 능력을 계산할 데이터가 없습니다.")
+        return
+    
+    n_spec = int(matrix['Cpk'].notna().sum())
+    n_low = int((matrix['Cpk'] < 1.33).sum())
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("분석 그룹 (모델 × 항목)", f"{len(matrix)}개")
+    col2.metric("규격 보유 그룹", f"{n_spec}개")
+    col3.metric("Cpk < 1.33 그룹", f"{n_low}개")
+    
+    st.dataframe(
+        matrix,
+        use_container_width=True,
+        hide_index=True,
+        key=key,
+        column_config={
+            'Cpk': st.column_config.NumberColumn('Cpk', format='%.2f'),
+            'Cp': st.column_config.NumberColumn('Cp', format='%.2f'),
+            'CPU': st.column_config.NumberColumn('CPU', format='%.2f'),
+            'CPL': st.column_config.NumberColumn('CPL', format='%.2f'),
+            'PPM (실측)': st.column_config.NumberColumn('PPM (실측)', format='%.0f'),
+            'PPM (예상)': st.column_config.NumberColumn('PPM (예상)', format='%.1f'),
+            '스펙 여유도(%)': st.column_config.NumberColumn('스펙 여유도', format='%.1f%%'),
+            '평균': st.column_config.NumberColumn('평균', format='%.4f'),
+            '표준편차': st.column_config.NumberColumn('σ', format='%.4f'),
+        }
+    )
+
+
 def create_histogram_with_specs(data, stats):
     """
     히스토그램 + 스펙 라인 + 정규분포 곡선 생성
@@ -0,0 +1,324 @@
+"""
+SQL Trace
+SQLite 문장별 실행 시간 기록 (ring buffer) + 느린 쿼리 로그
+
+    conn = sql_trace.connect(DB_FILE)     # database.get_connection()이 사용
+    sql_trace.get_statement_stats()       # 문장 유형(fingerprint)별 호출 수 / 총 시간 / p95
+    sql_trace.get_slow_queries()          # SLOW_QUERY_MS 이상 걸린 문장
+
+- 실행 시간 = execute + fetch (pandas read_sql_query 포함)
+- 행 수 = 조회한 행 수, 또는 INSERT/UPDATE/DELETE로 바뀐 행 수
+- 호출 함수 = 스택에서 이 모듈/pandas/sqlite3를 제외한 첫 함수 (예: database.fetch_filtered_data)
+- on_connection_closed(callback): 연결을 닫을 때 (함수, 그 연결에서 실행한 SQL 시간 합계 초) 전달
+- get_write_stats(): 쓰기 문장(INSERT/UPDATE/DELETE/COMMIT 등) 누적 시간 / 'database is locked' 오류 수
+  (쓰기 잠금은 첫 쓰기 문장의 암묵적 BEGIN에서 기다리므로 동시 사용 시 잠금 대기가 이 시간에 포함됨)
+- 환경 변수: SQL_TRACE=0 (기록 끄기), SQL_SLOW_QUERY_MS (느린 쿼리 기준, 기본 100)
+"""
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+TRACE_ENABLED = os.environ.get('SQL_TRACE', '1') != '0'
+SLOW_QUERY_MS = float(os.environ.get('SQL_SLOW_QUERY_MS', 100))
+TRACE_BUFFER_SIZE = 5000   # 최근 문장 수 (오래된 것부터 버림)
+SLOW_LOG_SIZE = 200
+
+# 기록: {'at', 'fingerprint', 'sql', 'ms', 'rows', 'caller', 'slow'} - fetch 시간/행 수는 나중에 더해짐
+_trace: deque = deque(maxlen=TRACE_BUFFER_SIZE)
+_slow_log: deque = deque(maxlen=SLOW_LOG_SIZE)
+_fingerprints: Dict[str, str] = {}
+_FINGERPRINT_CACHE_SIZE = 2000
+
+# 호출 함수를 찾을 때 건너뛰는 모듈
+_SKIP_MODULES = (__name__, 'sqlite3', 'pandas')
+_code_labels: Dict[Any, Optional[str]] = {}  # code -> 'module.function' (None = 건너뛰는 모듈)
+
+# 연결 종료 시 호출: callback(function, seconds)
+_close_callbacks: List[Callable[[str, float], None]] = []
+
+# 쓰기 문장 누적 (프로세스 전체, 잠금 대기 측정용)
+_WRITE_RE = re.compile(r"^\s*(INSERT|UPDATE|DELETE|REPLACE|BEGIN|COMMIT|END)\b", re.IGNORECASE)
+_write_stats = {'statements': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'locked_errors': 0}
+_write_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# Fingerprint (리터럴/IN 목록을 ?로 바꾼 문장 유형)
+# ============================================================
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_COMMENT_RE = re.compile(r"--[^\n]*")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """
+    문장 유형 키
+
+    WHERE id = 3 / WHERE id = 7, IN (?, ?) / IN (?, ?, ?)처럼 값만 다른 문장을 같은 키로 묶습니다.
+    """
+    fp = _fingerprints.get(sql)
+    if fp is None:
+        fp = _STRING_RE.sub('?', sql)
+        fp = _COMMENT_RE.sub(' ', fp)
+        fp = _NUMBER_RE.sub('?', fp)
+        fp = _IN_LIST_RE.sub('(...)', fp)
+        fp = _SPACE_RE.sub(' ', fp).strip()
+        if len(_fingerprints) >= _FINGERPRINT_CACHE_SIZE:
+            _fingerprints.clear()
+        _fingerprints[sql] = fp
+    return fp
+
+
+def _caller() -> str:
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        label = _code_labels.get(code, '')
+        if label == '':
+            if frame.f_globals.get('__name__', '').startswith(_SKIP_MODULES):
+                label = None
+            else:
+                label = f"{os.path.splitext(os.path.basename(code.co_filename))[0]}.{code.co_name}"
+            _code_labels[code] = label
+        if label:
+            return label
+        frame = frame.f_back
+    return '?'
+
+
+# ============================================================
+# Recording
+# ============================================================
+
+def _flag_slow(record: Dict[str, Any]):
+    if record['ms'] >= SLOW_QUERY_MS and not record['slow']:
+        record['slow'] = True
+        _slow_log.append(record)
+        logger.warning("slow query %.0f ms (%s): %s", record['ms'], record['caller'], record['fingerprint'][:200])
+
+
+def _record_statement(sql: str, ms: float, rows: int) -> Dict[str, Any]:
+    record = {
+        'at': time.time(), 'fingerprint': fingerprint(sql), 'sql': sql,
+        'ms': ms, 'rows': max(rows, 0), 'caller': _caller(), 'slow': False,
+    }
+    _trace.append(record)
+    _flag_slow(record)
+    return record
+
+
+def _record_write(sql: str, seconds: float, locked: bool = False):
+    if not (locked or _WRITE_RE.match(sql)):
+        return
+    with _write_lock:
+        _write_stats['statements'] += 1
+        _write_stats['seconds'] += seconds
+        _write_stats['max_seconds'] = max(_write_stats['max_seconds'], seconds)
+        _write_stats['locked_errors'] += locked
+
+
+def _add_fetch(record: Optional[Dict[str, Any]], seconds: float, rows: int):
+    if record is not None:
+        record['ms'] += seconds * 1000
+        record['rows'] += rows
+        _flag_slow(record)
+
+
+class TracedCursor(sqlite3.Cursor):
+    """execute/fetch 시간과 행 수를 기록하는 커서"""
+    _record = None
+
+    def _traced(self, method, sql, *args):
+        start = time.perf_counter()
+        locked = False
+        try:
+            return method(sql, *args)
+        except sqlite3.OperationalError as e:
+            locked = 'locked' in str(e)
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            self._record = _record_statement(sql, seconds * 1000, self.rowcount)
+            self.connection._records.append(self._record)
+            _record_write(sql, seconds, locked)
+
+    def execute(self, sql, parameters=()):
+        return self._traced(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._traced(super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._traced(super().executescript, sql_script)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        _add_fetch(self._record, time.perf_counter() - start, row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        _add_fetch(self._record, time.perf_counter() - start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        _add_fetch(self._record, time.perf_counter() - start, len(rows))
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        row = super().__next__()
+        _add_fetch(self._record, time.perf_counter() - start, 1)
+        return row
+
+
+class TracedConnection(sqlite3.Connection):
+    """모든 커서(conn.execute, pandas 포함)를 TracedCursor로 만드는 연결"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._records = []   # 이 연결에서 실행한 문장 (close 시 함수별 시간 합계)
+
+    def close(self):
+        super().close()
+        records, self._records = self._records, []
+        if records and _close_callbacks:
+            # 연결은 함수마다 열고 닫으므로 첫 문장의 호출 함수 = 연결을 사용한 함수
+            seconds = sum(record['ms'] for record in records) / 1000
+            for callback in _close_callbacks:
+                callback(records[0]['caller'], seconds)
+
+    def commit(self):
+        start = time.perf_counter()
+        locked = False
+        try:
+            super().commit()
+        except sqlite3.OperationalError as e:
+            locked = 'locked' in str(e)
+            raise
+        finally:
+            _record_write('COMMIT', time.perf_counter() - start, locked)
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    # Connection.execute*는 내부에서 기본 Cursor를 만들므로 직접 위임
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def connect(database: str, **kwargs) -> sqlite3.Connection:
+    """sqlite3.connect와 같음 (TRACE_ENABLED면 TracedConnection)"""
+    if TRACE_ENABLED:
+        kwargs.setdefault('factory', TracedConnection)
+    return sqlite3.connect(database, **kwargs)
+
+
+def on_connection_closed(callback: Callable[[str, float], None]):
+    """연결 종료 콜백 등록 (데코레이터로도 사용)"""
+    _close_callbacks.append(callback)
+    return callback
+
+
+def set_tracing(enabled: bool):
+    """기록 켜기/끄기 (이후 새로 여는 연결부터 적용)"""
+    global TRACE_ENABLED
+    TRACE_ENABLED = enabled
+
+
+def clear_trace():
+    """기록 초기화"""
+    _trace.clear()
+    _slow_log.clear()
+    with _write_lock:
+        _write_stats.update(statements=0, seconds=0.0, max_seconds=0.0, locked_errors=0)
+
+
+# ============================================================
+# Stats
+# ============================================================
+
+def get_trace_count() -> int:
+    return len(_trace)
+
+
+def get_write_stats() -> Dict[str, float]:
+    """
+    쓰기 문장 누적 통계 (clear_trace 이후, TRACE_ENABLED인 연결만)
+
+    Returns:
+        dict: statements, seconds (잠금 대기 포함 총 시간), max_seconds, locked_errors
+    """
+    with _write_lock:
+        return dict(_write_stats)
+
+
+def get_statement_stats(order_by: str = 'total_ms', limit: int = 20) -> pd.DataFrame:
+    """
+    문장 유형별 실행 통계 (ring buffer에 남은 최근 문장 기준)
+
+    Args:
+        order_by: 'total_ms', 'p95_ms', 'calls', 'max_ms' 등 정렬 컬럼 (내림차순)
+
+    Returns:
+        DataFrame: fingerprint, calls, total_ms, mean_ms, p95_ms, max_ms, rows, callers
+    """
+    columns = ['fingerprint', 'calls', 'total_ms', 'mean_ms', 'p95_ms', 'max_ms', 'rows', 'callers']
+    records = list(_trace)
+    if not records:
+        return pd.DataFrame(columns=columns)
+
+    df = pd.DataFrame(records, columns=['fingerprint', 'ms', 'rows', 'caller'])
+    stats = df.groupby('fingerprint').agg(
+        calls=('ms', 'size'),
+        total_ms=('ms', 'sum'),
+        mean_ms=('ms', 'mean'),
+        p95_ms=('ms', lambda s: s.quantile(0.95)),
+        max_ms=('ms', 'max'),
+        rows=('rows', 'sum'),
+        # 호출 횟수가 많은 함수 순
+        callers=('caller', lambda s: ', '.join(s.value_counts().index[:3])),
+    ).reset_index()
+    stats = stats.sort_values(order_by, ascending=False).head(limit).reset_index(drop=True)
+    return stats[columns].round({'total_ms': 1, 'mean_ms': 2, 'p95_ms': 2, 'max_ms': 2})
+
+
+def get_slow_queries(limit: int = 50) -> pd.DataFrame:
+    """
+    느린 쿼리 로그 (최근 순)
+
+    Returns:
+        DataFrame: at, ms, rows, caller, sql
+    """
+    records = list(_slow_log)[::-1][:limit]
+    df = pd.DataFrame(records, columns=['at', 'ms', 'rows', 'caller', 'sql'])
+    if df.empty:
+        return df
+    df['at'] = df['at'].map(lambda t: datetime.fromtimestamp(t).strftime('%H:%M:%S'))
+    df['ms'] = df['ms'].round(1)
+    df['sql'] = df['sql'].map(lambda sql: _SPACE_RE.sub(' ', sql).strip()[:500])
+    return df
@@ -2,13 +2,14 @@
 Control Chart 데이터 처리 및 통계 유틸리티 함수
 """
 import re
+from functools import lru_cache
 import pandas as pd
 import numpy as np
-from typing import Tuple, List, Dict
+from typing import Callable, Tuple, List, Dict
 from unicodedata import normalize as unicode_normalize
 
 
-# Model Classifications
+# Model Classifications (기본값 - 조회는 model_registry 사용, DB model_categories 초기값)
 RESEARCH_MODELS = [
     'FX200', 'FX40', 'NX-Hivac', 'NX7', 'NX10', 'NX12', 'NX15', 
     'NX20', 'NX20 300mm', 'NX20 Lite'
@@ -21,23 +22,33 @@ INDUSTRIAL_MODELS = [
 ]
 
 
+# 텍스트 정리 패턴 (모듈 로드 시 한 번만 컴파일)
+_WHITESPACE_RE = re.compile(r'\s+')
+_NON_NUMERIC_RE = re.compile(r'[^\d\.\-]+')
+
+# Check Items 등 반복되는 이름 정규화 결과 캐시 (체크리스트마다 같은 ~300개 항목)
+TEXT_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _normalize_key_cached(text: str) -> str:
+    s = text.strip()
+    # 전각/호환문자 통일 (NFKC 정규화)
+    s = unicode_normalize('NFKC', s)
+    # 모든 공백을 하나로
+    s = _WHITESPACE_RE.sub(' ', s)
+    # 대소문자 무시
+    return s.upper()
+
+
 def normalize_key(text: str) -> str:
     """
     C# NormalizeKey 함수 포팅
-    문자열을 정규화하여 일관된 비교를 위한 키 생성
+    문자열을 정규화하여 일관된 비교를 위한 키 생성 (같은 문자열은 캐시 결과 사용)
     """
     if not text or not isinstance(text, str):
         return ""
-    
-    s = text.strip()
-    # 전각/호환문자 통일 (NFKC 정규화)
-    s = unicode_normalize('NFKC', s)
-    # 모든 공백을 하나로
-    s = re.sub(r'\s+', ' ', s)
-    # 대소문자 무시
-    s = s.upper()
-    
-    return s
+    return _normalize_key_cached(text)
 
 
 def clean_numeric_string(s: str) -> str:
@@ -49,7 +60,53 @@ def clean_numeric_string(s: str) -> str:
         return ""
     
     # 숫자, '.', '-' 만 남김
-    return re.sub(r'[^\d\.\-]', '', s)
+    return _NON_NUMERIC_RE.sub('', s)
+
+
+def _map_strings(values: pd.Series, func: Callable[[str], str]) -> pd.Series:
+    """
+    문자열 값 종류별로 func를 한 번만 적용 (문자열이 아닌 값은 그대로 유지)
+    
+    행 수와 관계없이 고유 문자열 수만큼만 func가 호출됩니다.
+    """
+    codes, uniques = pd.factorize(values)
+    is_str = np.fromiter((isinstance(u, str) for u in uniques), dtype=bool, count=len(uniques))
+    mapped = np.empty(len(uniques), dtype=object)
+    mapped[:] = [func(u) if s else u for u, s in zip(uniques, is_str)]
+    
+    take = codes >= 0
+    take[take] = is_str[codes[take]]
+    result = values.to_numpy(dtype=object, copy=True)
+    result[take] = mapped[codes[take]]
+    return pd.Series(result, index=values.index, name=values.name)
+
+
+def clean_numeric_values(values: pd.Series) -> pd.Series:
+    """
+    Value 컬럼 -> float (변환할 수 없는 값은 NaN)
+    
+    숫자와 숫자 문자열은 그대로 변환하고, 나머지 문자열만 숫자/'.'/'-' 이외 문자를
+    제거(clean_numeric_string과 같은 규칙)한 뒤 다시 변환합니다. 각 값은 한 번만 파싱됩니다.
+    True/False는 기존 규칙('True' -> 숫자 없음)대로 측정값으로 보지 않습니다 (NaN).
+    """
+    numbers = pd.to_numeric(values, errors='coerce')
+    if not isinstance(numbers, pd.Series):
+        numbers = pd.Series(numbers, index=values.index)
+    numbers = numbers.astype(float)
+    
+    # bool은 1.0/0.0으로 변환되므로 0/1인 행만 값 타입을 확인해 제외
+    candidates = numbers.isin([0.0, 1.0]).to_numpy()
+    if candidates.any():
+        candidates[candidates] = [isinstance(v, (bool, np.bool_)) for v in values.to_numpy()[candidates]]
+        numbers[candidates] = np.nan
+    
+    rest = numbers.isna() & values.notna()
+    if rest.any():
+        text = values[rest].astype(str).str.replace(_NON_NUMERIC_RE, '', regex=True)
+        numbers[rest] = pd.to_numeric(text, errors='coerce')
+    
+    # inf 등은 유효한 측정값으로 보지 않음
+    return numbers.where(np.isfinite(numbers))
 
 
 def load_data(file) -> pd.DataFrame:
@@ -71,24 +128,12 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     if 'Value' not in df.columns:
         raise ValueError("'Value' 컬럼이 없습니다.")
     
-    def is_valid_numeric(val):
-        if pd.isna(val) or val == '':
-            return False
-        clean = clean_numeric_string(str(val))
-        try:
-            float(clean)
-            return True
-        except:
-            return False
+    values = clean_numeric_values(df['Value'])
     
-    # 유효한 숫자 행만 필터링
-    mask = df['Value'].apply(is_valid_numeric)
+    # 유효한 숫자 행만 남기고 Value를 float로 교체
+    mask = values.notna()
     cleaned_df = df[mask].copy()
-    
-    # Value를 float로 변환
-    cleaned_df['Value'] = cleaned_df['Value'].apply(
-        lambda x: float(clean_numeric_string(str(x)))
-    )
+    cleaned_df['Value'] = values[mask]
     
     return cleaned_df
 
@@ -101,16 +146,10 @@ def normalize_check_items_column(df: pd.DataFrame) -> pd.DataFrame:
     if 'Check Items' not in df.columns:
         return df
     
-    def normalize_text(text):
-        if not isinstance(text, str) or not text:
-            return text
-        # 앞뒤 공백 제거
-        s = text.strip()
-        # 연속된 공백을 하나로
-        s = re.sub(r'\s+', ' ', s)
-        return s
-    
-    df['Check Items'] = df['Check Items'].apply(normalize_text)
+    # 앞뒤 공백 제거 + 연속된 공백을 하나로 (항목명 종류별로 한 번만 처리)
+    df['Check Items'] = _map_strings(
+        df['Check Items'], lambda text: _WHITESPACE_RE.sub(' ', text.strip())
+    )
     return df
 
 
@@ -228,9 +267,10 @@ def add_date_columns(df: pd.DataFrame, date_col: str = '종료일') -> pd.DataFr
     df = df.copy()
     df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
     
-    df['연도'] = df[date_col].dt.year.astype(str)
-    df['분기'] = ((df[date_col].dt.month - 1) // 3 + 1).astype(str)
-    df['월'] = df[date_col].dt.month.apply(lambda x: f"{x:02d}" if pd.notna(x) else None)
+    # 파싱 불가 날짜(NaT)가 있으면 연도/월이 float가 되므로 정수로 바꿔 표기
+    df['연도'] = df[date_col].dt.year.apply(lambda x: str(int(x)) if pd.notna(x) else None)
+    df['분기'] = ((df[date_col].dt.month - 1) // 3 + 1).apply(lambda x: str(int(x)) if pd.notna(x) else None)
+    df['월'] = df[date_col].dt.month.apply(lambda x: f"{int(x):02d}" if pd.notna(x) else None)
     
     return df
 
@@ -245,8 +285,8 @@ def build_display_map(df: pd.DataFrame, column: str) -> Tuple[List[str], Dict[st
     
     key_to_display = {}
     
-    for val in df[column].dropna():
-        raw = str(val)
+    # 고유값만 순회 (pd.unique는 최초 등장 순서 유지)
+    for raw in pd.unique(df[column].dropna().astype(str)):
         if not raw.strip():
             continue
         
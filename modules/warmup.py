@@ -0,0 +1,159 @@
+"""
+Cache Warm-up
+프로세스 시작 시 캐시 예열 (배포/재시작 후 첫 사용자의 대기 시간 단축)
+
+    from modules import warmup
+    warmup.start_warmup()          # 백그라운드 스레드 (프로세스당 한 번, app.py)
+    warmup.get_warmup_status()     # UI 준비 상태 표시
+
+    python -m modules.warmup       # Docker entrypoint: 서버 시작 전 동기 실행
+                                   # (마이그레이션, .pyc, SQLite 파일 페이지 캐시 예열)
+
+단계: 스키마 -> 지연 import 모듈 -> 규격 맵 -> 필터 카탈로그 -> 장비 현황 요약
+      -> 자주 조회된 (모델, 항목) 분석 데이터셋 (analysis_usage 상위 WARMUP_DATASETS개,
+         단일 모델/단일 항목 조회에만 적중)
+각 단계는 실패해도 다음 단계를 계속 진행하며, 예열이 끝나지 않아도 앱은 그대로 동작합니다.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from . import database as db
+
+WARMUP_DATASETS = 5  # 예열할 분석 데이터셋 수 (db.FILTERED_DATA_CACHE_SIZE 이하)
+
+# 첫 화면(장비 현황)과 분석 탭에서 사용하는 모듈
+WARMUP_MODULES = ['plotly.express', 'scipy.stats',
+                  'tabs.equipment_explorer_tab', 'tabs.quality_analysis_tab']
+
+_state: Dict[str, Any] = {
+    'status': 'idle',   # idle / running / ready / failed
+    'started_at': None,
+    'seconds': None,
+    'steps': [],        # [(단계, 초, 오류 또는 None)]
+}
+_state_lock = threading.Lock()
+_thread = None
+
+
+# ============================================================
+# Warm-up Steps
+# ============================================================
+
+def _warm_schema():
+    db.init_db()
+
+
+def _warm_modules():
+    from .lazy_imports import preload
+    preload(WARMUP_MODULES)
+
+
+def _warm_specs():
+    db.get_spec_map()
+
+
+def _warm_filter_catalog():
+    for dimension in db.FILTER_DIMENSIONS:
+        db.get_filter_options(dimension)
+
+
+def _warm_equipment_summary():
+    from . import explorer_data
+    db.get_equipment_stats()
+    start, end = explorer_data.get_date_bounds()
+    if start and end:
+        explorer_data.get_model_counts(start, end)
+
+
+def _warm_datasets():
+    # log_analysis_usage()는 조회를 (모델, 항목) 쌍으로 나누고 R/I·기간 필터는 버리므로,
+    # 캐시 적중은 모델 1개(또는 미선택) + 항목 1개만 고르고 다른 필터가 없는 조회에 한정됨
+    # (여러 모델/항목, 기간, R/I 조건 조회는 예열 항목과 캐시 키가 달라 이득이 없음)
+    for model, item, _ in db.get_top_analysis_usage(WARMUP_DATASETS):
+        filters = {'model': [model]} if model else {}
+        filters['check_item'] = [item]
+        db.fetch_filtered_data(filters)
+
+
+WARMUP_STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ('스키마', _warm_schema),
+    ('모듈 import', _warm_modules),
+    ('규격 맵', _warm_specs),
+    ('필터 카탈로그', _warm_filter_catalog),
+    ('장비 현황 요약', _warm_equipment_summary),
+    ('분석 데이터셋', _warm_datasets),
+]
+
+
+# ============================================================
+# Run / Status
+# ============================================================
+
+def run_warmup() -> Dict[str, Any]:
+    """
+    예열 단계를 순서대로 실행 (동기)
+
+    Returns:
+        dict: get_warmup_status()와 같은 형식
+    """
+    with _state_lock:
+        _state.update(status='running', started_at=time.time(), seconds=None, steps=[])
+
+    start = time.perf_counter()
+    failed = False
+    for name, step in WARMUP_STEPS:
+        step_start = time.perf_counter()
+        error = None
+        try:
+            step()
+        except Exception as e:
+            error = str(e)
+            failed = True
+        with _state_lock:
+            _state['steps'].append((name, time.perf_counter() - step_start, error))
+
+    with _state_lock:
+        _state.update(status='failed' if failed else 'ready', seconds=time.perf_counter() - start)
+    return get_warmup_status()
+
+
+def start_warmup() -> bool:
+    """
+    백그라운드 스레드에서 예열 시작 (프로세스당 한 번)
+
+    Returns:
+        bool: 이번 호출에서 스레드를 시작했으면 True
+    """
+    global _thread
+    with _state_lock:
+        if _thread is not None:
+            return False
+        _state['status'] = 'running'
+        _thread = threading.Thread(target=run_warmup, name='cache-warmup', daemon=True)
+    _thread.start()
+    return True
+
+
+def get_warmup_status() -> Dict[str, Any]:
+    """
+    예열 상태
+
+    Returns:
+        dict: status('idle'/'running'/'ready'/'failed'), seconds(총 소요 초, 완료 전 None),
+              steps([(단계, 초, 오류)]), total_steps
+    """
+    with _state_lock:
+        return {**_state, 'steps': list(_state['steps']), 'total_steps': len(WARMUP_STEPS)}
+
+
+def is_ready() -> bool:
+    """예열 완료 여부 (일부 단계 실패도 완료로 봄)"""
+    return get_warmup_status()['status'] in ('ready', 'failed')
+
+
+if __name__ == '__main__':
+    status = run_warmup()
+    for name, seconds, error in status['steps']:
+        print(f"{name:<12}{seconds * 1000:>10,.0f} ms  {error or ''}")
+    print(f"{status['status']}: {status['seconds']:.2f}s")
@@ -1,22 +1,29 @@
 """
 Admin Mode Tabs Package
 관리자 모드 탭 모듈
+
+탭 모듈은 처음 사용할 때 import합니다 (from tabs import render_xxx_tab 시점).
+열지 않은 탭은 로드하지 않으므로 앱 시작이 빨라집니다.
 """
+import importlib
+
+# 렌더링 함수 -> 모듈
+_TAB_MODULES = {
+    'render_approval_queue_tab': '.approval_queue_tab',
+    'render_monthly_dashboard_tab': '.monthly_dashboard_tab',
+    'render_data_explorer_tab': '.data_explorer_tab',
+    'render_guide_tab': '.guide_tab',
+    'render_upload_tab': '.data_upload_tab',
+    'render_equipment_explorer_tab': '.equipment_explorer_tab',
+    'render_quality_analysis_tab': '.quality_analysis_tab',
+}
+
+__all__ = list(_TAB_MODULES)
 
-from .approval_queue_tab import render_approval_queue_tab
-from .monthly_dashboard_tab import render_monthly_dashboard_tab
-from .data_explorer_tab import render_data_explorer_tab
-from .guide_tab import render_guide_tab
-from .data_upload_tab import render_upload_tab
-from .equipment_explorer_tab import render_equipment_explorer_tab
-from .quality_analysis_tab import render_quality_analysis_tab
 
-__all__ = [
-    'render_approval_queue_tab',
-    'render_monthly_dashboard_tab',
-    'render_data_explorer_tab',
-    'render_guide_tab',
-    'render_upload_tab',
-    'render_equipment_explorer_tab',
-    'render_quality_analysis_tab'
-]
+def __getattr__(name):
+    if name not in _TAB_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    func = getattr(importlib.import_module(_TAB_MODULES[name], __name__), name)
+    globals()[name] = func
+    return func
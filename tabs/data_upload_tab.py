@@ -16,7 +16,7 @@ def render_upload_tab(extract_func, insert_func, equipment_options, industrial_m
         extract_func: extract_equipment_info_from_last_sheet function
         insert_func: db.insert_equipment_from_excel function
         equipment_options: EQUIPMENT_OPTIONS dict
-        industrial_models: INDUSTRIAL_MODELS list
+        industrial_models: 산업용 모델 집합 (model_registry.industrial_models())
         log_history_func: db.log_approval_history function (optional)
     """
     st.header("📤 체크리스트 업로드 (Checklist Upload)")
@@ -13,9 +13,63 @@ Features:
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from modules import database as db
 from modules import charts
+from modules import explorer_data
+from modules.lazy_imports import lazy_module
+from modules.render_timing import timed_fragment
+
+px = lazy_module('plotly.express')
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _sunburst_hierarchy(version, start_d, end_d, path):
+    """
+    (데이터 버전, 기간, 경로)별 Sunburst 계층 캐시
+    
+    캐시 미스일 때만 기간 내 장비를 경로에 필요한 컬럼만 조회해 집계합니다.
+    """
+    columns = ['date'] + [col for col in path if col not in charts.SUNBURST_TIME_UNITS]
+    df = explorer_data.get_explorer_equipments(start_d, end_d, columns=columns)
+    return charts.build_sunburst_hierarchy(df, list(path))
+
+
+@timed_fragment("Sunburst 상세 탐색")
+def _render_sunburst_panel(start_d, end_d):
+    """상세 탐색 Sunburst (fragment: 시간 단위/분류 변경 시 이 패널만 다시 실행)"""
+    c1, c2 = st.columns([1, 2])
+    with c1:
+        time_unit = st.selectbox(
+            "시간 단위",
+            options=['None', 'Year', 'YearQuarter', 'YearMonth'],
+            format_func=lambda x: {'None': '선택 안함', 'Year': '연도별', 'YearQuarter': '분기별', 'YearMonth': '월별'}.get(x, x),
+            index=0
+        )
+    with c2:
+        cat_options = ['ri', 'model', 'head_type', 'xy_scanner', 'mod_vit', 'sliding_stage', 'sample_chuck', 'ae']
+        cat_labels = {
+            'ri': 'R/I (용도)', 'model': 'Model', 'head_type': 'Head Type', 
+            'xy_scanner': 'XY Scanner', 'mod_vit': 'MOD/VIT', 'sliding_stage': 'Sliding Stage',
+            'sample_chuck': 'Sample Chuck', 'ae': 'AE'
+        }
+        selected_cats = st.multiselect(
+            "상세 분류",
+            options=cat_options,
+            default=['ri', 'model'],
+            format_func=lambda x: cat_labels.get(x, x)
+        )
+    
+    # Construct Path & Plot
+    final_path = []
+    if time_unit != 'None': final_path.append(time_unit)
+    final_path.extend(selected_cats)
+    
+    if final_path:
+        hierarchy = _sunburst_hierarchy(
+            explorer_data.get_data_version(), start_d, end_d, tuple(final_path)
+        )
+        fig_sun = charts.plot_sunburst_chart(None, path=final_path, hierarchy=hierarchy)
+        st.plotly_chart(fig_sun, use_container_width=True)
 
 
 def render_equipment_explorer_tab():
@@ -31,14 +85,12 @@ def render_equipment_explorer_tab():
     st.divider()
     
     # 2. Dynamic Sunburst & List
-    df_equip = db.get_all_equipments()
+    # 기간 / R/I / 모델 조건은 SQL로 내려 필요한 장비만 조회 (explorer_data)
+    min_date, max_date = explorer_data.get_date_bounds()
     
-    if not df_equip.empty:
+    if min_date is not None:
         # --- Global Date Filter ---
         st.markdown("### 📅 출고 기간 설정")
-        min_date = df_equip['date'].min().date()
-        max_date = df_equip['date'].max().date()
-        if min_date > max_date: min_date, max_date = max_date, min_date
         
         # Initialize session state if not present
         if 'explorer_date_range' not in st.session_state:
@@ -65,12 +117,10 @@ def render_equipment_explorer_tab():
             )
         
         # Apply Date Filter
-        if len(date_range) == 2:
-            start_d, end_d = date_range
-            mask = (df_equip['date'].dt.date >= start_d) & (df_equip['date'].dt.date <= end_d)
-            df_equip = df_equip.loc[mask]
+        start_d, end_d = date_range if len(date_range) == 2 else (min_date, max_date)
+        window_counts = explorer_data.get_model_counts(start_d, end_d)
             
-        if df_equip.empty:
+        if window_counts.empty:
             st.warning("선택한 기간에 해당하는 장비가 없습니다.")
             return
 
@@ -78,36 +128,7 @@ def render_equipment_explorer_tab():
         
         # --- 1. Sunburst & Analysis Criteria ---
         with st.expander("상세 탐색", expanded=False):
-            c1, c2 = st.columns([1, 2])
-            with c1:
-                time_unit = st.selectbox(
-                    "시간 단위",
-                    options=['None', 'Year', 'YearQuarter', 'YearMonth'],
-                    format_func=lambda x: {'None': '선택 안함', 'Year': '연도별', 'YearQuarter': '분기별', 'YearMonth': '월별'}.get(x, x),
-                    index=0
-                )
-            with c2:
-                cat_options = ['ri', 'model', 'head_type', 'xy_scanner', 'mod_vit', 'sliding_stage', 'sample_chuck', 'ae']
-                cat_labels = {
-                    'ri': 'R/I (용도)', 'model': 'Model', 'head_type': 'Head Type', 
-                    'xy_scanner': 'XY Scanner', 'mod_vit': 'MOD/VIT', 'sliding_stage': 'Sliding Stage',
-                    'sample_chuck': 'Sample Chuck', 'ae': 'AE'
-                }
-                selected_cats = st.multiselect(
-                    "상세 분류",
-                    options=cat_options,
-                    default=['ri', 'model'],
-                    format_func=lambda x: cat_labels.get(x, x)
-                )
-            
-            # Construct Path & Plot
-            final_path = []
-            if time_unit != 'None': final_path.append(time_unit)
-            final_path.extend(selected_cats)
-            
-            if final_path:
-                fig_sun = charts.plot_sunburst_chart(df_equip, path=final_path)
-                st.plotly_chart(fig_sun, use_container_width=True)
+            _render_sunburst_panel(start_d, end_d)
         
         st.divider()
         
@@ -118,18 +139,19 @@ def render_equipment_explorer_tab():
         def render_ri_column(col, title, ri_type, color_seq):
             with col:
                 st.markdown(f"### {title}")
-                df_sub = df_equip[df_equip['ri'] == ri_type]
+                model_counts = window_counts[window_counts['ri'] == ri_type]
+                total = int(model_counts['count'].sum())
                 
                 # Metric
-                st.metric(f"등록 장비 수", f"{len(df_sub):,} 대")
+                st.metric(f"등록 장비 수", f"{total:,} 대")
                 
-                if df_sub.empty:
+                if total == 0:
                     st.info("데이터가 없습니다.")
                     return None
                 
                 # Bar Chart
                 st.caption("📊 모델별 분포 (클릭하여 필터링)")
-                fig = charts.create_model_bar_chart(df_sub, color_seq)
+                fig = charts.create_model_bar_chart(None, color_seq, model_counts=model_counts)
                 
                 # Chart Selection
                 # Use a unique key for the chart to avoid conflicts
@@ -161,7 +183,7 @@ def render_equipment_explorer_tab():
                 st.caption("📋 장비 목록 (선택)")
                 
                 # Model Filter Dropdown
-                models = sorted(df_sub['model'].unique())
+                models = sorted(model_counts['model'].dropna())
                 sel_model_filter = st.selectbox(
                     f"모델 필터", 
                     ["All"] + list(models), 
@@ -169,12 +191,10 @@ def render_equipment_explorer_tab():
                     label_visibility="collapsed"
                 )
                 
-                if sel_model_filter != "All":
-                    df_list = df_sub[df_sub['model'] == sel_model_filter]
-                else:
-                    df_list = df_sub
-                
-                df_list = df_list.sort_values('date', ascending=False).reset_index(drop=True)
+                df_list = explorer_data.get_explorer_equipments(
+                    start_d, end_d, ri=ri_type,
+                    model=None if sel_model_filter == "All" else sel_model_filter
+                )
                 
                 # SID Display Logic
                 # If SID is missing, display as empty string
@@ -199,22 +219,21 @@ def render_equipment_explorer_tab():
                     }
                 )
                 
-                selected_names = []
                 if event.selection.rows:
-                    selected_names = df_list.iloc[event.selection.rows]['equipment_name'].tolist()
-                return selected_names
+                    return df_list.iloc[event.selection.rows]
+                return None
 
         # Render Columns
         sel_research = render_ri_column(col_research, "Research (연구용)", "Research", px.colors.qualitative.Bold)
         sel_industrial = render_ri_column(col_industrial, "Industrial (산업용)", "Industrial", px.colors.qualitative.Pastel)
         
-        # Aggregate Selections
-        all_selected = []
-        if sel_research: all_selected.extend(sel_research)
-        if sel_industrial: all_selected.extend(sel_industrial)
+        # Aggregate Selections (선택된 행이 상세/비교에 필요한 컬럼을 모두 가지고 있음)
+        selected_frames = [df for df in (sel_research, sel_industrial) if df is not None]
+        df_selected = pd.concat(selected_frames) if selected_frames else pd.DataFrame(columns=explorer_data.EXPLORER_COLUMNS)
+        df_selected = df_selected.drop_duplicates('equipment_name')
         
         # Remove duplicates (just in case) and limit to 5
-        all_selected = list(dict.fromkeys(all_selected))
+        all_selected = df_selected['equipment_name'].tolist()
         
         if len(all_selected) > 5:
             st.warning(f"⚠️ 최대 5개까지만 비교할 수 있습니다. (현재 {len(all_selected)}개 선택됨) 상위 5개만 표시합니다.")
@@ -225,6 +244,19 @@ def render_equipment_explorer_tab():
         st.markdown("### 장비 상세 정보 & 비교")
         
         if all_selected:
+            # Full Data View는 펼친 장비(토글 ON)만 한 번의 쿼리로 조회 (SID별 LRU 캐시)
+            sid_by_name = {
+                name: str(sid) if pd.notna(sid) and str(sid).strip() != '' else ''
+                for name, sid in zip(df_selected['equipment_name'], df_selected['sid'])
+                if name in all_selected
+            }
+            compare_open = len(all_selected) > 1 and st.session_state.get('full_view_compare', False)
+            open_sids = [
+                sid for name, sid in sid_by_name.items()
+                if sid and (compare_open or st.session_state.get(f"full_view_{name}", False))
+            ]
+            full_data_map = db.get_full_measurements_many(open_sids) if open_sids else {}
+            
             # Create Tabs: [Equip 1] [Equip 2] ... [Comparison]
             tab_names = all_selected.copy()
             if len(all_selected) > 1:
@@ -235,7 +267,7 @@ def render_equipment_explorer_tab():
             # Render Individual Tabs
             for i, equip_name in enumerate(all_selected):
                 with tabs[i]:
-                    equip_info = df_equip[df_equip['equipment_name'] == equip_name].iloc[0]
+                    equip_info = df_selected[df_selected['equipment_name'] == equip_name].iloc[0]
                     with st.container(border=True):
                         # Layout: Header (Left) and Body (Right-ish)
                         c_head, c_body = st.columns([1, 3])
@@ -244,8 +276,7 @@ def render_equipment_explorer_tab():
                         with c_head:
                             st.markdown(f"## 🏷️")
                             # SID Display
-                            sid_val = equip_info.get('sid')
-                            sid_str = str(sid_val) if pd.notna(sid_val) and str(sid_val).strip() != '' else ''
+                            sid_str = sid_by_name[equip_name]
                             if sid_str:
                                 st.caption(f"**SID: {sid_str}**")
                                 
@@ -286,9 +317,9 @@ def render_equipment_explorer_tab():
                         
                         # Full Data View (Below header/body split)
                         st.divider()
-                        with st.expander("📋 상세 측정 데이터 (Full Data View)", expanded=False):
+                        if st.toggle("📋 상세 측정 데이터 (Full Data View)", key=f"full_view_{equip_name}"):
                             if sid_str:
-                                full_data = db.get_full_measurements(sid_str)
+                                full_data = full_data_map[sid_str] if sid_str in full_data_map else db.get_full_measurements(sid_str)
                                 if not full_data.empty:
                                     st.caption("💡 업로드된 원본 상세 데이터입니다. (Category, Remark 등 포함)")
                                     st.dataframe(
@@ -309,7 +340,7 @@ def render_equipment_explorer_tab():
                 with tabs[-1]:
                     st.markdown("#### 📊 사양 비교")
                     # Prepare Comparison Data
-                    comp_data = df_equip[df_equip['equipment_name'].isin(all_selected)].set_index('equipment_name')
+                    comp_data = df_selected[df_selected['equipment_name'].isin(all_selected)].set_index('equipment_name')
                     
                     # Format date to YYYY-MM-DD string for display
                     if 'date' in comp_data.columns:
@@ -320,6 +351,21 @@ def render_equipment_explorer_tab():
                     df_comp = comp_data[cols_to_compare].T
                     st.dataframe(df_comp, use_container_width=True)
                     
+                    st.markdown("#### 📋 측정값 비교")
+                    if st.toggle("선택 장비의 상세 측정값 비교 (Full Data View)", key='full_view_compare'):
+                        frames = {
+                            name: full_data_map[sid] for name, sid in sid_by_name.items()
+                            if sid in full_data_map and not full_data_map[sid].empty
+                        }
+                        if len(frames) < 2:
+                            st.info("ℹ️ 상세 측정 데이터가 있는 장비가 2개 이상이어야 비교할 수 있습니다.")
+                        else:
+                            st.dataframe(
+                                explorer_data.compare_full_measurements(frames),
+                                use_container_width=True,
+                                hide_index=True
+                            )
+                    
         else:
             st.info("👆 위 목록에서 장비를 선택(체크박스)하면 상세 정보 탭이 생성됩니다. (최대 5개)")
             
@@ -12,11 +12,10 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from modules.monthly_shipment import (
-    aggregate_monthly_shipments,
+    monthly_stats_from_rollup,
     create_monthly_shipment_chart,
     show_shipment_stats
 )
-from modules.utils import RESEARCH_MODELS, INDUSTRIAL_MODELS
 from modules import database as db
 
 
@@ -27,30 +26,26 @@ def render_monthly_dashboard_tab():
     # === 1. 출하 현황 요약 ===
     st.caption("총 출하 수, 연구용, 산업용 통계 및 트렌드를 표시합니다")
     
-    df_equipments = db.get_all_equipments()
-    
-    if df_equipments.empty:
+    if db.get_equipment_count() == 0:
         st.info("데이터가 없습니다.")
         return
     
-    show_shipment_stats(df_equipments)
+    # 월별 집계 테이블 (year_month, category, model, count) - 장비 이력 전체 대신 수백 행만 조회
+    df_rollup = db.get_monthly_rollup()
+    
+    show_shipment_stats(df_rollup)
     
     st.divider()
     
     # === 2. 월별 차트 ===
     st.caption("💡 막대를 클릭하여 해당 월의 장비만 필터링할 수 있습니다")
     
-    # 날짜 데이터 준비
-    df_for_chart = df_equipments.copy()
-    df_for_chart['date'] = pd.to_datetime(df_for_chart['date'], errors='coerce')
-    df_for_chart = df_for_chart.dropna(subset=['date'])
-    
-    if df_for_chart.empty:
+    if df_rollup.empty:
         st.warning("유효한 날짜 데이터가 없습니다.")
         return
     
     # 년도 필터
-    available_years = sorted(df_for_chart['date'].dt.year.unique(), reverse=True)
+    available_years = sorted(df_rollup['year_month'].str[:4].astype(int).unique(), reverse=True)
     
     col_filter, col_space = st.columns([2, 3])
     with col_filter:
@@ -63,13 +58,7 @@ def render_monthly_dashboard_tab():
         )
     
     # 년도 필터링
-    if selected_years:
-        df_filtered_by_year = df_for_chart[
-            df_for_chart['date'].dt.year.isin(selected_years)
-        ]
-        monthly_stats = aggregate_monthly_shipments(df_filtered_by_year)
-    else:
-        monthly_stats = aggregate_monthly_shipments(df_for_chart)
+    monthly_stats = monthly_stats_from_rollup(df_rollup, years=selected_years)
     
     if monthly_stats.empty:
         st.info("선택한 년도에 데이터가 없습니다.")
@@ -121,10 +110,8 @@ def render_monthly_dashboard_tab():
     selected_month = st.session_state.get('monthly_selected_month', None)
     
     if selected_month:
-        # 필터링
-        df_filtered = df_for_chart[
-            df_for_chart['date'].dt.to_period('M').astype(str) == selected_month
-        ].copy()
+        # 해당 월 장비만 조회 (category 포함)
+        df_filtered = db.get_month_equipments(selected_month)
         
         if not df_filtered.empty:
             st.success(f"✅ {selected_month} 출하 장비: {len(df_filtered)}대")
@@ -136,8 +123,8 @@ def render_monthly_dashboard_tab():
                 st.markdown("#### 📊 타입별 출하 현황")
                 
                 # 연구용/산업용 개수 집계
-                research_count = len(df_filtered[df_filtered['model'].isin(RESEARCH_MODELS)])
-                industrial_count = len(df_filtered[df_filtered['model'].isin(INDUSTRIAL_MODELS)])
+                research_count = int((df_filtered['category'] == 'Research').sum())
+                industrial_count = int((df_filtered['category'] == 'Industrial').sum())
                 
                 # 파이 차트
                 fig_type = go.Figure(data=[go.Pie(
@@ -173,7 +160,7 @@ def render_monthly_dashboard_tab():
                 
                 with tab_all:
                     st.caption(f"전체 {len(df_filtered)}대")
-                    df_display = df_filtered.sort_values('date', ascending=False)
+                    df_display = df_filtered
                     st.dataframe(
                         df_display[['sid', 'equipment_name', 'model', 'date']],
                         use_container_width=True,
@@ -181,10 +168,10 @@ def render_monthly_dashboard_tab():
                     )
                 
                 with tab_research:
-                    df_research = df_filtered[df_filtered['model'].isin(RESEARCH_MODELS)]
+                    df_research = df_filtered[df_filtered['category'] == 'Research']
                     st.caption(f"연구용 {len(df_research)}대")
                     if not df_research.empty:
-                        df_display = df_research.sort_values('date', ascending=False)
+                        df_display = df_research
                         st.dataframe(
                             df_display[['sid', 'equipment_name', 'model', 'date']],
                             use_container_width=True,
@@ -194,10 +181,10 @@ def render_monthly_dashboard_tab():
                         st.info("연구용 장비가 없습니다.")
                 
                 with tab_industrial:
-                    df_industrial = df_filtered[df_filtered['model'].isin(INDUSTRIAL_MODELS)]
+                    df_industrial = df_filtered[df_filtered['category'] == 'Industrial']
                     st.caption(f"산업용 {len(df_industrial)}대")
                     if not df_industrial.empty:
-                        df_display = df_industrial.sort_values('date', ascending=False)
+                        df_display = df_industrial
                         st.dataframe(
                             df_display[['sid', 'equipment_name', 'model', 'date']],
                             use_container_width=True,
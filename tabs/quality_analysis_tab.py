@@ -23,6 +23,7 @@ from datetime import datetime, date
 from modules import database as db
 from modules.utils import calculate_stats
 from modules.charts import create_control_chart
+from modules.render_timing import timed_fragment
 
 
 def render_quality_analysis_tab():
@@ -240,8 +241,8 @@ def render_quality_analysis_tab():
             reduction = (1 - len(filtered_df) / len(display_df)) * 100
             st.metric("필터율", f"{reduction:.1f}%", delta=f"-{len(display_df) - len(filtered_df)}개")
     
-    # 필터링된 데이터를 display_df로 교체
-    display_df = filtered_df
+    # 필터링된 데이터를 display_df로 교체 (모델/항목별 LSL/USL/Target 컬럼 추가)
+    display_df = db.attach_specs(filtered_df)
     # ===============================================
     
     # ========== 현재 필터 조건 표시 (Task 1.3) ==========
@@ -306,268 +307,317 @@ def render_quality_analysis_tab():
     group_options = ['None', '연도', '분기', '월']
     
     with tab1:
-        st.subheader("📈 Trend 분석 (시계열 Control Chart)")
-        
-        c1, c2 = st.columns([1, 3])
-        with c1:
-            group_by_selection = st.selectbox("그룹화 기준 (시간)", group_options, index=0, key='combined_group')
-            show_violations = st.checkbox("Rule of Seven / Trend 표시", value=True, key='combined_viol')
-            
-        # Logic to determine actual group column
-        if group_by_selection == 'None':
-            if display_df['Check Items'].nunique() > 1:
-                group_col = 'Check Items'
-                st.caption("ℹ️ 'None' 선택 시, 항목(Check Items)별로 구분됩니다.")
-            else:
-                item_name = display_df['Check Items'].iloc[0]
-                display_df[item_name] = item_name
-                group_col = item_name
-        elif group_by_selection == '연도':
-            group_col = '연도'
-        elif group_by_selection == '분기':
-            if '분기' not in display_df.columns:
-                 display_df['분기'] = display_df['종료일'].dt.to_period('Q').astype(str)
-            display_df['YearQuarter'] = display_df['연도'] + '-' + display_df['분기'] + 'Q'
-            group_col = 'YearQuarter'
-        elif group_by_selection == '월':
-            display_df['YearMonth'] = display_df['연도'] + '-' + display_df['월']
-            group_col = 'YearMonth'
-            
-        # 이중 축 로직
-        use_dual_axis = False
-        if group_col == 'Check Items' and display_df['Check Items'].nunique() == 2:
-            use_dual_axis = st.checkbox("이중 Y축 사용", value=True, key='combined_dual')
-            
-        # Spec Fetching Logic
-        specs = None
-        unique_models = display_df['Model'].unique()
-        unique_items = display_df['Check Items'].unique()
-        
-        if len(unique_models) == 1 and len(unique_items) == 1:
-            specs = db.get_spec_for_item(unique_models[0], unique_items[0])
-            if specs and all(v is None for v in specs.values()):
-                specs = None
-            
-        try:
-            fig_combined = create_control_chart(
-                display_df, 
-                group_col=group_col,
-                equipment_col='장비명',
-                show_violations=show_violations,
-                use_dual_axis=use_dual_axis,
-                specs=specs
-            )
-            st.plotly_chart(fig_combined, use_container_width=True)
-        except Exception as e:
-            st.error(f"차트 생성 오류: {e}")
+        _render_trend_view(display_df, group_options)
     
     # ========== 스펙 분석 탭 (Phase 2 - NEW) ==========
     with tab_spec:
-        st.subheader("📊 스펙 분석 (Spec Analysis with Cpk)")
-        st.caption("💡 공정 능력 지수(Cpk)를 자동 계산하고, 스펙 적정성을 평가합니다.")
+        _render_spec_view(display_df)
+    # =================================================
         
-        from modules.spec_analysis import (
-            prepare_spec_data,
-            calculate_process_capability,
-            create_histogram_with_specs,
-            generate_insights
-        )
+    with tab_equip:
+        _render_equipment_compare_view(display_df)
+
+    with tab3:
+        _render_stats_view(display_df, group_options)
         
-        # Check Item 선택
-        unique_items = display_df['Check Items'].unique().tolist() if 'Check Items' in display_df.columns else []
+    with tab4:
+        st.subheader("💾 필터링된 원본 데이터")
+        st.dataframe(display_df, use_container_width=True)
+
+
+@timed_fragment("📈 Trend 분석")
+def _render_trend_view(display_df, group_options):
+    """Trend 분석 하위 탭 (fragment: 이 탭의 위젯 조작 시 이 탭만 다시 실행)"""
+    st.subheader("📈 Trend 분석 (시계열 Control Chart)")
+    
+    c1, c2 = st.columns([1, 3])
+    with c1:
+        group_by_selection = st.selectbox("그룹화 기준 (시간)", group_options, index=0, key='combined_group')
+        show_violations = st.checkbox("Rule of Seven / Trend 표시", value=True, key='combined_viol')
         
-        if len(unique_items) == 0:
-            st.warning("⚠️ Check Item이 없습니다.")
-        elif len(unique_items) == 1:
-            selected_spec_item = unique_items[0]
-            st.info(f"분석 항목: **{selected_spec_item}**")
+    # Logic to determine actual group column
+    if group_by_selection == 'None':
+        if display_df['Check Items'].nunique() > 1:
+            group_col = 'Check Items'
+            st.caption("ℹ️ 'None' 선택 시, 항목(Check Items)별로 구분됩니다.")
         else:
-            selected_spec_item = st.selectbox(
-                "분석 항목 선택",
-                unique_items,
-                key='spec_analysis_item',
-                help="Cpk를 계산할 Check Item을 선택하세요"
-            )
+            item_name = display_df['Check Items'].iloc[0]
+            display_df[item_name] = item_name
+            group_col = item_name
+    elif group_by_selection == '연도':
+        group_col = '연도'
+    elif group_by_selection == '분기':
+        if '분기' not in display_df.columns:
+             display_df['분기'] = display_df['종료일'].dt.to_period('Q').astype(str)
+        display_df['YearQuarter'] = display_df['연도'] + '-' + display_df['분기'] + 'Q'
+        group_col = 'YearQuarter'
+    elif group_by_selection == '월':
+        display_df['YearMonth'] = display_df['연도'] + '-' + display_df['월']
+        group_col = 'YearMonth'
+        
+    # 이중 축 로직
+    use_dual_axis = False
+    if group_col == 'Check Items' and display_df['Check Items'].nunique() == 2:
+        use_dual_axis = st.checkbox("이중 Y축 사용", value=True, key='combined_dual')
+        
+    # Spec Fetching Logic
+    specs = None
+    unique_models = display_df['Model'].unique()
+    unique_items = display_df['Check Items'].unique()
+    
+    if len(unique_models) == 1 and len(unique_items) == 1:
+        specs = db.get_spec_for_item(unique_models[0], unique_items[0])
+        if specs and all(v is None for v in specs.values()):
+            specs = None
         
-        if len(unique_items) > 0:
-            item_df = display_df[display_df['Check Items'] == selected_spec_item]
+    try:
+        fig_combined = create_control_chart(
+            display_df, 
+            group_col=group_col,
+            equipment_col='장비명',
+            show_violations=show_violations,
+            use_dual_axis=use_dual_axis,
+            specs=specs
+        )
+        st.plotly_chart(fig_combined, use_container_width=True)
+    except Exception as e:
+        st.error(f"차트 생성 오류: {e}")
+
+
+@timed_fragment("📊 SPEC 분석")
+def _render_spec_view(display_df):
+    """SPEC 분석 하위 탭 (fragment: 이 탭의 위젯 조작 시 이 탭만 다시 실행)"""
+    st.subheader("📊 스펙 분석 (Spec Analysis with Cpk)")
+    st.caption("💡 공정 능력 지수(Cpk)를 자동 계산하고, 스펙 적정성을 평가합니다.")
+    
+    from modules.spec_analysis import (
+        prepare_spec_data,
+        calculate_process_capability,
+        create_histogram_with_specs,
+        generate_insights,
+        calculate_capability_matrix,
+        render_capability_matrix
+    )
+    
+    # 전체 선택 범위의 모델 × 항목별 공정 능력 (행 단위 규격 join)
+    with st.expander("📋 공정 능력 매트릭스 (모델 × 항목 전체)", expanded=display_df['Model'].nunique() > 1):
+        st.caption("💡 선택한 모든 모델/항목의 Cpk를 한 번에 계산합니다. 컬럼 헤더를 클릭하면 정렬됩니다.")
+        render_capability_matrix(calculate_capability_matrix(display_df))
+    
+
+    # Check Item 선택
+    unique_items = display_df['Check Items'].unique().tolist() if 'Check Items' in display_df.columns else []
+    
+    if len(unique_items) == 0:
+        st.warning("⚠️ Check Item이 없습니다.")
+    elif len(unique_items) == 1:
+        selected_spec_item = unique_items[0]
+        st.info(f"분석 항목: **{selected_spec_item}**")
+    else:
+        selected_spec_item = st.selectbox(
+            "분석 항목 선택",
+            unique_items,
+            key='spec_analysis_item',
+            help="Cpk를 계산할 Check Item을 선택하세요"
+        )
+    
+    if len(unique_items) > 0:
+        item_df = display_df[display_df['Check Items'] == selected_spec_item]
+        
+        # 1. 데이터 준비
+        data = prepare_spec_data(item_df)
+        
+        if data is None or len(data['measurements']) == 0:
+            st.warning("⚠️ 선택한 항목에 측정 데이터가 없습니다.")
+        else:
+            # 2. 통계 계산
+            stats = calculate_process_capability(data, data['lsl'], data['usl'])
             
-            # 1. 데이터 준비
-            data = prepare_spec_data(item_df)
+            # 3. 핵심 지표 표시
+            st.markdown("#### 📈 핵심 공정 지표")
             
-            if data is None or len(data['measurements']) == 0:
-                st.warning("⚠️ 선택한 항목에 측정 데이터가 없습니다.")
-            else:
-                # 2. 통계 계산
-                stats = calculate_process_capability(data, data['lsl'], data['usl'])
-                
-                # 3. 핵심 지표 표시
-                st.markdown("#### 📈 핵심 공정 지표")
-                
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    if stats['cpk'] is not None:
-                        cpk_val = stats['cpk']
-                        if cpk_val >= 1.67:
-                            delta_text = "✅ 매우우수"
-                            delta_color = "normal"
-                        elif cpk_val >= 1.33:
-                            delta_text = "✅ 우수"
-                            delta_color = "normal"
-                        elif cpk_val >= 1.0:
-                            delta_text = "🟡 양호"
-                            delta_color = "off"
-                        else:
-                            delta_text = "🔴 부적합"
-                            delta_color = "inverse"
-                        
-                        st.metric(
-                            "Cpk (공정능력)",
-                            f"{cpk_val:.2f}",
-                            delta=delta_text,
-                            delta_color=delta_color,
-                            help="Cpk >= 1.33: 우수, >= 1.0: 양호, < 1.0: 부적합"
-                        )
-                    else:
-                        st.metric("Cpk", "N/A", help="스펙 정보 없음")
-                
-                with col2:
-                    if stats['mean'] is not None:
-                        st.metric(
-                            "평균",
-                            f"{stats['mean']:.2f} {data['unit']}",
-                            help=f"측정값 평균 ({stats['n']}개 데이터)"
-                        )
-                    else:
-                        st.metric("평균", "N/A")
-                
-                with col3:
-                    if stats['std'] is not None:
-                        st.metric(
-                            "표준편차 (σ)",
-                            f"{stats['std']:.2f} {data['unit']}",
-                            help="공정 변동성 지표"
-                        )
-                    else:
-                        st.metric("표준편차", "N/A")
-                
-                with col4:
-                    if stats['margin'] is not None:
-                        margin = stats['margin']
-                        if margin > 40:
-                            delta_text = "🔵 여유 많음"
-                            delta_color = "normal"
-                        elif margin > 20:
-                            delta_text = "✅ 적정"
-                            delta_color = "normal"
-                        elif margin > 10:
-                            delta_text = "⚠️ 주의"
-                            delta_color = "off"
-                        else:
-                            delta_text = "🔴 부족"
-                            delta_color = "inverse"
-                        
-                        st.metric(
-                            "스펙 여유도",
-                            f"{margin:.1f}%",
-                            delta=delta_text,
-                            delta_color=delta_color,
-                            help="스펙 대비 공정 변동 여유 공간"
-                        )
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                if stats['cpk'] is not None:
+                    cpk_val = stats['cpk']
+                    if cpk_val >= 1.67:
+                        delta_text = "✅ 매우우수"
+                        delta_color = "normal"
+                    elif cpk_val >= 1.33:
+                        delta_text = "✅ 우수"
+                        delta_color = "normal"
+                    elif cpk_val >= 1.0:
+                        delta_text = "🟡 양호"
+                        delta_color = "off"
                     else:
-                        st.metric("스펙 여유도", "N/A")
-                
-                st.divider()
-                
-                # 4. 히스토그램 + 스펙 라인
-                st.markdown("#### 📊 측정값 분포")
-                
-                fig = create_histogram_with_specs(data, stats)
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # 5. 인사이트
-                st.markdown("#### 💡 분석 결과 및 권장사항")
-                
-                insights = generate_insights(data, stats)
-                for insight in insights:
-                    st.markdown(f"- {insight}")
-                
-                # 6. 상세 통계 (Expander)
-                with st.expander("📋 상세 통계", expanded=False):
-                    col_detail1, col_detail2 = st.columns(2)
+                        delta_text = "🔴 부적합"
+                        delta_color = "inverse"
                     
-                    with col_detail1:
-                        st.markdown("**스펙 정보**")
-                        st.json({
-                            'Check Item': data['item'],
-                            'LSL (Min)': data['lsl'],
-                            'Target (Criteria)': data['target'],
-                            'USL (Max)': data['usl'],
-                            'Unit': data['unit']
-                        })
+                    st.metric(
+                        "Cpk (공정능력)",
+                        f"{cpk_val:.2f}",
+                        delta=delta_text,
+                        delta_color=delta_color,
+                        help="Cpk >= 1.33: 우수, >= 1.0: 양호, < 1.0: 부적합"
+                    )
+                else:
+                    st.metric("Cpk", "N/A", help="스펙 정보 없음")
+            
+            with col2:
+                if stats['mean'] is not None:
+                    st.metric(
+                        "평균",
+                        f"{stats['mean']:.2f} {data['unit']}",
+                        help=f"측정값 평균 ({stats['n']}개 데이터)"
+                    )
+                else:
+                    st.metric("평균", "N/A")
+            
+            with col3:
+                if stats['std'] is not None:
+                    st.metric(
+                        "표준편차 (σ)",
+                        f"{stats['std']:.2f} {data['unit']}",
+                        help="공정 변동성 지표"
+                    )
+                else:
+                    st.metric("표준편차", "N/A")
+            
+            with col4:
+                if stats['margin'] is not None:
+                    margin = stats['margin']
+                    if margin > 40:
+                        delta_text = "🔵 여유 많음"
+                        delta_color = "normal"
+                    elif margin > 20:
+                        delta_text = "✅ 적정"
+                        delta_color = "normal"
+                    elif margin > 10:
+                        delta_text = "⚠️ 주의"
+                        delta_color = "off"
+                    else:
+                        delta_text = "🔴 부족"
+                        delta_color = "inverse"
                     
-                    with col_detail2:
-                        st.markdown("**공정 통계**")
-                        st.json({
-                            '평균': round(stats['mean'], 4) if stats['mean'] else None,
-                            '표준편차': round(stats['std'], 4) if stats['std'] else None,
-                            'Cp': round(stats['cp'], 3) if stats['cp'] else None,
-                            'Cpk': round(stats['cpk'], 3) if stats['cpk'] else None,
-                            'CPU': round(stats['cpu'], 3) if stats['cpu'] else None,
-                            'CPL': round(stats['cpl'], 3) if stats['cpl'] else None,
-                            '스펙 여유도 (%)': round(stats['margin'], 2) if stats['margin'] else None,
-                            '불량률 (%)': round(stats['defect_rate'], 2) if stats['defect_rate'] else None,
-                            '스펙 외부 개수': stats['n_out_of_spec'],
-                            '데이터 수': stats['n'],
-                            '장비 수': data['n_equipments']
-                        })
-    # =================================================
-        
-    with tab_equip:
-        st.subheader("🏭 장비 비교 (Equipment Comparison)")
-        st.caption("💡 장비 간 성능 차이를 분석하고, 문제 장비를 자동으로 식별합니다.")
-        
-        # Check Item 선택
-        unique_items_equip = display_df['Check Items'].unique().tolist() if 'Check Items' in display_df.columns else []
-        with c1:
-            group_by_stat_sel = st.selectbox("그룹화 기준 (통계)", group_options, index=0, key='stat_group')
+                    st.metric(
+                        "스펙 여유도",
+                        f"{margin:.1f}%",
+                        delta=delta_text,
+                        delta_color=delta_color,
+                        help="스펙 대비 공정 변동 여유 공간"
+                    )
+                else:
+                    st.metric("스펙 여유도", "N/A")
+            
+            st.divider()
+            
+            # 4. 히스토그램 + 스펙 라인
+            st.markdown("#### 📊 측정값 분포")
             
-        if group_by_stat_sel == 'None':
-            if display_df['Check Items'].nunique() > 1:
-                group_col_stat = 'Check Items'
-            else:
-                item_name = display_df['Check Items'].iloc[0]
-                display_df[item_name] = item_name 
-                group_col_stat = item_name
-        elif group_by_stat_sel == '연도':
-            group_col_stat = '연도'
-        elif group_by_stat_sel == '분기':
-            display_df['YearQuarter'] = display_df['연도'] + '-' + display_df['분기'] + 'Q'
-            group_col_stat = 'YearQuarter'
-        elif group_by_stat_sel == '월':
-            display_df['YearMonth'] = display_df['연도'] + '-' + display_df['월']
-            group_col_stat = 'YearMonth'
+            fig = create_histogram_with_specs(data, stats)
+            st.plotly_chart(fig, use_container_width=True)
             
-        stats_list = []
-        for name, group in display_df.groupby(group_col_stat):
-            s = calculate_stats(group['Value'].values)
-            stats_list.append({
-                '그룹': name,
-                'Count': s['count'],
-                'AVG': round(s['avg'], 3),
-                'STD': round(s['std'], 3),
-                'UCL': round(s['ucl'], 3),
-                'LCL': round(s['lcl'], 3),
-                'Min': round(s['min'], 3),
-                'Max': round(s['max'], 3)
-            })
+            # 5. 인사이트
+            st.markdown("#### 💡 분석 결과 및 권장사항")
             
-        if stats_list:
-            st.dataframe(pd.DataFrame(stats_list), use_container_width=True)
+            insights = generate_insights(data, stats)
+            for insight in insights:
+                st.markdown(f"- {insight}")
+            
+            # 6. 상세 통계 (Expander)
+            with st.expander("📋 상세 통계", expanded=False):
+                col_detail1, col_detail2 = st.columns(2)
+                
+                with col_detail1:
+                    st.markdown("**스펙 정보**")
+                    st.json({
+                        'Check Item': data['item'],
+                        'LSL (Min)': data['lsl'],
+                        'Target (Criteria)': data['target'],
+                        'USL (Max)': data['usl'],
+                        'Unit': data['unit']
+                    })
+                
+                with col_detail2:
+                    st.markdown("**공정 통계**")
+                    st.json({
+                        '평균': round(stats['mean'], 4) if stats['mean'] else None,
+                        '표준편차': round(stats['std'], 4) if stats['std'] else None,
+                        'Cp': round(stats['cp'], 3) if stats['cp'] else None,
+                        'Cpk': round(stats['cpk'], 3) if stats['cpk'] else None,
+                        'CPU': round(stats['cpu'], 3) if stats['cpu'] else None,
+                        'CPL': round(stats['cpl'], 3) if stats['cpl'] else None,
+                        '스펙 여유도 (%)': round(stats['margin'], 2) if stats['margin'] else None,
+                        '불량률 (%)': round(stats['defect_rate'], 2) if stats['defect_rate'] else None,
+                        '스펙 외부 개수': stats['n_out_of_spec'],
+                        '데이터 수': stats['n'],
+                        '장비 수': data['n_equipments']
+                    })
+
+
+@timed_fragment("🏭 장비 비교")
+def _render_equipment_compare_view(display_df):
+    """장비 비교 하위 탭 (fragment: 이 탭의 위젯 조작 시 이 탭만 다시 실행)"""
+    st.subheader("🏭 장비 비교 (Equipment Comparison)")
+    st.caption("💡 장비 간 성능 차이를 분석하고, 문제 장비를 자동으로 식별합니다.")
+    
+    # Check Item 선택
+    unique_items_equip = display_df['Check Items'].unique().tolist() if 'Check Items' in display_df.columns else []
+
+    if len(unique_items_equip) == 0:
+        st.warning("⚠️ Check Item이 없습니다.")
+    else:
+        from modules.equipment_tab_renderer import render_equipment_comparison_content
+
+        selected_equip_item = st.selectbox(
+            "비교 항목 선택",
+            unique_items_equip,
+            key='equip_compare_item'
+        )
+        render_equipment_comparison_content(display_df, selected_equip_item)
+
+
+@timed_fragment("📉 통계 요약")
+def _render_stats_view(display_df, group_options):
+    """통계 요약 하위 탭 (fragment: 이 탭의 위젯 조작 시 이 탭만 다시 실행)"""
+    st.subheader("📉 통계 요약")
+
+    c1, c2 = st.columns([1, 3])
+    with c1:
+        group_by_stat_sel = st.selectbox("그룹화 기준 (통계)", group_options, index=0, key='stat_group')
+        
+    if group_by_stat_sel == 'None':
+        if display_df['Check Items'].nunique() > 1:
+            group_col_stat = 'Check Items'
         else:
-            st.info("통계 데이터가 없습니다.")
+            item_name = display_df['Check Items'].iloc[0]
+            display_df[item_name] = item_name 
+            group_col_stat = item_name
+    elif group_by_stat_sel == '연도':
+        group_col_stat = '연도'
+    elif group_by_stat_sel == '분기':
+        display_df['YearQuarter'] = display_df['연도'] + '-' + display_df['분기'] + 'Q'
+        group_col_stat = 'YearQuarter'
+    elif group_by_stat_sel == '월':
+        display_df['YearMonth'] = display_df['연도'] + '-' + display_df['월']
+        group_col_stat = 'YearMonth'
         
-    with tab4:
-        st.subheader("💾 필터링된 원본 데이터")
-        st.dataframe(display_df, use_container_width=True)
+    stats_list = []
+    for name, group in display_df.groupby(group_col_stat):
+        s = calculate_stats(group['Value'].values)
+        stats_list.append({
+            '그룹': name,
+            'Count': s['count'],
+            'AVG': round(s['avg'], 3),
+            'STD': round(s['std'], 3),
+            'UCL': round(s['ucl'], 3),
+            'LCL': round(s['lcl'], 3),
+            'Min': round(s['min'], 3),
+            'Max': round(s['max'], 3)
+        })
+        
+    if stats_list:
+        st.dataframe(pd.DataFrame(stats_list), use_container_width=True)
+    else:
+        st.info("통계 데이터가 없습니다.")
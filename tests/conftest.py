@@ -0,0 +1,39 @@
+"""
+pytest 공통 설정
+
+- 저장소 루트를 import 경로에 추가 (modules, equipment_config_validator)
+- temp_db: 임시 SQLite 파일로 database.DB_FILE을 바꾸고 프로세스 캐시를 비운 뒤 init_db
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modules import database as db  # noqa: E402
+
+# Streamlit 페이지/수동 실행 스크립트 (pytest 테스트 아님)
+collect_ignore = ['test_monthly_chart.py', 'test_extraction.py', 'analyze_last.py']
+
+
+def reset_db_caches():
+    """DB 파일을 바꾼 뒤 프로세스 캐시 폐기 (다른 DB의 결과가 남지 않도록)"""
+    for lock, cache in [(db._filtered_cache_lock, db._filtered_cache), (db._full_cache_lock, db._full_cache)]:
+        with lock:
+            cache.clear()
+    db._filtered_cache_version = None
+    db._full_cache_version = None
+    db.invalidate_spec_cache()
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """빈 임시 DB (최신 스키마). DB 파일 경로를 반환"""
+    db_file = str(tmp_path / 'control_chart.db')
+    monkeypatch.setattr(db, 'DB_FILE', db_file)
+    reset_db_caches()
+    db.init_db()
+    yield db_file
+    reset_db_caches()
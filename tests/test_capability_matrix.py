@@ -0,0 +1,106 @@
+"""
+calculate_capability_matrix 테스트
+
+(Model, Check Item) 그룹별 일괄 계산 결과의 각 행이
+같은 그룹을 prepare_spec_data + calculate_process_capability로 하나씩 계산한 값과 같은지 확인합니다.
+(SPEC 분석 탭의 단일 항목 계산과 매트릭스가 서로 다른 Cpk를 보여주지 않도록)
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.spec_analysis import calculate_capability_matrix, calculate_process_capability, prepare_spec_data
+
+# 매트릭스 컬럼 -> calculate_process_capability 결과 키
+MATRIX_TO_SINGLE = {
+    'Cpk': 'cpk', 'Cp': 'cp', 'CPU': 'cpu', 'CPL': 'cpl', '스펙 여유도(%)': 'margin',
+    '스펙 외부 개수': 'n_out_of_spec', '데이터 수': 'n', '평균': 'mean', '표준편차': 'std',
+}
+
+# (모델, 항목, LSL, USL, 측정값) - 같은 항목이라도 모델마다 규격이 다름
+GROUPS = [
+    ('NX-10', 'Item A', 1.0, 3.0, [1.8, 2.1, 2.0, 2.4, 1.9, 3.2]),
+    ('NX-20', 'Item A', 2.0, 6.0, [3.9, 4.2, 4.1, 1.5, 4.0]),
+    ('NX-10', 'Item B', 10.0, 20.0, [14.0, 15.5, 16.0, 15.0]),
+    ('NX-20', 'Item B', None, 20.0, [14.0, 21.0, 16.0]),      # 단측 규격 (USL만)
+    ('NX-30', 'Item B', 10.0, None, [9.0, 12.0, 16.0]),       # 단측 규격 (LSL만)
+    ('NX-30', 'Item A', 1.0, 3.0, [2.5]),                     # n = 1
+    ('NX-40', 'Item A', 1.0, 3.0, [2.0, 2.0, 2.0]),           # 표준편차 0
+    ('NX-40', 'Item C', None, None, [5.0, 6.0]),              # 규격 없음
+]
+
+
+@pytest.fixture
+def mixed_frame():
+    rows = []
+    for model, item, lsl, usl, values in GROUPS:
+        target = (lsl + usl) / 2 if lsl is not None and usl is not None else None
+        rows += [{'Model': model, 'Check Items': item, 'Value': v, 'LSL': lsl, 'USL': usl, 'Target': target,
+                  '장비명': f'{model}-{i}'} for i, v in enumerate(values)]
+    # 모델/항목이 섞인 순서로 입력
+    return pd.DataFrame(rows).sample(frac=1.0, random_state=0).reset_index(drop=True)
+
+
+def _single(df):
+    data = prepare_spec_data(df)
+    lsl = None if data['lsl'] is None or pd.isna(data['lsl']) else float(data['lsl'])
+    usl = None if data['usl'] is None or pd.isna(data['usl']) else float(data['usl'])
+    return calculate_process_capability(data, lsl, usl)
+
+
+def _same(matrix_value, single_value):
+    if single_value is None:
+        return pd.isna(matrix_value)
+    return math.isclose(float(matrix_value), float(single_value), rel_tol=1e-9, abs_tol=1e-12)
+
+
+def test_matrix_rows_match_single_item_calculation(mixed_frame):
+    matrix = calculate_capability_matrix(mixed_frame)
+
+    assert len(matrix) == len(GROUPS)
+    for row in matrix.to_dict('records'):
+        group = mixed_frame[(mixed_frame['Model'] == row['Model']) & (mixed_frame['Check Items'] == row['Check Items'])]
+        single = _single(group)
+        for column, key in MATRIX_TO_SINGLE.items():
+            assert _same(row[column], single[key]), (row['Model'], row['Check Items'], column, row[column], single[key])
+        # 실측 PPM = 불량률(%) x 10^4
+        expected_ppm = None if single['defect_rate'] is None else single['defect_rate'] * 1e4
+        assert _same(row['PPM (실측)'], expected_ppm)
+
+
+def test_spec_limits_are_per_model(mixed_frame):
+    matrix = calculate_capability_matrix(mixed_frame).set_index(['Model', 'Check Items'])
+
+    assert matrix.loc[('NX-10', 'Item A'), ['LSL', 'USL']].tolist() == [1.0, 3.0]
+    assert matrix.loc[('NX-20', 'Item A'), ['LSL', 'USL']].tolist() == [2.0, 6.0]
+    # NX-10 3.2, NX-20 1.5는 각자의 규격에서만 이탈
+    assert matrix.loc[('NX-10', 'Item A'), '스펙 외부 개수'] == 1
+    assert matrix.loc[('NX-20', 'Item A'), '스펙 외부 개수'] == 1
+
+
+@pytest.mark.parametrize('model, item', [('NX-20', 'Item B'), ('NX-30', 'Item B'), ('NX-40', 'Item C')])
+def test_one_sided_or_missing_spec_has_no_capability(mixed_frame, model, item):
+    row = calculate_capability_matrix(mixed_frame).set_index(['Model', 'Check Items']).loc[(model, item)]
+
+    assert np.isnan(row['Cpk']) and np.isnan(row['Cp']) and np.isnan(row['PPM (실측)'])
+    assert row['스펙 외부 개수'] == 0   # 단일 항목 계산과 같이 양측 규격이 있을 때만 집계
+    assert row['등급'] == '규격 없음'
+
+
+@pytest.mark.parametrize('model', ['NX-30', 'NX-40'])
+def test_single_value_or_zero_std_has_no_cpk(mixed_frame, model):
+    row = calculate_capability_matrix(mixed_frame).set_index(['Model', 'Check Items']).loc[(model, 'Item A')]
+
+    assert row['표준편차'] == 0
+    assert np.isnan(row['Cpk'])
+    assert row['스펙 외부 개수'] == 0
+
+
+def test_groups_without_cpk_sort_last(mixed_frame):
+    matrix = calculate_capability_matrix(mixed_frame)
+    has_cpk = matrix['Cpk'].notna().tolist()
+
+    assert has_cpk == sorted(has_cpk, reverse=True)
+    assert matrix['Cpk'].dropna().is_monotonic_increasing
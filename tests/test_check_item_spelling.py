@@ -0,0 +1,37 @@
+"""
+측정 항목명 표기 차이 회귀 테스트
+
+같은 항목이 'ITEM  A' / 'Item A' 처럼 다른 표기로 적재되어도
+- check_item 필터는 표기 차이를 무시하고 모두 조회하고
+- 각 행은 자신이 저장된 표기 그대로 반환되어 specs(정확한 이름 매칭)의 규격이 붙어야 합니다.
+
+실행: python -m pytest tests/test_check_item_spelling.py
+"""
+import pandas as pd
+
+from modules import database as db
+
+
+def _equipment(sid, date):
+    return {'SID': sid, '장비명': f'EQ-{sid}', '종료일': date, 'R/I': 'R', 'Model': 'NX-10'}
+
+
+def test_mixed_spellings_keep_their_own_spec(temp_db):
+    df_specs = pd.DataFrame([{'Model': 'NX-10', 'Check Item': 'Item A', 'LSL': 1.0, 'USL': 2.0, 'Target': 1.5}])
+    df_equip = pd.DataFrame([_equipment('S1', '2024-01-01'), _equipment('S2', '2024-02-01')])
+    # 'ITEM  A'가 먼저 적재되어 사전(check_items)의 대표 표기가 됩니다.
+    df_meas = pd.DataFrame([
+        {'SID': 'S1', 'Check Items': 'ITEM  A', 'Value': 1.2},
+        {'SID': 'S2', 'Check Items': 'Item A', 'Value': 1.4},
+    ])
+    db.sync_relational_data(df_equip, df_meas, df_specs)
+
+    df = db.fetch_filtered_data({'check_item': ['Item A']})
+
+    assert sorted(df['Check Items']) == ['ITEM  A', 'Item A']
+
+    df = db.attach_specs(df)
+    own = df[df['Check Items'] == 'Item A']
+    assert own['LSL'].tolist() == [1.0]
+    assert own['USL'].tolist() == [2.0]
+    assert db.get_spec_for_item('NX-10', own['Check Items'].iloc[0])['usl'] == 2.0
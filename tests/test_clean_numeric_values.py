@@ -0,0 +1,98 @@
+"""
+clean_numeric_values / clean_data 테스트
+
+벡터화 구현이 기존 셀 단위 구현(문자열로 바꾼 뒤 숫자/'.'/'-' 이외 문자 제거 -> float)과
+같은 값을 돌려주는지 입력 종류별로 비교합니다.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import utils
+
+
+def legacy_clean(val):
+    """기존 셀 단위 규칙 (변환할 수 없으면 NaN)"""
+    if pd.isna(val) or val == '':
+        return np.nan
+    try:
+        return float(re.sub(r'[^\d\.\-]', '', str(val)))
+    except ValueError:
+        return np.nan
+
+
+def legacy_clean_data(df):
+    values = df['Value'].apply(legacy_clean)
+    out = df[values.notna()].copy()
+    out['Value'] = values[values.notna()]
+    return out
+
+
+CASES = {
+    'numeric strings': ['1.5', '-3.2', '0', '007', ' 12 ', '+5'],
+    'thousands separator': ['1,234', '12,345.6', '-1,000'],
+    'units': ['12.5 nm', '3 um', '-0.8mV', '45%', '±0.3'],
+    'blanks': ['', ' ', '   ', '\t'],
+    'not a number': ['Pass', 'N/A', '-', '.', '1.2.3', '5-3', 'inf', 'nan'],
+    'none and nan': [None, np.nan, pd.NA, '1.0'],
+    'bools': [True, False, np.bool_(True), '1', 0, 1],
+    'mixed objects': [1, 2.5, '3', '4 nm', None, True, '', 'x'],
+}
+
+
+@pytest.mark.parametrize('values', CASES.values(), ids=CASES.keys())
+def test_object_values_match_legacy(values):
+    series = pd.Series(values, dtype=object, index=range(10, 10 + len(values)))
+
+    result = utils.clean_numeric_values(series)
+
+    expected = series.apply(legacy_clean).astype(float)
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+@pytest.mark.parametrize('series', [
+    pd.Series([1, -2, 0, 300], dtype='int64'),
+    pd.Series([1.5, np.nan, -0.25, 0.0], dtype='float64'),
+    pd.Series([1.5, 2.5], dtype='float32'),
+    pd.Series([1, None, 3], dtype='Int64'),
+    pd.Series(['1.5', None, '2 nm'], dtype='string'),
+], ids=['int64', 'float64', 'float32', 'Int64', 'string'])
+def test_numeric_dtypes_match_legacy(series):
+    result = utils.clean_numeric_values(series)
+
+    expected = series.astype(object).apply(legacy_clean).astype(float)
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+def test_bool_dtype_is_not_a_measurement():
+    result = utils.clean_numeric_values(pd.Series([True, False, True]))
+
+    assert result.isna().all()
+
+
+def test_exponent_notation_is_parsed_as_number():
+    # 의도된 차이: 기존 규칙은 'e'를 지워 '1e3' -> 13, 1e-05 -> '1-05' (NaN)이 되었음
+    result = utils.clean_numeric_values(pd.Series(['1e3', 1e-05, '2.5E-2'], dtype=object))
+
+    assert result.tolist() == [1000.0, 1e-05, 0.025]
+
+
+def test_clean_data_matches_legacy():
+    values = [v for case in CASES.values() for v in case]
+    df = pd.DataFrame({
+        'Check Items': [f'Item {i % 3}' for i in range(len(values))],
+        'Value': pd.Series(values, dtype=object),
+    })
+
+    result = utils.clean_data(df)
+
+    expected = legacy_clean_data(df)
+    pd.testing.assert_frame_equal(result, expected)
+    assert result['Value'].dtype == float
+
+
+def test_clean_data_requires_value_column():
+    with pytest.raises(ValueError):
+        utils.clean_data(pd.DataFrame({'Check Items': ['Item A']}))
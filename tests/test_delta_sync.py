@@ -0,0 +1,161 @@
+"""
+변경분 동기화(sync_relational_delta) 테스트
+
+일괄 저장으로 채운 DB에 시트를 조금 바꿔 다시 반영했을 때
+- 반환 요약(inserted / updated / deleted / unchanged / skipped)이 실제 변경과 일치하고
+- equipments / measurements / specs 행 내용이 시트와 같아지며
+- 출하일(ship_date)과 월별 집계가 같은 트랜잭션에서 바로 반영되는지 확인합니다.
+"""
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from modules import database as db
+
+UNCHANGED = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+
+
+def _query(sql, params=()):
+    conn = sqlite3.connect(db.DB_FILE)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def seeded(temp_db):
+    """장비 3대(S1~S3) x 항목 2개 + 규격 2개 (모두 approved)"""
+    equipments = pd.DataFrame([
+        {'SID': 'S1', '장비명': 'EQ-1', '종료일': '2024-01-15', 'R/I': 'Research', 'Model': 'NX-10'},
+        {'SID': 'S2', '장비명': 'EQ-2', '종료일': '2024-02-15', 'R/I': 'Industrial', 'Model': 'NX-20'},
+        {'SID': 'S3', '장비명': 'EQ-3', '종료일': '2024-03-15', 'R/I': 'Industrial', 'Model': 'NX-20'},
+    ])
+    measurements = pd.DataFrame([
+        {'SID': sid, 'Check Items': item, 'Value': value}
+        for sid, base in (('S1', 1.0), ('S2', 2.0), ('S3', 3.0))
+        for item, value in (('Item A', base), ('Item B', base * 10))
+    ])
+    specs = pd.DataFrame([
+        {'Model': 'NX-10', 'Check Item': 'Item A', 'LSL': 0.0, 'USL': 2.0, 'Target': 1.0},
+        {'Model': 'NX-20', 'Check Item': 'Item A', 'LSL': 1.0, 'USL': 4.0, 'Target': 2.5},
+    ])
+    db.sync_relational_data(equipments, measurements, specs)
+    return equipments, measurements, specs
+
+
+def _assert_rollup_matches_equipments():
+    rollup = _query("SELECT year_month, model, status, count FROM monthly_shipments ORDER BY 1, 2, 3")
+    expected = _query('''
+        SELECT substr(ship_date, 1, 7), COALESCE(model, ''), COALESCE(status, ''), COUNT(*)
+        FROM equipments WHERE ship_date > '' GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+    ''')
+    assert rollup == expected
+
+
+def test_same_sheets_change_nothing(seeded):
+    versions = db.get_table_versions()
+    result = db.sync_relational_delta(*seeded)
+
+    assert result['equipments'] == {**UNCHANGED, 'unchanged': 3, 'skipped': 0}
+    assert result['measurements'] == {**UNCHANGED, 'unchanged': 6}
+    assert result['specs'] == {**UNCHANGED, 'unchanged': 2}
+    assert db.get_table_versions() == versions
+
+
+def test_insert_rows(seeded, monkeypatch):
+    equipments, measurements, specs = seeded
+    equipments = pd.concat([equipments, pd.DataFrame([
+        {'SID': 'S4', '장비명': 'EQ-4', '종료일': '2024/04/20', 'R/I': 'Research', 'Model': 'NX-10'},
+    ])], ignore_index=True)
+    measurements = pd.concat([measurements, pd.DataFrame([
+        {'SID': 'S4', 'Check Items': 'Item A', 'Value': 1.5},
+        {'SID': 'S1', 'Check Items': 'Item C', 'Value': 7.0},
+    ])], ignore_index=True)
+    specs = pd.concat([specs, pd.DataFrame([
+        {'Model': 'NX-10', 'Check Item': 'Item C', 'LSL': 5.0, 'USL': 9.0, 'Target': 7.0},
+    ])], ignore_index=True)
+
+    # 출하일은 별도 backfill 없이 변경분과 같은 트랜잭션에서 기록되어야 함
+    monkeypatch.setattr(db, 'backfill_ship_dates', lambda: 0)
+    result = db.sync_relational_delta(equipments, measurements, specs)
+
+    assert result['equipments'] == {'inserted': 1, 'updated': 0, 'deleted': 0, 'unchanged': 3, 'skipped': 0}
+    assert result['measurements'] == {'inserted': 2, 'updated': 0, 'deleted': 0, 'unchanged': 6}
+    assert result['specs'] == {'inserted': 1, 'updated': 0, 'deleted': 0, 'unchanged': 2}
+
+    # 출하일은 동기화가 끝난 시점에 계산되어 월별 집계에 반영됨
+    assert _query("SELECT status, ship_date FROM equipments WHERE sid = 'S4'") == [('approved', '2024-04-20')]
+    _assert_rollup_matches_equipments()
+    assert _query('''
+        SELECT m.check_items, m.value, m.equipment_id = e.id, m.item_id > 0
+        FROM measurements m JOIN equipments e ON e.sid = 'S4' WHERE m.sid = 'S4'
+    ''') == [('Item A', 1.5, 1, 1)]
+    assert _query("SELECT value FROM measurements WHERE sid = 'S1' AND check_items = 'Item C'") == [(7.0,)]
+    assert db.get_spec_for_item('NX-10', 'Item C') == {'lsl': 5.0, 'usl': 9.0, 'target': 7.0}
+
+
+def test_update_rows(seeded, monkeypatch):
+    equipments, measurements, specs = seeded
+    equipments = equipments.copy()
+    equipments.loc[equipments['SID'] == 'S2', ['장비명', '종료일', 'Model']] = ['EQ-2b', '2023-12-01', 'NX-10']
+    measurements = measurements.copy()
+    measurements.loc[(measurements['SID'] == 'S3') & (measurements['Check Items'] == 'Item B'), 'Value'] = 31.0
+    specs = specs.copy()
+    specs.loc[specs['Model'] == 'NX-20', 'USL'] = 5.0
+
+    monkeypatch.setattr(db, 'backfill_ship_dates', lambda: 0)
+    result = db.sync_relational_delta(equipments, measurements, specs)
+
+    assert result['equipments'] == {'inserted': 0, 'updated': 1, 'deleted': 0, 'unchanged': 2, 'skipped': 0}
+    assert result['measurements'] == {'inserted': 0, 'updated': 1, 'deleted': 0, 'unchanged': 5}
+    assert result['specs'] == {'inserted': 0, 'updated': 1, 'deleted': 0, 'unchanged': 1}
+
+    assert _query("SELECT equipment_name, date, model, ship_date FROM equipments WHERE sid = 'S2'") == [
+        ('EQ-2b', '2023-12-01', 'NX-10', '2023-12-01')]
+    # 측정값의 비정규화 컬럼도 함께 갱신
+    assert {row[0] for row in _query("SELECT equipment_name FROM measurements WHERE sid = 'S2'")} == {'EQ-2b'}
+    assert _query("SELECT value FROM measurements WHERE sid = 'S3' AND check_items = 'Item B'") == [(31.0,)]
+    assert db.get_spec_for_item('NX-20', 'Item A')['usl'] == 5.0
+    _assert_rollup_matches_equipments()
+
+
+def test_delete_rows(seeded):
+    equipments, measurements, specs = seeded
+    equipments = equipments[equipments['SID'] != 'S3']
+    measurements = measurements[(measurements['SID'] != 'S3')
+                                & ~((measurements['SID'] == 'S1') & (measurements['Check Items'] == 'Item B'))]
+    specs = specs[specs['Model'] != 'NX-20']
+
+    result = db.sync_relational_delta(equipments, measurements, specs)
+
+    assert result['equipments'] == {'inserted': 0, 'updated': 0, 'deleted': 1, 'unchanged': 2, 'skipped': 0}
+    # S3의 측정값 2건은 장비 삭제와 함께 지워지고, S1 Item B만 따로 삭제됨
+    assert result['measurements'] == {'inserted': 0, 'updated': 0, 'deleted': 1, 'unchanged': 3}
+    assert result['specs'] == {'inserted': 0, 'updated': 0, 'deleted': 1, 'unchanged': 1}
+
+    assert [row[0] for row in _query("SELECT sid FROM equipments ORDER BY sid")] == ['S1', 'S2']
+    assert _query("SELECT sid, check_items FROM measurements ORDER BY sid, check_items") == [
+        ('S1', 'Item A'), ('S2', 'Item A'), ('S2', 'Item B')]
+    assert _query("SELECT model, check_item FROM specs") == [('NX-10', 'Item A')]
+    _assert_rollup_matches_equipments()
+
+
+def test_pending_equipment_is_skipped_and_specs_kept_without_sheet(seeded):
+    equipments, measurements, _ = seeded
+    conn = sqlite3.connect(db.DB_FILE)
+    conn.execute("INSERT INTO equipments (sid, equipment_name, date, model, status) "
+                 "VALUES ('P1', 'Pending', '2024-05-01', 'NX-10', 'pending')")
+    conn.commit()
+    conn.close()
+
+    equipments = pd.concat([equipments, pd.DataFrame([
+        {'SID': 'P1', '장비명': 'From sheet', '종료일': '2024-05-02', 'R/I': 'Research', 'Model': 'NX-10'},
+    ])], ignore_index=True)
+    result = db.sync_relational_delta(equipments, measurements, None)
+
+    assert result['equipments']['skipped'] == 1
+    assert result['specs'] == UNCHANGED
+    assert _query("SELECT equipment_name, status FROM equipments WHERE sid = 'P1'") == [('Pending', 'pending')]
+    assert _query("SELECT COUNT(*) FROM specs") == [(2,)]
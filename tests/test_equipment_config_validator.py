@@ -0,0 +1,92 @@
+"""
+장비 구성 검증(EquipmentConfigValidator) 테스트
+
+저장소의 equipment_config_rules.json으로 산업용(NX-Wafer)/연구용(MX-200, MX-300) 모델의
+정상/오류 구성을 validate_config / validate_many / validate_frame에 넣어 결과가 같은지 확인합니다.
+"""
+import pandas as pd
+import pytest
+
+from equipment_config_validator import EquipmentConfigValidator
+
+VALID = [
+    ('NX-Wafer', {'ri': 'Industrial', 'xy_scanner': 'Dual 100µm(300mm)', 'head_type': 'Auto Align Standard',
+                  'mod_vit': 'Dual MOD 6 units', 'sliding_stage': '10mm'}),
+    ('NX-Wafer', {'ri': 'Industrial', 'xy_scanner': 'Dual 50µm(200mm)', 'head_type': 'Manual Align',
+                  'mod_vit': 'Dual MOD 4 units'}),
+    ('MX-200', {'ri': 'Research', 'xy_scanner': 'Single 50µm(100mm)', 'head_type': 'Manual Align',
+                'mod_vit': 'Single MOD 4 units'}),
+    ('MX-200', {'ri': 'Research', 'xy_scanner': 'Single 100µm(150mm)', 'head_type': 'Manual Align',
+                'mod_vit': 'Single MOD 2 units', 'sliding_stage': '5mm', 'ae': 'Single Walled'}),
+    ('MX-300', {'ri': 'Research', 'xy_scanner': 'Dual 50µm(200mm)', 'head_type': 'Semi Auto Align',
+                'mod_vit': 'Dual MOD 4 units', 'sliding_stage': '10mm'}),
+]
+
+# (모델, 구성, 오류 메시지에 포함되어야 하는 문자열)
+INVALID = [
+    ('NX-Wafer', {'ri': 'Industrial', 'xy_scanner': 'Dual 100µm(300mm)', 'head_type': 'Auto Align Standard',
+                  'mod_vit': 'Single MOD 4 units', 'sliding_stage': '10mm'},
+     ["'Single MOD 4 units'는 NX-Wafer에서 사용할 수 없습니다", 'Dual MOD를 선택해야 합니다']),
+    ('NX-Wafer', {'ri': 'Industrial', 'xy_scanner': 'Dual 100µm(300mm)', 'head_type': 'Auto Align Premium',
+                  'mod_vit': 'Dual MOD 8 units'},
+     ['Sliding Stage는 10mm 이상이어야 합니다']),
+    ('NX-Wafer', {'ri': 'Industrial', 'head_type': 'Manual Align', 'mod_vit': 'Dual MOD 6 units'},
+     ['필수 필드 누락']),
+    ('MX-200', {'ri': 'Industrial', 'xy_scanner': 'Single 50µm(100mm)', 'head_type': 'Manual Align'},
+     ["'Industrial'는 MX-200에서 사용할 수 없습니다"]),
+    ('MX-200', {'ri': 'Research', 'xy_scanner': 'Single 50µm(100mm)', 'head_type': 'Manual Align',
+                'mod_vit': 'Dual MOD 4 units'},
+     ['Single MOD를 선택해야 합니다']),
+    ('MX-200', {'ri': 'Research', 'xy_scanner': 'Single 50µm(100mm)', 'head_type': 'Manual Align'},
+     ['Single MOD를 선택해야 합니다']),   # 조건부 규칙의 대상 필드가 비어 있음
+    ('MX-300', {'ri': 'Research', 'xy_scanner': 'Single 100µm(150mm)', 'head_type': 'Semi Auto Align',
+                'mod_vit': 'Single MOD 4 units', 'sliding_stage': '5mm'},
+     ['Sliding Stage는 10mm 이상이어야 합니다']),
+    ('MX-300', {'ri': 'Research', 'xy_scanner': 'Dual 50µm(200mm)', 'head_type': 'Manual Align'},
+     ['Dual MOD를 선택해야 합니다']),
+    ('NX-Unknown', {'ri': 'Industrial'}, ['알 수 없는 모델: NX-Unknown']),
+]
+
+
+@pytest.fixture(scope='module')
+def validator():
+    return EquipmentConfigValidator()
+
+
+@pytest.mark.parametrize('model, config', VALID)
+def test_valid_configs(validator, model, config):
+    assert validator.validate_config(model, config) == (True, [])
+
+
+@pytest.mark.parametrize('model, config, expected', INVALID)
+def test_invalid_configs(validator, model, config, expected):
+    is_valid, errors = validator.validate_config(model, config)
+
+    assert not is_valid
+    for message in expected:
+        assert any(message in error for error in errors), (message, errors)
+
+
+def test_conditional_options_follow_selected_fields(validator):
+    assert validator.get_allowed_options('NX-Wafer', 'mod_vit', {'xy_scanner': 'Dual 100µm(300mm)'}) == [
+        'Dual MOD 6 units', 'Dual MOD 8 units', 'Dual MOD 4 units']
+    assert validator.get_allowed_options('MX-300', 'mod_vit', {'xy_scanner': 'Single 100µm(150mm)'}) == [
+        'Single MOD 4 units']
+    # 'Semi Auto Align'도 'Auto Align'을 포함하므로 10mm 이상만 허용
+    assert validator.get_allowed_options('MX-300', 'sliding_stage', {'head_type': 'Semi Auto Align'}) == ['10mm']
+    assert validator.get_allowed_options('MX-300', 'sliding_stage', {'head_type': 'Manual Align'}) == ['5mm', '10mm']
+    assert validator.get_required_fields('MX-200') == ['ri', 'xy_scanner', 'head_type']
+
+
+def test_validate_many_and_frame_match_single_validation(validator):
+    items = [(model, config) for model, config in VALID] + [(model, config) for model, config, _ in INVALID]
+    items += items[:3]   # 반복되는 구성 (중복 제거 경로)
+    expected = [validator.validate_config(model, config) for model, config in items]
+
+    assert validator.validate_many(items) == expected
+
+    df = pd.DataFrame([{'model': model, **config} for model, config in items], index=range(100, 100 + len(items)))
+    result = validator.validate_frame(df)
+    assert result.index.tolist() == df.index.tolist()
+    assert result['is_valid'].tolist() == [is_valid for is_valid, _ in expected]
+    assert result['errors'].tolist() == [errors for _, errors in expected]
@@ -0,0 +1,174 @@
+"""
+스키마 마이그레이션(PRAGMA user_version) 테스트
+
+- 빈 DB -> SCHEMA_VERSION
+- 기존(버전 관리 이전, user_version = 0) 스키마 DB -> 데이터 손실 없이 SCHEMA_VERSION
+- 최신 DB에서 init_db() 재호출은 아무것도 바꾸지 않음
+- 실패한 단계는 롤백되고 user_version은 마지막 성공 단계에 머묾
+"""
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from modules import database as db
+
+ORIGINAL_MIGRATIONS = list(db.MIGRATIONS)
+
+# 버전 관리 이전 앱이 만든 스키마 (approval_history.timestamp, measurements.check_item만 있음)
+LEGACY_SCHEMA = '''
+    CREATE TABLE equipments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        sid TEXT UNIQUE, equipment_name TEXT, date TEXT, ri TEXT, model TEXT,
+        xy_scanner TEXT, head_type TEXT, mod_vit TEXT, sliding_stage TEXT, sample_chuck TEXT, ae TEXT,
+        status TEXT DEFAULT 'pending', uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE measurements (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        equipment_id INTEGER, check_item TEXT, value REAL,
+        FOREIGN KEY (equipment_id) REFERENCES equipments (id)
+    );
+    CREATE TABLE specs (
+        model TEXT, check_item TEXT, lsl REAL, usl REAL, target REAL,
+        PRIMARY KEY (model, check_item)
+    );
+    CREATE TABLE approval_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        sid TEXT NOT NULL, equipment_id INTEGER, action TEXT NOT NULL, admin_name TEXT, reason TEXT,
+        previous_status TEXT, new_status TEXT, modification_count INTEGER DEFAULT 0,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP, metadata TEXT
+    );
+    CREATE TABLE pending_measurements (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        sid TEXT NOT NULL, equipment_name TEXT, category TEXT, check_items TEXT,
+        min_value REAL, criteria REAL, max_value REAL, value REAL, unit TEXT,
+        pass_fail TEXT, trend TEXT, remark TEXT, status TEXT DEFAULT 'pending',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    INSERT INTO equipments (sid, equipment_name, date, ri, model, status)
+    VALUES ('S1', 'EQ-1', '2024-01-15', 'Research', 'NX-10', 'approved'),
+           ('S2', 'EQ-2', '2024/02/20', 'Industrial', 'NX-20', 'pending');
+    INSERT INTO measurements (equipment_id, check_item, value)
+    VALUES (1, 'Item A', 1.5), (1, 'Item  B', 2.5), (2, 'ITEM A', 3.5);
+    INSERT INTO specs VALUES ('NX-10', 'Item A', 1.0, 2.0, 1.5);
+    INSERT INTO approval_history (sid, equipment_id, action, timestamp)
+    VALUES ('S2', 2, 'rejected', '2024-02-21 09:00:00');
+    INSERT INTO pending_measurements (sid, check_items, value) VALUES ('S2', 'Item A', 3.5);
+'''
+
+
+@pytest.fixture
+def db_file(tmp_path, monkeypatch):
+    """아직 만들지 않은 DB 파일 경로"""
+    path = str(tmp_path / 'control_chart.db')
+    monkeypatch.setattr(db, 'DB_FILE', path)
+    return path
+
+
+def _query(sql, params=()):
+    conn = sqlite3.connect(db.DB_FILE)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def _columns(table):
+    return {row[1] for row in _query(f"PRAGMA table_info({table})")}
+
+
+def _snapshot():
+    """스키마 + 전체 데이터 (비교용)"""
+    schema = _query("SELECT type, name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_stat%' ORDER BY name")
+    tables = [name for kind, name, _ in schema if kind == 'table' and not name.startswith('sqlite_')]
+    return schema, {table: _query(f"SELECT * FROM {table}") for table in tables}
+
+
+def test_fresh_db_migrates_to_latest(db_file):
+    db.init_db()
+
+    assert db.get_schema_version() == db.SCHEMA_VERSION
+    assert _query("PRAGMA journal_mode") == [('wal',)]
+    tables = {row[0] for row in _query("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {'equipments', 'measurements', 'specs', 'approval_history', 'pending_measurements', 'check_items',
+            'monthly_shipments', 'model_categories', 'filter_catalog', 'config_audit_queue',
+            'table_versions', 'analysis_usage'} <= tables
+    assert {'ship_date', 'end_user', 'reference_doc'} <= _columns('equipments')
+    assert 'item_id' in _columns('measurements')
+
+
+def test_legacy_db_migrates_without_data_loss(db_file):
+    conn = sqlite3.connect(db_file)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.close()
+    assert db.get_schema_version() == 0
+
+    db.init_db()
+
+    assert db.get_schema_version() == db.SCHEMA_VERSION
+    assert _query("SELECT sid, equipment_name, date, model, status FROM equipments ORDER BY id") == [
+        ('S1', 'EQ-1', '2024-01-15', 'NX-10', 'approved'), ('S2', 'EQ-2', '2024/02/20', 'NX-20', 'pending')]
+    # check_item -> check_items 복사, 표기만 다른 항목은 같은 item_id
+    rows = _query("SELECT check_item, check_items, value, item_id FROM measurements ORDER BY id")
+    assert [row[:3] for row in rows] == [
+        ('Item A', 'Item A', 1.5), ('Item  B', 'Item  B', 2.5), ('ITEM A', 'ITEM A', 3.5)]
+    assert rows[0][3] == rows[2][3] != rows[1][3]
+    assert _query("SELECT * FROM specs") == [('NX-10', 'Item A', 1.0, 2.0, 1.5)]
+    # approval_history.timestamp -> action_at (값 유지)
+    assert 'timestamp' not in _columns('approval_history')
+    assert _query("SELECT sid, action, action_at FROM approval_history") == [('S2', 'rejected', '2024-02-21 09:00:00')]
+    assert _query("SELECT sid, check_items, value FROM pending_measurements") == [('S2', 'Item A', 3.5)]
+    # 파생 테이블은 기존 데이터로 채워짐
+    assert _query("SELECT ri, model, count FROM filter_catalog ORDER BY item_id") == [
+        ('Research', 'NX-10', 1), ('Research', 'NX-10', 1)]
+    assert sorted(row[0] for row in _query("SELECT equipment_id FROM config_audit_queue")) == [1, 2]
+    assert db.get_monthly_rollup()['count'].sum() == 2   # 출하일은 조회 시 backfill
+
+
+def test_second_init_db_is_noop(db_file, monkeypatch):
+    db.init_db()
+    equipments = pd.DataFrame([{'SID': 'S1', '장비명': 'EQ-1', '종료일': '2024-01-15', 'R/I': 'Research', 'Model': 'NX-10'}])
+    measurements = pd.DataFrame([{'SID': 'S1', 'Check Items': 'Item A', 'Value': 1.0}])
+    db.sync_relational_data(equipments, measurements)
+    before = _snapshot()
+
+    # 이미 적용된 단계는 (다른 프로세스가 먼저 적용한 경우처럼) 직접 실행해도 모두 건너뜀
+    conn = sqlite3.connect(db_file)
+    db._apply_migrations(conn)
+    conn.close()
+    assert _snapshot() == before
+
+    def fail(conn):
+        raise AssertionError('migrations must not run on an up-to-date DB')
+
+    monkeypatch.setattr(db, '_apply_migrations', fail)
+    db.init_db()
+    assert _snapshot() == before
+
+
+def test_failing_step_rolls_back_and_keeps_version(db_file, monkeypatch):
+    def broken_step(c):
+        c.execute("CREATE TABLE half_done (id INTEGER)")
+        c.execute("ALTER TABLE equipments ADD COLUMN half_done_col TEXT")
+        raise RuntimeError('migration step failed')
+
+    failing = [(3, 'broken', broken_step) if version == 3 else (version, name, step)
+               for version, name, step in ORIGINAL_MIGRATIONS]
+    monkeypatch.setattr(db, 'MIGRATIONS', failing)
+
+    with pytest.raises(RuntimeError):
+        db.init_db()
+
+    # 1, 2단계는 적용되고 3단계의 변경은 모두 롤백
+    assert db.get_schema_version() == 2
+    assert not _query("SELECT name FROM sqlite_master WHERE name = 'half_done'")
+    assert 'half_done_col' not in _columns('equipments')
+    assert 'ship_date' not in _columns('equipments')
+
+    # 원래 단계로 다시 실행하면 남은 단계부터 이어서 적용
+    monkeypatch.setattr(db, 'MIGRATIONS', ORIGINAL_MIGRATIONS)
+    db.init_db()
+    assert db.get_schema_version() == db.SCHEMA_VERSION
+    assert 'ship_date' in _columns('equipments')
+
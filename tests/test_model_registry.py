@@ -0,0 +1,48 @@
+"""
+model_registry.sync_rules_categories_once 테스트
+
+- 규칙 파일 분류의 DB 반영은 프로세스당 한 번만 실행
+- DB 오류(잠금 등)는 앱 시작을 막지 않고 다음 호출에서 다시 시도
+"""
+import sqlite3
+
+import pytest
+
+from modules import model_registry
+
+
+@pytest.fixture
+def calls(temp_db, monkeypatch):
+    monkeypatch.setattr(model_registry, '_rules_synced', False)
+    calls = []
+    monkeypatch.setattr(model_registry, 'sync_rules_categories', lambda: calls.append(1) or 2)
+    return calls
+
+
+def test_runs_once_per_process(calls):
+    assert model_registry.sync_rules_categories_once() == 2
+    assert model_registry.sync_rules_categories_once() == 0
+    assert len(calls) == 1
+
+
+def test_db_error_is_logged_and_retried(calls, monkeypatch, caplog):
+    def locked():
+        calls.append(1)
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(model_registry, 'sync_rules_categories', locked)
+    assert model_registry.sync_rules_categories_once() == 0
+    assert 'database is locked' in caplog.text
+
+    monkeypatch.setattr(model_registry, 'sync_rules_categories', lambda: calls.append(1) or 0)
+    model_registry.sync_rules_categories_once()
+    model_registry.sync_rules_categories_once()
+    assert len(calls) == 2
+
+
+def test_real_sync_adds_rules_only_models(temp_db, monkeypatch):
+    monkeypatch.setattr(model_registry, '_rules_synced', False)
+    model_registry.sync_rules_categories_once()
+
+    assert set(model_registry.rules_categories()) <= set(model_registry.get_registry())
+    assert model_registry.sync_rules_categories_once() == 0
@@ -0,0 +1,150 @@
+"""
+전체 재적재(shadow table swap) 테스트
+
+sync_relational_stream은 <table>_new에 적재한 뒤 DROP + RENAME으로 교체합니다.
+SQLite는 인덱스/트리거 이름을 바꿀 수 없으므로 재적재마다 기본 이름과 _alt 이름이 번갈아 쓰입니다.
+교체 후에도 인덱스/트리거(버전, 월별 집계, 필터 카탈로그, 구성 검증)가 모두 살아 있고,
+적재 중 실패하면 기존 테이블이 그대로 남는지 확인합니다.
+"""
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from modules import database as db
+
+
+def _frames(n_equipments, value_offset=0.0):
+    equipments = pd.DataFrame([{
+        'SID': f'S{i}', '장비명': f'EQ-{i}', '종료일': f'2024-0{1 + i % 3}-15',
+        'R/I': 'Industrial' if i % 2 else 'Research', 'Model': f'NX-{10 + i % 2}',
+    } for i in range(n_equipments)])
+    measurements = pd.DataFrame([
+        {'SID': f'S{i}', 'Check Items': item, 'Value': i + value_offset}
+        for i in range(n_equipments) for item in ('Item A', 'Item B')
+    ])
+    specs = pd.DataFrame([{'Model': 'NX-10', 'Check Item': 'Item A', 'LSL': 0.0, 'USL': 10.0, 'Target': 5.0}])
+    return equipments, measurements, specs
+
+
+def _query(sql, params=()):
+    conn = sqlite3.connect(db.DB_FILE)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def _counts():
+    return {table: _query(f"SELECT COUNT(*) FROM {table}")[0][0] for table in db.SWAP_TABLES}
+
+
+def _schema_objects():
+    """{(type, 기본 이름, 테이블)} 과 _alt 이름 사용 여부"""
+    rows = _query("SELECT type, name, tbl_name FROM sqlite_master WHERE type IN ('index', 'trigger') AND sql IS NOT NULL")
+    objects = {(kind, name[:-4] if name.endswith('_alt') else name, table) for kind, name, table in rows}
+    alt = {name for _, name, _ in rows if name.endswith('_alt')}
+    return objects, alt
+
+
+def _expected_objects():
+    expected = {('index', name, table) for name, table, _ in db.TABLE_INDEXES}
+    for table in db.VERSIONED_TABLES:
+        for op in ('insert', 'update', 'delete'):
+            expected.add(('trigger', f"trg_{table}_{op}_version", table))
+    expected |= {('trigger', name, 'equipments') for name in db.EQUIPMENT_TRIGGERS}
+    expected |= {('trigger', name, table) for name, (_, table, _, _) in db.CATALOG_TRIGGERS.items()}
+    return expected
+
+
+def _assert_derived_tables_consistent():
+    """월별 집계 / 필터 카탈로그 / 검증 대기열이 live 테이블에서 다시 계산한 값과 일치"""
+    rollup = _query("SELECT year_month, model, status, count FROM monthly_shipments ORDER BY 1, 2, 3")
+    expected_rollup = _query('''
+        SELECT substr(ship_date, 1, 7), COALESCE(model, ''), COALESCE(status, ''), COUNT(*)
+        FROM equipments WHERE ship_date > '' GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+    ''')
+    assert rollup == expected_rollup
+
+    catalog = _query("SELECT ri, model, item_id, count FROM filter_catalog WHERE count > 0 ORDER BY 1, 2, 3")
+    expected_catalog = _query('''
+        SELECT COALESCE(e.ri, ''), COALESCE(e.model, ''), m.item_id, COUNT(*)
+        FROM measurements m JOIN equipments e ON m.equipment_id = e.id
+        WHERE e.status = 'approved' AND m.item_id > 0 GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+    ''')
+    assert catalog == expected_catalog
+
+    queued = [row[0] for row in _query("SELECT equipment_id FROM config_audit_queue ORDER BY equipment_id")]
+    assert queued == [row[0] for row in _query("SELECT id FROM equipments ORDER BY id")]
+
+
+def test_full_reload_keeps_indexes_triggers_and_derived_tables(temp_db):
+    db.sync_relational_data(*_frames(3))
+    result = db.sync_relational_data(*_frames(5, value_offset=0.5))
+
+    assert result == {'equipments': 5, 'measurements': 10, 'specs': 1}
+    assert _counts() == {'equipments': 5, 'measurements': 10, 'specs': 1}
+    assert _query("SELECT model, check_item, lsl, usl, target FROM specs") == [('NX-10', 'Item A', 0.0, 10.0, 5.0)]
+    assert _query("SELECT value FROM measurements WHERE sid = 'S4' ORDER BY id") == [(4.5,), (4.5,)]
+    assert not _query("SELECT name FROM sqlite_master WHERE name LIKE '%\\_new' ESCAPE '\\'")
+
+    objects, _ = _schema_objects()
+    assert _expected_objects() <= objects
+    _assert_derived_tables_consistent()
+
+    # 교체된 테이블에서도 트리거가 동작 (승인 취소 -> 집계/카탈로그 감소, 버전 증가)
+    versions = db.get_table_versions()
+    conn = sqlite3.connect(db.DB_FILE)
+    conn.execute("UPDATE equipments SET status = 'pending' WHERE sid = 'S0'")
+    conn.execute("DELETE FROM measurements WHERE sid = 'S1'")
+    conn.commit()
+    conn.close()
+    after = db.get_table_versions()
+    assert after['equipments'] > versions['equipments']
+    assert after['measurements'] > versions['measurements']
+    _assert_derived_tables_consistent()
+
+
+def test_second_reload_flips_alt_names_back(temp_db):
+    objects_initial, alt_initial = _schema_objects()
+    assert not alt_initial
+
+    db.sync_relational_data(*_frames(3))
+    objects_first, alt_first = _schema_objects()
+    # 교체된 테이블의 인덱스/트리거는 모두 _alt 이름으로 바뀜
+    swapped = {name for kind, name, table in objects_first if table in db.SWAP_TABLES and name.startswith('idx_')}
+    assert {f"{name}_alt" for name in swapped} <= alt_first
+
+    db.sync_relational_data(*_frames(3))
+    objects_second, alt_second = _schema_objects()
+    assert not alt_second
+    assert objects_initial == objects_first == objects_second
+    assert _counts() == {'equipments': 3, 'measurements': 6, 'specs': 1}
+    _assert_derived_tables_consistent()
+
+
+def test_failure_mid_stream_leaves_live_tables_untouched(temp_db):
+    db.sync_relational_data(*_frames(3))
+    before_rows = _query("SELECT sid, model, ship_date FROM equipments ORDER BY id")
+    before_meas = _query("SELECT equipment_id, check_items, value, item_id FROM measurements ORDER BY id")
+    before_specs = _query("SELECT * FROM specs")
+    before_objects = _schema_objects()
+    before_versions = db.get_table_versions()
+
+    equipments, measurements, specs = _frames(6, value_offset=100.0)
+
+    def sheets():
+        yield 'Specs', specs.assign(LSL=-1.0)
+        yield 'Equipments', equipments
+        raise RuntimeError('parse failed')
+
+    with pytest.raises(RuntimeError):
+        db.sync_relational_stream(sheets())
+
+    assert _query("SELECT sid, model, ship_date FROM equipments ORDER BY id") == before_rows
+    assert _query("SELECT equipment_id, check_items, value, item_id FROM measurements ORDER BY id") == before_meas
+    assert _query("SELECT * FROM specs") == before_specs
+    assert _schema_objects() == before_objects
+    assert db.get_table_versions() == before_versions
+    assert not _query("SELECT name FROM sqlite_master WHERE name LIKE '%\\_new' ESCAPE '\\'")
+    _assert_derived_tables_consistent()